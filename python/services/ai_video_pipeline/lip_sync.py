@@ -37,11 +37,23 @@ Usage:
         fps=30,
         character_id="char_123"
     )
+
+    # Props for the Remotion composition (layout="spans" for the compact,
+    # run-length encoded form)
+    props = engine.export_for_remotion(animation)
+
+Frames are generated in one pass over the words (each word paints only the
+frames it covers) into parallel arrays; a word's viseme sequence is computed
+once per distinct word. Per-frame VisemeFrame objects are only built if
+someone reads LipSyncAnimation.frames.
 """
 
+import math
 import re
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Literal
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Literal, Tuple
 from enum import Enum
 import logging
 
@@ -83,16 +95,125 @@ class VisemeFrame:
     word: Optional[str] = None
 
 
+# Stable integer codes for the columnar representation
+VISEME_CODES: List[Viseme] = list(Viseme)
+_VISEME_CODE = {v: i for i, v in enumerate(VISEME_CODES)}
+
+NO_WORD = -1
+
+
 @dataclass
+class VisemeTrack:
+    """
+    Columnar frame data: parallel arrays indexed by frame number.
+
+    visemes holds VISEME_CODES indices; word_index points into words, or is
+    NO_WORD for silence (rest, intensity 0). intensity is only set for
+    tracks built from VisemeFrame lists (from_frames); otherwise it is 1.0
+    while a word is spoken and 0.0 in silence.
+    """
+    fps: int
+    visemes: array
+    word_index: array
+    words: List[str]
+    intensity: Optional[array] = None
+
+    @classmethod
+    def from_frames(cls, frames: List[VisemeFrame], fps: int) -> "VisemeTrack":
+        """Build a track from per-frame objects (frames missing from the list rest)."""
+        n = max((f.frame_number for f in frames), default=-1) + 1
+        visemes = array("B", [_VISEME_CODE[Viseme.REST]]) * n
+        word_index = array("i", [NO_WORD]) * n
+        intensity = array("d", [0.0]) * n
+        word_ids: Dict[str, int] = {}
+        for f in frames:
+            visemes[f.frame_number] = _VISEME_CODE[Viseme(f.viseme)]
+            intensity[f.frame_number] = f.intensity
+            if f.word is not None:
+                word_index[f.frame_number] = word_ids.setdefault(f.word, len(word_ids))
+        return cls(fps=fps, visemes=visemes, word_index=word_index, words=list(word_ids), intensity=intensity)
+
+    def __len__(self) -> int:
+        return len(self.visemes)
+
+    def _level(self, frame_num: int) -> float:
+        if self.intensity is not None:
+            return self.intensity[frame_num]
+        return 0.0 if self.word_index[frame_num] == NO_WORD else 1.0
+
+    def frame(self, frame_num: int) -> VisemeFrame:
+        word_idx = self.word_index[frame_num]
+        return VisemeFrame(
+            frame_number=frame_num,
+            time=frame_num * (1.0 / self.fps),
+            viseme=VISEME_CODES[self.visemes[frame_num]],
+            intensity=self._level(frame_num),
+            word=None if word_idx == NO_WORD else self.words[word_idx]
+        )
+
+    def runs(self) -> List[Tuple[int, int, int, float]]:
+        """Run-length encode as (start_frame, length, viseme_code, intensity)."""
+        runs = []
+        visemes, level = self.visemes, self._level
+        n = len(visemes)
+        start = 0
+        while start < n:
+            code = visemes[start]
+            intensity = level(start)
+            end = start + 1
+            while end < n and visemes[end] == code and level(end) == intensity:
+                end += 1
+            runs.append((start, end - start, code, intensity))
+            start = end
+        return runs
+
+
+@dataclass(init=False)
 class LipSyncAnimation:
-    """Complete lip-sync animation data"""
-    frames: List[VisemeFrame]
+    """
+    Complete lip-sync animation data.
+
+    Built from a VisemeTrack, or (the original signature) from a list of
+    VisemeFrame objects, passed as frames= or as the first argument.
+    """
+    track: VisemeTrack
     duration: float  # seconds
     fps: int
     total_frames: int
     character_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def __init__(
+        self,
+        track: Optional[VisemeTrack] = None,
+        duration: Optional[float] = None,
+        fps: Optional[int] = None,
+        total_frames: Optional[int] = None,
+        character_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        frames: Optional[List[VisemeFrame]] = None
+    ):
+        if isinstance(track, list):
+            track, frames = None, track
+        missing = [name for name, value in
+                   (("duration", duration), ("fps", fps), ("total_frames", total_frames))
+                   if value is None]
+        if missing:
+            raise TypeError(f"LipSyncAnimation missing required arguments: {', '.join(missing)}")
+        if (track is None) == (frames is None):
+            raise TypeError("LipSyncAnimation takes exactly one of track or frames")
+        self.track = track if track is not None else VisemeTrack.from_frames(frames, fps)
+        self.duration = duration
+        self.fps = fps
+        self.total_frames = total_frames
+        self.character_id = character_id
+        self.metadata = metadata if metadata is not None else {}
+
+    @property
+    def frames(self) -> List[VisemeFrame]:
+        """Per-frame view of the track (allocates one object per frame)."""
+        return [self.track.frame(n) for n in range(len(self.track))]
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to JSON-serializable dict"""
         return {
@@ -176,6 +297,54 @@ WORD_TO_VISEME_HINTS = {
 }
 
 
+def _letter_visemes(word: str) -> Tuple[Viseme, ...]:
+    """Simple letter-to-viseme mapping (see LipSyncEngine._analyze_word_visemes)."""
+    viseme_sequence = []
+
+    for char in word:
+        if char in "aeiou":
+            if char in "ae":
+                viseme_sequence.append(Viseme.A)
+            elif char in "ei":
+                viseme_sequence.append(Viseme.E)
+            elif char in "o":
+                viseme_sequence.append(Viseme.O)
+            elif char in "u":
+                viseme_sequence.append(Viseme.U)
+        elif char in "mbp":
+            viseme_sequence.append(Viseme.M)
+        elif char in "fv":
+            viseme_sequence.append(Viseme.F)
+        elif char in "l":
+            viseme_sequence.append(Viseme.L)
+        elif char in "sz":
+            viseme_sequence.append(Viseme.S)
+        elif char in "tdn":
+            viseme_sequence.append(Viseme.T)
+        elif char in "w":
+            viseme_sequence.append(Viseme.W)
+
+    return tuple(viseme_sequence)
+
+
+@lru_cache(maxsize=8192)
+def word_viseme_sequence(word: str) -> Tuple[Viseme, ...]:
+    """
+    Viseme sequence spoken across a word (empty = rest). Memoized: transcripts
+    repeat a small vocabulary, so each distinct word is normalized once.
+    """
+    word_lower = word.lower().strip(".,!?;:")
+    if word_lower in WORD_TO_VISEME_HINTS:
+        return tuple(WORD_TO_VISEME_HINTS[word_lower])
+    return _letter_visemes(word_lower)
+
+
+@lru_cache(maxsize=8192)
+def _word_codes(word: str) -> Tuple[int, ...]:
+    """word_viseme_sequence as VISEME_CODES indices (rest for unmapped words)."""
+    return tuple(_VISEME_CODE[v] for v in word_viseme_sequence(word)) or (_VISEME_CODE[Viseme.REST],)
+
+
 class LipSyncEngine:
     """
     Lip-sync animation engine that converts word timestamps to mouth shapes.
@@ -232,7 +401,7 @@ class LipSyncEngine:
         if not words:
             # Return empty animation
             return LipSyncAnimation(
-                frames=[],
+                track=VisemeTrack(fps=fps, visemes=array("B"), word_index=array("i"), words=[]),
                 duration=0.0,
                 fps=fps,
                 total_frames=0,
@@ -245,10 +414,10 @@ class LipSyncEngine:
         total_frames = int(duration * fps) + 1
 
         # Generate frames
-        frames = self._generate_frames(words, fps, total_frames)
+        track = self._generate_track(words, fps, total_frames)
 
         return LipSyncAnimation(
-            frames=frames,
+            track=track,
             duration=duration,
             fps=fps,
             total_frames=total_frames,
@@ -256,14 +425,19 @@ class LipSyncEngine:
             metadata=metadata or {}
         )
 
-    def _generate_frames(
+    def _generate_track(
         self,
         words: List[WordTimestamp],
         fps: int,
         total_frames: int
-    ) -> List[VisemeFrame]:
+    ) -> VisemeTrack:
         """
-        Generate frame-by-frame viseme data.
+        Generate columnar frame data in a single sweep over the words.
+
+        A frame belongs to the first word (in input order) whose
+        [start, end] contains its time. Painting words in reverse order
+        lets earlier words win overlaps, and each word only touches the
+        frames it covers, so the cost is O(words + frames).
 
         Args:
             words: List of word timestamps
@@ -271,43 +445,68 @@ class LipSyncEngine:
             total_frames: Total number of frames to generate
 
         Returns:
-            List of VisemeFrame objects
+            VisemeTrack with one entry per frame
         """
-        frames = []
         frame_duration = 1.0 / fps
-
-        for frame_num in range(total_frames):
-            frame_time = frame_num * frame_duration
-
-            # Find which word this frame belongs to
-            current_word = None
-            for word in words:
-                if word.start <= frame_time <= word.end:
-                    current_word = word
-                    break
-
-            if current_word:
-                # Calculate position within word (0.0 to 1.0)
-                word_duration = current_word.end - current_word.start
-                word_progress = (frame_time - current_word.start) / word_duration if word_duration > 0 else 0.0
-
-                # Get viseme for this word and position
-                viseme = self._get_viseme_for_word(current_word.word, word_progress)
-                intensity = 1.0
+        rest = _VISEME_CODE[Viseme.REST]
+        visemes = array("B", bytes([rest])) * total_frames
+        word_index = array("i", [NO_WORD]) * total_frames
+
+        for idx in range(len(words) - 1, -1, -1):
+            word = words[idx]
+            start, end = word.start, word.end
+
+            # Frame range from the estimate, nudged so membership uses the
+            # exact same float comparison as frame_num * frame_duration
+            first = max(0, math.ceil(start * fps) - 1)
+            while first < total_frames and first * frame_duration < start:
+                first += 1
+            last = min(total_frames - 1, math.floor(end * fps) + 1)
+            while last >= first and last * frame_duration > end:
+                last -= 1
+            if last < first:
+                continue
+
+            codes = _word_codes(word.word)
+            n = len(codes)
+            word_duration = end - start
+            span = last + 1 - first
+            if n == 1 or word_duration <= 0:
+                visemes[first:last + 1] = array("B", codes[:1]) * span
             else:
-                # Rest position (silence)
-                viseme = Viseme.REST
-                intensity = 0.0
+                last_code = n - 1
+                visemes[first:last + 1] = array("B", [
+                    codes[min(int((f * frame_duration - start) / word_duration * n), last_code)]
+                    for f in range(first, last + 1)
+                ])
+            word_index[first:last + 1] = array("i", [idx]) * span
+
+        return VisemeTrack(
+            fps=fps,
+            visemes=visemes,
+            word_index=word_index,
+            words=[w.word for w in words]
+        )
+
+    def _generate_frames(
+        self,
+        words: List[WordTimestamp],
+        fps: int,
+        total_frames: int
+    ) -> List[VisemeFrame]:
+        """
+        Generate frame-by-frame viseme data.
 
-            frames.append(VisemeFrame(
-                frame_number=frame_num,
-                time=frame_time,
-                viseme=viseme,
-                intensity=intensity,
-                word=current_word.word if current_word else None
-            ))
+        Args:
+            words: List of word timestamps
+            fps: Frames per second
+            total_frames: Total number of frames to generate
 
-        return frames
+        Returns:
+            List of VisemeFrame objects
+        """
+        track = self._generate_track(words, fps, total_frames)
+        return [track.frame(n) for n in range(total_frames)]
 
     def _get_viseme_for_word(self, word: str, progress: float) -> Viseme:
         """
@@ -320,21 +519,16 @@ class LipSyncEngine:
         Returns:
             Appropriate Viseme for this moment
         """
-        word_lower = word.lower().strip(".,!?;:")
-
-        # Check if we have a hint for this word
-        if word_lower in WORD_TO_VISEME_HINTS:
-            visemes = WORD_TO_VISEME_HINTS[word_lower]
-            # Select viseme based on progress through word
-            idx = min(int(progress * len(visemes)), len(visemes) - 1)
-            return visemes[idx]
-
-        # Fallback: analyze the word structure
-        return self._analyze_word_visemes(word_lower, progress)
+        visemes = word_viseme_sequence(word)
+        if not visemes:
+            return Viseme.REST
+        # Select viseme based on progress through word
+        idx = min(int(progress * len(visemes)), len(visemes) - 1)
+        return visemes[idx]
 
     def _analyze_word_visemes(self, word: str, progress: float) -> Viseme:
         """
-        Analyze word to determine viseme sequence (simplified).
+        Analyze word to determine viseme (simplified).
 
         This is a basic implementation that maps common letter patterns
         to visemes. A full implementation would use phoneme analysis.
@@ -346,35 +540,7 @@ class LipSyncEngine:
         Returns:
             Appropriate Viseme
         """
-        if not word:
-            return Viseme.REST
-
-        # Simple letter-to-viseme mapping
-        viseme_sequence = []
-
-        for char in word:
-            if char in "aeiou":
-                if char in "ae":
-                    viseme_sequence.append(Viseme.A)
-                elif char in "ei":
-                    viseme_sequence.append(Viseme.E)
-                elif char in "o":
-                    viseme_sequence.append(Viseme.O)
-                elif char in "u":
-                    viseme_sequence.append(Viseme.U)
-            elif char in "mbp":
-                viseme_sequence.append(Viseme.M)
-            elif char in "fv":
-                viseme_sequence.append(Viseme.F)
-            elif char in "l":
-                viseme_sequence.append(Viseme.L)
-            elif char in "sz":
-                viseme_sequence.append(Viseme.S)
-            elif char in "tdn":
-                viseme_sequence.append(Viseme.T)
-            elif char in "w":
-                viseme_sequence.append(Viseme.W)
-
+        viseme_sequence = _letter_visemes(word)
         if not viseme_sequence:
             return Viseme.REST
 
@@ -382,32 +548,59 @@ class LipSyncEngine:
         idx = min(int(progress * len(viseme_sequence)), len(viseme_sequence) - 1)
         return viseme_sequence[idx]
 
-    def export_for_remotion(self, animation: LipSyncAnimation) -> Dict[str, Any]:
+    def export_for_remotion(
+        self,
+        animation: LipSyncAnimation,
+        layout: Literal["frames", "spans"] = "frames"
+    ) -> Dict[str, Any]:
         """
         Export animation in Remotion-compatible format.
 
+        The default "frames" layout is one object per frame (props.frames),
+        which existing compositions read. The opt-in "spans" layout is
+        run-length encoded and columnar: spans.startFrame / spans.viseme /
+        spans.intensity are parallel arrays, a span lasts until the next
+        startFrame (or durationInFrames), and spans.viseme indexes
+        visemeTable. A composition reading it finds the span for a frame
+        with a binary search over startFrame.
+
         Args:
             animation: LipSyncAnimation to export
+            layout: "frames" (default) or "spans" (compact)
 
         Returns:
             JSON-serializable dict for Remotion composition
         """
-        return {
+        props = {
             "type": "lip_sync_animation",
             "fps": animation.fps,
             "duration": animation.duration,
             "durationInFrames": animation.total_frames,
             "characterId": animation.character_id,
-            "frames": [
+        }
+
+        if layout == "frames":
+            props["frames"] = [
                 {
                     "frame": f.frame_number,
                     "viseme": f.viseme.value,
                     "intensity": f.intensity
                 }
                 for f in animation.frames
-            ],
-            "metadata": animation.metadata
-        }
+            ]
+        else:
+            runs = animation.track.runs()
+            props["layout"] = "spans"
+            props["visemeTable"] = [v.value for v in VISEME_CODES]
+            props["spans"] = {
+                "startFrame": [r[0] for r in runs],
+                "viseme": [r[2] for r in runs],
+                # Whole numbers keep the JSON small (intensity is usually 0 or 1)
+                "intensity": [int(r[3]) if float(r[3]).is_integer() else r[3] for r in runs],
+            }
+
+        props["metadata"] = animation.metadata
+        return props
 
     def get_viseme_image_url(
         self,
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 import logging
 import json
 
+from services.ffprobe_service import ProbeError, get_probe_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -221,15 +223,7 @@ class VideoStitcher:
     
     def get_video_duration(self, video_path: str) -> float:
         """Get duration of a video file"""
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            video_path
-        ]
-        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            return float(result.stdout.strip())
-        except:
+            return get_probe_service().probe_sync(video_path).duration or 0.0
+        except ProbeError:
             return 0.0
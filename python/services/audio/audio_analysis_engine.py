@@ -0,0 +1,226 @@
+"""
+Audio Analysis Engine
+Off-event-loop, block-streamed feature extraction for AudioAnalyzer.
+
+The audio file is read in fixed-size blocks (plus a little context on each
+side) so memory stays bounded for hour-long inputs. Each block gets ONE
+STFT, reused for the spectral features, HPSS and the onset envelope; only
+running aggregates and the (small) onset envelope are kept between blocks.
+Beat tracking runs once on the full onset envelope at the end.
+
+Frames are aligned to the same global grid librosa uses for a whole-signal
+analysis, and the context is wide enough for HPSS's median filters, so the
+aggregates match a whole-signal run except for per-block dB clipping in
+the onset envelope.
+
+Work runs in a process pool so the asyncio event loop is never blocked.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional, Dict, Any
+
+import numpy as np
+from loguru import logger
+
+# Frames of context on each side of a block: HPSS uses a 31-frame median
+# filter in time (15 each way) and istft needs n_fft / hop overlapping frames
+CONTEXT_FRAMES = 24
+
+
+def compute_audio_features(
+    audio_path: str,
+    sample_rate: int = 22050,
+    n_fft: int = 2048,
+    hop_length: int = 512,
+    block_seconds: float = 30.0,
+) -> Dict[str, Any]:
+    """
+    Stream an audio file in blocks and return aggregate features.
+
+    Module-level so it can be shipped to a ProcessPoolExecutor worker.
+
+    Returns:
+        Dict with duration, rms/zcr/spectral means, rms extrema, tempo,
+        beat count and harmonic ratio.
+    """
+    import librosa
+    import soundfile as sf
+
+    info = sf.info(audio_path)
+    if info.samplerate != sample_rate:
+        # Only happens for files we didn't extract ourselves; fall back to a
+        # resampling load (unbounded memory, but correct)
+        y, _ = librosa.load(audio_path, sr=sample_rate, mono=True)
+        return _features_from_signal(y, sample_rate, n_fft, hop_length, block_seconds)
+
+    with sf.SoundFile(audio_path) as f:
+        return _stream_features(
+            lambda start, stop: _read_mono(f, start, stop),
+            info.frames, sample_rate, n_fft, hop_length, block_seconds,
+        )
+
+
+def _read_mono(f, start: int, stop: int) -> np.ndarray:
+    f.seek(start)
+    data = f.read(stop - start, dtype="float32", always_2d=True)
+    return data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+
+
+def _features_from_signal(
+    y: np.ndarray,
+    sample_rate: int,
+    n_fft: int,
+    hop_length: int,
+    block_seconds: float,
+) -> Dict[str, Any]:
+    return _stream_features(
+        lambda start, stop: y[start:stop], len(y), sample_rate, n_fft, hop_length, block_seconds,
+    )
+
+
+def _stream_features(
+    read,
+    n_samples: int,
+    sample_rate: int,
+    n_fft: int,
+    hop_length: int,
+    block_seconds: float,
+) -> Dict[str, Any]:
+    """Core block loop; read(start, stop) returns samples in [start, stop)."""
+    import librosa
+
+    # Global frame grid (center=True): frame k is centered on sample k * hop
+    n_frames = 1 + n_samples // hop_length
+    block_frames = max(CONTEXT_FRAMES, int(block_seconds * sample_rate) // hop_length)
+    context = CONTEXT_FRAMES * hop_length
+
+    sums = {"rms": 0.0, "zcr": 0.0, "centroid": 0.0, "rolloff": 0.0, "bandwidth": 0.0}
+    rms_max, rms_min = -np.inf, np.inf
+    abs_sum = 0.0
+    harmonic_abs_sum = 0.0
+    onset_blocks = []
+    mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft)
+
+    for first_frame in range(0, n_frames, block_frames):
+        last_frame = min(first_frame + block_frames, n_frames)
+        own_start = first_frame * hop_length
+        own_stop = min(last_frame * hop_length, n_samples)
+
+        # Block samples [own_start - context, own_stop + context), zero outside the file
+        seg_start = own_start - context
+        seg_stop = own_stop + context
+        y = np.zeros(seg_stop - seg_start, dtype=np.float32)
+        lo, hi = max(seg_start, 0), min(seg_stop, n_samples)
+        y[lo - seg_start:hi - seg_start] = read(lo, hi)
+
+        # One STFT per block; block frame j is global frame j + seg_start / hop
+        D = librosa.stft(y, n_fft=n_fft, hop_length=hop_length)
+        S = np.abs(D)
+        own = slice(CONTEXT_FRAMES, CONTEXT_FRAMES + (last_frame - first_frame))
+
+        rms = librosa.feature.rms(y=y, frame_length=n_fft, hop_length=hop_length)[0, own]
+        zcr = librosa.feature.zero_crossing_rate(y, frame_length=n_fft, hop_length=hop_length)[0, own]
+        centroid = librosa.feature.spectral_centroid(S=S, sr=sample_rate)[0, own]
+        rolloff = librosa.feature.spectral_rolloff(S=S, sr=sample_rate)[0, own]
+        bandwidth = librosa.feature.spectral_bandwidth(S=S, sr=sample_rate)[0, own]
+
+        sums["rms"] += float(rms.sum())
+        sums["zcr"] += float(zcr.sum())
+        sums["centroid"] += float(centroid.sum())
+        sums["rolloff"] += float(rolloff.sum())
+        sums["bandwidth"] += float(bandwidth.sum())
+        rms_max = max(rms_max, float(rms.max()))
+        rms_min = min(rms_min, float(rms.min()))
+
+        # Onset envelope from the same STFT (mel power → dB → median spectral
+        # flux, as beat_track computes it)
+        mel_db = librosa.power_to_db(mel_basis @ (S ** 2))
+        onset = librosa.onset.onset_strength(
+            S=mel_db, sr=sample_rate, hop_length=hop_length, aggregate=np.median,
+        )[own]
+        if first_frame == 0:
+            # A whole-signal envelope is zero-padded for the lag + centering
+            # shift; the context here would otherwise show a spurious onset
+            onset[:1 + n_fft // (2 * hop_length)] = 0.0
+        onset_blocks.append(onset)
+
+        # Harmonic component from the same STFT, summed over owned samples only
+        H, _ = librosa.decompose.hpss(D)
+        y_harmonic = librosa.istft(H, hop_length=hop_length, length=len(y))
+        own_samples = slice(context, context + (own_stop - own_start))
+        harmonic_abs_sum += float(np.sum(np.abs(y_harmonic[own_samples])))
+        abs_sum += float(np.sum(np.abs(y[own_samples])))
+
+    onset_env = np.concatenate(onset_blocks) if onset_blocks else np.zeros(0)
+    tempo, beats = librosa.beat.beat_track(
+        onset_envelope=onset_env, sr=sample_rate, hop_length=hop_length,
+    )
+    tempo = float(np.atleast_1d(tempo)[0]) if np.size(tempo) else 0.0
+
+    return {
+        "duration": n_samples / sample_rate,
+        "n_frames": n_frames,
+        "mean_rms": sums["rms"] / n_frames,
+        "max_rms": rms_max,
+        "min_rms": rms_min,
+        "mean_zcr": sums["zcr"] / n_frames,
+        "mean_centroid": sums["centroid"] / n_frames,
+        "mean_rolloff": sums["rolloff"] / n_frames,
+        "mean_bandwidth": sums["bandwidth"] / n_frames,
+        "tempo": tempo,
+        "beat_count": int(len(beats)),
+        "harmonic_ratio": harmonic_abs_sum / (abs_sum + 1e-10),
+    }
+
+
+class AudioAnalysisEngine:
+    """Runs compute_audio_features on a process pool."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        block_seconds: float = 30.0,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            max_workers: Worker processes (default: CPU count, capped at 4)
+            block_seconds: Audio per streamed block; bounds peak memory
+            executor: Use this executor instead of creating a process pool
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.block_seconds = block_seconds
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # spawn: librosa/numba state must not be forked from a running event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def compute_features(
+        self,
+        audio_path: str,
+        sample_rate: int = 22050,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        logger.info(f"[AudioAnalysisEngine] Streaming features for {audio_path}")
+        return await loop.run_in_executor(
+            self._get_executor(),
+            compute_audio_features,
+            audio_path, sample_rate, n_fft, hop_length, self.block_seconds,
+        )
+
+    def shutdown(self):
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
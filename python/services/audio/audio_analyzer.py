@@ -4,6 +4,8 @@ Detects background music, speech, and audio characteristics in video content.
 Part of Background Music Detection feature (Phase 1)
 """
 
+import asyncio
+import importlib.util
 import os
 import subprocess
 import tempfile
@@ -14,15 +16,14 @@ from datetime import datetime
 from loguru import logger
 import numpy as np
 
-# Try to import librosa for audio analysis
-try:
-    import librosa
-    import librosa.display
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
+# librosa is only imported inside the analysis worker processes; here we
+# just check it is installed so the main process does not pay for the import
+LIBROSA_AVAILABLE = importlib.util.find_spec("librosa") is not None
+if not LIBROSA_AVAILABLE:
     logger.warning("librosa not installed - using basic audio analysis")
 
+from .audio_analysis_engine import AudioAnalysisEngine
+
 
 class AudioAnalysisResult:
     """Result of audio analysis"""
@@ -78,10 +79,17 @@ class AudioAnalysisResult:
 class AudioAnalyzer:
     """Service for analyzing audio content in videos"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        block_seconds: float = 30.0,
+        engine: Optional[AudioAnalysisEngine] = None,
+    ):
         self.sample_rate = 22050  # Standard for audio analysis
         self.hop_length = 512
         self.n_fft = 2048
+        # librosa work runs in worker processes, streamed in blocks
+        self.engine = engine or AudioAnalysisEngine(max_workers=max_workers, block_seconds=block_seconds)
         
     async def analyze_video_audio(self, video_path: str) -> AudioAnalysisResult:
         """
@@ -116,12 +124,39 @@ class AudioAnalyzer:
                 except:
                     pass
     
+    async def analyze_batch(
+        self,
+        video_paths: List[str],
+        max_concurrency: Optional[int] = None,
+    ) -> List[AudioAnalysisResult]:
+        """
+        Analyze several videos concurrently.
+        
+        Extraction (ffmpeg) and feature work (process pool) overlap across
+        videos; at most max_concurrency videos are in flight at once.
+        
+        Returns:
+            Results in the same order as video_paths
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.engine.max_workers)
+        
+        async def run(path: str) -> AudioAnalysisResult:
+            async with semaphore:
+                try:
+                    return await self.analyze_video_audio(path)
+                except Exception as e:
+                    logger.error(f"[AudioAnalyzer] Batch item failed for {path}: {e}")
+                    return AudioAnalysisResult(error=str(e))
+        
+        logger.info(f"[AudioAnalyzer] Batch analysis of {len(video_paths)} videos")
+        return await asyncio.gather(*(run(p) for p in video_paths))
+    
     async def _extract_audio(self, video_path: str) -> Optional[str]:
         """Extract audio track from video using ffmpeg"""
         try:
-            # Create temp file for audio
-            temp_dir = tempfile.gettempdir()
-            audio_path = os.path.join(temp_dir, f"audio_analysis_{os.getpid()}.wav")
+            # Create temp file for audio (unique per call so batches don't collide)
+            fd, audio_path = tempfile.mkstemp(prefix="audio_analysis_", suffix=".wav")
+            os.close(fd)
             
             # Use ffmpeg to extract audio as WAV
             cmd = [
@@ -135,15 +170,20 @@ class AudioAnalyzer:
             ]
             
             logger.info(f"[AudioAnalyzer] Extracting audio with ffmpeg...")
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=120
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
             )
-            
-            if result.returncode != 0:
-                logger.error(f"[AudioAnalyzer] ffmpeg error: {result.stderr}")
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise subprocess.TimeoutExpired(cmd, 120)
+            
+            if proc.returncode != 0:
+                logger.error(f"[AudioAnalyzer] ffmpeg error: {stderr.decode(errors='replace')}")
                 return None
             
             if not os.path.exists(audio_path):
@@ -169,143 +209,138 @@ class AudioAnalyzer:
             return await self._analyze_basic(audio_path)
     
     async def _analyze_with_librosa(self, audio_path: str) -> AudioAnalysisResult:
-        """Advanced audio analysis using librosa"""
+        """Advanced audio analysis using librosa (streamed, in a worker process)"""
         try:
-            logger.info("[AudioAnalyzer] Loading audio with librosa...")
-            
-            # Load audio file
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
-            duration = librosa.get_duration(y=y, sr=sr)
-            
-            logger.info(f"[AudioAnalyzer] Audio loaded: {duration:.1f}s at {sr}Hz")
-            
-            # Basic audio statistics
-            rms = librosa.feature.rms(y=y)[0]
-            overall_loudness = float(np.mean(rms))
-            loudness_db = 20 * np.log10(overall_loudness + 1e-10)
-            dynamic_range = float(20 * np.log10((np.max(rms) + 1e-10) / (np.min(rms) + 1e-10)))
-            
-            # Spectral features for music detection
-            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
-            
-            # Zero crossing rate (higher for speech, lower for music)
-            zcr = librosa.feature.zero_crossing_rate(y)[0]
-            mean_zcr = float(np.mean(zcr))
-            
-            # Tempo and beat detection
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            tempo = float(tempo) if not isinstance(tempo, np.ndarray) else float(tempo[0]) if len(tempo) > 0 else 0.0
-            beat_strength = len(beats) / duration if duration > 0 else 0
-            
-            # Harmonic vs percussive separation
-            y_harmonic, y_percussive = librosa.effects.hpss(y)
-            harmonic_ratio = float(np.sum(np.abs(y_harmonic))) / (float(np.sum(np.abs(y))) + 1e-10)
-            
-            # Music detection heuristics
-            music_indicators = []
-            speech_indicators = []
-            
-            # Strong beat presence indicates music
-            if beat_strength > 1.0:
-                music_indicators.append(("beat_strength", 0.3))
-            
-            # Consistent tempo indicates music
-            if tempo > 60 and tempo < 200:
-                music_indicators.append(("tempo_range", 0.2))
-            
-            # High harmonic content indicates music
-            if harmonic_ratio > 0.5:
-                music_indicators.append(("harmonic_ratio", 0.25))
-            
-            # Low zero crossing rate indicates music
-            if mean_zcr < 0.1:
-                music_indicators.append(("low_zcr", 0.15))
-            
-            # Wide spectral bandwidth indicates music
-            mean_bandwidth = float(np.mean(spectral_bandwidth))
-            if mean_bandwidth > 1500:
-                music_indicators.append(("wide_bandwidth", 0.2))
-            
-            # High ZCR indicates speech
-            if mean_zcr > 0.15:
-                speech_indicators.append(("high_zcr", 0.3))
-            
-            # Narrow spectral spread indicates speech
-            if mean_bandwidth < 1200:
-                speech_indicators.append(("narrow_bandwidth", 0.2))
-            
-            # Calculate confidence scores
-            music_score = sum(weight for _, weight in music_indicators)
-            speech_score = sum(weight for _, weight in speech_indicators)
-            
-            # Normalize
-            total_score = music_score + speech_score + 0.1
-            music_confidence = min(1.0, music_score / 0.8)  # Max possible ~0.9
-            speech_ratio = speech_score / total_score
-            
-            # Determine audio type
-            has_music = music_confidence > 0.4
-            has_speech = speech_ratio > 0.3
-            
-            if has_music and has_speech:
-                audio_type = "mixed"
-            elif has_music:
-                audio_type = "music_only"
-            elif has_speech:
-                audio_type = "speech_only"
-            elif overall_loudness < 0.01:
-                audio_type = "silence"
-            else:
-                audio_type = "ambient"
-            
-            # Overall confidence
-            confidence = max(music_confidence, speech_ratio, 0.5)
-            
-            # Music characteristics
-            music_chars = {}
-            if has_music:
-                music_chars = {
-                    "tempo_bpm": round(tempo, 1),
-                    "energy": "high" if overall_loudness > 0.1 else "medium" if overall_loudness > 0.05 else "low",
-                    "harmonic_ratio": round(harmonic_ratio, 2),
-                    "genre_hints": self._guess_genre(tempo, harmonic_ratio, mean_zcr),
-                    "mood": self._guess_mood(tempo, harmonic_ratio, loudness_db),
-                    "beat_strength": round(beat_strength, 2)
-                }
-            
-            # Copyright risk assessment
-            copyright_risk = "unknown"
-            if has_music:
-                # Strong beat + high production value = likely copyrighted
-                if beat_strength > 2 and harmonic_ratio > 0.6:
-                    copyright_risk = "high"
-                elif beat_strength > 1 or harmonic_ratio > 0.5:
-                    copyright_risk = "medium"
-                else:
-                    copyright_risk = "low"
-            
-            logger.info(f"[AudioAnalyzer] Analysis complete: type={audio_type}, music_conf={music_confidence:.2f}")
-            
-            return AudioAnalysisResult(
-                has_music=has_music,
-                has_speech=has_speech,
-                audio_type=audio_type,
-                confidence=round(confidence, 3),
-                music_confidence=round(music_confidence, 3),
-                speech_ratio=round(speech_ratio, 3),
-                music_characteristics=music_chars,
-                copyright_risk=copyright_risk,
-                overall_loudness_db=round(loudness_db, 1),
-                dynamic_range_db=round(dynamic_range, 1),
-                duration_sec=round(duration, 2)
+            features = await self.engine.compute_features(
+                audio_path,
+                sample_rate=self.sample_rate,
+                n_fft=self.n_fft,
+                hop_length=self.hop_length,
             )
-            
+            return self._result_from_features(features)
         except Exception as e:
             logger.error(f"[AudioAnalyzer] Librosa analysis failed: {e}")
             return AudioAnalysisResult(error=str(e))
     
+    def _result_from_features(self, features: Dict[str, Any]) -> AudioAnalysisResult:
+        """Apply the music/speech heuristics to aggregated audio features"""
+        duration = features["duration"]
+        logger.info(f"[AudioAnalyzer] Features computed: {duration:.1f}s at {self.sample_rate}Hz")
+        
+        # Basic audio statistics
+        overall_loudness = float(features["mean_rms"])
+        loudness_db = 20 * np.log10(overall_loudness + 1e-10)
+        dynamic_range = float(20 * np.log10((features["max_rms"] + 1e-10) / (features["min_rms"] + 1e-10)))
+        
+        # Zero crossing rate (higher for speech, lower for music)
+        mean_zcr = float(features["mean_zcr"])
+        
+        # Tempo and beat detection
+        tempo = float(features["tempo"])
+        beat_strength = features["beat_count"] / duration if duration > 0 else 0
+        
+        # Harmonic vs percussive separation
+        harmonic_ratio = float(features["harmonic_ratio"])
+        
+        # Music detection heuristics
+        music_indicators = []
+        speech_indicators = []
+        
+        # Strong beat presence indicates music
+        if beat_strength > 1.0:
+            music_indicators.append(("beat_strength", 0.3))
+        
+        # Consistent tempo indicates music
+        if tempo > 60 and tempo < 200:
+            music_indicators.append(("tempo_range", 0.2))
+        
+        # High harmonic content indicates music
+        if harmonic_ratio > 0.5:
+            music_indicators.append(("harmonic_ratio", 0.25))
+        
+        # Low zero crossing rate indicates music
+        if mean_zcr < 0.1:
+            music_indicators.append(("low_zcr", 0.15))
+        
+        # Wide spectral bandwidth indicates music
+        mean_bandwidth = float(features["mean_bandwidth"])
+        if mean_bandwidth > 1500:
+            music_indicators.append(("wide_bandwidth", 0.2))
+        
+        # High ZCR indicates speech
+        if mean_zcr > 0.15:
+            speech_indicators.append(("high_zcr", 0.3))
+        
+        # Narrow spectral spread indicates speech
+        if mean_bandwidth < 1200:
+            speech_indicators.append(("narrow_bandwidth", 0.2))
+        
+        # Calculate confidence scores
+        music_score = sum(weight for _, weight in music_indicators)
+        speech_score = sum(weight for _, weight in speech_indicators)
+        
+        # Normalize
+        total_score = music_score + speech_score + 0.1
+        music_confidence = min(1.0, music_score / 0.8)  # Max possible ~0.9
+        speech_ratio = speech_score / total_score
+        
+        # Determine audio type
+        has_music = music_confidence > 0.4
+        has_speech = speech_ratio > 0.3
+        
+        if has_music and has_speech:
+            audio_type = "mixed"
+        elif has_music:
+            audio_type = "music_only"
+        elif has_speech:
+            audio_type = "speech_only"
+        elif overall_loudness < 0.01:
+            audio_type = "silence"
+        else:
+            audio_type = "ambient"
+        
+        # Overall confidence
+        confidence = max(music_confidence, speech_ratio, 0.5)
+        
+        # Music characteristics
+        music_chars = {}
+        if has_music:
+            music_chars = {
+                "tempo_bpm": round(tempo, 1),
+                "energy": "high" if overall_loudness > 0.1 else "medium" if overall_loudness > 0.05 else "low",
+                "harmonic_ratio": round(harmonic_ratio, 2),
+                "genre_hints": self._guess_genre(tempo, harmonic_ratio, mean_zcr),
+                "mood": self._guess_mood(tempo, harmonic_ratio, loudness_db),
+                "beat_strength": round(beat_strength, 2)
+            }
+        
+        # Copyright risk assessment
+        copyright_risk = "unknown"
+        if has_music:
+            # Strong beat + high production value = likely copyrighted
+            if beat_strength > 2 and harmonic_ratio > 0.6:
+                copyright_risk = "high"
+            elif beat_strength > 1 or harmonic_ratio > 0.5:
+                copyright_risk = "medium"
+            else:
+                copyright_risk = "low"
+        
+        logger.info(f"[AudioAnalyzer] Analysis complete: type={audio_type}, music_conf={music_confidence:.2f}")
+        
+        return AudioAnalysisResult(
+            has_music=has_music,
+            has_speech=has_speech,
+            audio_type=audio_type,
+            confidence=round(confidence, 3),
+            music_confidence=round(music_confidence, 3),
+            speech_ratio=round(speech_ratio, 3),
+            music_characteristics=music_chars,
+            copyright_risk=copyright_risk,
+            overall_loudness_db=round(loudness_db, 1),
+            dynamic_range_db=round(dynamic_range, 1),
+            duration_sec=round(duration, 2)
+        )
+    
     async def _analyze_basic(self, audio_path: str) -> AudioAnalysisResult:
         """Basic audio analysis without librosa (fallback)"""
         try:
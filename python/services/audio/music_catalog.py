@@ -0,0 +1,563 @@
+"""
+Music Catalog
+On-disk metadata index for local music libraries.
+
+One SQLite file holds every known track with numeric columns (bpm, energy,
+duration) behind B-tree indexes and an FTS5 table over the text fields
+(title, genre, moods, attributes, tags). Tracks are grouped by source:
+a scanned directory ("dir:<root>") or an imported track list such as
+MusicSelector's JSON index.
+
+Directory sources are refreshed incrementally: one scandir walk compares
+each file's (mtime, size) and its sidecar JSON's mtime against the index,
+and only new or changed files have their metadata extracted. Vanished
+files are dropped. Searches never touch the library directory.
+
+Compatibility ranking runs on NumPy columns cached per source (rebuilt
+only after the source changes), so scoring tens of thousands of tracks
+stays under a millisecond.
+
+Usage:
+    catalog = MusicCatalog("data/suno/.music_catalog.db")
+    catalog.refresh_directory("data/suno", extract_metadata)
+    rows = catalog.search(source=catalog.dir_source("data/suno"), genre="lofi", bpm_max=100)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac")
+
+# Compatibility weights (MusicSelector._calculate_compatibility)
+MOOD_EXACT_SCORE = 0.4
+MOOD_LISTED_SCORE = 0.3
+MOOD_COMPATIBLE_SCORE = 0.2
+ENERGY_WEIGHT = 0.3
+GENRE_SCORE = 0.2
+DURATION_SCORE = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    mtime_ns INTEGER,
+    size INTEGER,
+    sidecar_mtime_ns INTEGER,
+    title TEXT,
+    genre TEXT,
+    mood TEXT,
+    moods TEXT,
+    attributes TEXT,
+    tags TEXT,
+    bpm REAL,
+    energy REAL,
+    duration REAL,
+    metadata TEXT,
+    UNIQUE (source, key)
+);
+CREATE INDEX IF NOT EXISTS idx_tracks_genre ON tracks (source, genre);
+CREATE INDEX IF NOT EXISTS idx_tracks_mood ON tracks (source, mood);
+CREATE INDEX IF NOT EXISTS idx_tracks_bpm ON tracks (source, bpm);
+CREATE INDEX IF NOT EXISTS idx_tracks_duration ON tracks (source, duration);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tracks_fts USING fts5(
+    title, genre, mood, moods, attributes, tags,
+    content='tracks', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS tracks_ai AFTER INSERT ON tracks BEGIN
+    INSERT INTO tracks_fts (rowid, title, genre, mood, moods, attributes, tags)
+    VALUES (new.id, new.title, new.genre, new.mood, new.moods, new.attributes, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_ad AFTER DELETE ON tracks BEGIN
+    INSERT INTO tracks_fts (tracks_fts, rowid, title, genre, mood, moods, attributes, tags)
+    VALUES ('delete', old.id, old.title, old.genre, old.mood, old.moods, old.attributes, old.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS tracks_au AFTER UPDATE ON tracks BEGIN
+    INSERT INTO tracks_fts (tracks_fts, rowid, title, genre, mood, moods, attributes, tags)
+    VALUES ('delete', old.id, old.title, old.genre, old.mood, old.moods, old.attributes, old.tags);
+    INSERT INTO tracks_fts (rowid, title, genre, mood, moods, attributes, tags)
+    VALUES (new.id, new.title, new.genre, new.mood, new.moods, new.attributes, new.tags);
+END;
+
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    fingerprint TEXT,
+    refreshed_at REAL
+);
+"""
+
+_COLUMNS = (
+    "key", "path", "title", "genre", "mood", "moods", "attributes",
+    "tags", "bpm", "energy", "duration", "metadata",
+)
+
+
+class _SourceColumns:
+    """
+    NumPy view of one source, in position order, for vectorized scoring.
+    Moods and genres are stored as integer codes into a shared vocabulary.
+    """
+
+    def __init__(self, rows: List[tuple]):
+        self.keys = [row[0] for row in rows]
+        self.vocabulary: Dict[str, int] = {}
+        self.mood = np.array([self._code(row[1]) for row in rows], dtype=np.intp)
+        self.genre = np.array([self._code(row[2]) for row in rows], dtype=np.intp)
+        self.energy = np.array([row[3] if row[3] is not None else 0.5 for row in rows], dtype=np.float64)
+        self.duration = np.array([row[4] if row[4] is not None else 0.0 for row in rows], dtype=np.float64)
+        listed: Dict[str, List[int]] = {}
+        for i, row in enumerate(rows):
+            for mood in json.loads(row[5] or "[]"):
+                listed.setdefault(mood, []).append(i)
+        self.listed = {mood: np.array(rows_, dtype=np.intp) for mood, rows_ in listed.items()}
+
+    def _code(self, value: Optional[str]) -> int:
+        return self.vocabulary.setdefault(value or "", len(self.vocabulary))
+
+    def score_table(self, scores: Dict[str, float]) -> np.ndarray:
+        """Per-vocabulary-code scores (0.0 for anything not listed)."""
+        table = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for value, score in scores.items():
+            code = self.vocabulary.get(value)
+            if code is not None:
+                table[code] = score
+        return table
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class MusicCatalog:
+    """SQLite (FTS5) index of music track metadata."""
+
+    def __init__(self, db_path: Union[str, Path] = ":memory:", min_refresh_interval: float = 10.0):
+        """
+        Args:
+            db_path: Catalog file (":memory:" for a throwaway index)
+            min_refresh_interval: Seconds between directory walks unless forced
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.min_refresh_interval = min_refresh_interval
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        self._last_refresh: Dict[str, float] = {}
+        self._columns: Dict[str, _SourceColumns] = {}
+
+    # ─── Sources ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def dir_source(root: Union[str, Path]) -> str:
+        return f"dir:{Path(root).resolve()}"
+
+    def refresh_directory(
+        self,
+        root: Union[str, Path],
+        extract_metadata: Callable[[Path], Dict[str, Any]],
+        extensions: Iterable[str] = AUDIO_EXTENSIONS,
+        force: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Bring a directory source up to date.
+
+        Only files whose (mtime, size) or sidecar .json mtime changed are
+        passed to extract_metadata. Walks at most once per
+        min_refresh_interval unless force is set.
+
+        Returns:
+            Counts of added/updated/removed/unchanged tracks
+        """
+        root = Path(root).resolve()
+        source = self.dir_source(root)
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        now = time.monotonic()
+        if not force and now - self._last_refresh.get(source, -float("inf")) < self.min_refresh_interval:
+            return counts
+        self._last_refresh[source] = now
+
+        extensions = tuple(ext.lower() for ext in extensions)
+        with self._lock:
+            known = {
+                key: (mtime_ns, size, sidecar)
+                for key, mtime_ns, size, sidecar in self._db.execute(
+                    "SELECT key, mtime_ns, size, sidecar_mtime_ns FROM tracks WHERE source = ?", (source,)
+                )
+            }
+
+        upserts = []
+        seen = set()
+        for key, path, stamp in _walk_files(root, extensions):
+            seen.add(key)
+            previous = known.get(key)
+            if previous == stamp:
+                counts["unchanged"] += 1
+                continue
+            counts["updated" if previous else "added"] += 1
+            path = Path(path)
+            metadata = extract_metadata(path)
+            upserts.append(_track_row(source, key, str(path), 0, stamp, metadata, default_title=path.stem))
+
+        removed = [key for key in known if key not in seen]
+        counts["removed"] = len(removed)
+
+        if upserts or removed:
+            with self._lock, self._db:
+                self._upsert(upserts)
+                self._db.executemany(
+                    "DELETE FROM tracks WHERE source = ? AND key = ?", [(source, key) for key in removed]
+                )
+                self._mark_source(source, None)
+            self._columns.pop(source, None)
+            logger.info(
+                f"Music catalog {root}: +{counts['added']} ~{counts['updated']} -{counts['removed']} "
+                f"({counts['unchanged']} unchanged)"
+            )
+        return counts
+
+    def replace_source(self, source: str, tracks: List[Dict[str, Any]], fingerprint: str) -> bool:
+        """
+        Replace an imported source (e.g. a JSON track index) unless its
+        fingerprint is unchanged. Track dicts use MusicTrack.to_dict keys.
+
+        Returns:
+            True if the source was re-imported
+        """
+        with self._lock:
+            row = self._db.execute("SELECT fingerprint FROM sources WHERE source = ?", (source,)).fetchone()
+            if row and row[0] == fingerprint:
+                return False
+            rows = []
+            for position, track in enumerate(tracks):
+                metadata = {
+                    "title": track.get("file_name") or Path(track.get("file_path", "")).name,
+                    "genre": track.get("genre"),
+                    "mood": track.get("mood"),
+                    "moods": track.get("moods") or [],
+                    "attributes": track.get("attributes") or [],
+                    "bpm": track.get("tempo"),
+                    "energy_level": track.get("energy_level"),
+                    "duration": track.get("duration"),
+                }
+                rows.append(_track_row(
+                    source, str(track.get("id", position)), track.get("file_path"), position,
+                    (None, None, None), metadata, raw=track,
+                ))
+            with self._db:
+                self._db.execute("DELETE FROM tracks WHERE source = ?", (source,))
+                self._upsert(rows)
+                self._mark_source(source, fingerprint)
+            self._columns.pop(source, None)
+        logger.info(f"Music catalog imported {len(rows)} tracks into {source}")
+        return True
+
+    def _upsert(self, rows: List[tuple]) -> None:
+        self._db.executemany(
+            """
+            INSERT INTO tracks (source, key, path, position, mtime_ns, size, sidecar_mtime_ns,
+                                title, genre, mood, moods, attributes, tags, bpm, energy, duration, metadata)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source, key) DO UPDATE SET
+                path = excluded.path, position = excluded.position, mtime_ns = excluded.mtime_ns,
+                size = excluded.size, sidecar_mtime_ns = excluded.sidecar_mtime_ns,
+                title = excluded.title, genre = excluded.genre, mood = excluded.mood,
+                moods = excluded.moods, attributes = excluded.attributes, tags = excluded.tags,
+                bpm = excluded.bpm, energy = excluded.energy, duration = excluded.duration,
+                metadata = excluded.metadata
+            """,
+            rows,
+        )
+
+    def _mark_source(self, source: str, fingerprint: Optional[str]) -> None:
+        self._db.execute(
+            "INSERT INTO sources (source, fingerprint, refreshed_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (source) DO UPDATE SET fingerprint = excluded.fingerprint, refreshed_at = excluded.refreshed_at",
+            (source, fingerprint, time.time()),
+        )
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        source: Optional[str] = None,
+        genre: Optional[str] = None,
+        mood: Optional[str] = None,
+        bpm_min: Optional[float] = None,
+        bpm_max: Optional[float] = None,
+        duration_min: Optional[float] = None,
+        duration_max: Optional[float] = None,
+        text: Optional[Union[str, List[str]]] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Indexed search.
+
+        genre/mood match exactly. A track without a bpm fails bpm_min and
+        passes bpm_max; a track without a duration passes duration filters.
+        text is an FTS query over title/genre/moods/attributes/tags; a list
+        matches any of its phrases.
+
+        Returns:
+            Track dicts (key, path, title, genre, mood, moods, attributes,
+            tags, bpm, energy, duration, metadata) ordered by key
+        """
+        clauses, params = [], []
+        if source:
+            clauses.append("t.source = ?")
+            params.append(source)
+        if genre:
+            clauses.append("t.genre = ?")
+            params.append(genre)
+        if mood:
+            clauses.append("t.mood = ?")
+            params.append(mood)
+        if bpm_min:
+            clauses.append("COALESCE(t.bpm, 0) >= ?")
+            params.append(bpm_min)
+        if bpm_max:
+            clauses.append("COALESCE(t.bpm, 999) <= ?")
+            params.append(bpm_max)
+        if duration_min:
+            clauses.append("(t.duration IS NULL OR t.duration >= ?)")
+            params.append(duration_min)
+        if duration_max:
+            clauses.append("(t.duration IS NULL OR t.duration <= ?)")
+            params.append(duration_max)
+
+        match = _fts_query(text)
+        if match:
+            clauses.append("t.id IN (SELECT rowid FROM tracks_fts WHERE tracks_fts MATCH ?)")
+            params.append(match)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT {', '.join('t.' + c for c in _COLUMNS)} FROM tracks t {where} "
+            f"ORDER BY t.source, t.key LIMIT ?"
+        )
+        with self._lock:
+            rows = self._db.execute(sql, (*params, limit)).fetchall()
+        return [_row_dict(row) for row in rows]
+
+    def get(self, source: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM tracks WHERE source = ? AND key = ?", (source, key)
+            ).fetchone()
+        return _row_dict(row) if row else None
+
+    def is_current(self, source: str, key: str, path: Union[str, Path]) -> bool:
+        """True if the indexed file and its sidecar are unchanged on disk."""
+        path = Path(path)
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mtime_ns, size, sidecar_mtime_ns FROM tracks WHERE source = ? AND key = ?", (source, key)
+            ).fetchone()
+        return row == (st.st_mtime_ns, st.st_size, _mtime_ns(path.with_suffix(".json")))
+
+    def count(self, source: Optional[str] = None) -> int:
+        with self._lock:
+            if source:
+                return self._db.execute("SELECT COUNT(*) FROM tracks WHERE source = ?", (source,)).fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+
+    def rank_compatible(
+        self,
+        source: str,
+        mood: str,
+        compatible_moods: Iterable[str],
+        energy: float,
+        preferred_genres: Iterable[str],
+        duration: float,
+        min_score: float = 0.3,
+        top_n: int = 3,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Top tracks by clip compatibility, scored on cached NumPy columns.
+
+        Score = mood (exact 0.4 / listed in moods 0.3 / compatible 0.2)
+        + (1 - |energy diff|) * 0.3 + genre in preferred 0.2
+        + duration long enough 0.1, capped at 1.0 — the same arithmetic as
+        MusicSelector._calculate_compatibility. Ties keep source order.
+
+        Returns:
+            [(track dict, score)] with score > min_score, best first
+        """
+        cols = self._source_columns(source)
+        if not len(cols):
+            return []
+
+        # The mood tiers are exclusive and ordered, so the best one applies
+        mood_scores = {m: MOOD_COMPATIBLE_SCORE for m in compatible_moods}
+        mood_scores[mood] = MOOD_EXACT_SCORE
+        mood_score = cols.score_table(mood_scores)[cols.mood]
+        listed = cols.listed.get(mood)
+        if listed is not None:
+            mood_score[listed] = np.maximum(mood_score[listed], MOOD_LISTED_SCORE)
+
+        # max(0, 1 - |diff|) * 0.3 + mood, computed in place
+        score = np.subtract(energy, cols.energy)
+        np.abs(score, out=score)
+        np.subtract(1, score, out=score)
+        np.maximum(score, 0, out=score)
+        score *= ENERGY_WEIGHT
+        score += mood_score
+        score += cols.score_table({g: GENRE_SCORE for g in preferred_genres})[cols.genre]
+        score += (cols.duration >= duration) * DURATION_SCORE
+        np.minimum(score, 1.0, out=score)
+
+        candidates = np.flatnonzero(score > min_score)
+        if len(candidates) > top_n:
+            # Everything above the top_n-th score, then the earliest of its ties
+            values = score[candidates]
+            kth = np.partition(values, len(values) - top_n)[len(values) - top_n]
+            above = candidates[values > kth]
+            ties = candidates[values == kth][:top_n - len(above)]
+            candidates = np.concatenate((above, ties))
+        order = candidates[np.lexsort((candidates, -score[candidates]))]
+
+        results = []
+        for i in order:
+            track = self.get(source, cols.keys[i])
+            if track is not None:
+                results.append((track, float(score[i])))
+        return results
+
+    def _source_columns(self, source: str) -> _SourceColumns:
+        cols = self._columns.get(source)
+        if cols is None:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT key, mood, genre, energy, duration, moods FROM tracks "
+                    "WHERE source = ? ORDER BY position, key",
+                    (source,),
+                ).fetchall()
+            cols = self._columns[source] = _SourceColumns(rows)
+        return cols
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ─── Helpers ─────────────────────────────────────────────────────────────────
+
+def _walk_files(root: Path, extensions: Tuple[str, ...]):
+    """
+    (key, path, (mtime_ns, size, sidecar_mtime_ns)) for audio files under
+    root. Sidecar stats come from the same directory listing.
+    """
+    stack = [("", str(root))]
+    while stack:
+        prefix, directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        sidecars = {e.name: e for e in entries if e.name.endswith(".json")}
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((prefix + entry.name + "/", entry.path))
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                if ext.lower() not in extensions:
+                    continue
+                st = entry.stat()
+                sidecar = sidecars.get(stem + ".json")
+                sidecar_mtime = sidecar.stat().st_mtime_ns if sidecar is not None else 0
+                yield prefix + entry.name, entry.path, (st.st_mtime_ns, st.st_size, sidecar_mtime)
+            except OSError:
+                continue
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value]
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _track_row(
+    source: str,
+    key: str,
+    path: Optional[str],
+    position: int,
+    stamp: tuple,
+    metadata: Dict[str, Any],
+    default_title: Optional[str] = None,
+    raw: Optional[Dict[str, Any]] = None,
+) -> tuple:
+    mtime_ns, size, sidecar = stamp
+    return (
+        source, key, path, position, mtime_ns, size, sidecar,
+        metadata.get("title") or default_title,
+        metadata.get("genre"),
+        metadata.get("mood"),
+        json.dumps(_as_list(metadata.get("moods"))),
+        json.dumps(_as_list(metadata.get("attributes"))),
+        " ".join(_as_list(metadata.get("tags"))),
+        _as_float(metadata.get("bpm")),
+        _as_float(metadata.get("energy_level", metadata.get("energy"))),
+        _as_float(metadata.get("duration")),
+        json.dumps(raw if raw is not None else metadata, default=str),
+    )
+
+
+def _row_dict(row: tuple) -> Dict[str, Any]:
+    data = dict(zip(_COLUMNS, row))
+    data["moods"] = json.loads(data["moods"] or "[]")
+    data["attributes"] = json.loads(data["attributes"] or "[]")
+    data["metadata"] = json.loads(data["metadata"] or "{}")
+    return data
+
+
+def _fts_query(text: Optional[Union[str, List[str]]]) -> Optional[str]:
+    """Quote user text for FTS5: all words of a string, or any phrase of a list."""
+    if not text:
+        return None
+    if isinstance(text, str):
+        terms = text.split()
+        joiner = " "
+    else:
+        terms = [t for t in text if t and t.strip()]
+        joiner = " OR "
+    if not terms:
+        return None
+    return joiner.join('"' + term.replace('"', '""') + '"' for term in terms)
@@ -11,6 +11,7 @@ Features:
 - Enforces max clip duration (default 5 minutes)
 - Supports AI-powered mood detection
 - Caches music analysis for performance
+- Ranks tracks on an indexed MusicCatalog (vectorized scoring)
 
 Usage:
     from services.music_selector import MusicSelector
@@ -19,6 +20,7 @@ Usage:
     match = await selector.select_music_for_clip(clip_path, duration=30)
 """
 
+import hashlib
 import json
 import logging
 import os
@@ -27,6 +29,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
+from services.audio.music_catalog import MusicCatalog
+
 logger = logging.getLogger(__name__)
 
 # Maximum clip duration for music selection (5 minutes)
@@ -115,12 +119,35 @@ class MusicSelector:
         4. Return ranked matches
     """
     
+    # Content type -> genres that fit it
+    GENRE_MAP = {
+        "corporate": ["corporate", "ambient", "general"],
+        "educational": ["ambient", "lofi", "general"],
+        "lifestyle": ["pop", "lofi", "general"],
+        "entertainment": ["pop", "electronic", "hiphop"],
+        "fitness": ["electronic", "hiphop", "pop"],
+        "cooking": ["lofi", "pop", "ambient"],
+        "general": ["general", "pop", "ambient"]
+    }
+    
+    COMPATIBLE_MOOD_PAIRS = [
+        ("happy", "energetic"),
+        ("calm", "peaceful"),
+        ("neutral", "calm"),
+        ("neutral", "happy"),
+        ("energetic", "exciting"),
+        ("confident", "powerful"),
+        ("relaxed", "calm"),
+        ("upbeat", "happy")
+    ]
+    
     def __init__(
         self,
         music_library_path: Optional[Path] = None,
         music_index_path: Optional[Path] = None,
         max_clip_duration: int = MAX_CLIP_DURATION_SECONDS,
-        ai_provider: Optional[str] = None
+        ai_provider: Optional[str] = None,
+        catalog: Optional[MusicCatalog] = None
     ):
         self.music_library_path = music_library_path or Path(
             os.getenv("MUSIC_LIBRARY_PATH", "./music")
@@ -132,6 +159,10 @@ class MusicSelector:
         self.ai_provider_name = ai_provider or os.getenv("AI_PROVIDER", "mock")
         self._music_library: List[MusicTrack] = []
         self._ai_provider = None
+        self._catalog = catalog
+        self._catalog_source = f"selector:{self.music_index_path}"
+        self._library_fingerprint: Optional[str] = None
+        self._catalog_fingerprint: Optional[str] = None
     
     def _get_ai_provider(self):
         """Get configured AI provider for mood analysis."""
@@ -156,10 +187,13 @@ class MusicSelector:
         if self._music_library:
             return self._music_library
         
+        fingerprint = None
         if index_data:
             tracks_data = index_data.get("tracks", [])
         elif self.music_index_path.exists():
             try:
+                stat = self.music_index_path.stat()
+                fingerprint = f"file:{stat.st_mtime_ns}:{stat.st_size}"
                 with open(self.music_index_path, 'r') as f:
                     data = json.load(f)
                     tracks_data = data.get("tracks", [])
@@ -170,7 +204,12 @@ class MusicSelector:
             # Use default demo tracks
             tracks_data = self._get_demo_tracks()
         
+        if fingerprint is None:
+            digest = hashlib.sha1(json.dumps(tracks_data, sort_keys=True, default=str).encode())
+            fingerprint = f"data:{digest.hexdigest()}"
+        
         self._music_library = [MusicTrack.from_dict(t) for t in tracks_data]
+        self._library_fingerprint = fingerprint
         logger.info(f"Loaded {len(self._music_library)} music tracks")
         
         return self._music_library
@@ -250,6 +289,23 @@ class MusicSelector:
             }
         ]
     
+    def _get_catalog(self) -> MusicCatalog:
+        """
+        Catalog holding the loaded library, re-imported only when the
+        index changes. Uses $MUSIC_CATALOG_PATH if set, else memory.
+        """
+        library = self.load_music_library()
+        if self._catalog is None:
+            self._catalog = MusicCatalog(os.getenv("MUSIC_CATALOG_PATH", ":memory:"))
+        if self._catalog_fingerprint != self._library_fingerprint:
+            self._catalog.replace_source(
+                self._catalog_source,
+                [dict(track.to_dict(), id=str(position)) for position, track in enumerate(library)],
+                self._library_fingerprint or "",
+            )
+            self._catalog_fingerprint = self._library_fingerprint
+        return self._catalog
+    
     async def analyze_clip(
         self,
         clip_path: Optional[str] = None,
@@ -437,24 +493,30 @@ class MusicSelector:
             topics=topics
         )
         
-        # Load music library
+        # Load music library and rank it on the catalog index
         music_library = self.load_music_library()
+        ranked = self._get_catalog().rank_compatible(
+            self._catalog_source,
+            mood=analysis.mood,
+            compatible_moods=self._compatible_moods(analysis.mood),
+            energy=analysis.energy_level,
+            preferred_genres=self.GENRE_MAP.get(analysis.content_type, ["general"]),
+            duration=analysis.duration,
+            min_score=0.3,  # Minimum threshold
+            top_n=top_n
+        )
         
-        # Calculate compatibility for each track
+        # Reasoning only for the returned matches
         matches = []
-        for track in music_library:
-            score, reasoning = self._calculate_compatibility(analysis, track)
-            
-            if score > 0.3:  # Minimum threshold
-                matches.append(MusicMatch(
-                    track=track,
-                    compatibility_score=score,
-                    reasoning=reasoning
-                ))
-        
-        # Sort by score and return top N
-        matches.sort(key=lambda x: x.compatibility_score, reverse=True)
-        return matches[:top_n]
+        for row, score in ranked:
+            track = music_library[int(row["key"])]
+            _, reasoning = self._calculate_compatibility(analysis, track)
+            matches.append(MusicMatch(
+                track=track,
+                compatibility_score=score,
+                reasoning=reasoning
+            ))
+        return matches
     
     def _calculate_compatibility(
         self,
@@ -489,17 +551,7 @@ class MusicSelector:
             reasons.append(f"Energy match: clip={analysis.energy_level:.1f}, track={track.energy_level:.1f}")
         
         # Content type to genre matching (20% weight)
-        genre_map = {
-            "corporate": ["corporate", "ambient", "general"],
-            "educational": ["ambient", "lofi", "general"],
-            "lifestyle": ["pop", "lofi", "general"],
-            "entertainment": ["pop", "electronic", "hiphop"],
-            "fitness": ["electronic", "hiphop", "pop"],
-            "cooking": ["lofi", "pop", "ambient"],
-            "general": ["general", "pop", "ambient"]
-        }
-        
-        preferred_genres = genre_map.get(analysis.content_type, ["general"])
+        preferred_genres = self.GENRE_MAP.get(analysis.content_type, ["general"])
         if track.genre in preferred_genres:
             score += 0.2
             reasons.append(f"Genre fits content: {track.genre} for {analysis.content_type}")
@@ -514,22 +566,15 @@ class MusicSelector:
     
     def _moods_compatible(self, mood1: str, mood2: str) -> bool:
         """Check if two moods are compatible."""
-        compatible_pairs = [
-            ("happy", "energetic"),
-            ("calm", "peaceful"),
-            ("neutral", "calm"),
-            ("neutral", "happy"),
-            ("energetic", "exciting"),
-            ("confident", "powerful"),
-            ("relaxed", "calm"),
-            ("upbeat", "happy")
-        ]
-        
         return (
-            (mood1, mood2) in compatible_pairs or 
-            (mood2, mood1) in compatible_pairs
+            (mood1, mood2) in self.COMPATIBLE_MOOD_PAIRS or 
+            (mood2, mood1) in self.COMPATIBLE_MOOD_PAIRS
         )
     
+    def _compatible_moods(self, mood: str) -> List[str]:
+        """All moods compatible with the given one."""
+        return [b if a == mood else a for a, b in self.COMPATIBLE_MOOD_PAIRS if mood in (a, b)]
+    
     def get_library_stats(self) -> Dict[str, Any]:
         """Get statistics about the music library."""
         library = self.load_music_library()
@@ -0,0 +1,330 @@
+"""
+TTS Clip Cache
+Disk-backed, content-addressed cache of synthesized speech clips.
+
+A clip's key is a hash of everything that determines the audio: the
+normalized text, voice, model and generation parameters (speed, emotion,
+voice settings...) plus the output format. Re-rendering a script therefore
+only re-synthesizes the lines that actually changed.
+
+Layout:
+    <root>/<key[:2]>/<key>.<ext>     audio
+    <root>/<key[:2]>/<key>.json      metadata (duration, text preview, ...)
+
+Writes go to a temp file in the same directory followed by os.replace, so
+readers never see partial clips and concurrent writers (threads or
+processes) of the same key simply race to publish identical content.
+Recency is the file mtime (touched on every hit); when the cache grows past
+max_bytes the least recently used clips are evicted down to 90%.
+
+Usage:
+    cache = get_tts_clip_cache()
+    key = cache.make_key(text, voice="alloy", model="openai:tts-1", params={"speed": 1.0}, fmt="mp3")
+    if not cache.materialize(key, out_path):
+        await synthesize(text, out_path)
+        cache.store(key, out_path, meta={"text": text[:100]})
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unicodedata
+import weakref
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+EVICT_TO_FRACTION = 0.9
+
+
+def normalize_tts_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace; case is kept (it changes prosody)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TTSClipCache:
+    """Content-addressed, size-bounded LRU cache of TTS audio files."""
+
+    def __init__(self, root_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            root_dir: Cache directory (default: $TTS_CLIP_CACHE_DIR or <tmp>/mediaposter/tts_clip_cache)
+            max_bytes: Size bound (default: $TTS_CLIP_CACHE_MAX_BYTES or 2 GiB)
+        """
+        self.root_dir = Path(
+            root_dir
+            or os.environ.get("TTS_CLIP_CACHE_DIR")
+            or Path(tempfile.gettempdir()) / "mediaposter" / "tts_clip_cache"
+        )
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes or os.environ.get("TTS_CLIP_CACHE_MAX_BYTES") or DEFAULT_MAX_BYTES)
+
+        self._lock = threading.Lock()
+        # Per event loop: key -> [lock, number of tasks holding or awaiting it]
+        self._key_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, List[Any]]]" = weakref.WeakKeyDictionary()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bytes_written = 0
+        self.bytes_served = 0
+
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    # ─── Keys ────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def make_key(
+        text: str,
+        voice: Optional[str] = None,
+        model: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        fmt: str = "wav",
+    ) -> str:
+        """
+        Content hash of a synthesis request.
+
+        Args:
+            text: Text to speak (whitespace/unicode normalized)
+            voice: Voice id, reference audio or profile
+            model: Provider/model identifier, e.g. "openai:tts-1"
+            params: Anything else that changes the audio (speed, emotion, settings)
+            fmt: Audio container/extension
+        """
+        payload = json.dumps({
+            "text": normalize_tts_text(text),
+            "voice": voice,
+            "model": model,
+            "params": params or {},
+            "format": fmt.lstrip(".").lower(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root_dir / key[:2]
+
+    def _find(self, key: str) -> Optional[Path]:
+        entry_dir = self._entry_dir(key)
+        if not entry_dir.is_dir():
+            return None
+        for path in entry_dir.glob(f"{key}.*"):
+            if path.suffix not in (".json", ".tmp"):
+                return path
+        return None
+
+    # ─── Read ────────────────────────────────────────────────────────────────
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Path of the cached clip (marked as recently used), or None."""
+        path = self._find(key)
+        if path is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            # Evicted by another process between find and touch
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += size
+        return path
+
+    def get_meta(self, key: str) -> Dict[str, Any]:
+        try:
+            return json.loads((self._entry_dir(key) / f"{key}.json").read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def materialize(self, key: str, out_path: str) -> bool:
+        """Copy the cached clip to out_path (atomically). Returns False on a miss."""
+        cached = self.lookup(key)
+        if cached is None:
+            return False
+        out_path = Path(out_path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            _atomic_copy(cached, out_path)
+        except FileNotFoundError:
+            return False
+        logger.debug(f"TTS clip cache HIT {key[:12]} → {out_path.name}")
+        return True
+
+    # ─── Write ───────────────────────────────────────────────────────────────
+
+    def store(self, key: str, src_path: str, meta: Optional[Dict[str, Any]] = None) -> Optional[Path]:
+        """Publish a synthesized clip under key. Never raises; returns the cached path."""
+        src_path = Path(src_path)
+        try:
+            entry_dir = self._entry_dir(key)
+            entry_dir.mkdir(parents=True, exist_ok=True)
+            target = entry_dir / f"{key}{src_path.suffix or '.bin'}"
+            existed = target.exists()
+            _atomic_copy(src_path, target)
+            if meta is not None:
+                meta_path = entry_dir / f"{key}.json"
+                _atomic_write_bytes(meta_path, json.dumps(dict(meta, cached_at=time.time()), default=str).encode())
+            size = target.stat().st_size
+        except OSError as e:
+            logger.warning(f"TTS clip cache write failed for {key[:12]}: {e}")
+            return None
+
+        with self._lock:
+            self.writes += 1
+            self.bytes_written += size
+            if not existed:
+                self._total_bytes += size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self.evict()
+        return target
+
+    async def get_or_synthesize(
+        self,
+        key: str,
+        out_path: str,
+        synthesize: Callable[[], Awaitable[Any]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Materialize a cached clip at out_path, or run synthesize() (which must
+        write out_path) and cache the result. Concurrent calls for the same
+        key on one event loop synthesize once.
+
+        Returns:
+            True if served from cache
+        """
+        if self.materialize(key, out_path):
+            return True
+        locks = self._key_locks.setdefault(asyncio.get_running_loop(), {})
+        entry = locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                # Another task may have produced it while we waited
+                if self._find(key) is not None and self.materialize(key, out_path):
+                    return True
+                await synthesize()
+                if os.path.exists(out_path):
+                    self.store(key, out_path, meta)
+            return False
+        finally:
+            # Drop the lock with its last user, whether synthesis succeeded or not
+            entry[1] -= 1
+            if entry[1] == 0 and locks.get(key) is entry:
+                del locks[key]
+
+    # ─── Eviction ────────────────────────────────────────────────────────────
+
+    def _scan(self):
+        """(path, size, mtime) for every cached clip."""
+        entries = []
+        for entry_dir in self.root_dir.iterdir() if self.root_dir.exists() else []:
+            if not entry_dir.is_dir():
+                continue
+            for path in entry_dir.iterdir():
+                if path.suffix in (".json", ".tmp"):
+                    continue
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def evict(self) -> int:
+        """Delete least recently used clips until under 90% of max_bytes."""
+        entries = sorted(self._scan(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TO_FRACTION
+        removed = 0
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                path.with_suffix(".json").unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._total_bytes = total
+            self.evictions += removed
+        if removed:
+            logger.info(f"TTS clip cache evicted {removed} clips ({total / 1024 ** 2:.1f} MiB kept)")
+        return removed
+
+    def clear(self) -> int:
+        count = len(self._scan())
+        shutil.rmtree(self.root_dir, ignore_errors=True)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._total_bytes = 0
+        return count
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit/miss counts and byte totals."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "total_requests": total,
+                "hit_rate_percent": round(self.hits / total * 100, 2) if total else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "bytes_written": self.bytes_written,
+                "bytes_served": self.bytes_served,
+                "bytes_cached": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _atomic_copy(src: Path, dest: Path) -> None:
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _atomic_write_bytes(dest: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# Singleton instance
+_tts_clip_cache: Optional[TTSClipCache] = None
+
+
+def get_tts_clip_cache() -> TTSClipCache:
+    """Get or create the process-wide TTS clip cache."""
+    global _tts_clip_cache
+    if _tts_clip_cache is None:
+        _tts_clip_cache = TTSClipCache()
+    return _tts_clip_cache
@@ -13,18 +13,28 @@ Key Metrics:
 - Distortion detection
 - Transcript alignment
 - Duration requirements
+
+Clips are decoded once and analyzed in NumPy (voice_quality_engine); the
+original one-ffmpeg-run-per-analysis path remains as a fallback.
 """
 
+import multiprocessing
+import os
 import subprocess
 import json
 import re
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from loguru import logger
 import numpy as np
 
+from services.ffprobe_service import ProbeError, get_probe_service
+
+from .voice_quality_engine import analyze_voice_quality
+
 
 @dataclass
 class VoiceQualityMetrics:
@@ -108,8 +118,20 @@ class VoiceCloningQualityAssessor:
     MAX_SILENCE_PERCENTAGE = 20.0  # Max % silence acceptable
     MAX_BACKGROUND_NOISE_DB = -30.0  # Max background noise level
     
-    def __init__(self):
-        """Initialize voice cloning quality assessor"""
+    MEDIA_EXTENSIONS = {'.wav', '.mp3', '.m4a', '.aac', '.flac', '.ogg', '.mp4', '.mov', '.mkv', '.webm'}
+    
+    def __init__(self, use_numpy_engine: bool = True, mmap_threshold_seconds: float = 600.0):
+        """
+        Initialize voice cloning quality assessor
+        
+        Args:
+            use_numpy_engine: Decode once and analyze in NumPy (falls back to
+                              the per-analysis ffmpeg path if decoding fails)
+            mmap_threshold_seconds: Clips longer than this are decoded into a
+                                    memory-mapped temp file instead of RAM
+        """
+        self.use_numpy_engine = use_numpy_engine
+        self.mmap_threshold_seconds = mmap_threshold_seconds
         logger.info("Voice cloning quality assessor initialized")
     
     def assess_audio_quality(
@@ -134,11 +156,22 @@ class VoiceCloningQualityAssessor:
         metrics = VoiceQualityMetrics()
         
         try:
-            # Extract audio if video file
-            audio_file = self._extract_audio_for_analysis(audio_path)
+            analysis = None
+            if self.use_numpy_engine:
+                try:
+                    analysis = analyze_voice_quality(
+                        audio_path,
+                        mmap_threshold_seconds=self.mmap_threshold_seconds,
+                        voice_min_hz=self.VOICE_FUNDAMENTAL_MIN_HZ,
+                        voice_max_hz=self.VOICE_FUNDAMENTAL_MAX_HZ,
+                    )
+                except Exception as e:
+                    logger.warning(f"NumPy analysis failed, falling back to ffmpeg: {e}")
+            if analysis is None:
+                analysis = self._analyze_with_ffmpeg(audio_path)
             
             # Get audio metadata
-            metadata = self._get_audio_metadata(audio_file)
+            metadata = analysis.get('metadata', {})
             metrics.duration_seconds = metadata.get('duration', 0.0)
             metrics.sample_rate_hz = metadata.get('sample_rate')
             metrics.bitrate_kbps = metadata.get('bitrate')
@@ -146,32 +179,32 @@ class VoiceCloningQualityAssessor:
             metrics.audio_format = metadata.get('format')
             
             # Analyze signal quality
-            signal_quality = self._analyze_signal_quality(audio_file)
+            signal_quality = analysis.get('signal', {})
             metrics.snr_db = signal_quality.get('snr_db')
             metrics.background_noise_level_db = signal_quality.get('background_noise_db')
             metrics.speech_clarity_score = signal_quality.get('clarity_score', 0.0)
             
             # Analyze volume levels
-            volume_analysis = self._analyze_volume_levels(audio_file)
+            volume_analysis = analysis.get('volume', {})
             metrics.mean_volume_db = volume_analysis.get('mean_volume_db')
             metrics.volume_consistency = volume_analysis.get('consistency', 0.0)
             metrics.dynamic_range_db = volume_analysis.get('dynamic_range_db')
             
             # Analyze frequency response
-            frequency_analysis = self._analyze_frequency_response(audio_file)
+            frequency_analysis = analysis.get('frequency', {})
             metrics.fundamental_frequency_hz = frequency_analysis.get('fundamental_freq_hz')
             metrics.frequency_response_score = frequency_analysis.get('score', 0.0)
             metrics.voice_range_covered = frequency_analysis.get('voice_range_covered', False)
             
             # Detect silence and speech
-            silence_analysis = self._analyze_silence_and_speech(audio_file)
+            silence_analysis = analysis.get('silence', {})
             metrics.silence_percentage = silence_analysis.get('silence_percentage', 0.0)
             metrics.speech_percentage = silence_analysis.get('speech_percentage', 0.0)
             metrics.pause_count = silence_analysis.get('pause_count', 0)
             metrics.avg_pause_duration_s = silence_analysis.get('avg_pause_duration', 0.0)
             
             # Detect distortion
-            distortion_analysis = self._detect_distortion(audio_file)
+            distortion_analysis = analysis.get('distortion', {})
             metrics.has_distortion = distortion_analysis.get('has_distortion', False)
             metrics.has_clipping = distortion_analysis.get('has_clipping', False)
             metrics.distortion_score = distortion_analysis.get('score', 1.0)
@@ -196,13 +229,6 @@ class VoiceCloningQualityAssessor:
             metrics.recommendations = self._generate_recommendations(metrics)
             metrics.issues = self._identify_issues(metrics)
             
-            # Cleanup temp file if created
-            if audio_file != audio_path and audio_file.exists():
-                try:
-                    audio_file.unlink()
-                except:
-                    pass
-            
             logger.success(f"✓ Quality assessment complete: {metrics.suitability_for_cloning} ({metrics.overall_score:.2f})")
             
         except Exception as e:
@@ -211,6 +237,88 @@ class VoiceCloningQualityAssessor:
         
         return metrics
     
+    def assess_directory(
+        self,
+        directory: Path,
+        transcripts: Optional[Dict[str, str]] = None,
+        recursive: bool = False,
+        max_workers: Optional[int] = None
+    ) -> List[Tuple[Path, VoiceQualityMetrics]]:
+        """
+        Score every candidate training clip in a directory.
+        
+        Args:
+            directory: Directory of audio/video clips
+            transcripts: Optional transcripts keyed by file name or stem;
+                         a sibling <stem>.txt is used when no entry is given
+            recursive: Also scan subdirectories
+            max_workers: Worker processes (default: CPU count, capped at 4;
+                         1 = assess in this process)
+            
+        Returns:
+            (path, metrics) pairs, best candidate first
+        """
+        directory = Path(directory)
+        pattern = '**/*' if recursive else '*'
+        clips = sorted(
+            p for p in directory.glob(pattern)
+            if p.is_file() and p.suffix.lower() in self.MEDIA_EXTENSIONS
+        )
+        if not clips:
+            logger.warning(f"No audio/video clips found in {directory}")
+            return []
+        
+        transcripts = transcripts or {}
+        jobs = []
+        for clip in clips:
+            transcript = transcripts.get(clip.name, transcripts.get(clip.stem))
+            sidecar = clip.with_suffix('.txt')
+            if transcript is None and sidecar.exists():
+                transcript = sidecar.read_text()
+            jobs.append((str(clip), transcript))
+        
+        max_workers = max_workers or min(4, os.cpu_count() or 1)
+        logger.info(f"Assessing {len(jobs)} clips in {directory} ({max_workers} workers)")
+        
+        settings = (self.use_numpy_engine, self.mmap_threshold_seconds)
+        if max_workers <= 1 or len(jobs) == 1:
+            results = [_assess_clip(path, transcript, settings) for path, transcript in jobs]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(max_workers, len(jobs)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                results = list(executor.map(
+                    _assess_clip,
+                    [path for path, _ in jobs],
+                    [transcript for _, transcript in jobs],
+                    [settings] * len(jobs),
+                ))
+        
+        ranked = sorted(zip(clips, results), key=lambda item: item[1].overall_score, reverse=True)
+        logger.success(f"✓ Assessed {len(ranked)} clips; best: {ranked[0][0].name} ({ranked[0][1].overall_score:.2f})")
+        return ranked
+    
+    def _analyze_with_ffmpeg(self, audio_path: Path) -> Dict[str, Dict]:
+        """Original per-analysis ffmpeg/ffprobe path (one decode per analysis)"""
+        audio_file = self._extract_audio_for_analysis(audio_path)
+        try:
+            return {
+                'metadata': self._get_audio_metadata(audio_file),
+                'signal': self._analyze_signal_quality(audio_file),
+                'volume': self._analyze_volume_levels(audio_file),
+                'frequency': self._analyze_frequency_response(audio_file),
+                'silence': self._analyze_silence_and_speech(audio_file),
+                'distortion': self._detect_distortion(audio_file),
+            }
+        finally:
+            # Cleanup temp file if created
+            if audio_file != audio_path and audio_file.exists():
+                try:
+                    audio_file.unlink()
+                except:
+                    pass
+    
     def _extract_audio_for_analysis(self, media_path: Path) -> Path:
         """Extract audio to WAV format for analysis"""
         # If already audio file, return as-is
@@ -624,29 +732,10 @@ class VoiceCloningQualityAssessor:
     
     def _get_duration(self, audio_path: Path) -> float:
         """Get audio duration"""
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'json',
-            str(audio_path)
-        ]
-        
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return float(data['format']['duration'])
-        except:
-            pass
-        
-        return 0.0
+            return get_probe_service().probe_sync(str(audio_path)).duration or 0.0
+        except ProbeError:
+            return 0.0
     
     def _calculate_overall_score(self, metrics: VoiceQualityMetrics) -> float:
         """Calculate overall quality score (0.0 to 1.0)"""
@@ -760,17 +849,34 @@ class VoiceCloningQualityAssessor:
         return issues
 
 
+def _assess_clip(audio_path: str, transcript: Optional[str], settings: Tuple[bool, float]) -> VoiceQualityMetrics:
+    """Module-level so assess_directory can ship it to worker processes"""
+    use_numpy_engine, mmap_threshold_seconds = settings
+    assessor = VoiceCloningQualityAssessor(use_numpy_engine, mmap_threshold_seconds)
+    return assessor.assess_audio_quality(Path(audio_path), transcript)
+
+
 # Example usage
 if __name__ == "__main__":
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python voice_cloning_quality_assessor.py <audio_file> [transcript_file]")
+        print("Usage: python -m services.audio.voice_cloning_quality_assessor <audio_file|clip_dir> [transcript_file]")
         sys.exit(1)
     
     audio_path = Path(sys.argv[1])
     transcript = None
     
+    if audio_path.is_dir():
+        ranked = VoiceCloningQualityAssessor().assess_directory(audio_path)
+        print(f"\n{'Score':>6}  {'Suitability':<11}  {'Duration':>9}  Clip")
+        for clip, clip_metrics in ranked:
+            print(
+                f"{clip_metrics.overall_score:6.2f}  {clip_metrics.suitability_for_cloning:<11}  "
+                f"{clip_metrics.duration_seconds:8.1f}s  {clip.name}"
+            )
+        sys.exit(0)
+    
     if len(sys.argv) > 2:
         with open(sys.argv[2], 'r') as f:
             transcript = f.read()
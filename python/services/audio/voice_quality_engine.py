@@ -0,0 +1,415 @@
+"""
+Voice Quality Engine
+One-decode, vectorized analysis for VoiceCloningQualityAssessor.
+
+The clip is decoded ONCE into a float32 buffer (a np.memmap on a temp file
+for long clips, so an hour of reference audio never sits in RAM) and every
+measurement the assessor needs is computed from that buffer in a single
+block-wise pass:
+
+- per-frame RMS / peak levels (astats reset=1 semantics: one frame per
+  1024-sample demuxer packet) → SNR estimate, background noise, clarity
+- whole-file mean / peak volume (volumedetect semantics) and the spread of
+  speech-frame loudness → volume consistency
+- per-frame power spectra → energy through the same 85-255 Hz bandpass the
+  ffmpeg path applied, coarse spectral bands and an autocorrelation F0
+- silence spans (silencedetect noise=-40dB:d=0.5 semantics) → pauses
+- sample peaks at/near full scale → clipping
+
+Results come back as the same section dicts the ffmpeg-based helpers return,
+so the assessor fills VoiceQualityMetrics identically from either path.
+"""
+
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+# ffmpeg's PCM demuxer hands astats 1024-sample packets; astats reset=1
+# reports one RMS/peak pair per packet
+FRAME_SAMPLES = 1024
+BLOCK_FRAMES = 256
+
+# Levels of digitally silent frames (astats prints -inf)
+DB_FLOOR = -120.0
+
+SILENCE_THRESHOLD_DB = -40.0
+SILENCE_MIN_DURATION_S = 0.5
+CLIPPING_THRESHOLD_DB = -0.1
+VOICE_PRESENCE_DB = -40.0
+
+# Sample rate/layout the ffmpeg path extracts video audio to
+EXTRACT_SAMPLE_RATE = 44100
+
+SPECTRAL_BANDS_HZ = {
+    "low": (0.0, 85.0),
+    "fundamental": (85.0, 255.0),
+    "harmonics": (255.0, 8000.0),
+    "high": (8000.0, None),
+}
+
+# soundfile subtype/format → ffprobe codec_name
+_CODEC_NAMES = {
+    "PCM_16": "pcm_s16le",
+    "PCM_24": "pcm_s24le",
+    "PCM_32": "pcm_s32le",
+    "PCM_U8": "pcm_u8",
+    "PCM_S8": "pcm_s8",
+    "FLOAT": "pcm_f32le",
+    "DOUBLE": "pcm_f64le",
+    "MPEG_LAYER_III": "mp3",
+    "VORBIS": "vorbis",
+    "OPUS": "opus",
+}
+
+
+def _db(power: np.ndarray) -> np.ndarray:
+    """Power (mean square) → dBFS, floored at DB_FLOOR."""
+    with np.errstate(divide="ignore"):
+        return np.maximum(10.0 * np.log10(power), DB_FLOOR)
+
+
+# ─── Decoding ────────────────────────────────────────────────────────────────
+
+def decode_audio(
+    audio_path: Path,
+    mmap_threshold_seconds: float = 600.0,
+    temp_dir: Optional[str] = None,
+) -> Tuple[np.ndarray, Dict[str, Any], Optional[str]]:
+    """
+    Decode a clip once into a (samples, channels) float32 buffer.
+
+    Files libsndfile can read are decoded in-process; anything else (video
+    containers, AAC) goes through a single ffmpeg decode to raw float32,
+    downmixed to mono at 44.1 kHz like the ffmpeg path's extraction.
+
+    Returns:
+        (buffer, metadata, backing_file). backing_file is the temp file behind
+        a memory-mapped buffer (caller deletes it), or None for in-memory.
+    """
+    import soundfile as sf
+
+    audio_path = Path(audio_path)
+    try:
+        info = sf.info(str(audio_path))
+    except RuntimeError:
+        return _decode_with_ffmpeg(audio_path, temp_dir)
+
+    metadata = {
+        "duration": info.frames / info.samplerate if info.samplerate else 0.0,
+        "sample_rate": info.samplerate,
+        "channels": info.channels,
+        "format": _CODEC_NAMES.get(info.subtype, info.format.lower()),
+        "bitrate": _bitrate_kbps(audio_path, info.frames / info.samplerate if info.samplerate else 0.0),
+    }
+    if info.format == "FLAC":
+        metadata["format"] = "flac"
+
+    if metadata["duration"] <= mmap_threshold_seconds:
+        data, _ = sf.read(str(audio_path), dtype="float32", always_2d=True)
+        return data, metadata, None
+
+    fd, backing = tempfile.mkstemp(suffix=".f32", dir=temp_dir)
+    os.close(fd)
+    try:
+        buffer = np.memmap(backing, dtype=np.float32, mode="w+", shape=(info.frames, info.channels))
+        offset = 0
+        for block in sf.blocks(str(audio_path), blocksize=1 << 18, dtype="float32", always_2d=True):
+            buffer[offset:offset + len(block)] = block
+            offset += len(block)
+        buffer.flush()
+    except Exception:
+        os.unlink(backing)
+        raise
+    return buffer[:offset], metadata, backing
+
+
+def _decode_with_ffmpeg(audio_path: Path, temp_dir: Optional[str]) -> Tuple[np.ndarray, Dict[str, Any], str]:
+    fd, backing = tempfile.mkstemp(suffix=".f32", dir=temp_dir)
+    os.close(fd)
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-i", str(audio_path),
+        "-vn",
+        "-ac", "1",
+        "-ar", str(EXTRACT_SAMPLE_RATE),
+        "-f", "f32le",
+        "-y", backing,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        if result.returncode != 0:
+            raise RuntimeError(f"Audio decode failed: {result.stderr}")
+        n_samples = os.path.getsize(backing) // 4
+        if n_samples == 0:
+            raise RuntimeError(f"No audio decoded from {audio_path.name}")
+        buffer = np.memmap(backing, dtype=np.float32, mode="r", shape=(n_samples, 1))
+    except Exception:
+        os.unlink(backing)
+        raise
+
+    # Same technical specs the ffmpeg path reported for its extracted WAV
+    metadata = {
+        "duration": n_samples / EXTRACT_SAMPLE_RATE,
+        "sample_rate": EXTRACT_SAMPLE_RATE,
+        "channels": 1,
+        "format": "pcm_s16le",
+        "bitrate": EXTRACT_SAMPLE_RATE * 16 // 1000,
+    }
+    return buffer, metadata, backing
+
+
+def _bitrate_kbps(path: Path, duration: float) -> Optional[int]:
+    if duration <= 0:
+        return None
+    return int(path.stat().st_size * 8 / duration) // 1000
+
+
+# ─── Analysis ────────────────────────────────────────────────────────────────
+
+def _bandpass_power_response(freqs: np.ndarray, sample_rate: int, low_hz: float, high_hz: float) -> np.ndarray:
+    """|H|² of ffmpeg's bandpass (RBJ, constant 0 dB peak, width_type=h)."""
+    center = (low_hz + high_hz) / 2.0
+    w0 = 2.0 * np.pi * center / sample_rate
+    alpha = np.sin(w0) / (2.0 * center / (high_hz - low_hz))
+    b = np.array([alpha, 0.0, -alpha])
+    a = np.array([1.0 + alpha, -2.0 * np.cos(w0), 1.0 - alpha])
+    z = np.exp(-1j * 2.0 * np.pi * freqs / sample_rate)
+    num = b[0] + b[1] * z + b[2] * z ** 2
+    den = a[0] + a[1] * z + a[2] * z ** 2
+    return np.abs(num / den) ** 2
+
+
+def analyze_buffer(
+    buffer: np.ndarray,
+    sample_rate: int,
+    voice_min_hz: float = 85.0,
+    voice_max_hz: float = 255.0,
+) -> Dict[str, Any]:
+    """
+    Vectorized per-frame and whole-file measurements over a decoded buffer.
+
+    Args:
+        buffer: (samples, channels) float32, may be a np.memmap
+        sample_rate: Sample rate of the buffer
+
+    Returns:
+        Raw measurements: per-frame rms/peak/voice-band levels (dB), F0 per
+        frame (NaN if unvoiced), whole-file mean square and peak, silence
+        spans in seconds, clipped sample count and spectral band energies.
+    """
+    n_samples = len(buffer)
+    n_frames = -(-n_samples // FRAME_SAMPLES)
+    fft_size = 2 * FRAME_SAMPLES  # zero-padded so the autocorrelation is linear
+    freqs = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+
+    # Full-spectrum power from an rfft: interior bins count twice
+    bin_weight = np.full(len(freqs), 2.0)
+    bin_weight[0] = 1.0
+    bin_weight[-1] = 1.0
+    voice_weight = bin_weight * _bandpass_power_response(freqs, sample_rate, voice_min_hz, voice_max_hz)
+    band_masks = {
+        name: (freqs >= lo) & (freqs < (hi if hi is not None else np.inf))
+        for name, (lo, hi) in SPECTRAL_BANDS_HZ.items()
+    }
+    band_power = {name: 0.0 for name in band_masks}
+
+    min_lag = max(1, int(sample_rate / voice_max_hz))
+    max_lag = min(FRAME_SAMPLES - 1, int(sample_rate / voice_min_hz))
+
+    silence_amp = 10 ** (SILENCE_THRESHOLD_DB / 20.0)
+    min_silence = int(round(SILENCE_MIN_DURATION_S * sample_rate))
+    clip_amp = 10 ** (CLIPPING_THRESHOLD_DB / 20.0)
+
+    rms_db = np.empty(n_frames)
+    peak_db = np.empty(n_frames)
+    voice_db = np.empty(n_frames)
+    f0 = np.full(n_frames, np.nan)
+    sum_squares = 0.0
+    peak = 0.0
+    clipped = 0
+    silences = []
+    run_start: Optional[int] = None  # open silence run carried across blocks
+
+    block = BLOCK_FRAMES * FRAME_SAMPLES
+    for offset in range(0, n_samples, block):
+        chunk = np.asarray(buffer[offset:offset + block], dtype=np.float32)
+        n = len(chunk)
+        channels = chunk.shape[1]
+        first = offset // FRAME_SAMPLES
+        count = -(-n // FRAME_SAMPLES)
+
+        # Frame view (zero-padding the last partial frame; lengths kept apart)
+        padded = np.zeros((count * FRAME_SAMPLES, channels), dtype=np.float32)
+        padded[:n] = chunk
+        frames = padded.reshape(count, FRAME_SAMPLES, channels)
+        lengths = np.full(count, FRAME_SAMPLES)
+        lengths[-1] = n - (count - 1) * FRAME_SAMPLES
+        denom = lengths * channels
+
+        squares = np.einsum("fsc,fsc->f", frames, frames, dtype=np.float64)
+        abs_frames = np.abs(frames)
+        frame_peak = abs_frames.max(axis=(1, 2)).astype(np.float64)
+        rms_db[first:first + count] = _db(squares / denom)
+        peak_db[first:first + count] = _db(frame_peak ** 2)
+        sum_squares += float(squares.sum())
+        peak = max(peak, float(frame_peak.max()))
+        clipped += int(np.count_nonzero(abs_frames >= clip_amp))
+
+        # One rfft per frame (channels summed: bandpass/F0 are on the voice)
+        mono = frames.mean(axis=2)
+        spectrum = np.fft.rfft(mono, n=fft_size, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        voice_ms = (power @ voice_weight) / (fft_size * lengths)
+        voice_db[first:first + count] = _db(voice_ms)
+        for name, mask in band_masks.items():
+            band_power[name] += float((power[:, mask] @ bin_weight[mask]).sum())
+
+        # Autocorrelation F0 on frames loud enough to carry speech
+        voiced = rms_db[first:first + count] > SILENCE_THRESHOLD_DB
+        if voiced.any():
+            acf = np.fft.irfft(power[voiced], n=fft_size, axis=1)
+            lags = acf[:, min_lag:max_lag + 1]
+            best = lags.argmax(axis=1)
+            strength = lags[np.arange(len(best)), best] / np.maximum(acf[:, 0], 1e-12)
+            frame_f0 = sample_rate / (best + min_lag)
+            frame_f0[strength < 0.3] = np.nan
+            f0[first + np.flatnonzero(voiced)] = frame_f0
+
+        # Silence runs: every channel below the noise floor
+        quiet = abs_frames.max(axis=2).reshape(-1)[:n] < silence_amp
+        edges = np.empty(n + 1, dtype=bool)
+        edges[0] = run_start is not None
+        edges[1:] = quiet
+        changes = np.flatnonzero(edges[1:] != edges[:-1])
+        starts = changes[quiet[changes]] + offset
+        ends = changes[~quiet[changes]] + offset
+        if run_start is not None:
+            starts = np.concatenate(([run_start], starts))
+        closed = len(ends)
+        keep = (ends - starts[:closed]) >= min_silence
+        silences.extend(zip(starts[:closed][keep].tolist(), ends[keep].tolist()))
+        run_start = int(starts[closed]) if len(starts) > closed else None
+
+    # Silence running into EOF is reported at the end of the stream
+    if run_start is not None and n_samples - run_start >= min_silence:
+        silences.append((run_start, n_samples))
+
+    total_ms = sum_squares / max(n_samples * (buffer.shape[1] if n_samples else 1), 1)
+    return {
+        "n_samples": n_samples,
+        "sample_rate": sample_rate,
+        "rms_db": rms_db,
+        "peak_db": peak_db,
+        "voice_band_db": voice_db,
+        "f0_hz": f0,
+        "mean_square": total_ms,
+        "peak": peak,
+        "clipped_samples": clipped,
+        "silences": [(s / sample_rate, e / sample_rate) for s, e in silences],
+        "band_energy_db": {
+            name: float(_db(np.array(p / (fft_size * max(n_samples, 1)))))
+            for name, p in band_power.items()
+        },
+    }
+
+
+def summarize(raw: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Turn raw measurements into the assessor's per-analysis section dicts
+    (same keys and heuristics as the ffmpeg-based helpers).
+    """
+    rms = raw["rms_db"]
+    peak_db = raw["peak_db"]
+    duration = raw["n_samples"] / raw["sample_rate"] if raw["sample_rate"] else 0.0
+    sections: Dict[str, Dict[str, Any]] = {"metadata": dict(metadata, duration=duration)}
+
+    if len(rms):
+        mean_rms = float(np.mean(rms))
+        std_rms = float(np.std(rms))
+        estimated_snr = mean_rms - std_rms if std_rms > 0 else mean_rms
+        sections["signal"] = {
+            "snr_db": estimated_snr,
+            "background_noise_db": float(rms.min()),
+            "clarity_score": min(1.0, max(0.0, (estimated_snr + 20) / 40)),
+            "rms_mean": mean_rms,
+            "rms_std": std_rms,
+        }
+
+        # volumedetect gives mean/peak; the spread is taken over speech frames
+        mean_volume = float(_db(np.array(raw["mean_square"])))
+        max_volume = float(_db(np.array(raw["peak"] ** 2)))
+        speech = rms[rms > SILENCE_THRESHOLD_DB]
+        if len(speech):
+            loud, quiet = np.percentile(speech, [95, 10])
+            dynamic_range = float(loud - quiet)
+            sections["volume"] = {
+                "mean_volume_db": mean_volume,
+                "max_volume_db": max_volume,
+                "min_volume_db": float(quiet),
+                "dynamic_range_db": dynamic_range,
+                "consistency": max(0.0, min(1.0, 1.0 - (dynamic_range / 30.0))),
+            }
+        else:
+            sections["volume"] = {"mean_volume_db": mean_volume, "max_volume_db": max_volume}
+
+        mean_voice_energy = float(np.mean(raw["voice_band_db"]))
+        f0 = raw["f0_hz"][~np.isnan(raw["f0_hz"])]
+        sections["frequency"] = {
+            "fundamental_freq_hz": float(np.median(f0)) if len(f0) else None,
+            "voice_range_covered": mean_voice_energy > VOICE_PRESENCE_DB,
+            "score": min(1.0, max(0.0, (mean_voice_energy + 60) / 40)),
+            "mean_voice_energy_db": mean_voice_energy,
+            "band_energy_db": raw["band_energy_db"],
+        }
+
+        max_peak = float(peak_db.max())
+        has_clipping = max_peak >= CLIPPING_THRESHOLD_DB
+        sections["distortion"] = {
+            "has_clipping": has_clipping,
+            "has_distortion": has_clipping,
+            "score": 0.3 if has_clipping else 1.0,
+            "max_peak_db": max_peak,
+            "clipped_samples": raw["clipped_samples"],
+        }
+
+    if duration > 0:
+        silences = raw["silences"]
+        total_silence = sum(end - start for start, end in silences)
+        silence_percentage = (total_silence / duration) * 100.0
+        sections["silence"] = {
+            "silence_percentage": silence_percentage,
+            "speech_percentage": 100.0 - silence_percentage,
+            "pause_count": len(silences),
+            "avg_pause_duration": total_silence / len(silences) if silences else 0.0,
+            "total_silence_seconds": total_silence,
+            "silences": [{"start": s, "end": e, "duration": e - s} for s, e in silences],
+        }
+
+    return sections
+
+
+def analyze_voice_quality(
+    audio_path: Path,
+    mmap_threshold_seconds: float = 600.0,
+    voice_min_hz: float = 85.0,
+    voice_max_hz: float = 255.0,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Decode a clip once and return every analysis section the assessor uses:
+    metadata, signal, volume, frequency, silence, distortion.
+    """
+    buffer, metadata, backing = decode_audio(Path(audio_path), mmap_threshold_seconds)
+    try:
+        if backing:
+            logger.debug(f"Memory-mapped {metadata['duration']:.0f}s of audio from {Path(audio_path).name}")
+        raw = analyze_buffer(buffer, metadata["sample_rate"], voice_min_hz, voice_max_hz)
+    finally:
+        del buffer
+        if backing and os.path.exists(backing):
+            os.unlink(backing)
+    return summarize(raw, metadata)
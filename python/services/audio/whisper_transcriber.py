@@ -11,6 +11,7 @@ from loguru import logger
 
 from config.model_registry import TaskType, ModelRegistry
 from services.ai_client import AIClient
+from services.ffprobe_service import get_probe_service
 
 
 class WhisperTranscriber:
@@ -56,16 +57,7 @@ class WhisperTranscriber:
             return False
         
         try:
-            cmd = [
-                "ffprobe",
-                "-v", "error",
-                "-select_streams", "a",
-                "-show_entries", "stream=codec_type",
-                "-of", "csv=p=0",
-                file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            has_audio = "audio" in result.stdout.lower()
+            has_audio = get_probe_service().probe_sync(file_path).has_audio
             logger.info(f"Audio stream check for {Path(file_path).name}: {has_audio}")
             return has_audio
         except Exception as e:
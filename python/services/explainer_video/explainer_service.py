@@ -381,40 +381,56 @@ JSON structure:
             return
         
         import httpx
+        from services.audio.tts_clip_cache import get_tts_clip_cache
         
         voiceover_dir = self.output_dir / "voiceovers" / brief.id
         voiceover_dir.mkdir(parents=True, exist_ok=True)
         
+        voice_id = "21m00Tcm4TlvDq8ikWAM"
+        model_id = "eleven_monolingual_v1"
+        voice_settings = {
+            "stability": 0.5,
+            "similarity_boost": 0.5,
+        }
+        cache = get_tts_clip_cache()
+        
         for item in brief.items:
             if not item.narration or not item.narration.script:
                 continue
             
             output_path = voiceover_dir / f"{item.id}.mp3"
+            script = item.narration.script
             
-            # Skip if already generated
-            if output_path.exists():
+            # Reuse the clip if this exact script was voiced before
+            # (an edited script gets a new key and is re-generated)
+            key = cache.make_key(
+                script,
+                voice=voice_id,
+                model=f"elevenlabs:{model_id}",
+                params={"voice_settings": voice_settings},
+                fmt="mp3",
+            )
+            if cache.materialize(key, str(output_path)):
                 continue
             
             try:
                 async with httpx.AsyncClient(timeout=60.0) as client:
                     response = await client.post(
-                        "https://api.elevenlabs.io/v1/text-to-speech/21m00Tcm4TlvDq8ikWAM",
+                        f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
                         headers={
                             "xi-api-key": elevenlabs_key,
                             "Content-Type": "application/json",
                         },
                         json={
-                            "text": item.narration.script,
-                            "model_id": "eleven_monolingual_v1",
-                            "voice_settings": {
-                                "stability": 0.5,
-                                "similarity_boost": 0.5,
-                            }
+                            "text": script,
+                            "model_id": model_id,
+                            "voice_settings": voice_settings,
                         }
                     )
                     
                     if response.status_code == 200:
                         output_path.write_bytes(response.content)
+                        cache.store(key, str(output_path), meta={"text": script[:100], "provider": "elevenlabs"})
                         logger.info(f"Generated voiceover: {item.id}")
                     else:
                         logger.warning(f"TTS failed for {item.id}: {response.status_code}")
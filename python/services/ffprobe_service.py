@@ -0,0 +1,386 @@
+"""
+FFprobe Service
+===============
+Shared, cached media probing for every pipeline stage.
+
+Each file is probed with a single ``ffprobe -show_format -show_streams`` call
+and the parsed result is cached under ``(path, size, mtime)``, so duration,
+resolution, fps, codec and audio presence all come from one subprocess and a
+file is only re-probed after it changes on disk.
+
+- At most ``max_concurrency`` ffprobe processes run at once (async and sync
+  callers are bounded separately).
+- Concurrent requests for the same file share one in-flight probe.
+- ``get_stats()`` reports probes run vs. probes avoided (cache hits plus
+  coalesced requests).
+
+Usage:
+    from services.ffprobe_service import get_probe_service
+
+    info = await get_probe_service().probe("clip.mp4")
+    info.duration, info.width, info.height, info.has_audio
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+
+class ProbeError(RuntimeError):
+    """ffprobe could not read the file (missing, unreadable or not media)."""
+
+
+# ─── Result ──────────────────────────────────────────────────────────────────
+
+def parse_frame_rate(rate: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe rational ("30000/1001") into fps, None if unusable."""
+    if not rate:
+        return None
+    num, _, den = str(rate).partition("/")
+    try:
+        value = float(num) / float(den) if den else float(num)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value if value > 0 else None
+
+
+def _float_or_none(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ProbeResult:
+    """Parsed ``-show_format -show_streams`` output for one file."""
+    path: str
+    format: Dict[str, Any] = field(default_factory=dict)
+    streams: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_ffprobe(cls, path: str, data: Dict[str, Any]) -> "ProbeResult":
+        return cls(path=path, format=data.get("format") or {}, streams=data.get("streams") or [])
+
+    def _first(self, codec_type: str) -> Optional[Dict[str, Any]]:
+        for stream in self.streams:
+            if stream.get("codec_type") == codec_type:
+                return stream
+        return None
+
+    @property
+    def video_stream(self) -> Optional[Dict[str, Any]]:
+        return self._first("video")
+
+    @property
+    def audio_stream(self) -> Optional[Dict[str, Any]]:
+        return self._first("audio")
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Container duration, falling back to the longest stream."""
+        duration = _float_or_none(self.format.get("duration"))
+        if duration is not None:
+            return duration
+        durations = [d for d in (_float_or_none(s.get("duration")) for s in self.streams) if d is not None]
+        return max(durations) if durations else None
+
+    @property
+    def width(self) -> Optional[int]:
+        stream = self.video_stream
+        return int(stream["width"]) if stream and stream.get("width") else None
+
+    @property
+    def height(self) -> Optional[int]:
+        stream = self.video_stream
+        return int(stream["height"]) if stream and stream.get("height") else None
+
+    @property
+    def fps(self) -> Optional[float]:
+        stream = self.video_stream
+        return parse_frame_rate(stream.get("r_frame_rate")) if stream else None
+
+    @property
+    def codec(self) -> Optional[str]:
+        stream = self.video_stream
+        return stream.get("codec_name") if stream else None
+
+    @property
+    def audio_codec(self) -> Optional[str]:
+        stream = self.audio_stream
+        return stream.get("codec_name") if stream else None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_stream is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_stream is not None
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """The ffprobe JSON document (``format`` and ``streams``)."""
+        return {"format": self.format, "streams": self.streams}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "duration": self.duration,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "codec": self.codec,
+            "audio_codec": self.audio_codec,
+            "has_video": self.has_video,
+            "has_audio": self.has_audio,
+        }
+
+
+# ─── Service ─────────────────────────────────────────────────────────────────
+
+CacheKey = Tuple[str, int, int]
+
+
+class _LoopState:
+    """Per-event-loop concurrency slots and in-flight probes."""
+
+    def __init__(self, max_concurrency: int):
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.inflight: Dict[CacheKey, "asyncio.Task[ProbeResult]"] = {}
+
+
+class FFprobeService:
+    """
+    Cached, bounded, single-flight ffprobe.
+
+    Args:
+        max_concurrency: Max simultaneous ffprobe processes per event loop
+            (and, separately, across sync callers)
+        max_entries: LRU cache size
+        timeout: Per-probe timeout in seconds
+        ffprobe_bin: ffprobe executable
+    """
+
+    PROBE_ARGS = ("-v", "error", "-print_format", "json", "-show_format", "-show_streams")
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_entries: int = 4096,
+        timeout: float = 30.0,
+        ffprobe_bin: str = "ffprobe",
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.ffprobe_bin = ffprobe_bin
+
+        self._cache: "OrderedDict[CacheKey, ProbeResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._sync_slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._sync_inflight: Dict[CacheKey, threading.Lock] = {}
+        self._stats = {"probes": 0, "cache_hits": 0, "coalesced": 0, "errors": 0}
+
+    # ── Public API ──
+
+    async def probe(self, path: str) -> ProbeResult:
+        """
+        Probe a media file (cached; concurrent callers share one ffprobe).
+
+        Raises:
+            ProbeError: If the file is missing or ffprobe fails
+        """
+        key = self._key(path)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        state = self._loop_state()
+        task = state.inflight.get(key)
+        if task is not None:
+            self._count("coalesced")
+        else:
+            task = asyncio.get_running_loop().create_task(self._probe_async(key, state))
+            task.add_done_callback(_consume_exception)
+            state.inflight[key] = task
+        # Shielded so a cancelled caller does not abort the shared probe
+        return await asyncio.shield(task)
+
+    async def probe_many(self, paths: Iterable[str]) -> List[Optional[ProbeResult]]:
+        """Probe several files concurrently; failed probes come back as None."""
+        async def one(path: str) -> Optional[ProbeResult]:
+            try:
+                return await self.probe(path)
+            except ProbeError as e:
+                logger.debug(f"Probe failed for {path}: {e}")
+                return None
+
+        return list(await asyncio.gather(*(one(p) for p in paths)))
+
+    def probe_sync(self, path: str) -> ProbeResult:
+        """
+        Blocking variant of probe() sharing the same cache.
+
+        Raises:
+            ProbeError: If the file is missing or ffprobe fails
+        """
+        key = self._key(path)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._sync_inflight.setdefault(key, threading.Lock())
+        with flight:
+            try:
+                # Another thread may have finished this probe while we waited
+                cached = self._cache_get(key, count=False)
+                if cached is not None:
+                    self._count("coalesced")
+                    return cached
+                with self._sync_slots:
+                    result = ProbeResult.from_ffprobe(key[0], self._run_sync(key[0]))
+                self._cache_put(key, result)
+                return result
+            finally:
+                with self._lock:
+                    if self._sync_inflight.get(key) is flight:
+                        del self._sync_inflight[key]
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop cached results for one file, or everything."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+                return
+            real = os.path.realpath(path)
+            for key in [k for k in self._cache if k[0] == real]:
+                del self._cache[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached"] = len(self._cache)
+        stats["probes_avoided"] = stats["cache_hits"] + stats["coalesced"]
+        return stats
+
+    # ── Internals ──
+
+    def _key(self, path: str) -> CacheKey:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            raise ProbeError(f"Cannot probe {path}: {e.strerror or e}") from e
+        return (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _cache_get(self, key: CacheKey, count: bool = True) -> Optional[ProbeResult]:
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                if count:
+                    self._stats["cache_hits"] += 1
+            return result
+
+    def _cache_put(self, key: CacheKey, result: ProbeResult) -> None:
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = _LoopState(self.max_concurrency)
+        return state
+
+    async def _probe_async(self, key: CacheKey, state: _LoopState) -> ProbeResult:
+        try:
+            async with state.slots:
+                data = await self._run_async(key[0])
+            result = ProbeResult.from_ffprobe(key[0], data)
+            self._cache_put(key, result)
+            return result
+        finally:
+            state.inflight.pop(key, None)
+
+    async def _run_async(self, path: str) -> Dict[str, Any]:
+        self._count("probes")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                self.ffprobe_bin, *self.PROBE_ARGS, path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            self._count("errors")
+            raise ProbeError(f"ffprobe unavailable: {e}") from e
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError as e:
+            process.kill()
+            await process.wait()
+            self._count("errors")
+            raise ProbeError(f"ffprobe timed out after {self.timeout}s for {path}") from e
+        return self._parse(path, process.returncode, stdout, stderr)
+
+    def _run_sync(self, path: str) -> Dict[str, Any]:
+        self._count("probes")
+        try:
+            process = subprocess.run(
+                [self.ffprobe_bin, *self.PROBE_ARGS, path],
+                capture_output=True,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self._count("errors")
+            raise ProbeError(f"ffprobe failed for {path}: {e}") from e
+        return self._parse(path, process.returncode, process.stdout, process.stderr)
+
+    def _parse(self, path: str, returncode: int, stdout: bytes, stderr: bytes) -> Dict[str, Any]:
+        if returncode != 0:
+            self._count("errors")
+            raise ProbeError(f"ffprobe failed for {path}: {stderr.decode(errors='replace')[:200]}")
+        try:
+            return json.loads(stdout.decode() or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self._count("errors")
+            raise ProbeError(f"Invalid ffprobe output for {path}: {e}") from e
+
+
+def _consume_exception(task: "asyncio.Task") -> None:
+    # Every waiter may have been cancelled; don't warn about unretrieved errors
+    if not task.cancelled():
+        task.exception()
+
+
+# ─── Singleton ───────────────────────────────────────────────────────────────
+
+_service: Optional[FFprobeService] = None
+
+
+def get_probe_service() -> FFprobeService:
+    """Process-wide probe service ($FFPROBE_MAX_CONCURRENCY, default 4)."""
+    global _service
+    if _service is None:
+        _service = FFprobeService(
+            max_concurrency=int(os.getenv("FFPROBE_MAX_CONCURRENCY", "4")),
+            ffprobe_bin=os.getenv("FFPROBE_PATH", "ffprobe"),
+        )
+    return _service
@@ -11,10 +11,12 @@ from __future__ import annotations
 import os
 import subprocess
 import tempfile
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from loguru import logger
 
+from services.ffprobe_service import get_probe_service
+
 
 # Shared FFmpeg voice filter chain
 VOICE_FILTER_CHAIN = ",".join([
@@ -110,6 +112,74 @@ class AudioEnhancer:
         logger.info(f"Enhanced audio: {output_path}")
         return output_path
 
+    # ─── Single-Pass Graph ───────────────────────────────────────────────
+
+    @staticmethod
+    def build_single_pass_command(
+        video_path: str,
+        video_out: str,
+        transcription_out: str,
+    ) -> List[str]:
+        """
+        One ffmpeg invocation that decodes the source audio once and splits it:
+
+            [0:a] ─ asplit ─┬─ voice chain ─ AAC → video_out (video stream copied)
+                            └─ 16 kHz mono ─ MP3 → transcription_out (Whisper)
+
+        The transcription branch is the unfiltered source audio, matching
+        LongformTranscriber.extract_audio, so transcripts don't change.
+        """
+        filter_graph = ";".join([
+            "[0:a:0]asplit=2[voice][asr]",
+            f"[voice]{VOICE_FILTER_CHAIN}[enh_mux]",
+            "[asr]aresample=16000,aformat=channel_layouts=mono[asr16]",
+        ])
+        return [
+            "ffmpeg", "-y",
+            "-i", video_path,
+            "-filter_complex", filter_graph,
+            # Enhanced video: remux with the video stream copied
+            "-map", "0:v:0?", "-map", "[enh_mux]",
+            "-c:v", "copy",
+            "-c:a", "aac", "-b:a", "192k",
+            video_out,
+            # Whisper input
+            "-map", "[asr16]",
+            "-c:a", "libmp3lame", "-ar", "16000", "-ac", "1", "-q:a", "4",
+            transcription_out,
+        ]
+
+    def enhance_single_pass(self, video_path: str, timeout: int = 1800) -> Dict[str, str]:
+        """
+        Produce the enhanced video and the transcription audio in one ffmpeg
+        process (one decode instead of two).
+
+        Returns:
+            {"video": ..., "transcription_audio": ...}
+        """
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"Source video not found: {video_path}")
+
+        outputs = {
+            "video": os.path.join(self.output_dir, "enhanced_voice.mp4"),
+            "transcription_audio": os.path.join(self.output_dir, "transcription_audio.mp3"),
+        }
+        cmd = self.build_single_pass_command(
+            video_path, outputs["video"], outputs["transcription_audio"],
+        )
+
+        logger.info(f"Enhancing voice + extracting audio (single pass): {video_path}")
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"FFmpeg single-pass enhancement timed out after {timeout}s")
+        if result.returncode != 0:
+            logger.error(f"Single-pass enhancement failed: {result.stderr[-500:]}")
+            raise RuntimeError(f"FFmpeg single-pass enhancement failed: {result.stderr[-200:]}")
+
+        logger.info(f"Voice enhanced: {outputs['video']} (+ {outputs['transcription_audio']})")
+        return outputs
+
     # ─── Background Music ────────────────────────────────────────────────
 
     def source_background_music(
@@ -201,12 +271,7 @@ class AudioEnhancer:
 
         # Validate it's actually an audio file
         try:
-            result = subprocess.run(
-                ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                 "-of", "csv=p=0", local_file],
-                capture_output=True, text=True, timeout=10,
-            )
-            duration = float(result.stdout.strip()) if result.stdout.strip() else 0
+            duration = get_probe_service().probe_sync(local_file).duration or 0
             if duration < 10:
                 logger.warning(f"Track too short ({duration:.1f}s), skipping")
                 return None
@@ -0,0 +1,384 @@
+"""
+B-Roll Sourcing Engine — Concurrent, cached B-roll sourcing for many windows.
+
+Runs the BrollSourcer pipeline (search → Pass A → Pass B → download) for a
+whole TimelinePlan at once instead of window by window:
+  - per-host concurrency limits (Pexels also honours PexelsClient's min interval)
+  - identical Pexels queries across windows are fetched once
+  - Pass A embeddings for every window go out in a few batched requests
+  - Pexels query results persist on disk with a TTL across runs
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from .broll_sourcer import BrollSourcer
+from .types import BrollCandidate, TimelineWindow
+
+
+class QueryCache:
+    """On-disk JSON cache for search results, one file per key, with TTL."""
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 7 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"created_at": time.time(), "value": value}, f)
+        os.replace(tmp_path, path)  # atomic: readers never see partial files
+
+
+class HostLimiter:
+    """Per-host concurrency semaphores, created lazily inside the running loop."""
+
+    def __init__(self, default_limit: int = 4, limits: Optional[Dict[str, int]] = None):
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def for_url(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc or url
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limits.get(host, self.default_limit))
+        return self._semaphores[host]
+
+
+class BrollSourcingEngine:
+    """Source B-roll for many timeline windows concurrently."""
+
+    def __init__(
+        self,
+        sourcer: BrollSourcer,
+        cache_dir: Optional[str] = None,
+        cache_ttl_hours: float = 168.0,
+        max_concurrency_per_host: int = 4,
+        host_limits: Optional[Dict[str, int]] = None,
+        embedding_batch_size: int = 512,
+        multimodal: bool = True,
+        top_n_pass_a: int = 5,
+        per_page: int = 8,
+        orientation: str = "landscape",
+    ):
+        """
+        Args:
+            sourcer: Configured BrollSourcer (keys, base URLs, download dir)
+            cache_dir: Directory for the persistent query cache (None = no cache)
+            cache_ttl_hours: Age after which cached query results are refetched
+            max_concurrency_per_host: Default in-flight request limit per host
+            host_limits: Per-host overrides, e.g. {"api.pexels.com": 2}
+            embedding_batch_size: Max texts per embeddings request
+            multimodal: Run Pass B vision scoring (False = rank by Pass A only)
+            top_n_pass_a: Candidates per window kept for Pass B
+            per_page: Pexels results per query
+            orientation: Pexels orientation filter
+        """
+        self.sourcer = sourcer
+        self.cache = QueryCache(cache_dir, cache_ttl_hours * 3600) if cache_dir else None
+        self.limiter = HostLimiter(max_concurrency_per_host, host_limits)
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.multimodal = multimodal
+        self.top_n_pass_a = top_n_pass_a
+        self.per_page = per_page
+        self.orientation = orientation
+
+        self._http: Optional[httpx.AsyncClient] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self.stats = {
+            "search_requests": 0,
+            "search_deduped": 0,
+            "search_cache_hits": 0,
+            "embedding_requests": 0,
+            "embedded_texts": 0,
+            "downloads": 0,
+        }
+
+    # ─── Entry Point ──────────────────────────────────────────────────────
+
+    async def source_windows(
+        self,
+        windows: List[TimelineWindow],
+    ) -> Dict[str, BrollCandidate]:
+        """Source, score and download B-roll for every window with a search intent."""
+        windows = [w for w in windows if w.broll_search_intent]
+        if not windows:
+            return {}
+
+        self._rate_lock = asyncio.Lock()
+        async with httpx.AsyncClient(timeout=60, follow_redirects=True) as http:
+            self._http = http
+            try:
+                candidates = await self._search_all(windows)
+                candidates = await self._score_pass_a_all(windows, candidates)
+                candidates = await self._score_pass_b_all(windows, candidates)
+                return await self._download_all(windows, candidates)
+            finally:
+                self._http = None
+                logger.info(f"B-roll engine stats: {self.stats}")
+
+    # ─── Search ───────────────────────────────────────────────────────────
+
+    async def _search_all(self, windows: List[TimelineWindow]) -> Dict[str, List[BrollCandidate]]:
+        """Run every window's queries concurrently; identical queries share one fetch."""
+        per_window = {
+            w.window_id: self.sourcer.intent_queries(w.broll_search_intent) for w in windows
+        }
+        unique_queries = list(dict.fromkeys(q for queries in per_window.values() for _, q in queries))
+        self.stats["search_deduped"] += sum(len(q) for q in per_window.values()) - len(unique_queries)
+
+        results = await asyncio.gather(
+            *(self._search(q) for q in unique_queries), return_exceptions=True
+        )
+        videos_by_query: Dict[str, List[Dict]] = {}
+        for query, result in zip(unique_queries, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Pexels search failed for '{query}': {result}")
+                continue
+            videos_by_query[query] = result
+
+        candidates: Dict[str, List[BrollCandidate]] = {}
+        for window_id, queries in per_window.items():
+            query_results = [
+                (query_type, query_text, videos_by_query[query_text])
+                for query_type, query_text in queries
+                if query_text in videos_by_query
+            ]
+            candidates[window_id] = self.sourcer.build_candidates(query_results)
+        return candidates
+
+    async def _search(self, query: str) -> List[Dict]:
+        """Pexels search served from the persistent cache when fresh."""
+        key = QueryCache.make_key("pexels_videos", query, self.orientation, "medium", self.per_page)
+        videos = self.cache.get(key) if self.cache else None
+        if videos is not None:
+            self.stats["search_cache_hits"] += 1
+            return videos
+
+        videos = await self._fetch_pexels(query)
+        if self.cache:
+            self.cache.set(key, videos)
+        return videos
+
+    async def _fetch_pexels(self, query: str) -> List[Dict]:
+        pexels = self.sourcer.pexels
+        url = f"{pexels.base_url}/videos/search"
+        async with self.limiter.for_url(url):
+            await self._pexels_rate_limit()
+            self.stats["search_requests"] += 1
+            resp = await self._http.get(
+                url,
+                headers={"Authorization": pexels.api_key},
+                params={
+                    "query": query,
+                    "orientation": self.orientation,
+                    "size": "medium",
+                    "per_page": self.per_page,
+                },
+            )
+            resp.raise_for_status()
+            videos = resp.json().get("videos", [])
+        logger.debug(f"Pexels search '{query}': {len(videos)} results")
+        return videos
+
+    async def _pexels_rate_limit(self):
+        """Async twin of PexelsClient._rate_limit, sharing its clock and interval."""
+        pexels = self.sourcer.pexels
+        async with self._rate_lock:
+            elapsed = time.time() - pexels._last_request_time
+            if elapsed < pexels._min_interval:
+                await asyncio.sleep(pexels._min_interval - elapsed)
+            pexels._last_request_time = time.time()
+
+    # ─── Pass A: Batched Embeddings ───────────────────────────────────────
+
+    async def _score_pass_a_all(
+        self,
+        windows: List[TimelineWindow],
+        candidates: Dict[str, List[BrollCandidate]],
+    ) -> Dict[str, List[BrollCandidate]]:
+        """Embed every window's intent + candidate texts in shared batches, then rank."""
+        if not self.sourcer.openai_api_key:
+            logger.warning("No OpenAI API key, skipping embedding scoring")
+            return {wid: cands[:self.top_n_pass_a] for wid, cands in candidates.items()}
+
+        texts_by_window: Dict[str, Tuple[str, List[str]]] = {}
+        unique_texts: Dict[str, None] = {}
+        for window in windows:
+            cands = candidates.get(window.window_id, [])
+            if not cands:
+                continue
+            intent_text, cand_texts = self.sourcer.embedding_texts(cands, window.broll_search_intent)
+            texts_by_window[window.window_id] = (intent_text, cand_texts)
+            unique_texts.update(dict.fromkeys([intent_text] + cand_texts))
+
+        try:
+            embeddings = await self._embed(list(unique_texts))
+        except Exception as e:
+            logger.warning(f"Batched embedding failed, skipping embedding scoring: {e}")
+            return {wid: cands[:self.top_n_pass_a] for wid, cands in candidates.items()}
+
+        ranked: Dict[str, List[BrollCandidate]] = {}
+        for window_id, (intent_text, cand_texts) in texts_by_window.items():
+            ranked[window_id] = self.sourcer.rank_by_embeddings(
+                candidates[window_id],
+                embeddings[intent_text],
+                [embeddings[t] for t in cand_texts],
+                top_n=self.top_n_pass_a,
+            )
+        return ranked
+
+    async def _embed(self, texts: List[str]) -> Dict[str, Any]:
+        """Embed texts, reusing the sourcer's embedding cache; misses go out in batches."""
+        cache = self.sourcer.embedding_cache
+        embeddings, missing = cache.split(texts)
+        batches = [
+            missing[i:i + self.embedding_batch_size]
+            for i in range(0, len(missing), self.embedding_batch_size)
+        ]
+        logger.info(
+            f"Computing embeddings for {len(missing)} texts in {len(batches)} request(s) "
+            f"({len(embeddings)} cached)"
+        )
+        results = await asyncio.gather(*(self._embed_batch(b) for b in batches))
+        for batch, vectors in zip(batches, results):
+            for text, vector in zip(batch, vectors):
+                embeddings[text] = cache.set(text, vector)
+        return embeddings
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        url = f"{self.sourcer.openai_base_url}/embeddings"
+        async with self.limiter.for_url(url):
+            self.stats["embedding_requests"] += 1
+            self.stats["embedded_texts"] += len(texts)
+            resp = await self._http.post(
+                url,
+                headers={"Authorization": f"Bearer {self.sourcer.openai_api_key}"},
+                json={"model": self.sourcer.embedding_cache.model, "input": texts},
+            )
+            resp.raise_for_status()
+            data = sorted(resp.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    # ─── Pass B: Multimodal Scoring ───────────────────────────────────────
+
+    async def _score_pass_b_all(
+        self,
+        windows: List[TimelineWindow],
+        candidates: Dict[str, List[BrollCandidate]],
+    ) -> Dict[str, List[BrollCandidate]]:
+        """Run the (blocking) vision scorer per window in threads, bounded per provider."""
+        if not self.multimodal:
+            for cands in candidates.values():
+                for c in cands:
+                    c.overall_score = c.embedding_similarity
+                cands.sort(key=lambda c: c.overall_score, reverse=True)
+            return candidates
+
+        vision_host = "api.openai.com" if self.sourcer.openai_api_key else "api.anthropic.com"
+        semaphore = self.limiter.for_url(f"https://{vision_host}")
+
+        async def score(window: TimelineWindow):
+            cands = candidates.get(window.window_id, [])
+            if not cands:
+                return
+            async with semaphore:
+                candidates[window.window_id] = await asyncio.to_thread(
+                    self.sourcer.score_pass_b,
+                    cands,
+                    window.transcript_text,
+                    window.retention_role.value,
+                )
+
+        await asyncio.gather(*(score(w) for w in windows))
+        return candidates
+
+    # ─── Download ─────────────────────────────────────────────────────────
+
+    async def _download_all(
+        self,
+        windows: List[TimelineWindow],
+        candidates: Dict[str, List[BrollCandidate]],
+    ) -> Dict[str, BrollCandidate]:
+        selected: Dict[str, BrollCandidate] = {}
+        for window in windows:
+            cands = candidates.get(window.window_id, [])
+            if not cands:
+                logger.warning(f"No B-roll candidates for window {window.window_id}")
+                continue
+            best = cands[0]
+            best.selected = True
+            selected[window.window_id] = best
+
+        downloads: Dict[str, asyncio.Task] = {}
+        for best in selected.values():
+            if best.candidate_id not in downloads:
+                downloads[best.candidate_id] = asyncio.ensure_future(self._download(best))
+        results = await asyncio.gather(*downloads.values(), return_exceptions=True)
+        local_paths = dict(zip(downloads, results))
+
+        for window_id in list(selected):
+            best = selected[window_id]
+            path = local_paths[best.candidate_id]
+            if isinstance(path, Exception):
+                logger.warning(f"B-roll download failed for {window_id}: {path}")
+                del selected[window_id]
+                continue
+            best.local_path = path
+            logger.info(
+                f"Selected B-roll for {window_id}: "
+                f"{best.candidate_id} (score={best.overall_score:.3f})"
+            )
+        return selected
+
+    async def _download(self, candidate: BrollCandidate) -> str:
+        if not candidate.download_url:
+            raise ValueError(f"No download URL for {candidate.candidate_id}")
+
+        local_path = os.path.join(self.sourcer.download_dir, f"{candidate.candidate_id}.mp4")
+        if os.path.exists(local_path):
+            logger.debug(f"Already downloaded: {local_path}")
+            return local_path
+
+        tmp_path = f"{local_path}.part"
+        async with self.limiter.for_url(candidate.download_url):
+            self.stats["downloads"] += 1
+            async with self._http.stream("GET", candidate.download_url) as resp:
+                resp.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    async for chunk in resp.aiter_bytes(chunk_size=65536):
+                        f.write(chunk)
+        os.replace(tmp_path, local_path)
+        logger.info(f"Downloaded: {local_path}")
+        return local_path
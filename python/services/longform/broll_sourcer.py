@@ -7,14 +7,17 @@ Pass B: Multimodal visual scoring with Claude Vision (expensive, picks winner)
 
 from __future__ import annotations
 
+import hashlib
 import os
 import time
 import uuid
 import tempfile
 import subprocess
-from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import List, Dict, Optional, Sequence, Tuple
 
 import httpx
+import numpy as np
 from loguru import logger
 
 from .types import (
@@ -29,10 +32,11 @@ class PexelsClient:
 
     BASE_URL = "https://api.pexels.com"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         self.api_key = api_key or os.environ.get("PEXELS_API_KEY", "")
         if not self.api_key:
             raise ValueError("PEXELS_API_KEY is required")
+        self.base_url = (base_url or os.environ.get("PEXELS_BASE_URL", self.BASE_URL)).rstrip("/")
         self._last_request_time = 0.0
         self._min_interval = 0.5  # Max ~120 req/min (well under 200/hr limit)
 
@@ -54,7 +58,7 @@ class PexelsClient:
 
         with httpx.Client(timeout=30) as client:
             resp = client.get(
-                f"{self.BASE_URL}/videos/search",
+                f"{self.base_url}/videos/search",
                 headers={"Authorization": self.api_key},
                 params={
                     "query": query,
@@ -71,6 +75,85 @@ class PexelsClient:
         return videos
 
 
+class EmbeddingCache:
+    """
+    Text → embedding cache keyed by a hash of (model, text).
+
+    Memoizes in-process in a bounded LRU; with a cache_dir, vectors also
+    persist as .npy files (the durable layer) so repeat queries across runs
+    are never re-embedded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        model: str = "text-embedding-3-small",
+        max_memory_entries: int = 4096,
+    ):
+        self.cache_dir = cache_dir
+        self.model = model
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npy")
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self._key(text)
+        vec = self._memory.get(key)
+        if vec is not None:
+            self._memory.move_to_end(key)
+        elif self.cache_dir:
+            try:
+                vec = np.load(self._path(key))
+                self._remember(key, vec)
+            except (OSError, ValueError):
+                vec = None
+        if vec is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return vec
+
+    def set(self, text: str, embedding: Sequence[float]) -> np.ndarray:
+        key = self._key(text)
+        vec = np.asarray(embedding, dtype=np.float32)
+        self._remember(key, vec)
+        if self.cache_dir:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, vec)
+            os.replace(tmp_path, path)
+        return vec
+
+    def split(self, texts: Sequence[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """Partition unique texts into (cached embeddings, texts still to embed)."""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        for text in dict.fromkeys(texts):
+            vec = self.get(text)
+            if vec is None:
+                missing.append(text)
+            else:
+                found[text] = vec
+        return found, missing
+
+
 class BrollSourcer:
     """Source, score, and select B-roll for timeline windows."""
 
@@ -80,12 +163,19 @@ class BrollSourcer:
         openai_api_key: Optional[str] = None,
         anthropic_api_key: Optional[str] = None,
         download_dir: Optional[str] = None,
+        pexels_base_url: Optional[str] = None,
+        openai_base_url: Optional[str] = None,
+        embedding_cache_dir: Optional[str] = None,
     ):
-        self.pexels = PexelsClient(pexels_api_key)
+        self.pexels = PexelsClient(pexels_api_key, base_url=pexels_base_url)
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY", "")
+        self.openai_base_url = (
+            openai_base_url or os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        ).rstrip("/")
         self.anthropic_api_key = anthropic_api_key or os.environ.get("ANTHROPIC_API_KEY", "")
         self.download_dir = download_dir or tempfile.mkdtemp(prefix="broll_")
         os.makedirs(self.download_dir, exist_ok=True)
+        self.embedding_cache = EmbeddingCache(embedding_cache_dir)
 
     # ─── Search ───────────────────────────────────────────────────────────
 
@@ -98,17 +188,9 @@ class BrollSourcer:
         orientation: str = "landscape",
     ) -> List[BrollCandidate]:
         """Search Pexels for B-roll candidates using all three query types."""
-        candidates: List[BrollCandidate] = []
-        seen_ids = set()
-
-        for query_type, query_text in [
-            ("literal", intent.literal),
-            ("metaphor", intent.metaphor),
-            ("contextual", intent.contextual),
-        ]:
-            if not query_text.strip():
-                continue
+        query_results: List[Tuple[str, str, List[Dict]]] = []
 
+        for query_type, query_text in self.intent_queries(intent):
             try:
                 videos = self.pexels.search_videos(
                     query=query_text,
@@ -118,7 +200,35 @@ class BrollSourcer:
             except Exception as e:
                 logger.warning(f"Pexels search failed for '{query_text}': {e}")
                 continue
+            query_results.append((query_type, query_text, videos))
+
+        return self.build_candidates(query_results, min_duration, max_duration, min_width)
+
+    @staticmethod
+    def intent_queries(intent: BrollSearchIntent) -> List[Tuple[str, str]]:
+        """Non-empty (query_type, query_text) pairs for a search intent."""
+        return [
+            (query_type, query_text)
+            for query_type, query_text in [
+                ("literal", intent.literal),
+                ("metaphor", intent.metaphor),
+                ("contextual", intent.contextual),
+            ]
+            if query_text.strip()
+        ]
+
+    def build_candidates(
+        self,
+        query_results: List[Tuple[str, str, List[Dict]]],
+        min_duration: float = 3.0,
+        max_duration: float = 30.0,
+        min_width: int = 1920,
+    ) -> List[BrollCandidate]:
+        """Filter raw Pexels results of (query_type, query_text, videos) into candidates."""
+        candidates: List[BrollCandidate] = []
+        seen_ids = set()
 
+        for query_type, query_text, videos in query_results:
             for video in videos:
                 vid_id = str(video.get("id", ""))
                 if vid_id in seen_ids:
@@ -179,32 +289,50 @@ class BrollSourcer:
             logger.warning("No OpenAI API key, skipping embedding scoring")
             return candidates[:top_n]
 
-        import openai
-
-        client = openai.OpenAI(api_key=self.openai_api_key)
+        # Get embeddings for intent + all candidate descriptions (cached ones are reused)
+        intent_text, candidate_texts = self.embedding_texts(candidates, intent)
+        embeddings, missing = self.embedding_cache.split([intent_text] + candidate_texts)
 
-        # Build intent text for embedding
-        intent_text = f"{intent.literal}. {intent.metaphor}. {intent.contextual}"
-
-        # Get embeddings for intent + all candidate descriptions
-        texts = [intent_text] + [
-            f"{c.query_text} {c.source_asset_id}" for c in candidates
-        ]
+        if missing:
+            import openai
 
-        logger.info(f"Computing embeddings for {len(texts)} texts")
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=texts,
+            client = openai.OpenAI(api_key=self.openai_api_key, base_url=self.openai_base_url)
+            logger.info(f"Computing embeddings for {len(missing)} texts ({len(embeddings)} cached)")
+            response = client.embeddings.create(
+                model=self.embedding_cache.model,
+                input=missing,
+            )
+            for text, item in zip(missing, response.data):
+                embeddings[text] = self.embedding_cache.set(text, item.embedding)
+
+        return self.rank_by_embeddings(
+            candidates,
+            embeddings[intent_text],
+            [embeddings[t] for t in candidate_texts],
+            top_n,
         )
 
-        embeddings = [item.embedding for item in response.data]
-        intent_emb = embeddings[0]
-        candidate_embs = embeddings[1:]
+    @staticmethod
+    def embedding_texts(
+        candidates: List[BrollCandidate],
+        intent: BrollSearchIntent,
+    ) -> Tuple[str, List[str]]:
+        """Texts embedded for Pass A: (intent text, one text per candidate)."""
+        intent_text = f"{intent.literal}. {intent.metaphor}. {intent.contextual}"
+        return intent_text, [f"{c.query_text} {c.source_asset_id}" for c in candidates]
 
-        # Cosine similarity
-        for candidate, emb in zip(candidates, candidate_embs):
-            similarity = self._cosine_similarity(intent_emb, emb)
-            candidate.embedding_similarity = similarity
+    def rank_by_embeddings(
+        self,
+        candidates: List[BrollCandidate],
+        intent_emb: Sequence[float],
+        candidate_embs: Sequence[Sequence[float]],
+        top_n: int = 5,
+    ) -> List[BrollCandidate]:
+        """Set embedding_similarity on each candidate and return the top N."""
+        # Cosine similarity, all candidates in one matmul
+        similarities = self._cosine_similarities(intent_emb, candidate_embs)
+        for candidate, similarity in zip(candidates, similarities):
+            candidate.embedding_similarity = float(similarity)
 
         # Sort by similarity, return top N
         candidates.sort(key=lambda c: c.embedding_similarity, reverse=True)
@@ -216,11 +344,22 @@ class BrollSourcer:
         return top
 
     @staticmethod
-    def _cosine_similarity(a: List[float], b: List[float]) -> float:
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-        return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+    def _cosine_similarities(
+        query: Sequence[float],
+        matrix: Sequence[Sequence[float]],
+    ) -> np.ndarray:
+        """Cosine similarity of one vector against each row (zero-norm rows score 0)."""
+        if len(matrix) == 0:
+            return np.zeros(0)
+        q = np.asarray(query, dtype=np.float64)
+        m = np.asarray(matrix, dtype=np.float64)
+        q_norm = np.linalg.norm(q)
+        row_norms = np.linalg.norm(m, axis=1)
+        if not q_norm:
+            return np.zeros(len(m))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sims = (m @ q) / (row_norms * q_norm)
+        return np.where(row_norms > 0, sims, 0.0)
 
     # ─── Pass B: Multimodal Scoring ───────────────────────────────────────
 
@@ -306,7 +445,7 @@ class BrollSourcer:
     def _score_with_openai_vision(self, img_data_b64: str, prompt: str) -> str:
         """Score using OpenAI GPT-4o Vision."""
         import openai
-        client = openai.OpenAI(api_key=self.openai_api_key)
+        client = openai.OpenAI(api_key=self.openai_api_key, base_url=self.openai_base_url)
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             max_tokens=200,
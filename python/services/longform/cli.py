@@ -5,17 +5,22 @@ Usage:
     python -m services.longform.cli run --video path/to/video.mp4 --output output/
     python -m services.longform.cli run --video video.mp4 --skip-broll --skip-segmentation
     python -m services.longform.cli run --video video.mp4 --topic "Sales outreach" --sync
+    python -m services.longform.cli run --video video.mp4 --force-stage plan_timeline
+    python -m services.longform.cli cache --output output/ --bust transcribe
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import os
 import sys
+import time
 
 from loguru import logger
 
 from .pipeline import LongformPipeline, PipelineConfig
+from .stage_cache import STAGES, StageCache
 
 
 def main():
@@ -71,6 +76,22 @@ def main():
         "--music-volume", type=float, default=0.08,
         help="Music volume (default: 0.08)",
     )
+    run_parser.add_argument(
+        "--stage-executor", default="thread", choices=["thread", "process"],
+        help="Pool used for concurrent stages in async mode (default: thread)",
+    )
+    run_parser.add_argument(
+        "--stage-workers", type=int, default=4,
+        help="Max concurrently running stages in async mode (default: 4)",
+    )
+    run_parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Ignore and do not write the stage cache",
+    )
+    run_parser.add_argument(
+        "--force-stage", action="append", default=[], choices=STAGES + ["all"],
+        help="Re-run a stage (and everything downstream of it); repeatable",
+    )
 
     # ─── dry-run command ──────────────────────────────────────────────────
     dry_parser = subparsers.add_parser("dry-run", help="Plan only, no B-roll or rendering")
@@ -79,6 +100,14 @@ def main():
     dry_parser.add_argument("--topic", "-t", default="")
     dry_parser.add_argument("--fps", type=int, default=30)
 
+    # ─── cache command ────────────────────────────────────────────────────
+    cache_parser = subparsers.add_parser("cache", help="Inspect or bust cached stage outputs")
+    cache_parser.add_argument("--output", "-o", default="output")
+    cache_parser.add_argument(
+        "--bust", default=None, choices=STAGES + ["all"],
+        help="Delete a stage's cached outputs (and downstream stages)",
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -89,6 +118,19 @@ def main():
     logger.remove()
     logger.add(sys.stderr, level="INFO", format="{time:HH:mm:ss} | {level:<7} | {message}")
 
+    if args.command == "cache":
+        cache = StageCache(os.path.join(args.output, "cache", "stages"))
+        if args.bust:
+            removed = cache.bust(None if args.bust == "all" else args.bust)
+            print(f"Removed {removed} cached entries")
+            return
+        for stage, entries in cache.inspect().items():
+            print(f"{stage}: {len(entries)} entries")
+            for entry in entries:
+                created = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created_at"]))
+                print(f"  {entry['key'][:12]}  {created}  {entry['size_bytes']:>9} B")
+        return
+
     if args.command == "dry-run":
         args.skip_broll = True
         args.skip_segmentation = True
@@ -97,6 +139,10 @@ def main():
         args.music = None
         args.music_volume = 0.08
         args.brand_notes = ""
+        args.no_cache = False
+        args.force_stage = []
+        args.stage_executor = "thread"
+        args.stage_workers = 4
 
     # Build config
     music_config = None
@@ -117,6 +163,10 @@ def main():
         video_topic=args.topic,
         brand_notes=args.brand_notes,
         music_config=music_config,
+        use_stage_cache=not args.no_cache,
+        force_stages=args.force_stage,
+        stage_executor=args.stage_executor,
+        max_stage_workers=args.stage_workers,
     )
 
     pipeline = LongformPipeline(config=config)
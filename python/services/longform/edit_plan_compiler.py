@@ -14,11 +14,13 @@ from __future__ import annotations
 
 import math
 import re
-import subprocess
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Sequence, Set
 
+import numpy as np
 from loguru import logger
 
+from services.ffprobe_service import get_probe_service
+
 from .types import (
     TimelinePlan,
     TimelineWindow,
@@ -51,6 +53,25 @@ FILLER_WORDS: Set[str] = {
     "right", "so",  # when at start of sentence as filler
 }
 
+# Always-filler hesitation sounds (matched after FILLER_STRIP normalization)
+HESITATION_WORDS: Set[str] = {"um", "uh", "umm", "uhh", "erm", "hmm", "hm", "ah", "oh"}
+
+# Words that are filler only in certain contexts
+CONTEXT_FILLERS: Set[str] = {"like", "right", "so"}
+
+# "like" after these is a comparison ("looks like"), not filler
+COMPARISON_WORDS: Set[str] = {"looks", "sounds", "feels", "seems", "acts", "is", "was"}
+
+FILLER_STRIP = ".,!?;:'\""
+PREV_WORD_STRIP = ".,!?"
+
+# Token codes used by the vectorized sweep
+_HESITATION, _LIKE, _RIGHT, _SO = 1, 2, 3, 4
+_TOKEN_CODES: Dict[str, int] = {
+    **{w: _HESITATION for w in HESITATION_WORDS},
+    "like": _LIKE, "right": _RIGHT, "so": _SO,
+}
+
 # Minimum gap (seconds) to consider as dead air worth cutting
 MIN_GAP_TO_CUT = 0.4
 
@@ -79,14 +100,23 @@ class EditPlanCompiler:
         """Remove filler words from transcript windows and tighten timing."""
         if not self.remove_fillers:
             return windows
+        return self._apply_filler_flags(windows, [self._filler_flags(w.words) for w in windows])
+
+    def filter_filler_words_batch(self, windows: List[TimelineWindow]) -> List[TimelineWindow]:
+        """
+        Same result as filter_filler_words, but classifies every word of every
+        window in one vectorized sweep. Preferred for long transcripts.
+        """
+        if not self.remove_fillers:
+            return windows
+        return self._apply_filler_flags(windows, self.filler_masks(windows))
 
+    @staticmethod
+    def _apply_filler_flags(windows: List[TimelineWindow], flags: List[Sequence[bool]]) -> List[TimelineWindow]:
         total_removed = 0
-        for window in windows:
+        for window, is_filler in zip(windows, flags):
             original_count = len(window.words)
-            window.words = [
-                w for w in window.words
-                if not self._is_filler(w, window.words)
-            ]
+            window.words = [w for w, filler in zip(window.words, is_filler) if not filler]
             removed = original_count - len(window.words)
             total_removed += removed
 
@@ -102,38 +132,37 @@ class EditPlanCompiler:
         return windows
 
     @staticmethod
-    def _find_word_index(word: TranscriptWord, context: List[TranscriptWord]) -> int:
-        """Find word index by value (timestamp + text), not object identity."""
-        for i, w in enumerate(context):
+    def _canonical_index(words: List[TranscriptWord], i: int) -> int:
+        """
+        Index a word resolves to: the first word with the same text starting
+        within 10ms. Almost always i itself; only near-duplicate words differ.
+        """
+        word = words[i]
+        for j in range(i + 1):
+            w = words[j]
             if w.word == word.word and abs(w.start - word.start) < 0.01:
-                return i
-        return -1
+                return j
+        return i
 
     @staticmethod
-    def _is_filler(word: TranscriptWord, context: List[TranscriptWord]) -> bool:
-        """Determine if a word is filler based on the word and context."""
-        clean = word.word.lower().strip(".,!?;:'\"")
-
-        # Direct filler words
-        if clean in {"um", "uh", "umm", "uhh", "erm", "hmm", "hm", "ah", "oh"}:
-            return True
-
-        # Find index using value comparison, not identity
-        idx = EditPlanCompiler._find_word_index(word, context)
+    def _is_filler_at(words: List[TranscriptWord], clean: str, i: int, idx: int) -> bool:
+        """Context rules for word i (normalized to clean) whose window position is idx."""
+        word = words[i]
+        last = len(words) - 1
 
         # "like" as filler: if surrounded by non-punctuation words (not "looks like X")
         if clean == "like":
-            if idx > 0 and idx < len(context) - 1:
-                prev = context[idx - 1].word.lower().strip(".,!?")
+            if 0 < idx < last:
+                prev = words[idx - 1].word.lower().strip(PREV_WORD_STRIP)
                 # Keep "like" after comparison words
-                if prev not in {"looks", "sounds", "feels", "seems", "acts", "is", "was"}:
+                if prev not in COMPARISON_WORDS:
                     return True
 
         # "right" as filler: when standalone between pauses
         if clean == "right":
-            if idx > 0 and idx < len(context) - 1:
-                gap_before = word.start - context[idx - 1].end
-                gap_after = context[idx + 1].start - word.end
+            if 0 < idx < last:
+                gap_before = word.start - words[idx - 1].end
+                gap_after = words[idx + 1].start - word.end
                 if gap_before > 0.15 and gap_after > 0.15:
                     return True
 
@@ -141,13 +170,99 @@ class EditPlanCompiler:
         if clean == "so":
             if idx == 0:
                 return True
-            if idx > 0:
-                gap_before = word.start - context[idx - 1].end
-                if gap_before > 0.3:
-                    return True
+            if idx > 0 and word.start - words[idx - 1].end > 0.3:
+                return True
 
         return False
 
+    @classmethod
+    def _filler_flags(cls, words: List[TranscriptWord]) -> List[bool]:
+        """Single indexed pass over one window's words."""
+        in_order = all(a.start <= b.start for a, b in zip(words, words[1:]))
+
+        flags = []
+        for i, word in enumerate(words):
+            clean = word.word.lower().strip(FILLER_STRIP)
+            if clean in HESITATION_WORDS:
+                flags.append(True)
+            elif clean in CONTEXT_FILLERS:
+                # In a time-ordered window a near-duplicate can only sit right
+                # before this word; otherwise the word resolves to its own index
+                crowded = i > 0 and abs(words[i - 1].start - word.start) < 0.01
+                idx = i if in_order and not crowded else cls._canonical_index(words, i)
+                flags.append(cls._is_filler_at(words, clean, i, idx))
+            else:
+                flags.append(False)
+        return flags
+
+    @classmethod
+    def filler_masks(cls, windows: List[TimelineWindow]) -> List[np.ndarray]:
+        """
+        Vectorized filler classification for many windows at once.
+
+        Each word is normalized once into a small token code; the context
+        rules then run as array ops over flat start/end/position arrays for
+        the whole transcript. Rows whose index lookup is ambiguous
+        (near-duplicate words, or windows that aren't time-ordered) fall back
+        to the scalar rules.
+
+        Returns:
+            One boolean mask per window (True = filler).
+        """
+        lengths = np.array([len(w.words) for w in windows], dtype=np.int64)
+        total = int(lengths.sum())
+        if total == 0:
+            return [np.zeros(0, dtype=bool) for _ in windows]
+
+        words = [word for w in windows for word in w.words]
+        codes = np.fromiter(
+            (_TOKEN_CODES.get(w.word.lower().strip(FILLER_STRIP), 0) for w in words),
+            dtype=np.int8, count=total,
+        )
+        starts = np.fromiter((w.start for w in words), dtype=np.float64, count=total)
+        ends = np.fromiter((w.end for w in words), dtype=np.float64, count=total)
+
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        window_of = np.repeat(np.arange(len(windows)), lengths)
+        pos = np.arange(total) - offsets[window_of]
+        has_prev = pos > 0
+        has_next = pos < (lengths - 1)[window_of]
+
+        # Neighbor values (edges are masked out by has_prev / has_next)
+        prev_end = np.concatenate(([0.0], ends[:-1]))
+        prev_start = np.concatenate(([0.0], starts[:-1]))
+        next_start = np.concatenate((starts[1:], [0.0]))
+        gap_before = starts - prev_end
+
+        is_like = codes == _LIKE
+        is_right = codes == _RIGHT
+        is_so = codes == _SO
+
+        mask = codes == _HESITATION
+        mask |= is_right & has_prev & has_next & (gap_before > 0.15) & (next_start - ends > 0.15)
+        mask |= is_so & (~has_prev | (gap_before > 0.3))
+        like_rows = np.flatnonzero(is_like & has_prev & has_next)
+        mask[like_rows] = [
+            words[row - 1].word.lower().strip(PREV_WORD_STRIP) not in COMPARISON_WORDS
+            for row in like_rows
+        ]
+
+        # Rows where "index of this word" isn't simply its position
+        out_of_order = has_prev & (starts < prev_start)
+        unordered_windows = np.zeros(len(windows), dtype=bool)
+        unordered_windows[window_of[out_of_order]] = True
+        crowded = has_prev & (np.abs(prev_start - starts) < 0.01)
+        ambiguous = (is_like | is_right | is_so) & (crowded | unordered_windows[window_of])
+
+        for row in np.flatnonzero(ambiguous):
+            window_words = windows[window_of[row]].words
+            i = int(pos[row])
+            idx = cls._canonical_index(window_words, i)
+            clean = window_words[i].word.lower().strip(FILLER_STRIP)
+            mask[row] = cls._is_filler_at(window_words, clean, i, idx)
+
+        return [mask[offsets[k]:offsets[k] + lengths[k]] for k in range(len(windows))]
+
     # ─── Gapless Timeline ─────────────────────────────────────────────────
 
     def build_gapless_edl(self, edl_entries: List[EdlEntry]) -> List[EdlEntry]:
@@ -227,7 +342,7 @@ class EditPlanCompiler:
         resolution = self._get_video_resolution(source_video)
 
         # Step 1: Remove filler words from windows
-        cleaned_windows = self.filter_filler_words(list(timeline_plan.windows))
+        cleaned_windows = self.filter_filler_words_batch(list(timeline_plan.windows))
 
         # Step 2: Compile each window into an EDL entry
         edl_entries: List[EdlEntry] = []
@@ -424,19 +539,9 @@ class EditPlanCompiler:
     def _get_video_resolution(video_path: str) -> tuple:
         """Get video resolution via FFprobe."""
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe", "-v", "error",
-                    "-select_streams", "v:0",
-                    "-show_entries", "stream=width,height",
-                    "-of", "csv=p=0",
-                    video_path,
-                ],
-                capture_output=True, text=True, timeout=10,
-            )
-            parts = result.stdout.strip().split(",")
-            if len(parts) == 2:
-                return (int(parts[0]), int(parts[1]))
+            info = get_probe_service().probe_sync(video_path)
+            if info.width and info.height:
+                return (info.width, info.height)
         except Exception as e:
             logger.warning(f"Could not determine resolution: {e}")
         return (1920, 1080)  # default
@@ -8,9 +8,11 @@ where possible. Emits PostHog events at each stage boundary.
 from __future__ import annotations
 
 import asyncio
+import json
 import os
 import time
 import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
@@ -28,9 +30,12 @@ from .transcriber import LongformTranscriber
 from .scene_detector import SceneDetector
 from .timeline_planner import TimelinePlanner
 from .broll_sourcer import BrollSourcer
-from .audio_enhancer import AudioEnhancer
+from .broll_engine import BrollSourcingEngine
+from .audio_enhancer import AudioEnhancer, VOICE_FILTER_CHAIN
 from .speaker_segmenter import SpeakerSegmenter
 from .edit_plan_compiler import EditPlanCompiler
+from .stage_cache import StageCache, STAGE_DEPENDENCIES, file_fingerprint
+from .stage_graph import StageGraph
 
 
 class PipelineConfig:
@@ -47,6 +52,13 @@ class PipelineConfig:
         video_topic: str = "",
         brand_notes: str = "",
         music_config: Optional[Dict] = None,
+        broll_max_concurrency: int = 4,
+        broll_cache_ttl_hours: float = 168.0,
+        use_stage_cache: bool = True,
+        force_stages: Optional[List[str]] = None,
+        single_pass_audio: bool = False,
+        stage_executor: str = "thread",
+        max_stage_workers: int = 4,
         posthog_api_key: Optional[str] = None,
         posthog_host: str = "https://app.posthog.com",
     ):
@@ -59,6 +71,13 @@ class PipelineConfig:
         self.video_topic = video_topic
         self.brand_notes = brand_notes
         self.music_config = music_config
+        self.broll_max_concurrency = broll_max_concurrency
+        self.broll_cache_ttl_hours = broll_cache_ttl_hours
+        self.use_stage_cache = use_stage_cache
+        self.force_stages = force_stages or []
+        self.single_pass_audio = single_pass_audio
+        self.stage_executor = stage_executor      # "thread" or "process" (run_async)
+        self.max_stage_workers = max_stage_workers
         self.posthog_api_key = posthog_api_key or os.environ.get("POSTHOG_API_KEY", "")
         self.posthog_host = posthog_host
 
@@ -71,6 +90,20 @@ class LongformPipeline:
         self.video_id = f"video_{uuid.uuid4().hex[:8]}"
         self._posthog = None
         self._init_posthog()
+        self.stage_cache = StageCache(
+            os.path.join(self.config.output_dir, "cache", "stages"),
+            enabled=self.config.use_stage_cache,
+        )
+        self._source_hash: Optional[str] = None
+        self._stage_keys: Dict[str, str] = {}
+        # Outputs of the audio enhancement stage: video (+ transcription_audio in single-pass mode)
+        self.enhanced_audio: Dict[str, str] = {}
+
+    def __getstate__(self):
+        # Process-pool stages get a copy of the pipeline without the analytics client
+        state = self.__dict__.copy()
+        state["_posthog"] = None
+        return state
 
     def _init_posthog(self):
         """Initialize PostHog analytics client."""
@@ -99,15 +132,74 @@ class LongformPipeline:
             except Exception as e:
                 logger.debug(f"PostHog capture failed: {e}")
 
+    # ─── Stage Cache ──────────────────────────────────────────────────────
+
+    def _prepare_stage_cache(self, video_path: str):
+        """Hash the source and apply --force-stage busts before a run."""
+        self._stage_keys = {}
+        for stage in self.config.force_stages:
+            self.stage_cache.bust(None if stage == "all" else stage)
+        if not self.stage_cache.enabled:
+            self._source_hash = None
+            return
+        start = time.time()
+        self._source_hash = file_fingerprint(
+            video_path, index_path=os.path.join(self.stage_cache.root_dir, "source_hashes.json"),
+        )
+        logger.info(f"Source hash {self._source_hash[:12]} ({time.time() - start:.1f}s)")
+
+    def _stage_key(self, stage: str, config: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a stage, or None if the source/upstream stages are untracked."""
+        if self._source_hash is None:
+            return None
+        upstream = {}
+        for dep in STAGE_DEPENDENCIES[stage]:
+            if dep not in self._stage_keys:
+                return None
+            upstream[dep] = self._stage_keys[dep]
+        return StageCache.make_key(stage, self._source_hash, config, upstream)
+
+    def _cached_stage(
+        self,
+        stage: str,
+        config: Dict[str, Any],
+        compute,
+        encode,
+        decode,
+        artifacts=None,
+    ):
+        """Return the cached output of a stage, or compute and store it."""
+        key = self._stage_key(stage, config)
+        if key:
+            payload = self.stage_cache.get(stage, key)
+            if payload is not None:
+                self._stage_keys[stage] = key
+                self._track("stage cache hit", {"stage": stage, "key": key})
+                return decode(payload)
+
+        result = compute()
+        if key:
+            self.stage_cache.put(
+                stage, key, encode(result), config,
+                artifacts=artifacts(result) if artifacts else None,
+            )
+            self._stage_keys[stage] = key
+        return result
+
     # ─── Individual Steps ─────────────────────────────────────────────────
 
     def step_transcribe(self, video_path: str) -> TranscriptionResult:
         """Step 1: Transcribe video with word timestamps + diarization."""
         start = time.time()
-        transcriber = LongformTranscriber(
-            diarization_enabled=self.config.diarization_enabled,
+        result = self._cached_stage(
+            "transcribe",
+            {"diarization_enabled": self.config.diarization_enabled, "model": "whisper-1"},
+            lambda: LongformTranscriber(
+                diarization_enabled=self.config.diarization_enabled,
+            ).transcribe_video(video_path, audio_path=self.enhanced_audio.get("transcription_audio")),
+            TranscriptionResult.to_dict,
+            TranscriptionResult.from_dict,
         )
-        result = transcriber.transcribe_video(video_path)
         self._track("transcript generated", {
             "word_count": len(result.all_words),
             "speaker_count": len(result.speakers),
@@ -122,7 +214,13 @@ class LongformPipeline:
         """Step 2: Detect scene boundaries."""
         start = time.time()
         detector = SceneDetector()
-        result = detector.detect_scenes(video_path)
+        result = self._cached_stage(
+            "detect_scenes",
+            dict(vars(detector)),
+            lambda: detector.detect_scenes(video_path),
+            SceneDetectionResult.to_dict,
+            SceneDetectionResult.from_dict,
+        )
         self._track("scene boundaries detected", {
             "scene_count": len(result.scenes),
             "cut_point_count": len(result.safe_cut_points),
@@ -138,11 +236,25 @@ class LongformPipeline:
         """Step 3: Plan edit decisions per speech window."""
         start = time.time()
         planner = TimelinePlanner()
-        plan = planner.plan(
-            transcript=transcript,
-            scene_boundaries=scenes,
-            video_topic=self.config.video_topic,
-            brand_notes=self.config.brand_notes,
+        plan = self._cached_stage(
+            "plan_timeline",
+            {
+                "video_topic": self.config.video_topic,
+                "brand_notes": self.config.brand_notes,
+                "provider": planner.provider,
+                "model": planner.openai_model if planner.provider == "openai" else planner.model,
+                "min_window_sec": planner.min_window_sec,
+                "max_window_sec": planner.max_window_sec,
+                "has_scenes": scenes is not None,
+            },
+            lambda: planner.plan(
+                transcript=transcript,
+                scene_boundaries=scenes,
+                video_topic=self.config.video_topic,
+                brand_notes=self.config.brand_notes,
+            ),
+            TimelinePlan.to_dict,
+            TimelinePlan.from_dict,
         )
         self._track("edit plan generated", {
             "window_count": len(plan.windows),
@@ -158,23 +270,45 @@ class LongformPipeline:
             return {}
 
         start = time.time()
-        sourcer = BrollSourcer(download_dir=os.path.join(self.config.output_dir, "broll"))
-        selected: Dict[str, BrollCandidate] = {}
+        sourcer = BrollSourcer(
+            download_dir=os.path.join(self.config.output_dir, "broll"),
+            embedding_cache_dir=os.path.join(self.config.output_dir, "cache", "embeddings"),
+        )
+        engine = BrollSourcingEngine(
+            sourcer,
+            cache_dir=os.path.join(self.config.output_dir, "cache", "broll_queries"),
+            cache_ttl_hours=self.config.broll_cache_ttl_hours,
+            max_concurrency_per_host=self.config.broll_max_concurrency,
+            multimodal=not self.config.skip_multimodal_scoring,
+        )
 
-        for window in plan.broll_windows():
-            try:
-                candidate = sourcer.source_for_window(window)
-                if candidate:
-                    selected[window.window_id] = candidate
-                    self._track("broll candidate accepted", {
-                        "window_id": window.window_id,
-                        "candidate_id": candidate.candidate_id,
-                        "source": candidate.source,
-                        "overall_score": candidate.overall_score,
-                        "semantic_fit": candidate.semantic_fit,
-                    })
-            except Exception as e:
-                logger.warning(f"B-roll sourcing failed for {window.window_id}: {e}")
+        def source() -> Dict[str, BrollCandidate]:
+            # Steps are synchronous (run_async calls them from executor threads),
+            # so the engine gets a private event loop
+            return asyncio.run(engine.source_windows(plan.broll_windows()))
+
+        # A failed run must not be cached, so the fallback happens out here
+        try:
+            selected = self._cached_stage(
+                "source_broll",
+                {"multimodal": engine.multimodal, "top_n_pass_a": engine.top_n_pass_a},
+                source,
+                lambda sel: {wid: c.to_dict() for wid, c in sel.items()},
+                lambda payload: {wid: BrollCandidate.from_dict(c) for wid, c in payload.items()},
+                artifacts=lambda sel: [c.local_path for c in sel.values()],
+            )
+        except Exception as e:
+            logger.warning(f"B-roll sourcing failed: {e}")
+            selected = {}
+
+        for window_id, candidate in selected.items():
+            self._track("broll candidate accepted", {
+                "window_id": window_id,
+                "candidate_id": candidate.candidate_id,
+                "source": candidate.source,
+                "overall_score": candidate.overall_score,
+                "semantic_fit": candidate.semantic_fit,
+            })
 
         self._track("broll sourcing completed", {
             "windows_needing_broll": len(plan.broll_windows()),
@@ -243,8 +377,25 @@ class LongformPipeline:
         start = time.time()
         enhancer = AudioEnhancer(output_dir=os.path.join(self.config.output_dir, "audio"))
 
-        # Enhance voice
-        enhanced_path = enhancer.enhance_voice(video_path)
+        def enhance() -> Dict[str, str]:
+            if self.config.single_pass_audio:
+                try:
+                    return enhancer.enhance_single_pass(video_path)
+                except RuntimeError as e:
+                    logger.warning(f"Single-pass audio graph failed, falling back: {e}")
+            return {"video": enhancer.enhance_voice(video_path)}
+
+        # Enhance voice (and, in single-pass mode, extract the Whisper input
+        # from the same decode)
+        self.enhanced_audio = self._cached_stage(
+            "enhance_audio",
+            {"filter_chain": VOICE_FILTER_CHAIN, "single_pass": self.config.single_pass_audio},
+            enhance,
+            dict,
+            dict,
+            artifacts=lambda outputs: list(outputs.values()),
+        )
+        enhanced_path = self.enhanced_audio["video"]
         self._track("audio enhanced", {
             "processing_time": time.time() - start,
         })
@@ -278,6 +429,7 @@ class LongformPipeline:
         self._track("video ingested", {"source": video_path})
 
         os.makedirs(self.config.output_dir, exist_ok=True)
+        self._prepare_stage_cache(video_path)
 
         # Step 0: Enhance audio + source music
         enhanced_video = self.step_enhance_audio(video_path)
@@ -303,7 +455,6 @@ class LongformPipeline:
 
         # Save transcript for reference
         transcript_path = os.path.join(self.config.output_dir, f"{self.video_id}_transcript.json")
-        import json
         with open(transcript_path, "w") as f:
             json.dump(transcript.to_dict(), f, indent=2)
 
@@ -316,6 +467,35 @@ class LongformPipeline:
 
     # ─── Async Runner ─────────────────────────────────────────────────────
 
+    def _make_stage_executor(self) -> Executor:
+        if self.config.stage_executor == "process":
+            return ProcessPoolExecutor(max_workers=self.config.max_stage_workers)
+        if self.config.stage_executor == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.config.max_stage_workers, thread_name_prefix="longform-stage",
+            )
+        raise ValueError(f"Unknown stage_executor: {self.config.stage_executor}")
+
+    def _run_stage(self, step: str, *args: Any):
+        """
+        Run a step and return (output, state) so pipeline state mutated in a
+        process-pool worker can be merged back in the parent.
+        """
+        output = getattr(self, step)(*args)
+        state = {"stage_keys": dict(self._stage_keys)}
+        if step == "step_enhance_audio":
+            state["music_config"] = self.config.music_config
+            state["enhanced_audio"] = self.enhanced_audio
+        return output, state
+
+    def _merge_stage_output(self, stage: str, result):
+        output, state = result
+        self._stage_keys.update(state["stage_keys"])
+        if "music_config" in state:
+            self.config.music_config = state["music_config"]
+            self.enhanced_audio = state["enhanced_audio"]
+        return output
+
     async def run_async(self, video_path: str) -> LongformEditPlan:
         """
         Run the full pipeline with parallel execution where possible.
@@ -329,35 +509,51 @@ class LongformPipeline:
 
         os.makedirs(self.config.output_dir, exist_ok=True)
         loop = asyncio.get_event_loop()
-
-        # Phase 0: Enhance audio (must complete before transcription uses enhanced video)
-        enhanced_video = await loop.run_in_executor(
-            None, self.step_enhance_audio, video_path
+        await loop.run_in_executor(None, self._prepare_stage_cache, video_path)
+
+        # Each stage starts as soon as its inputs are done. Transcription and
+        # scene detection use the original timeline (so timestamps match
+        # source trims); only compile needs the enhanced video.
+        graph = StageGraph(on_complete=self._merge_stage_output)
+        graph.add("enhance_audio", self._run_stage, "step_enhance_audio", video_path)
+        # Single-pass mode (opt-in) trades the enhance/transcribe overlap for
+        # one fewer decode: transcription waits for the enhancement graph's
+        # Whisper input instead of extracting its own
+        graph.add(
+            "transcribe", self._run_stage, "step_transcribe", video_path,
+            after=["enhance_audio"] if self.config.single_pass_audio else None,
         )
-
-        # Phase A: Transcribe original + detect scenes (parallel)
-        # Transcribe original video so timestamps match source trims
-        transcript_future = loop.run_in_executor(None, self.step_transcribe, video_path)
-        scenes_future = loop.run_in_executor(None, self.step_detect_scenes, video_path)
-        transcript, scenes = await asyncio.gather(transcript_future, scenes_future)
-
-        # Phase B: Plan timeline (needs both above)
-        plan = await loop.run_in_executor(
-            None, self.step_plan_timeline, transcript, scenes
+        graph.add("detect_scenes", self._run_stage, "step_detect_scenes", video_path)
+        graph.add(
+            "plan_timeline", self._run_stage, "step_plan_timeline",
+            inputs=["transcribe", "detect_scenes"],
         )
-
-        # Phase C: Source B-roll + segment speaker (parallel)
-        broll_future = loop.run_in_executor(None, self.step_source_broll, plan)
-        masks_future = loop.run_in_executor(
-            None, self.step_segment_speaker, video_path, transcript
+        graph.add("source_broll", self._run_stage, "step_source_broll", inputs=["plan_timeline"])
+        graph.add(
+            "segment_speaker", self._run_stage, "step_segment_speaker", video_path,
+            inputs=["transcribe"],
         )
-        broll, masks = await asyncio.gather(broll_future, masks_future)
-
-        # Phase D: Compile (uses enhanced video as source)
-        edit_plan = await loop.run_in_executor(
-            None, self.step_compile, plan, broll, masks, transcript, enhanced_video
+        graph.add(
+            "compile", self._run_stage, "step_compile",
+            inputs=["plan_timeline", "source_broll", "segment_speaker", "transcribe", "enhance_audio"],
         )
 
+        with self._make_stage_executor() as executor:
+            outputs = await graph.run(executor)
+        edit_plan = outputs["compile"]
+        transcript = outputs["transcribe"]
+
+        report = graph.critical_path()
+        logger.info(f"Stage critical path:\n{report.summary()}")
+        report_path = os.path.join(self.config.output_dir, f"{self.video_id}_stage_report.json")
+        with open(report_path, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        self._track("stage critical path", {
+            "gating_stage": report.gating_stage,
+            "critical_path": report.critical_path,
+            "total_seconds": report.total_seconds,
+        })
+
         # Save
         output_path = os.path.join(self.config.output_dir, f"{self.video_id}_props.json")
         edit_plan.save(output_path)
@@ -365,7 +561,6 @@ class LongformPipeline:
 
         # Save transcript
         transcript_path = os.path.join(self.config.output_dir, f"{self.video_id}_transcript.json")
-        import json
         with open(transcript_path, "w") as f:
             json.dump(transcript.to_dict(), f, indent=2)
 
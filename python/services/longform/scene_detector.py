@@ -7,13 +7,17 @@ for the timeline planner.
 
 from __future__ import annotations
 
+import inspect
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from loguru import logger
 
 from .types import SceneBoundary, SceneDetectionResult
 
+# (start_sec, end_sec) of a single detected scene
+SceneSpan = Tuple[float, float]
+
 
 class SceneDetector:
     """Detect shot boundaries using PySceneDetect."""
@@ -24,6 +28,9 @@ class SceneDetector:
         min_scene_len_sec: float = 1.0,
         adaptive_threshold: float = 3.5,
         use_adaptive: bool = True,
+        single_pass: bool = True,
+        downscale: Optional[int] = None,
+        frame_skip: int = 0,
     ):
         """
         Args:
@@ -31,11 +38,20 @@ class SceneDetector:
             min_scene_len_sec: Minimum scene length in seconds
             adaptive_threshold: AdaptiveDetector sensitivity
             use_adaptive: Whether to also run AdaptiveDetector and merge results
+            single_pass: Decode the video once and feed every frame to both
+                detectors (False = legacy one-decode-per-detector passes)
+            downscale: Integer downscale factor applied before detection
+                (None = PySceneDetect's automatic factor, 1 = full resolution)
+            frame_skip: Frames to skip between analysed frames (single-pass only,
+                0 = analyse every frame). Trades boundary accuracy for speed.
         """
         self.threshold = threshold
         self.min_scene_len_sec = min_scene_len_sec
         self.adaptive_threshold = adaptive_threshold
         self.use_adaptive = use_adaptive
+        self.single_pass = single_pass
+        self.downscale = downscale
+        self.frame_skip = max(0, frame_skip)
 
     def detect_scenes(self, video_path: str) -> SceneDetectionResult:
         """
@@ -47,46 +63,161 @@ class SceneDetector:
         if not os.path.exists(video_path):
             raise FileNotFoundError(f"Video not found: {video_path}")
 
-        from scenedetect import open_video, SceneManager
+        if self.single_pass:
+            content_scenes, adaptive_scenes = self._detect_single_pass(video_path)
+        else:
+            content_scenes, adaptive_scenes = self._detect_two_pass(video_path)
+
+        return self._build_result(content_scenes, adaptive_scenes)
+
+    # ─── Detector Setup ───────────────────────────────────────────────────
+
+    def _make_detectors(self, fps: float):
+        """Build the (content, adaptive) detector pair for a given frame rate."""
         from scenedetect.detectors import ContentDetector, AdaptiveDetector
 
+        min_scene_len = int(self.min_scene_len_sec * fps)
+        content = ContentDetector(
+            threshold=self.threshold,
+            min_scene_len=min_scene_len,
+        )
+        adaptive = None
+        if self.use_adaptive:
+            adaptive = AdaptiveDetector(
+                adaptive_threshold=self.adaptive_threshold,
+                min_scene_len=min_scene_len,
+            )
+        return content, adaptive
+
+    # ─── Two-Pass Detection (legacy) ──────────────────────────────────────
+
+    def _detect_two_pass(self, video_path: str) -> Tuple[List[SceneSpan], List[SceneSpan]]:
+        """Run each detector over its own decode of the video."""
+        from scenedetect import open_video, SceneManager
+
         video = open_video(video_path)
         fps = video.frame_rate
+        content_detector, adaptive_detector = self._make_detectors(fps)
 
         # Run ContentDetector
         scene_manager = SceneManager()
-        scene_manager.add_detector(
-            ContentDetector(
-                threshold=self.threshold,
-                min_scene_len=int(self.min_scene_len_sec * fps),
-            )
-        )
+        if self.downscale is not None:
+            scene_manager.auto_downscale = False
+            scene_manager.downscale = self.downscale
+        scene_manager.add_detector(content_detector)
 
         logger.info(f"Detecting scenes in {video_path} (ContentDetector, threshold={self.threshold})")
         scene_manager.detect_scenes(video, show_progress=False)
-        content_scenes = scene_manager.get_scene_list()
+        content_scenes = [
+            (scene[0].get_seconds(), scene[1].get_seconds())
+            for scene in scene_manager.get_scene_list()
+        ]
 
         # Optionally run AdaptiveDetector and merge
-        adaptive_scenes = []
-        if self.use_adaptive:
+        adaptive_scenes: List[SceneSpan] = []
+        if adaptive_detector is not None:
             video = open_video(video_path)  # re-open for second pass
             scene_manager2 = SceneManager()
-            scene_manager2.add_detector(
-                AdaptiveDetector(
-                    adaptive_threshold=self.adaptive_threshold,
-                    min_scene_len=int(self.min_scene_len_sec * fps),
-                )
-            )
+            if self.downscale is not None:
+                scene_manager2.auto_downscale = False
+                scene_manager2.downscale = self.downscale
+            scene_manager2.add_detector(adaptive_detector)
             logger.info("Running AdaptiveDetector second pass")
             scene_manager2.detect_scenes(video, show_progress=False)
-            adaptive_scenes = scene_manager2.get_scene_list()
+            adaptive_scenes = [
+                (scene[0].get_seconds(), scene[1].get_seconds())
+                for scene in scene_manager2.get_scene_list()
+            ]
+
+        return content_scenes, adaptive_scenes
+
+    # ─── Single-Pass Detection ────────────────────────────────────────────
+
+    def _detect_single_pass(self, video_path: str) -> Tuple[List[SceneSpan], List[SceneSpan]]:
+        """
+        Decode the video once and feed each frame to every detector.
+
+        Mirrors SceneManager's frame loop (downscale → process_frame →
+        post_process → cuts-to-scenes) so each detector sees exactly the
+        frames it would in its own pass, without the second decode.
+
+        scenedetect 0.6 detectors take the frame number, 0.7+ take the
+        FrameTimecode; both are supported.
+        """
+        import cv2
+        from scenedetect import open_video
+        from scenedetect.scene_manager import compute_downscale_factor
 
+        video = open_video(video_path)
+        fps = float(video.frame_rate)  # a Fraction on scenedetect 0.7+
+        content_detector, adaptive_detector = self._make_detectors(fps)
+        detectors = [d for d in (content_detector, adaptive_detector) if d is not None]
+        cuts: List[List[int]] = [[] for _ in detectors]
+        timecode_api = _takes_timecode(content_detector)
+
+        downscale = self.downscale
+        if downscale is None:
+            downscale = compute_downscale_factor(video.frame_size[0])
+
+        logger.info(
+            f"Detecting scenes in {video_path} (single pass, "
+            f"{len(detectors)} detector(s), downscale={downscale}, frame_skip={self.frame_skip})"
+        )
+
+        start_frame = video.position.frame_num
+        last_frame = start_frame
+        last_position = video.position
+        while True:
+            frame_im = video.read()
+            if frame_im is False or frame_im is None:
+                break
+            last_position = video.position
+            last_frame = last_position.frame_num
+            position = last_position if timecode_api else last_frame
+
+            if downscale > 1:
+                frame_im = cv2.resize(
+                    frame_im,
+                    (
+                        round(frame_im.shape[1] / downscale),
+                        round(frame_im.shape[0] / downscale),
+                    ),
+                    interpolation=cv2.INTER_LINEAR,
+                )
+
+            for idx, detector in enumerate(detectors):
+                cuts[idx].extend(_frame_index(c) for c in detector.process_frame(position, frame_im))
+
+            # Skip frames without decoding them
+            for _ in range(self.frame_skip):
+                if video.read(decode=False) is False:
+                    break
+
+        end_position = last_position if timecode_api else last_frame
+        for idx, detector in enumerate(detectors):
+            cuts[idx].extend(_frame_index(c) for c in detector.post_process(end_position))
+
+        end_frame = last_frame + 1
+        scene_lists = [
+            _scenes_from_cuts(detector_cuts, start_frame, end_frame, fps)
+            for detector_cuts in cuts
+        ]
+        content_scenes = scene_lists[0]
+        adaptive_scenes = scene_lists[1] if len(scene_lists) > 1 else []
+        return content_scenes, adaptive_scenes
+
+    # ─── Result Assembly ──────────────────────────────────────────────────
+
+    @staticmethod
+    def _build_result(
+        content_scenes: List[SceneSpan],
+        adaptive_scenes: List[SceneSpan],
+    ) -> SceneDetectionResult:
+        """Merge detector scene lists into a SceneDetectionResult."""
         # Merge and deduplicate scene boundaries
         all_cut_times = set()
-        for scene_list, detector_name in [(content_scenes, "content"), (adaptive_scenes, "adaptive")]:
-            for scene in scene_list:
-                start_sec = scene[0].get_seconds()
-                end_sec = scene[1].get_seconds()
+        for scene_list in (content_scenes, adaptive_scenes):
+            for start_sec, end_sec in scene_list:
                 all_cut_times.add(round(start_sec, 3))
                 all_cut_times.add(round(end_sec, 3))
 
@@ -99,9 +230,7 @@ class SceneDetector:
         # Build scene boundaries from content detector results (primary)
         scenes: List[SceneBoundary] = []
         scene_source = content_scenes if content_scenes else adaptive_scenes
-        for idx, scene in enumerate(scene_source):
-            start_sec = scene[0].get_seconds()
-            end_sec = scene[1].get_seconds()
+        for idx, (start_sec, end_sec) in enumerate(scene_source):
             scenes.append(SceneBoundary(
                 scene_id=idx + 1,
                 start_time=round(start_sec, 3),
@@ -121,6 +250,43 @@ class SceneDetector:
         return result
 
 
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+def _takes_timecode(detector) -> bool:
+    """True for scenedetect 0.7+ detectors, whose process_frame takes a FrameTimecode."""
+    params = list(inspect.signature(detector.process_frame).parameters)
+    return bool(params) and params[0] == "timecode"
+
+
+def _frame_index(cut) -> int:
+    """Normalize a detector cut (int or FrameTimecode) to a frame number."""
+    return cut.frame_num if hasattr(cut, "frame_num") else int(cut)
+
+
+def _scenes_from_cuts(
+    cut_frames: List[int],
+    start_frame: int,
+    end_frame: int,
+    fps: float,
+) -> List[SceneSpan]:
+    """
+    Convert cut frames into (start_sec, end_sec) scenes.
+
+    Matches SceneManager.get_scene_list(): no cuts → no scenes.
+    """
+    cut_list = sorted(set(cut_frames))
+    if not cut_list:
+        return []
+
+    scenes: List[SceneSpan] = []
+    last_cut = start_frame
+    for cut in cut_list:
+        scenes.append((last_cut / fps, cut / fps))
+        last_cut = cut
+    scenes.append((last_cut / fps, end_frame / fps))
+    return scenes
+
+
 # ─── CLI Test ─────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -13,17 +13,132 @@ GPU required. Falls back to mock mode for CPU-only development.
 
 from __future__ import annotations
 
+import contextlib
 import os
+import shutil
 import subprocess
 import tempfile
 import uuid
-from typing import List, Optional, Tuple
+from typing import Any, Iterator, List, Optional, Tuple
 
 from loguru import logger
 
+from services.ffprobe_service import get_probe_service
+
 from .types import SpeakerMask, TranscriptionResult
 
 
+# Mock mask geometry: centered ellipse, shared by the FFmpeg mock generator
+# and the in-process MockMaskPredictor (cx, cy, rx, ry as fractions of W/H)
+MOCK_ELLIPSE = (0.5, 0.4, 0.2, 0.45)
+
+
+class FrameStreamer:
+    """
+    Decode a frame range once and yield it in bounded chunks.
+
+    Consecutive chunks share one frame (the last frame of chunk N is the
+    first of chunk N+1) so mask state can be carried across the seam.
+    Frames are optionally downscaled for inference.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        start_time: float = 0.0,
+        end_time: Optional[float] = None,
+        chunk_seconds: float = 10.0,
+        scale: float = 1.0,
+    ):
+        import cv2
+
+        self.video_path = video_path
+        self.scale = scale
+
+        cap = cv2.VideoCapture(video_path)
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+
+        self.chunk_frames = max(2, int(chunk_seconds * self.fps))
+        self.start_frame = int(start_time * self.fps)
+        self.end_frame = int(end_time * self.fps) if end_time else total_frames
+        self.inference_size = (
+            max(1, round(self.width * scale)),
+            max(1, round(self.height * scale)),
+        )
+
+    def chunks(self) -> Iterator[List[Any]]:
+        """Yield lists of (possibly downscaled) BGR frames, at most chunk_frames long."""
+        import cv2
+
+        cap = cv2.VideoCapture(self.video_path)
+        if self.start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+
+        chunk: List[Any] = []
+        frame_idx = self.start_frame
+        try:
+            while frame_idx <= self.end_frame:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if self.scale != 1.0:
+                    frame = cv2.resize(frame, self.inference_size, interpolation=cv2.INTER_AREA)
+                chunk.append(frame)
+                frame_idx += 1
+                if len(chunk) == self.chunk_frames:
+                    yield chunk
+                    chunk = [chunk[-1]]  # seam frame carried into the next chunk
+            if len(chunk) > 1 or frame_idx == self.start_frame + 1:
+                yield chunk
+        finally:
+            cap.release()
+
+
+class MockMaskPredictor:
+    """
+    CPU-only stand-in for the SAM video predictor API.
+
+    Emits the same centered ellipse as the FFmpeg mock mask generator, so
+    the streaming/chunked segmentation path can run without a GPU or SAM.
+    """
+
+    def init_state(self, video_path: str):
+        import cv2
+
+        frames = sorted(os.listdir(video_path))
+        h, w = cv2.imread(os.path.join(video_path, frames[0])).shape[:2]
+        return {"num_frames": len(frames), "size": (h, w), "prompted": False}
+
+    def add_new_points_or_box(self, inference_state, frame_idx, obj_id, box=None, **kwargs):
+        inference_state["prompted"] = True
+        return frame_idx, [obj_id], self._logits(inference_state)
+
+    def add_new_mask(self, inference_state, frame_idx, obj_id, mask):
+        inference_state["prompted"] = True
+        return frame_idx, [obj_id], self._logits(inference_state)
+
+    def propagate_in_video(self, inference_state):
+        for frame_idx in range(inference_state["num_frames"]):
+            yield frame_idx, [1], self._logits(inference_state)
+
+    def reset_state(self, inference_state):
+        inference_state["prompted"] = False
+
+    @staticmethod
+    def _logits(inference_state):
+        import numpy as np
+
+        h, w = inference_state["size"]
+        cx, cy, rx, ry = MOCK_ELLIPSE
+        ys, xs = np.mgrid[0:h, 0:w]
+        inside = ((xs - w * cx) / (w * rx)) ** 2 + ((ys - h * cy) / (h * ry)) ** 2 < 1
+        return np.where(inside, 10.0, -10.0).astype(np.float32)[None, None]
+
+
 class SpeakerSegmenter:
     """Isolate the main speaker from video background using SAM 2."""
 
@@ -33,6 +148,9 @@ class SpeakerSegmenter:
         sam2_config: str = "sam2_hiera_large",
         output_dir: Optional[str] = None,
         device: str = "auto",
+        chunk_seconds: float = 10.0,
+        inference_scale: float = 1.0,
+        mock_backend: str = "ffmpeg",
     ):
         """
         Args:
@@ -40,11 +158,20 @@ class SpeakerSegmenter:
             sam2_config: SAM 2 model config name.
             output_dir: Directory for output masks.
             device: "cuda", "cpu", or "auto" (detect GPU).
+            chunk_seconds: Length of each inference chunk; bounds frames held
+                in memory and on disk at any time.
+            inference_scale: Resolution factor for SAM inference (e.g. 0.5);
+                masks are upscaled back to source resolution.
+            mock_backend: Fallback without SAM: "ffmpeg" (ellipse via FFmpeg)
+                or "streaming" (MockMaskPredictor through the chunked path).
         """
         self.sam2_checkpoint = sam2_checkpoint
         self.sam2_config = sam2_config
         self.output_dir = output_dir or tempfile.mkdtemp(prefix="speaker_masks_")
         os.makedirs(self.output_dir, exist_ok=True)
+        self.chunk_seconds = chunk_seconds
+        self.inference_scale = inference_scale
+        self.mock_backend = mock_backend
 
         if device == "auto":
             self.device = self._detect_device()
@@ -167,6 +294,10 @@ class SpeakerSegmenter:
         """
         if not self._sam2_available:
             logger.warning("No SAM model available, generating mock mask")
+            if self.mock_backend == "streaming":
+                return self._segment_streaming(
+                    MockMaskPredictor(), video_path, bbox, start_time, end_time, label="mock",
+                )
             return self._generate_mock_mask(video_path, start_time, end_time)
 
         if self._sam_version == 3:
@@ -184,81 +315,17 @@ class SpeakerSegmenter:
         """Segment speaker using SAM 3 video predictor."""
         try:
             import torch
-            import numpy as np
-            import cv2
             from sam3.model_builder import build_sam3_video_predictor
 
             logger.info(f"Running SAM 3 segmentation on {self.device}")
 
             # Build SAM 3 video predictor (auto-downloads checkpoint from HuggingFace)
             predictor = build_sam3_video_predictor(device=self.device)
-
-            # Extract frames to temp directory (SAM 3 needs frame directory)
-            frames_dir = os.path.join(self.output_dir, "frames")
-            os.makedirs(frames_dir, exist_ok=True)
-
-            cap = cv2.VideoCapture(video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-            start_frame = int(start_time * fps)
-            end_frame = int(end_time * fps) if end_time else total_frames
-
-            # Extract frames as JPEG images
-            frame_idx = 0
-            frame_paths = []
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                if start_frame <= frame_idx <= end_frame:
-                    path = os.path.join(frames_dir, f"{frame_idx:06d}.jpg")
-                    cv2.imwrite(path, frame)
-                    frame_paths.append(path)
-                frame_idx += 1
-            cap.release()
-            logger.info(f"Extracted {len(frame_paths)} frames for SAM 3")
-
-            mask_output_path = os.path.join(
-                self.output_dir, f"mask_{uuid.uuid4().hex[:8]}.mp4"
+            return self._segment_streaming(
+                predictor, video_path, bbox, start_time, end_time,
+                batched_box=True, autocast_dtype=torch.bfloat16, label="SAM 3",
             )
 
-            with torch.inference_mode(), torch.autocast(self.device, dtype=torch.bfloat16):
-                # Initialize state from frame directory
-                state = predictor.init_state(video_path=frames_dir)
-
-                # Add bounding box prompt on first frame
-                x, y, bw, bh = bbox
-                box = np.array([[x, y, x + bw, y + bh]], dtype=np.float32)
-                _, obj_ids, mask_logits = predictor.add_new_points_or_box(
-                    inference_state=state,
-                    frame_idx=0,  # First extracted frame
-                    obj_id=1,
-                    box=box,
-                )
-
-                # Propagate through all frames and write mask video
-                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                out = cv2.VideoWriter(mask_output_path, fourcc, fps, (w, h), False)
-
-                for frame_idx, obj_ids, mask_logits in predictor.propagate_in_video(state):
-                    mask = (mask_logits[0] > 0.0).cpu().numpy().squeeze().astype(np.uint8) * 255
-                    if mask.shape != (h, w):
-                        mask = cv2.resize(mask, (w, h))
-                    out.write(mask)
-
-                out.release()
-                predictor.reset_state(state)
-
-            # Cleanup extracted frames
-            import shutil
-            shutil.rmtree(frames_dir, ignore_errors=True)
-
-            logger.info(f"SAM 3 mask saved: {mask_output_path}")
-            return mask_output_path
-
         except Exception as e:
             logger.error(f"SAM 3 segmentation failed: {e}", exc_info=True)
             return self._generate_mock_mask(video_path, start_time, end_time)
@@ -273,8 +340,6 @@ class SpeakerSegmenter:
         """Fallback: Segment speaker using SAM 2."""
         try:
             import torch
-            import numpy as np
-            import cv2
             from sam2.build_sam import build_sam2_video_predictor
 
             logger.info(f"Running SAM 2 segmentation on {self.device}")
@@ -284,52 +349,108 @@ class SpeakerSegmenter:
                 self.sam2_checkpoint,
                 device=self.device,
             )
-
-            cap = cv2.VideoCapture(video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-            start_frame = int(start_time * fps)
-            end_frame = int(end_time * fps) if end_time else total_frames
-            cap.release()
-
-            with torch.inference_mode(), torch.autocast(self.device, dtype=torch.float16):
-                state = predictor.init_state(video_path)
-
-                x, y, bw, bh = bbox
-                box = np.array([x, y, x + bw, y + bh], dtype=np.float32)
-                _, obj_ids, mask_logits = predictor.add_new_points_or_box(
-                    inference_state=state,
-                    frame_idx=start_frame,
-                    obj_id=1,
-                    box=box,
-                )
-
-                mask_output_path = os.path.join(
-                    self.output_dir, f"mask_{uuid.uuid4().hex[:8]}.mp4"
-                )
-                fourcc = cv2.VideoWriter_fourcc(*"mp4v")
-                out = cv2.VideoWriter(mask_output_path, fourcc, fps, (w, h), False)
-
-                for frame_idx, obj_ids, mask_logits in predictor.propagate_in_video(state):
-                    if frame_idx < start_frame or frame_idx > end_frame:
-                        continue
-                    mask = (mask_logits[0] > 0.0).cpu().numpy().squeeze().astype(np.uint8) * 255
-                    if mask.shape != (h, w):
-                        mask = cv2.resize(mask, (w, h))
-                    out.write(mask)
-
-                out.release()
-
-            logger.info(f"SAM 2 mask saved: {mask_output_path}")
-            return mask_output_path
+            return self._segment_streaming(
+                predictor, video_path, bbox, start_time, end_time,
+                batched_box=False, autocast_dtype=torch.float16, label="SAM 2",
+            )
 
         except Exception as e:
             logger.error(f"SAM 2 segmentation failed: {e}")
             return self._generate_mock_mask(video_path, start_time, end_time)
 
+    # ─── Streaming / Chunked Inference ────────────────────────────────────
+
+    def _segment_streaming(
+        self,
+        predictor: Any,
+        video_path: str,
+        bbox: Tuple[int, int, int, int],
+        start_time: float = 0.0,
+        end_time: Optional[float] = None,
+        batched_box: bool = False,
+        autocast_dtype: Any = None,
+        label: str = "SAM",
+    ) -> str:
+        """
+        Run a SAM-style video predictor over the video in time chunks.
+
+        Frames are decoded once and handed to the predictor one chunk at a
+        time (the predictors only accept a frame directory, so each chunk is
+        staged as JPEGs and removed before the next). The final mask of each
+        chunk re-prompts the next chunk on their shared seam frame, so the
+        object track carries across chunks. Inference may run at reduced
+        resolution; mask logits are upscaled before thresholding.
+        """
+        import cv2
+        import numpy as np
+
+        streamer = FrameStreamer(
+            video_path,
+            start_time=start_time,
+            end_time=end_time,
+            chunk_seconds=self.chunk_seconds,
+            scale=self.inference_scale,
+        )
+        w, h = streamer.width, streamer.height
+        x, y, bw, bh = (int(round(v * self.inference_scale)) for v in bbox)
+        box = np.array([x, y, x + bw, y + bh], dtype=np.float32)
+        if batched_box:
+            box = box[None]
+
+        mask_output_path = os.path.join(self.output_dir, f"mask_{uuid.uuid4().hex[:8]}.mp4")
+        chunk_dir = tempfile.mkdtemp(prefix="sam_chunk_", dir=self.output_dir)
+        out = cv2.VideoWriter(mask_output_path, cv2.VideoWriter_fourcc(*"mp4v"), streamer.fps, (w, h), False)
+
+        carry_mask = None
+        frames_written = 0
+        try:
+            with self._inference_context(autocast_dtype):
+                for chunk_idx, frames in enumerate(streamer.chunks()):
+                    for i, frame in enumerate(frames):
+                        cv2.imwrite(os.path.join(chunk_dir, f"{i:05d}.jpg"), frame)
+
+                    state = predictor.init_state(video_path=chunk_dir)
+                    if carry_mask is not None and carry_mask.any() and hasattr(predictor, "add_new_mask"):
+                        predictor.add_new_mask(
+                            inference_state=state, frame_idx=0, obj_id=1, mask=carry_mask,
+                        )
+                    else:
+                        predictor.add_new_points_or_box(
+                            inference_state=state, frame_idx=0, obj_id=1,
+                            box=_mask_box(carry_mask, batched_box) if carry_mask is not None and carry_mask.any() else box,
+                        )
+
+                    for frame_idx, _obj_ids, mask_logits in predictor.propagate_in_video(state):
+                        logits = _to_numpy(mask_logits[0]).squeeze().astype(np.float32)
+                        if frame_idx == len(frames) - 1:
+                            carry_mask = logits > 0.0
+                        # Seam frame was already written as the previous chunk's last frame
+                        if chunk_idx > 0 and frame_idx == 0:
+                            continue
+                        if logits.shape != (h, w):
+                            logits = cv2.resize(logits, (w, h), interpolation=cv2.INTER_LINEAR)
+                        out.write((logits > 0.0).astype(np.uint8) * 255)
+                        frames_written += 1
+
+                    predictor.reset_state(state)
+                    for name in os.listdir(chunk_dir):
+                        os.unlink(os.path.join(chunk_dir, name))
+        finally:
+            out.release()
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+        logger.info(f"{label} mask saved: {mask_output_path} ({frames_written} frames)")
+        return mask_output_path
+
+    def _inference_context(self, autocast_dtype: Any):
+        """torch inference_mode + autocast when running a real model."""
+        stack = contextlib.ExitStack()
+        if autocast_dtype is not None:
+            import torch
+            stack.enter_context(torch.inference_mode())
+            stack.enter_context(torch.autocast(self.device, dtype=autocast_dtype))
+        return stack
+
     def _generate_mock_mask(
         self,
         video_path: str,
@@ -352,7 +473,8 @@ class SpeakerSegmenter:
             *duration_args,
             "-vf", (
                 "format=gray,"
-                "geq=lum='if(lt(pow((X-W/2)/(W*0.2),2)+pow((Y-H*0.4)/(H*0.45),2),1),255,0)'"
+                "geq=lum='if(lt(pow((X-W*{0})/(W*{2}),2)+pow((Y-H*{1})/(H*{3}),2),1),255,0)'"
+                .format(*MOCK_ELLIPSE)
             ),
             "-an",
             mask_path,
@@ -470,18 +592,10 @@ class SpeakerSegmenter:
     @staticmethod
     def _get_center_bbox(video_path: str) -> Tuple[int, int, int, int]:
         """Get a center-crop bounding box from video dimensions."""
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-select_streams", "v:0",
-                "-show_entries", "stream=width,height",
-                "-of", "csv=p=0",
-                video_path,
-            ],
-            capture_output=True, text=True, timeout=10,
-        )
-        parts = result.stdout.strip().split(",")
-        w, h = int(parts[0]), int(parts[1])
+        info = get_probe_service().probe_sync(video_path)
+        if not info.width or not info.height:
+            raise ValueError(f"No video dimensions for {video_path}")
+        w, h = info.width, info.height
         # Center crop covering ~40% width, ~80% height
         bw, bh = int(w * 0.4), int(h * 0.8)
         x, y = (w - bw) // 2, int(h * 0.05)
@@ -489,16 +603,27 @@ class SpeakerSegmenter:
 
     @staticmethod
     def _get_duration(video_path: str) -> float:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "csv=p=0",
-                video_path,
-            ],
-            capture_output=True, text=True, timeout=10,
-        )
-        return float(result.stdout.strip())
+        duration = get_probe_service().probe_sync(video_path).duration
+        if duration is None:
+            raise ValueError(f"No duration reported for {video_path}")
+        return duration
+
+
+def _to_numpy(value: Any):
+    """Torch tensor or array-like → NumPy array."""
+    if hasattr(value, "detach"):
+        return value.detach().float().cpu().numpy()
+    import numpy as np
+    return np.asarray(value)
+
+
+def _mask_box(mask: Any, batched: bool):
+    """Bounding box [x0, y0, x1, y1] of a boolean mask, as a SAM box prompt."""
+    import numpy as np
+
+    ys, xs = np.nonzero(mask)
+    box = np.array([xs.min(), ys.min(), xs.max() + 1, ys.max() + 1], dtype=np.float32)
+    return box[None] if batched else box
 
 
 # ─── CLI Test ─────────────────────────────────────────────────────────────────
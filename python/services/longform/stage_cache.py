@@ -0,0 +1,201 @@
+"""
+Stage Cache — Content-addressed cache for longform pipeline stage outputs.
+
+Each stage output is stored under a key derived from:
+  - the source video's content hash
+  - the stage's own config
+  - the keys of the upstream stages it consumed
+
+so changing an input (or any upstream stage) yields a new key and the stale
+entry is simply never read again. Re-running with different compile
+options reuses transcription, scene detection, planning and B-roll.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+
+# Pipeline stages with cacheable outputs, in dependency order
+STAGES = ["enhance_audio", "transcribe", "detect_scenes", "plan_timeline", "source_broll"]
+
+# Stage → stages whose output it consumes
+STAGE_DEPENDENCIES: Dict[str, List[str]] = {
+    "enhance_audio": [],
+    "transcribe": [],
+    "detect_scenes": [],
+    "plan_timeline": ["transcribe", "detect_scenes"],
+    "source_broll": ["plan_timeline"],
+}
+
+
+def file_fingerprint(path: str, index_path: Optional[str] = None, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of a file's contents.
+
+    Hashing a multi-GB source is slow, so results are memoized in a small
+    JSON index keyed by (path, size, mtime) when index_path is given.
+    """
+    stat = os.stat(path)
+    stat_key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+    index: Dict[str, str] = {}
+    if index_path and os.path.exists(index_path):
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        if stat_key in index:
+            return index[stat_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    file_hash = digest.hexdigest()
+
+    if index_path:
+        index[stat_key] = file_hash
+        _atomic_write_json(index_path, index)
+    return file_hash
+
+
+def _atomic_write_json(path: str, data: Any) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class StageCache:
+    """On-disk stage output cache rooted at <output_dir>/cache/stages."""
+
+    def __init__(self, root_dir: str, enabled: bool = True):
+        self.root_dir = root_dir
+        self.enabled = enabled
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        stage: str,
+        source_hash: str,
+        config: Dict[str, Any],
+        upstream_keys: Optional[Dict[str, str]] = None,
+    ) -> str:
+        raw = json.dumps(
+            {
+                "stage": stage,
+                "source": source_hash,
+                "config": config,
+                "upstream": upstream_keys or {},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.root_dir, stage, f"{key}.json")
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        """Return the cached payload, or None on miss / disabled / stale artifact."""
+        if not self.enabled:
+            return None
+        path = self._path(stage, key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # File artifacts must still exist unchanged
+        for artifact in entry.get("artifacts", []):
+            try:
+                if os.path.getsize(artifact["path"]) != artifact["size"]:
+                    return None
+            except OSError:
+                return None
+
+        logger.info(f"Stage cache hit: {stage} ({key[:12]})")
+        return entry["payload"]
+
+    def put(
+        self,
+        stage: str,
+        key: str,
+        payload: Any,
+        config: Optional[Dict[str, Any]] = None,
+        artifacts: Optional[List[str]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        entry = {
+            "stage": stage,
+            "key": key,
+            "created_at": time.time(),
+            "config": config or {},
+            "artifacts": [
+                {"path": os.path.abspath(p), "size": os.path.getsize(p)}
+                for p in (artifacts or [])
+                if p and os.path.exists(p)
+            ],
+            "payload": payload,
+        }
+        _atomic_write_json(self._path(stage, key), entry)
+
+    def bust(self, stage: Optional[str] = None) -> int:
+        """Delete cached entries for a stage and its downstream stages (None = all)."""
+        stages = STAGES if stage is None else self.downstream(stage)
+        removed = 0
+        for name in stages:
+            stage_dir = os.path.join(self.root_dir, name)
+            if os.path.isdir(stage_dir):
+                removed += len([n for n in os.listdir(stage_dir) if n.endswith(".json")])
+                shutil.rmtree(stage_dir, ignore_errors=True)
+        logger.info(f"Busted {removed} cached entries for {', '.join(stages)}")
+        return removed
+
+    @staticmethod
+    def downstream(stage: str) -> List[str]:
+        """The stage itself plus every stage that (transitively) depends on it."""
+        if stage not in STAGE_DEPENDENCIES:
+            raise ValueError(f"Unknown stage: {stage}")
+        result = [stage]
+        for name in STAGES:
+            if name not in result and any(dep in result for dep in STAGE_DEPENDENCIES[name]):
+                result.append(name)
+        return result
+
+    def inspect(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Summaries of cached entries, grouped by stage."""
+        summary: Dict[str, List[Dict[str, Any]]] = {}
+        for stage in STAGES:
+            stage_dir = os.path.join(self.root_dir, stage)
+            entries = []
+            if os.path.isdir(stage_dir):
+                for name in sorted(os.listdir(stage_dir)):
+                    if not name.endswith(".json"):
+                        continue
+                    path = os.path.join(stage_dir, name)
+                    try:
+                        with open(path, "r") as f:
+                            entry = json.load(f)
+                    except (OSError, ValueError):
+                        continue
+                    entries.append({
+                        "key": entry.get("key", name[:-5]),
+                        "created_at": entry.get("created_at", 0.0),
+                        "size_bytes": os.path.getsize(path),
+                        "config": entry.get("config", {}),
+                    })
+            summary[stage] = entries
+        return summary
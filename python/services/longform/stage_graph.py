@@ -0,0 +1,217 @@
+"""
+Stage Graph — Dependency-driven executor for pipeline stages.
+
+Each stage declares the stages whose outputs it consumes. A stage is
+submitted to the executor as soon as all of its inputs have finished, so
+independent stages (e.g. audio enhancement vs. transcription) overlap
+instead of running in fixed phases.
+
+After a run, critical_path() reports which chain of stages gated total
+latency and how much slack every other stage had.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+@dataclass
+class StageNode:
+    """A stage: fn(*args, *[outputs of inputs]) run on the executor."""
+    name: str
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    inputs: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)  # ordering-only dependencies
+
+    @property
+    def dependencies(self) -> List[str]:
+        return self.inputs + [dep for dep in self.after if dep not in self.inputs]
+
+
+@dataclass
+class StageTiming:
+    name: str
+    ready: float        # seconds since run start when all inputs were done
+    start: float        # seconds since run start when submitted
+    end: float          # seconds since run start when finished
+    inputs: List[str] = field(default_factory=list)
+    slack: float = 0.0  # how much later it could have finished without delaying the run
+    critical: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "inputs": self.inputs,
+            "ready": round(self.ready, 3),
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "duration": round(self.duration, 3),
+            "slack": round(self.slack, 3),
+            "critical": self.critical,
+        }
+
+
+@dataclass
+class CriticalPathReport:
+    total_seconds: float
+    critical_path: List[str]
+    gating_stage: Optional[str]
+    stages: List[StageTiming]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": round(self.total_seconds, 3),
+            "critical_path": self.critical_path,
+            "gating_stage": self.gating_stage,
+            "stages": [s.to_dict() for s in self.stages],
+        }
+
+    def summary(self) -> str:
+        lines = [f"Total {self.total_seconds:.1f}s — gated by {self.gating_stage}"]
+        for s in self.stages:
+            marker = "*" if s.critical else " "
+            lines.append(
+                f" {marker} {s.name:<16} {s.start:7.1f}s → {s.end:7.1f}s "
+                f"({s.duration:6.1f}s, slack {s.slack:5.1f}s)"
+            )
+        return "\n".join(lines)
+
+
+class StageGraph:
+    """Runs a DAG of StageNodes on an executor, recording per-stage timings."""
+
+    def __init__(self, on_complete: Optional[Callable[[str, Any], Any]] = None):
+        """
+        Args:
+            on_complete: Called in the event loop thread with (stage, raw result);
+                         its return value becomes the stage output. Lets callers
+                         merge state returned from process-pool workers.
+        """
+        self.nodes: Dict[str, StageNode] = {}
+        self.on_complete = on_complete
+        self.timings: Dict[str, StageTiming] = {}
+        self._total = 0.0
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        inputs: Optional[List[str]] = None,
+        after: Optional[List[str]] = None,
+    ) -> StageNode:
+        """
+        Args:
+            inputs: Stages whose outputs are appended to fn's arguments
+            after: Stages that must finish first but whose outputs aren't passed
+        """
+        if name in self.nodes:
+            raise ValueError(f"Duplicate stage: {name}")
+        for dep in (inputs or []) + (after or []):
+            if dep not in self.nodes:
+                raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+        node = StageNode(
+            name=name, fn=fn, args=args,
+            inputs=list(inputs or []), after=list(after or []),
+        )
+        self.nodes[name] = node
+        return node
+
+    async def run(self, executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """Execute every stage once its inputs are ready; returns {stage: output}."""
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        results: Dict[str, Any] = {}
+        pending = dict(self.nodes)
+        running: Dict[asyncio.Future, str] = {}
+        ready_at: Dict[str, float] = {}
+        started_at: Dict[str, float] = {}
+        self.timings = {}
+
+        def submit_ready():
+            for name, node in list(pending.items()):
+                if all(dep in results for dep in node.dependencies):
+                    del pending[name]
+                    now = time.perf_counter() - t0
+                    ready_at[name] = now
+                    started_at[name] = now
+                    call_args = node.args + tuple(results[dep] for dep in node.inputs)
+                    future = loop.run_in_executor(executor, node.fn, *call_args)
+                    running[future] = name
+
+        submit_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    raw = future.result()
+                    results[name] = self.on_complete(name, raw) if self.on_complete else raw
+                    self.timings[name] = StageTiming(
+                        name=name,
+                        ready=ready_at[name],
+                        start=started_at[name],
+                        end=time.perf_counter() - t0,
+                        inputs=self.nodes[name].dependencies,
+                    )
+                    logger.debug(f"Stage {name} done in {self.timings[name].duration:.1f}s")
+                submit_ready()
+        except BaseException:
+            for future in running:
+                future.cancel()
+            raise
+
+        self._total = time.perf_counter() - t0
+        return results
+
+    def critical_path(self) -> CriticalPathReport:
+        """Latest-finish analysis over the recorded timings."""
+        order = [name for name in self.nodes if name in self.timings]
+        if not order:
+            return CriticalPathReport(0.0, [], None, [])
+
+        successors: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for dep in self.timings[name].inputs:
+                successors[dep].append(name)
+
+        # Latest finish each stage could have had without moving the run's end
+        latest_finish: Dict[str, float] = {}
+        for name in reversed(order):
+            succ = successors[name]
+            if succ:
+                latest_finish[name] = min(latest_finish[s] - self.timings[s].duration for s in succ)
+            else:
+                latest_finish[name] = self._total
+        for name in order:
+            timing = self.timings[name]
+            timing.slack = max(0.0, latest_finish[name] - timing.end)
+
+        # Walk back from the last stage to finish through its latest input
+        path = []
+        current: Optional[str] = max(order, key=lambda n: self.timings[n].end)
+        while current is not None:
+            path.append(current)
+            self.timings[current].critical = True
+            inputs = self.timings[current].inputs
+            current = max(inputs, key=lambda n: self.timings[n].end) if inputs else None
+        path.reverse()
+
+        gating = max(path, key=lambda n: self.timings[n].duration)
+        return CriticalPathReport(
+            total_seconds=self._total,
+            critical_path=path,
+            gating_stage=gating,
+            stages=[self.timings[name] for name in order],
+        )
@@ -8,11 +8,13 @@ assigned per speech window.
 
 from __future__ import annotations
 
+import bisect
 import os
 import json
 import re
 from typing import List, Optional
 
+import numpy as np
 from loguru import logger
 
 from .types import (
@@ -65,6 +67,10 @@ class TimelinePlanner:
         """
         Split transcript into 2.5-8 second speech windows aligned to
         sentence boundaries, clause boundaries, or natural pauses.
+
+        Cut-point scores are computed once for every word as NumPy arrays;
+        each window then only needs a bisect for its candidate range and an
+        argmax over that slice.
         """
         words = transcript.all_words
         if not words:
@@ -73,6 +79,15 @@ class TimelinePlanner:
         safe_cuts = set()
         if scene_boundaries:
             safe_cuts = set(scene_boundaries.safe_cut_points)
+        sorted_cuts = sorted(safe_cuts)
+        # min() over the set breaks distance ties by set iteration order
+        cut_rank = {c: rank for rank, c in enumerate(safe_cuts)}
+
+        starts = np.fromiter((w.start for w in words), dtype=np.float64, count=len(words))
+        ends = np.fromiter((w.end for w in words), dtype=np.float64, count=len(words))
+        scores = self._score_cut_points(words, starts, ends, sorted_cuts)
+        # Running max of word ends: searchsorted gives the first word ending past a time
+        ends_cummax = np.maximum.accumulate(ends)
 
         windows: List[TimelineWindow] = []
         window_start_idx = 0
@@ -84,25 +99,23 @@ class TimelinePlanner:
             target_end_time = window_start_time + self.max_window_sec
             min_end_time = window_start_time + self.min_window_sec
 
-            best_cut_idx = None
-            best_cut_score = -1
-
-            for i in range(window_start_idx + 1, len(words)):
-                word_end = words[i].end
-
-                # Don't exceed max window
-                if word_end > target_end_time:
-                    break
-
-                # Don't cut too early
-                if word_end < min_end_time:
-                    continue
+            # Candidates run from the next word up to (excluding) the first
+            # word that ends past the max window
+            lo = window_start_idx + 1
+            if ends_cummax[window_start_idx] > target_end_time:
+                # An earlier word already overran the target; scan directly
+                hi = lo
+                while hi < len(words) and not ends[hi] > target_end_time:
+                    hi += 1
+            else:
+                hi = int(np.searchsorted(ends_cummax, target_end_time, side="right"))
 
-                # Score this cut point
-                score = self._score_cut_point(words, i, safe_cuts)
-                if score > best_cut_score:
-                    best_cut_score = score
-                    best_cut_idx = i
+            best_cut_idx = None
+            if hi > lo:
+                candidate_scores = np.where(ends[lo:hi] < min_end_time, -1.0, scores[lo:hi])
+                best = int(np.argmax(candidate_scores))
+                if candidate_scores[best] > -1:
+                    best_cut_idx = lo + best
 
             # If no good cut found, take everything up to max or end
             if best_cut_idx is None:
@@ -126,8 +139,8 @@ class TimelinePlanner:
 
             # Find nearest safe cut point
             nearest_cut = 0.0
-            if safe_cuts:
-                nearest_cut = min(safe_cuts, key=lambda c: abs(c - window_words[0].start))
+            if sorted_cuts:
+                nearest_cut = self._nearest_cut(sorted_cuts, cut_rank, window_words[0].start)
 
             windows.append(TimelineWindow(
                 window_id=f"w_{window_id_counter:04d}",
@@ -144,40 +157,54 @@ class TimelinePlanner:
         logger.info(f"Created {len(windows)} speech windows from {len(words)} words")
         return windows
 
-    def _score_cut_point(
-        self,
+    @staticmethod
+    def _score_cut_points(
         words: List[TranscriptWord],
-        idx: int,
-        safe_cuts: set,
-    ) -> float:
-        """Score a potential cut point. Higher = better place to cut."""
-        word = words[idx]
-        text = word.word.strip()
-        score = 0.0
-
-        # Sentence ending (period, question mark, exclamation)
-        if text.endswith((".", "?", "!")):
-            score += 10.0
-
-        # Clause ending (comma, semicolon, colon, dash)
-        elif text.endswith((",", ";", ":", "—", "-")):
-            score += 5.0
+        starts: np.ndarray,
+        ends: np.ndarray,
+        sorted_cuts: List[float],
+    ) -> np.ndarray:
+        """Score every word as a potential cut point. Higher = better place to cut."""
+        scores = np.zeros(len(words), dtype=np.float64)
+
+        # Sentence ending (period, question mark, exclamation), else
+        # clause ending (comma, semicolon, colon, dash)
+        for i, w in enumerate(words):
+            text = w.word.strip()
+            if text.endswith((".", "?", "!")):
+                scores[i] += 10.0
+            elif text.endswith((",", ";", ":", "—", "-")):
+                scores[i] += 5.0
 
         # Natural pause (gap to next word > 0.3s)
-        if idx + 1 < len(words):
-            gap = words[idx + 1].start - word.end
-            if gap > 0.3:
-                score += 7.0
-            elif gap > 0.15:
-                score += 3.0
-
-        # Near a scene boundary (within 0.5s)
-        for cut in safe_cuts:
-            if abs(cut - word.end) < 0.5:
-                score += 4.0
-                break
+        if len(words) > 1:
+            gaps = starts[1:] - ends[:-1]
+            scores[:-1] += np.where(gaps > 0.3, 7.0, np.where(gaps > 0.15, 3.0, 0.0))
 
-        return score
+        # Near a scene boundary (within 0.5s) — only the neighbouring cuts can qualify
+        if sorted_cuts:
+            cuts = np.asarray(sorted_cuts, dtype=np.float64)
+            right = np.searchsorted(cuts, ends)
+            left = np.clip(right - 1, 0, len(cuts) - 1)
+            right = np.clip(right, 0, len(cuts) - 1)
+            near = (np.abs(cuts[left] - ends) < 0.5) | (np.abs(cuts[right] - ends) < 0.5)
+            scores += np.where(near, 4.0, 0.0)
+
+        return scores
+
+    @staticmethod
+    def _nearest_cut(sorted_cuts: List[float], cut_rank: dict, t: float) -> float:
+        """Closest safe cut to t via bisect (ties resolved as min() over the cut set)."""
+        idx = bisect.bisect_left(sorted_cuts, t)
+        best = None
+        for c in sorted_cuts[max(0, idx - 1):idx + 1]:
+            if (
+                best is None
+                or abs(c - t) < abs(best - t)
+                or (abs(c - t) == abs(best - t) and cut_rank[c] < cut_rank[best])
+            ):
+                best = c
+        return best
 
     @staticmethod
     def _words_for_duration(
@@ -8,16 +8,28 @@ via pyannote.audio.
 
 from __future__ import annotations
 
+import difflib
+import heapq
 import os
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from services.ffprobe_service import get_probe_service
+
 from .types import TranscriptWord, TranscriptSegment, TranscriptionResult
 
+# A seam is spliced on a textual match only if it is at least this many words
+# long and both chunks place every matched word at the same time (±tolerance);
+# otherwise a lone stop-word ("the", "and") could splice at the wrong instance
+SEAM_MIN_MATCH_WORDS = 2
+SEAM_MATCH_TOLERANCE_SEC = 0.3
+
 
 class LongformTranscriber:
     """Transcribe long-form video with word-level timestamps and speaker diarization."""
@@ -27,31 +39,53 @@ class LongformTranscriber:
         openai_api_key: Optional[str] = None,
         diarization_enabled: bool = True,
         hf_token: Optional[str] = None,
+        speaker_assignment: str = "midpoint",
+        client: Optional[Any] = None,
+        max_workers: int = 4,
+        chunk_overlap_sec: float = 3.0,
+        max_retries: int = 3,
+        retry_backoff_sec: float = 2.0,
     ):
+        """
+        Args:
+            openai_api_key: OpenAI key (defaults to OPENAI_API_KEY)
+            diarization_enabled: Run pyannote speaker diarization
+            hf_token: HuggingFace token for pyannote
+            speaker_assignment: Word→speaker rule, "midpoint" or "overlap"
+            client: OpenAI-compatible client (anything exposing
+                audio.transcriptions.create); built from the API key if omitted
+            max_workers: Concurrent Whisper requests for chunked transcription
+            chunk_overlap_sec: Audio shared by neighbouring chunks, stitched at word level
+            max_retries: Attempts per chunk before the transcription fails
+            retry_backoff_sec: Base delay for exponential retry backoff
+        """
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY", "")
         self.diarization_enabled = diarization_enabled
         self.hf_token = hf_token or os.environ.get("HF_TOKEN", "")
-
-        if not self.openai_api_key:
+        self.speaker_assignment = speaker_assignment
+        self.max_workers = max(1, max_workers)
+        self.chunk_overlap_sec = max(0.0, chunk_overlap_sec)
+        self.max_retries = max(1, max_retries)
+        self.retry_backoff_sec = retry_backoff_sec
+        self._client = client
+
+        if not self.openai_api_key and client is None:
             raise ValueError("OPENAI_API_KEY is required for transcription")
 
+    def _get_client(self):
+        """Return the injected client or lazily build an OpenAI client."""
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.openai_api_key)
+        return self._client
+
     # ─── Audio Extraction ─────────────────────────────────────────────────
 
     @staticmethod
     def has_audio_stream(file_path: str) -> bool:
         """Check if a file has an audio stream using FFprobe."""
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe", "-v", "error",
-                    "-select_streams", "a",
-                    "-show_entries", "stream=codec_type",
-                    "-of", "csv=p=0",
-                    file_path,
-                ],
-                capture_output=True, text=True, timeout=30,
-            )
-            return "audio" in result.stdout
+            return get_probe_service().probe_sync(file_path).has_audio
         except Exception as e:
             logger.warning(f"FFprobe check failed: {e}")
             return False
@@ -78,24 +112,15 @@ class LongformTranscriber:
     @staticmethod
     def get_duration(file_path: str) -> float:
         """Get media duration in seconds via FFprobe."""
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "csv=p=0",
-                file_path,
-            ],
-            capture_output=True, text=True, timeout=30,
-        )
-        return float(result.stdout.strip())
+        duration = get_probe_service().probe_sync(file_path).duration
+        if duration is None:
+            raise ValueError(f"No duration reported for {file_path}")
+        return duration
 
     # ─── Whisper Transcription ────────────────────────────────────────────
 
     def transcribe_audio(self, audio_path: str) -> dict:
         """Call OpenAI Whisper API with word-level timestamps."""
-        import openai
-
-        client = openai.OpenAI(api_key=self.openai_api_key)
         logger.info(f"Transcribing with Whisper (word timestamps): {audio_path}")
 
         # Whisper API has a 25MB file size limit; chunk if needed
@@ -104,6 +129,11 @@ class LongformTranscriber:
             logger.info(f"File is {file_size_mb:.1f}MB, chunking for Whisper limit")
             return self._transcribe_chunked(audio_path)
 
+        return self._whisper_request(audio_path)
+
+    def _whisper_request(self, audio_path: str) -> dict:
+        """Single verbose_json Whisper request for one audio file."""
+        client = self._get_client()
         with open(audio_path, "rb") as f:
             response = client.audio.transcriptions.create(
                 model="whisper-1",
@@ -114,72 +144,246 @@ class LongformTranscriber:
 
         return response.model_dump() if hasattr(response, "model_dump") else dict(response)
 
-    def _transcribe_chunked(self, audio_path: str, chunk_minutes: int = 10) -> dict:
-        """Split long audio into chunks and transcribe each, then merge."""
-        import openai
+    # ─── Chunked Transcription ────────────────────────────────────────────
 
+    def _transcribe_chunked(self, audio_path: str, chunk_minutes: int = 10) -> dict:
+        """
+        Split long audio into overlapping chunks, transcribe them concurrently,
+        then stitch the chunk transcripts back together at word level.
+        """
         duration = self.get_duration(audio_path)
-        chunk_seconds = chunk_minutes * 60
-        chunks = []
-        offset = 0.0
+        spans = self.plan_chunks(duration, chunk_minutes * 60, self.chunk_overlap_sec)
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            # Split audio into chunks
-            chunk_idx = 0
-            while offset < duration:
-                chunk_path = os.path.join(tmpdir, f"chunk_{chunk_idx}.mp3")
-                end = min(offset + chunk_seconds, duration)
-                subprocess.run(
-                    [
-                        "ffmpeg", "-y", "-i", audio_path,
-                        "-ss", str(offset), "-to", str(end),
-                        "-acodec", "libmp3lame", "-ar", "16000", "-ac", "1",
-                        chunk_path,
-                    ],
-                    capture_output=True, check=True, timeout=120,
+            chunk_paths = self._extract_chunks(audio_path, spans, tmpdir)
+            chunks = [
+                (path, start, end) for path, (start, end) in zip(chunk_paths, spans)
+            ]
+            results = self._transcribe_chunks(chunks)
+
+        merged = self.stitch_chunks(results)
+        merged["duration"] = duration
+        return merged
+
+    @staticmethod
+    def plan_chunks(
+        duration: float,
+        chunk_seconds: float,
+        overlap_seconds: float = 0.0,
+    ) -> List[Tuple[float, float]]:
+        """
+        Plan (start, end) chunk spans covering [0, duration].
+
+        Consecutive chunks share `overlap_seconds` of audio so words cut at a
+        chunk edge are heard whole by the neighbouring chunk.
+        """
+        if duration <= 0:
+            return []
+        overlap = min(overlap_seconds, chunk_seconds / 2)
+        step = chunk_seconds - overlap
+
+        spans = []
+        start = 0.0
+        while True:
+            end = min(start + chunk_seconds, duration)
+            spans.append((round(start, 3), round(end, 3)))
+            if end >= duration:
+                break
+            start += step
+        return spans
+
+    @staticmethod
+    def _extract_chunks(
+        audio_path: str,
+        spans: List[Tuple[float, float]],
+        output_dir: str,
+    ) -> List[str]:
+        """
+        Extract every chunk in a single FFmpeg process.
+
+        The input is decoded once and fanned out to one output per chunk with
+        output-side seeking; the segment muxer cannot emit overlapping segments.
+        """
+        cmd = ["ffmpeg", "-y", "-i", audio_path]
+        chunk_paths = []
+        for idx, (start, end) in enumerate(spans):
+            chunk_path = os.path.join(output_dir, f"chunk_{idx:04d}.mp3")
+            cmd += [
+                "-map", "0:a",
+                "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}",
+                "-acodec", "libmp3lame", "-ar", "16000", "-ac", "1",
+                chunk_path,
+            ]
+            chunk_paths.append(chunk_path)
+
+        logger.info(f"Extracting {len(spans)} chunks from {audio_path} in one FFmpeg pass")
+        subprocess.run(cmd, capture_output=True, check=True, timeout=max(300, 30 * len(spans)))
+        return chunk_paths
+
+    def _transcribe_chunks(
+        self,
+        chunks: List[Tuple[str, float, float]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcribe (path, start, end) chunks through a bounded worker pool.
+
+        Returns one result per chunk, in chunk order, with timestamps shifted
+        to absolute source time and the chunk span attached.
+        """
+        logger.info(
+            f"Transcribing {len(chunks)} chunks with {min(self.max_workers, len(chunks) or 1)} workers"
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda c: self._transcribe_chunk(*c), chunks))
+
+    def _transcribe_chunk(self, chunk_path: str, start: float, end: float) -> Dict[str, Any]:
+        """Transcribe one chunk with retry, offsetting timestamps by the chunk start."""
+        for attempt in range(self.max_retries):
+            try:
+                data = self._whisper_request(chunk_path)
+                break
+            except Exception as e:
+                if attempt + 1 >= self.max_retries:
+                    raise
+                delay = self.retry_backoff_sec * (2 ** attempt)
+                logger.warning(
+                    f"Chunk at {start:.1f}s failed (attempt {attempt + 1}/{self.max_retries}): "
+                    f"{e}; retrying in {delay:.1f}s"
                 )
-                chunks.append((chunk_path, offset))
-                offset = end
-                chunk_idx += 1
-
-            # Transcribe each chunk
-            client = openai.OpenAI(api_key=self.openai_api_key)
-            all_words = []
-            all_segments = []
-            full_text_parts = []
-
-            for chunk_path, time_offset in chunks:
-                logger.info(f"Transcribing chunk at offset {time_offset:.1f}s")
-                with open(chunk_path, "rb") as f:
-                    resp = client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=f,
-                        response_format="verbose_json",
-                        timestamp_granularities=["word", "segment"],
-                    )
-                data = resp.model_dump() if hasattr(resp, "model_dump") else dict(resp)
-
-                # Offset timestamps
-                for word in data.get("words", []):
-                    word["start"] = word.get("start", 0) + time_offset
-                    word["end"] = word.get("end", 0) + time_offset
-                    all_words.append(word)
-
-                for seg in data.get("segments", []):
-                    seg["start"] = seg.get("start", 0) + time_offset
-                    seg["end"] = seg.get("end", 0) + time_offset
-                    all_segments.append(seg)
-
-                full_text_parts.append(data.get("text", ""))
+                time.sleep(delay)
+
+        for word in data.get("words", []) or []:
+            word["start"] = word.get("start", 0) + start
+            word["end"] = word.get("end", 0) + start
+        for seg in data.get("segments", []) or []:
+            seg["start"] = seg.get("start", 0) + start
+            seg["end"] = seg.get("end", 0) + start
+
+        data["chunk_start"] = start
+        data["chunk_end"] = end
+        return data
+
+    @staticmethod
+    def _normalize_token(word: str) -> str:
+        return "".join(ch for ch in word.lower() if ch.isalnum())
+
+    @classmethod
+    def stitch_chunks(cls, results: List[Dict[str, Any]]) -> dict:
+        """
+        Merge per-chunk Whisper results (absolute timestamps, chunk order).
+
+        At each seam the overlapping words of both chunks are aligned by
+        normalized text; the splice happens in the middle of the longest
+        matching run so a word is kept exactly once. Without a reliable
+        textual match (see SEAM_MIN_MATCH_WORDS) the seam falls back to the
+        midpoint of the overlap window.
+        """
+        words: List[dict] = []
+        segments: List[dict] = []
+        language = results[0].get("language", "en") if results else "en"
+
+        for idx, data in enumerate(results):
+            chunk_words = list(data.get("words", []) or [])
+            chunk_segments = list(data.get("segments", []) or [])
+
+            if idx == 0 or not words:
+                words.extend(chunk_words)
+                segments.extend(chunk_segments)
+                continue
+
+            prev = results[idx - 1]
+            seam_start = data.get("chunk_start", 0.0)
+            seam_end = prev.get("chunk_end", seam_start)
+            cut_time = (seam_start + seam_end) / 2
+
+            # Words from each side that fall inside the shared window
+            tail_from = len(words)
+            while tail_from > 0 and words[tail_from - 1].get("end", 0) > seam_start:
+                tail_from -= 1
+            head_to = 0
+            while head_to < len(chunk_words) and chunk_words[head_to].get("start", 0) < seam_end:
+                head_to += 1
+
+            tail_tokens = [cls._normalize_token(w.get("word", "")) for w in words[tail_from:]]
+            head_tokens = [cls._normalize_token(w.get("word", "")) for w in chunk_words[:head_to]]
+            match = difflib.SequenceMatcher(None, tail_tokens, head_tokens, autojunk=False) \
+                .find_longest_match(0, len(tail_tokens), 0, len(head_tokens))
+
+            matched_in_sync = match.size >= SEAM_MIN_MATCH_WORDS and all(
+                abs(words[tail_from + match.a + i].get("start", 0) - chunk_words[match.b + i].get("start", 0))
+                <= SEAM_MATCH_TOLERANCE_SEC
+                for i in range(match.size)
+            )
+            if matched_in_sync:
+                pivot = match.size // 2
+                keep_prev = tail_from + match.a + pivot
+                take_from = match.b + pivot
+                if keep_prev < len(words):
+                    cut_time = words[keep_prev].get("start", cut_time)
+            else:
+                keep_prev = len(words)
+                while keep_prev > 0 and _midpoint(words[keep_prev - 1]) >= cut_time:
+                    keep_prev -= 1
+                take_from = 0
+                while take_from < len(chunk_words) and _midpoint(chunk_words[take_from]) < cut_time:
+                    take_from += 1
+
+            del words[keep_prev:]
+            taken = chunk_words[take_from:]
+
+            # Segments are cut where the words were spliced: the previous
+            # side ends with its last kept word, the next side starts with
+            # its first taken word
+            prev_limit = words[-1].get("end", cut_time) if words else cut_time
+            next_start = taken[0].get("start", cut_time) if taken else cut_time
+            segments = cls._clip_segments(segments, words, float("-inf"), prev_limit)
+            segments.extend(cls._clip_segments(chunk_segments, taken, next_start, float("inf")))
+            words.extend(taken)
+
+        if words:
+            text = " ".join(w.get("word", "").strip() for w in words).strip()
+        else:
+            text = " ".join(s.get("text", "").strip() for s in segments).strip()
 
         return {
-            "text": " ".join(full_text_parts),
-            "words": all_words,
-            "segments": all_segments,
-            "language": data.get("language", "en"),
-            "duration": duration,
+            "text": text,
+            "words": words,
+            "segments": segments,
+            "language": language,
         }
 
+    @staticmethod
+    def _clip_segments(
+        segments: List[dict], seg_words: List[dict], lo: float, hi: float
+    ) -> List[dict]:
+        """
+        Clip segments to [lo, hi]. A clipped segment's text is rebuilt from
+        the words of `seg_words` inside it; without word timings, a clipped
+        segment is kept whole on the side holding its midpoint.
+        """
+        clipped: List[dict] = []
+        for seg in segments:
+            start = seg.get("start", 0)
+            end = seg.get("end", start)
+            if lo <= start and end <= hi:
+                clipped.append(seg)
+                continue
+            if end <= lo or start >= hi:
+                continue
+
+            if seg_words:
+                inside = [w for w in seg_words if start <= _midpoint(w) <= end and lo <= _midpoint(w) <= hi]
+                if not inside:
+                    continue
+                text = " ".join(w.get("word", "").strip() for w in inside)
+            elif lo <= (start + end) / 2 < hi:
+                text = seg.get("text", "")
+            else:
+                continue
+
+            clipped.append({**seg, "start": max(start, lo), "end": min(end, hi), "text": text})
+        return clipped
+
     # ─── Speaker Diarization ──────────────────────────────────────────────
 
     def diarize(self, audio_path: str) -> List[Tuple[float, float, str]]:
@@ -223,16 +427,29 @@ class LongformTranscriber:
     def assign_speakers(
         words: List[dict],
         diarization: List[Tuple[float, float, str]],
+        strategy: str = "midpoint",
     ) -> List[TranscriptWord]:
-        """Assign speaker labels to words based on time overlap with diarization segments."""
+        """
+        Assign speaker labels to words based on time overlap with diarization segments.
+
+        Strategies:
+            midpoint: first diarization turn (in list order) containing the word's midpoint
+            overlap: speaker with the most total overlap with the word's span,
+                falling back to the midpoint rule for zero-length or uncovered words
+
+        Both run as a single sweep over time-sorted words and turns
+        (O((words + turns) log turns)) instead of scanning every turn per word.
+        """
+        if strategy not in ("midpoint", "overlap"):
+            raise ValueError(f"Unknown speaker assignment strategy: {strategy}")
+
+        speakers = _assign_by_midpoint(words, diarization)
+        if strategy == "overlap":
+            for idx, speaker in _assign_by_overlap(words, diarization):
+                speakers[idx] = speaker
+
         result = []
-        for w in words:
-            word_mid = (w.get("start", 0) + w.get("end", 0)) / 2
-            speaker = "speaker_0"
-            for seg_start, seg_end, seg_speaker in diarization:
-                if seg_start <= word_mid <= seg_end:
-                    speaker = seg_speaker
-                    break
+        for w, speaker in zip(words, speakers):
             result.append(TranscriptWord(
                 word=w.get("word", ""),
                 start=w.get("start", 0),
@@ -282,21 +499,31 @@ class LongformTranscriber:
 
     # ─── Main Entry Point ─────────────────────────────────────────────────
 
-    def transcribe_video(self, video_path: str, cleanup: bool = True) -> TranscriptionResult:
+    def transcribe_video(
+        self,
+        video_path: str,
+        cleanup: bool = True,
+        audio_path: Optional[str] = None,
+    ) -> TranscriptionResult:
         """
         Full pipeline: extract audio → transcribe with word timestamps → diarize → merge.
 
         Args:
             video_path: Path to the source video file
             cleanup: Whether to delete temporary audio files
+            audio_path: Already-extracted 16 kHz mono audio (e.g. from
+                        AudioEnhancer.enhance_single_pass); skips extraction
+                        and is never deleted
 
         Returns:
             TranscriptionResult with word-level timestamps and speaker labels
         """
-        if not self.has_audio_stream(video_path):
-            raise ValueError(f"No audio stream found in {video_path}")
-
-        audio_path = self.extract_audio(video_path)
+        if audio_path is not None:
+            cleanup = False
+        else:
+            if not self.has_audio_stream(video_path):
+                raise ValueError(f"No audio stream found in {video_path}")
+            audio_path = self.extract_audio(video_path)
 
         try:
             # Step 1: Transcribe with word timestamps
@@ -318,7 +545,7 @@ class LongformTranscriber:
             diarization = self.diarize(audio_path)
 
             # Step 3: Merge — assign speaker to each word
-            words = self.assign_speakers(raw_words, diarization)
+            words = self.assign_speakers(raw_words, diarization, strategy=self.speaker_assignment)
 
             # Step 4: Group into segments
             segments = self.group_into_segments(words)
@@ -349,6 +576,72 @@ class LongformTranscriber:
                 os.unlink(audio_path)
 
 
+def _midpoint(word: dict) -> float:
+    return (word.get("start", 0) + word.get("end", 0)) / 2
+
+
+def _assign_by_midpoint(
+    words: List[dict],
+    diarization: List[Tuple[float, float, str]],
+) -> List[str]:
+    """
+    Speaker per word: the earliest-listed turn whose [start, end] contains the
+    word midpoint, or "speaker_0".
+
+    Words are visited in midpoint order while turns are admitted in start
+    order into a heap keyed by their list position; turns that ended before
+    the current midpoint can never match again and are dropped lazily.
+    """
+    speakers = ["speaker_0"] * len(words)
+    turn_order = sorted(range(len(diarization)), key=lambda i: diarization[i][0])
+    word_order = sorted(range(len(words)), key=lambda i: _midpoint(words[i]))
+
+    active: List[int] = []  # heap of turn list positions
+    next_turn = 0
+    for word_idx in word_order:
+        mid = _midpoint(words[word_idx])
+        while next_turn < len(turn_order) and diarization[turn_order[next_turn]][0] <= mid:
+            heapq.heappush(active, turn_order[next_turn])
+            next_turn += 1
+        while active and diarization[active[0]][1] < mid:
+            heapq.heappop(active)
+        if active:
+            speakers[word_idx] = diarization[active[0]][2]
+    return speakers
+
+
+def _assign_by_overlap(
+    words: List[dict],
+    diarization: List[Tuple[float, float, str]],
+) -> List[Tuple[int, str]]:
+    """
+    (word index, speaker) for every word that overlaps at least one turn,
+    choosing the speaker with the largest summed overlap (ties → first seen).
+    """
+    turns = sorted(diarization, key=lambda t: t[0])
+    word_order = sorted(range(len(words)), key=lambda i: words[i].get("start", 0))
+
+    assigned: List[Tuple[int, str]] = []
+    active: List[Tuple[float, float, str]] = []
+    next_turn = 0
+    for word_idx in word_order:
+        w_start = words[word_idx].get("start", 0)
+        w_end = words[word_idx].get("end", 0)
+        while next_turn < len(turns) and turns[next_turn][0] < w_end:
+            active.append(turns[next_turn])
+            next_turn += 1
+        active = [t for t in active if t[1] > w_start]
+
+        totals: Dict[str, float] = {}
+        for t_start, t_end, t_speaker in active:
+            overlap = min(w_end, t_end) - max(w_start, t_start)
+            if overlap > 0:
+                totals[t_speaker] = totals.get(t_speaker, 0.0) + overlap
+        if totals:
+            assigned.append((word_idx, max(totals, key=totals.get)))
+    return assigned
+
+
 # ─── CLI Test ─────────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
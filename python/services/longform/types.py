@@ -71,6 +71,10 @@ class TranscriptWord:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TranscriptWord":
+        return cls(**d)
+
 
 @dataclass
 class TranscriptSegment:
@@ -89,6 +93,16 @@ class TranscriptSegment:
             "words": [w.to_dict() for w in self.words],
         }
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TranscriptSegment":
+        return cls(
+            speaker=d["speaker"],
+            start=d["start"],
+            end=d["end"],
+            text=d["text"],
+            words=[TranscriptWord.from_dict(w) for w in d.get("words", [])],
+        )
+
 
 @dataclass
 class TranscriptionResult:
@@ -115,6 +129,16 @@ class TranscriptionResult:
             "duration_seconds": self.duration_seconds,
         }
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TranscriptionResult":
+        return cls(
+            segments=[TranscriptSegment.from_dict(s) for s in d.get("segments", [])],
+            speakers=list(d.get("speakers", [])),
+            language=d.get("language", "en"),
+            confidence=d.get("confidence", 0.0),
+            duration_seconds=d.get("duration_seconds", 0.0),
+        )
+
 
 # ─── Scene Detection Types ───────────────────────────────────────────────────
 
@@ -129,6 +153,10 @@ class SceneBoundary:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SceneBoundary":
+        return cls(**d)
+
 
 @dataclass
 class SceneDetectionResult:
@@ -141,6 +169,13 @@ class SceneDetectionResult:
             "safe_cut_points": self.safe_cut_points,
         }
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SceneDetectionResult":
+        return cls(
+            scenes=[SceneBoundary.from_dict(s) for s in d.get("scenes", [])],
+            safe_cut_points=list(d.get("safe_cut_points", [])),
+        )
+
 
 # ─── B-Roll Types ────────────────────────────────────────────────────────────
 
@@ -153,6 +188,10 @@ class BrollSearchIntent:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "BrollSearchIntent":
+        return cls(**d)
+
     def queries(self) -> List[str]:
         return [self.literal, self.metaphor, self.contextual]
 
@@ -184,6 +223,10 @@ class BrollCandidate:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "BrollCandidate":
+        return cls(**d)
+
 
 # ─── Speaker Segmentation Types ──────────────────────────────────────────────
 
@@ -230,6 +273,26 @@ class TimelineWindow:
         d["energy_level"] = self.energy_level.value
         return d
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TimelineWindow":
+        intent = d.get("broll_search_intent")
+        return cls(
+            window_id=d["window_id"],
+            start=d["start"],
+            end=d["end"],
+            transcript_text=d["transcript_text"],
+            speaker=d["speaker"],
+            words=[TranscriptWord.from_dict(w) for w in d.get("words", [])],
+            retention_role=RetentionRole(d.get("retention_role", RetentionRole.EXPLANATION.value)),
+            edit_mode=EditMode(d.get("edit_mode", EditMode.SPEAKER_ONLY.value)),
+            broll_needed=d.get("broll_needed", False),
+            broll_search_intent=BrollSearchIntent.from_dict(intent) if intent else None,
+            caption_style=CaptionStyle(d.get("caption_style", CaptionStyle.HIGHLIGHT_KEY_WORDS.value)),
+            zoom_instruction=ZoomType(d.get("zoom_instruction", ZoomType.NONE.value)),
+            energy_level=EnergyLevel(d.get("energy_level", EnergyLevel.MEDIUM.value)),
+            nearest_safe_cut=d.get("nearest_safe_cut", 0.0),
+        )
+
 
 @dataclass
 class TimelinePlan:
@@ -245,6 +308,13 @@ class TimelinePlan:
             "total_duration": self.total_duration,
         }
 
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TimelinePlan":
+        return cls(
+            windows=[TimelineWindow.from_dict(w) for w in d.get("windows", [])],
+            total_duration=d.get("total_duration", 0.0),
+        )
+
 
 # ─── EDL / Edit Plan (Remotion Input) ────────────────────────────────────────
 
@@ -2,8 +2,12 @@
 Suno Adapter
 ============
 Adapter for local Suno downloaded files.
+
+Searches are served from an on-disk MusicCatalog (data/suno/.music_catalog.db)
+that is refreshed incrementally from file mtimes/sizes.
 """
 
+import asyncio
 import logging
 import os
 import shutil
@@ -11,6 +15,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from .base import MusicAdapter
+from services.audio.music_catalog import AUDIO_EXTENSIONS, MusicCatalog
 from services.music.models import MusicSearchCriteria, MusicResponse
 
 logger = logging.getLogger(__name__)
@@ -23,17 +28,28 @@ class SunoAdapter(MusicAdapter):
     Assumes Suno files are stored in a local directory.
     """
     
-    def __init__(self, suno_dir: Optional[str] = None):
+    CATALOG_FILENAME = ".music_catalog.db"
+    
+    def __init__(self, suno_dir: Optional[str] = None, catalog: Optional[MusicCatalog] = None):
         """
         Initialize Suno adapter.
         
         Args:
             suno_dir: Directory containing Suno downloads (default: data/suno)
+            catalog: Metadata index (default: .music_catalog.db inside suno_dir)
         """
         if suno_dir is None:
             suno_dir = "data/suno"
         self.suno_dir = Path(suno_dir)
         self.suno_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = catalog or MusicCatalog(self.suno_dir / self.CATALOG_FILENAME)
+        self._catalog_source = MusicCatalog.dir_source(self.suno_dir)
+    
+    def refresh_catalog(self, force: bool = False) -> Dict[str, int]:
+        """Re-index new/changed/removed files (throttled unless force)."""
+        return self.catalog.refresh_directory(
+            self.suno_dir, self._extract_metadata, AUDIO_EXTENSIONS, force=force
+        )
     
     def get_source_name(self) -> str:
         return "suno"
@@ -49,37 +65,37 @@ class SunoAdapter(MusicAdapter):
         """
         Search local Suno files by metadata.
         
-        For now, returns all files. In production, would parse metadata files.
+        Metadata comes from sidecar .json files and filename hints, indexed
+        in the catalog; only files changed since the last refresh are re-read.
         """
-        results = []
+        # Directory walk + SQLite writes; keep them off the event loop
+        await asyncio.to_thread(self.refresh_catalog)
         
-        # Scan Suno directory for audio files
-        audio_extensions = [".mp3", ".wav", ".m4a", ".flac"]
-        for ext in audio_extensions:
-            for file_path in self.suno_dir.rglob(f"*{ext}"):
-                # Get file metadata
-                file_size = file_path.stat().st_size
-                
-                # Try to extract metadata from filename or metadata file
-                metadata = self._extract_metadata(file_path)
-                
-                # Check if matches criteria
-                if self._matches_criteria(metadata, criteria):
-                    results.append({
-                        "track_id": str(file_path.relative_to(self.suno_dir)),
-                        "title": metadata.get("title", file_path.stem),
-                        "path": str(file_path),
-                        "duration": metadata.get("duration"),
-                        "bpm": metadata.get("bpm"),
-                        "genre": metadata.get("genre"),
-                        "mood": metadata.get("mood"),
-                        "source": "suno"
-                    })
-                    
-                    if len(results) >= limit:
-                        break
+        rows = self.catalog.search(
+            source=self._catalog_source,
+            genre=criteria.genre,
+            mood=criteria.mood,
+            bpm_min=criteria.bpm_min,
+            bpm_max=criteria.bpm_max,
+            duration_min=criteria.duration_min,
+            duration_max=criteria.duration_max,
+            text=criteria.tags,
+            limit=limit
+        )
         
-        return results
+        return [
+            {
+                "track_id": row["key"],
+                "title": row["metadata"].get("title", Path(row["path"]).stem),
+                "path": row["path"],
+                "duration": row["metadata"].get("duration"),
+                "bpm": row["metadata"].get("bpm"),
+                "genre": row["metadata"].get("genre"),
+                "mood": row["metadata"].get("mood"),
+                "source": "suno"
+            }
+            for row in rows
+        ]
     
     async def get_music(
         self,
@@ -110,8 +126,8 @@ class SunoAdapter(MusicAdapter):
         else:
             music_path = str(source_path)
         
-        # Extract metadata
-        metadata = self._extract_metadata(source_path)
+        # Indexed metadata, unless the file changed since the last refresh
+        metadata = self._indexed_metadata(track_id, source_path)
         
         # Get duration (simplified - would use audio library in production)
         duration = metadata.get("duration", 0.0)
@@ -128,6 +144,13 @@ class SunoAdapter(MusicAdapter):
             metadata=metadata
         )
     
+    def _indexed_metadata(self, track_id: str, source_path: Path) -> Dict[str, Any]:
+        """Catalog metadata for a track if its file and sidecar are unchanged."""
+        row = self.catalog.get(self._catalog_source, Path(track_id).as_posix())
+        if row is not None and self.catalog.is_current(self._catalog_source, row["key"], source_path):
+            return row["metadata"]
+        return self._extract_metadata(source_path)
+    
     def _extract_metadata(self, file_path: Path) -> Dict[str, Any]:
         """Extract metadata from file (filename or metadata file)."""
         metadata = {}
@@ -15,10 +15,12 @@ Emits:
 
 import asyncio
 import logging
+from dataclasses import asdict
 from typing import Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime, timezone
 
+from services.audio.tts_clip_cache import TTSClipCache, get_tts_clip_cache
 from services.event_bus import EventBus, Event, Topics
 from services.workers.base import BaseWorker
 
@@ -45,10 +47,18 @@ class TTSWorker(BaseWorker):
         # - tts.requested
     """
     
-    def __init__(self, event_bus: Optional[EventBus] = None, worker_id: Optional[str] = None):
+    def __init__(
+        self,
+        event_bus: Optional[EventBus] = None,
+        worker_id: Optional[str] = None,
+        clip_cache: Optional[TTSClipCache] = None,
+        use_clip_cache: bool = True,
+    ):
         super().__init__(event_bus, worker_id)
         self._adapters: Dict[str, Any] = {}
         self._jobs: Dict[str, TTSJobStatus] = {}
+        # Content-addressed cache of generated clips, shared with other TTS call sites
+        self._clip_cache = (clip_cache or get_tts_clip_cache()) if use_clip_cache else None
     
     def get_subscriptions(self) -> list:
         """Subscribe to TTS-related events."""
@@ -146,73 +156,68 @@ class TTSWorker(BaseWorker):
         job_status.started_at = datetime.now(timezone.utc)
 
         try:
+            wants_cloning = request.use_voice_cloning or request.voice_profile_id
+            preferred_model = "voice_cloning" if wants_cloning else request.model.value
+
+            # Identical requests are served from the clip cache without loading a model
+            response = self._serve_from_cache(request, preferred_model)
+            cached = response is not None
+
             # VC-005: Voice Cloning Integration
             # Try voice cloning first if requested
-            if request.use_voice_cloning or request.voice_profile_id:
+            if response is None and wants_cloning:
                 try:
                     logger.info(f"[{self.worker_id}] Attempting voice cloning for job {request.job_id}")
                     response = await self._generate_with_voice_cloning(request, job_status)
-                    if response and response.success:
-                        # Voice cloning succeeded
-                        job_status.status = "completed"
-                        job_status.completed_at = datetime.now(timezone.utc)
-                        job_status.progress = 1.0
-                        job_status.response = response
-
-                        await self.emit(
-                            Topics.TTS_COMPLETED,
-                            {
-                                "job_id": response.job_id,
-                                "audio_path": response.audio_path,
-                                "audio_url": response.audio_url,
-                                "duration_seconds": response.duration_seconds,
-                                "model_used": "voice_cloning",
-                                "generation_time": response.generation_time,
-                                "correlation_id": response.correlation_id
-                            },
-                            response.correlation_id
-                        )
-                        return
+                    if response and not response.success:
+                        response = None
                 except Exception as e:
                     logger.warning(f"[{self.worker_id}] Voice cloning failed: {e}. Falling back to standard TTS.")
                     # Continue to standard TTS fallback below
-
-            # Standard TTS pipeline
-            # Get or create adapter for the model
-            adapter = await self._get_adapter(request.model)
-            
-            if not adapter:
-                error = f"Adapter not available for model: {request.model.value}"
-                job_status.status = "failed"
-                job_status.error = error
+                if response is None:
+                    response = self._serve_from_cache(request, request.model.value)
+                    cached = response is not None
+
+            if response is None:
+                # Standard TTS pipeline
+                # Get or create adapter for the model
+                adapter = await self._get_adapter(request.model)
+                
+                if not adapter:
+                    error = f"Adapter not available for model: {request.model.value}"
+                    job_status.status = "failed"
+                    job_status.error = error
+                    await self.emit(
+                        Topics.TTS_FAILED,
+                        {
+                            "job_id": request.job_id,
+                            "error": error,
+                            "correlation_id": request.correlation_id
+                        },
+                        request.correlation_id
+                    )
+                    return
+                
+                # Emit progress
                 await self.emit(
-                    Topics.TTS_FAILED,
+                    Topics.TTS_PROGRESS,
                     {
                         "job_id": request.job_id,
-                        "error": error,
+                        "progress": 0.1,
+                        "message": "Generating speech...",
                         "correlation_id": request.correlation_id
                     },
                     request.correlation_id
                 )
-                return
-            
-            # Emit progress
-            await self.emit(
-                Topics.TTS_PROGRESS,
-                {
-                    "job_id": request.job_id,
-                    "progress": 0.1,
-                    "message": "Generating speech...",
-                    "correlation_id": request.correlation_id
-                },
-                request.correlation_id
-            )
-            job_status.progress = 0.1
-            
-            # Generate speech
-            response = await adapter.generate(request)
+                job_status.progress = 0.1
+                
+                # Generate speech
+                response = await adapter.generate(request)
             
             if response.success:
+                if not cached:
+                    self._store_in_cache(request, response)
+
                 job_status.status = "completed"
                 job_status.completed_at = datetime.now(timezone.utc)
                 job_status.progress = 1.0
@@ -228,6 +233,7 @@ class TTSWorker(BaseWorker):
                         "duration_seconds": response.duration_seconds,
                         "model_used": response.model_used,
                         "generation_time": response.generation_time,
+                        "cached": cached,
                         "correlation_id": response.correlation_id
                     },
                     response.correlation_id
@@ -263,6 +269,56 @@ class TTSWorker(BaseWorker):
                 request.correlation_id
             )
     
+    def _clip_cache_key(self, request: TTSRequest, model_used: str) -> str:
+        """Cache key for the clip a given model produces for this request."""
+        voice = request.voice_profile_id if model_used == "voice_cloning" else request.voice_reference
+        return self._clip_cache.make_key(
+            request.text,
+            voice=voice,
+            model=model_used,
+            params={
+                "emotion": asdict(request.emotion) if request.emotion else None,
+                "sample_rate": request.sample_rate,
+            },
+            fmt=request.output_format,
+        )
+    
+    def _serve_from_cache(self, request: TTSRequest, model_used: str) -> Optional[TTSResponse]:
+        """Materialize a cached clip for the request, or None on a miss."""
+        if self._clip_cache is None:
+            return None
+        key = self._clip_cache_key(request, model_used)
+        output_path = request.output_path or str(
+            Path("data/tts_outputs") / f"{request.job_id}.{request.output_format}"
+        )
+        if not self._clip_cache.materialize(key, output_path):
+            return None
+        meta = self._clip_cache.get_meta(key)
+        logger.info(f"[{self.worker_id}] Served job {request.job_id} from TTS clip cache")
+        return TTSResponse(
+            job_id=request.job_id,
+            success=True,
+            audio_path=output_path,
+            duration_seconds=meta.get("duration_seconds"),
+            model_used=model_used,
+            generation_time=0.0,
+            correlation_id=request.correlation_id
+        )
+    
+    def _store_in_cache(self, request: TTSRequest, response: TTSResponse) -> None:
+        if self._clip_cache is None or not response.audio_path or not Path(response.audio_path).exists():
+            return
+        model_used = "voice_cloning" if response.model_used == "voice_cloning" else request.model.value
+        self._clip_cache.store(
+            self._clip_cache_key(request, model_used),
+            response.audio_path,
+            meta={
+                "text": request.text[:100],
+                "model": model_used,
+                "duration_seconds": response.duration_seconds,
+            },
+        )
+    
     async def _generate_with_voice_cloning(
         self,
         request: TTSRequest,
@@ -4,12 +4,13 @@ Analyzes video files to extract orientation, duration, and metadata
 """
 import os
 import subprocess
-import json
 from typing import Dict, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from loguru import logger
 
+from services.ffprobe_service import ProbeError, get_probe_service
+
 
 class Orientation(str, Enum):
     """Video orientation types"""
@@ -133,28 +134,10 @@ class VideoAnalyzer:
             Dictionary with format and stream information
         """
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe",
-                    "-v", "quiet",
-                    "-print_format", "json",
-                    "-show_format",
-                    "-show_streams",
-                    file_path
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            return json.loads(result.stdout)
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFprobe failed: {e.stderr}")
-            raise RuntimeError(f"Failed to analyze video: {e.stderr}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse FFprobe output: {e}")
-            raise RuntimeError(f"Invalid FFprobe output: {e}")
+            return get_probe_service().probe_sync(file_path).raw
+        except ProbeError as e:
+            logger.error(f"FFprobe failed: {e}")
+            raise RuntimeError(f"Failed to analyze video: {e}")
     
     def _get_video_stream(self, metadata: Dict) -> Dict:
         """
@@ -225,22 +208,8 @@ class VideoAnalyzer:
             Duration in seconds
         """
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe",
-                    "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    file_path
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            return float(result.stdout.strip())
-            
-        except (subprocess.CalledProcessError, ValueError) as e:
+            return get_probe_service().probe_sync(file_path).duration or 0.0
+        except ProbeError as e:
             logger.error(f"Failed to extract duration: {e}")
             return 0.0
     
@@ -255,26 +224,11 @@ class VideoAnalyzer:
             Tuple of (width, height)
         """
         try:
-            result = subprocess.run(
-                [
-                    "ffprobe",
-                    "-v", "error",
-                    "-select_streams", "v:0",
-                    "-show_entries", "stream=width,height",
-                    "-of", "csv=s=x:p=0",
-                    file_path
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            width, height = result.stdout.strip().split("x")
-            return int(width), int(height)
-            
-        except (subprocess.CalledProcessError, ValueError) as e:
+            info = get_probe_service().probe_sync(file_path)
+        except ProbeError as e:
             logger.error(f"Failed to extract dimensions: {e}")
             return 0, 0
+        return info.width or 0, info.height or 0
 
 
 # Singleton instance
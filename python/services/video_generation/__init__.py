@@ -125,6 +125,7 @@ from .media_probe import (
 )
 from .audio_ducking import (
     DuckingPolicy,
+    DuckingEngine,
     NarrationCue,
     DEFAULT_DUCKING,
     bg_volume_at_frame,
@@ -190,6 +191,7 @@ from .vo_stitcher import (
     NarrationAsset,
     StitchedNarration,
     synthesize_beat_narrations,
+    synthesize_and_stitch_narration,
     stitch_narration,
     stitch_narration_sync,
     beats_to_narration_inputs,
@@ -268,6 +270,8 @@ from .audio_bus_mixer import (
     mix_audio_bus,
     mix_audio_bus_sync,
     sfx_cues_to_tracks,
+    build_grouped_sfx_graph,
+    render_sfx_bus,
     build_audio_bus_from_pipeline,
 )
 from .render_trigger import (
@@ -427,6 +431,7 @@ __all__ = [
     "build_plate_frames_map",
     # Audio Ducking
     "DuckingPolicy",
+    "DuckingEngine",
     "NarrationCue",
     "DEFAULT_DUCKING",
     "bg_volume_at_frame",
@@ -486,6 +491,7 @@ __all__ = [
     "NarrationAsset",
     "StitchedNarration",
     "synthesize_beat_narrations",
+    "synthesize_and_stitch_narration",
     "stitch_narration",
     "stitch_narration_sync",
     "beats_to_narration_inputs",
@@ -557,6 +563,8 @@ __all__ = [
     "mix_audio_bus",
     "mix_audio_bus_sync",
     "sfx_cues_to_tracks",
+    "build_grouped_sfx_graph",
+    "render_sfx_bus",
     "build_audio_bus_from_pipeline",
     # Render Trigger
     "RenderConfig",
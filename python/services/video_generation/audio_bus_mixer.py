@@ -7,16 +7,45 @@ FFmpeg-based audio bus generation combining:
 - SFX (from expanded macro cues)
 
 Outputs a single audio_bus.wav for Motion Canvas / Remotion.
+
+Music ducking under narration is sample-accurate: DuckingEngine renders a
+per-sample gain track (raw float32, 1.0 outside ducks) that is multiplied
+into the music branch with amultiply, so fades land exactly where the
+keyframes say.
+
+SFX mixing modes (AudioBusConfig.sfx_mix_mode):
+- "per_cue" (default): one -i input and adelay branch per cue, all in the
+  final amix
+- "grouped": identical files are decoded once and fanned out with asplit;
+  cues are summed into sub-buses of at most sfx_group_size inputs, then
+  into one SFX bus (no amix normalization inside the bus)
+- "numpy": the SFX bus is rendered in process by overlay-adding cached PCM
+  into a memory-mapped float32 file, which ffmpeg reads as a single input
+
+"grouped" and "numpy" are opt-in: the final amix normalizes over the voice,
+music and one SFX bus instead of every cue, so SFX come out louder than in
+"per_cue". Compare modes with scripts/benchmark_sfx_mix.py before switching.
 """
 
 import asyncio
 import os
 import json
-from typing import Optional
+import subprocess
+from functools import lru_cache
+from typing import Callable, Literal, Optional
 from pathlib import Path
+
+import numpy as np
 from pydantic import BaseModel, Field
 from loguru import logger
 
+from services.ffprobe_service import ProbeError, get_probe_service
+
+from .audio_ducking import DuckingEngine, DuckingPolicy, NarrationCue
+
+# Seconds of gain envelope computed per block when writing the gain track
+GAIN_BLOCK_SECONDS = 10
+
 
 class AudioTrack(BaseModel):
     """A single audio track for mixing."""
@@ -38,6 +67,8 @@ class AudioBusConfig(BaseModel):
     output_format: str = Field(default="wav", alias="outputFormat")
     normalize: bool = True
     target_lufs: float = Field(default=-16, alias="targetLufs")
+    sfx_mix_mode: Literal["per_cue", "grouped", "numpy"] = Field(default="per_cue", alias="sfxMixMode")
+    sfx_group_size: int = Field(default=16, alias="sfxGroupSize", ge=2)
     
     class Config:
         populate_by_name = True
@@ -54,29 +85,196 @@ class AudioBusResult(BaseModel):
 
 
 async def probe_audio_duration(file_path: str) -> float:
-    """Get audio duration using ffprobe."""
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, _ = await process.communicate()
-    
+    """Get audio duration using ffprobe (cached by the shared probe service)."""
     try:
-        return float(stdout.decode().strip())
-    except (ValueError, AttributeError):
+        return (await get_probe_service().probe(file_path)).duration or 0
+    except ProbeError:
         return 0
 
 
+def write_gain_track(
+    engine: DuckingEngine,
+    out_path: str,
+    duration_seconds: float,
+    sample_rate: int,
+    fps: float,
+) -> int:
+    """
+    Write the ducking envelope as raw mono float32 samples (ffmpeg -f f32le).
+
+    The gain is relative to the policy's bg_base_volume (1.0 outside ducks,
+    ducked_volume / bg_base_volume inside), since the music track's own
+    volume already sets the level of the bed.
+
+    Computed in GAIN_BLOCK_SECONDS blocks so memory stays bounded.
+
+    Returns:
+        Number of samples written
+    """
+    base = engine.policy.bg_base_volume
+    scale = 1.0 / base if base > 0 else 1.0
+    total = int(round(duration_seconds * sample_rate))
+    block = GAIN_BLOCK_SECONDS * sample_rate
+    with open(out_path, "wb") as f:
+        for start in range(0, total, block):
+            gain = engine.gain_envelope(start, min(block, total - start), sample_rate, fps) * scale
+            gain.astype("<f4").tofile(f)
+    return total
+
+
+def _channel_layout(channels: int) -> str:
+    return {1: "mono", 2: "stereo"}.get(channels, f"{channels}c")
+
+
+# ─── SFX bus ─────────────────────────────────────────────────────────────────
+
+def _sfx_chain(track: AudioTrack) -> str:
+    """volume/adelay filters for one cue (same as the per-cue graph)."""
+    chain = []
+    if track.volume != 1.0:
+        chain.append(f"volume={track.volume}")
+    if track.start_seconds > 0:
+        delay_ms = int(track.start_seconds * 1000)
+        chain.append(f"adelay={delay_ms}|{delay_ms}")
+    return ",".join(chain) or "anull"
+
+
+def build_grouped_sfx_graph(
+    tracks: list[AudioTrack],
+    add_input: Callable[[str], int],
+    group_size: int = 16,
+) -> tuple[list[str], Optional[str]]:
+    """
+    Filtergraph for an SFX bus with bounded fan-in.
+
+    Each distinct file becomes one input (asplit when it is used more than
+    once); cue branches are summed in amix groups of at most group_size,
+    level by level, until a single bus remains.
+
+    Args:
+        tracks: SFX cues (files must exist)
+        add_input: Registers an input file and returns its input index
+        group_size: Max inputs per amix
+
+    Returns:
+        (filters, bus label) — label is None when there are no tracks
+    """
+    filters = []
+    labels = []
+
+    uses: dict[str, list[AudioTrack]] = {}
+    for track in tracks:
+        uses.setdefault(track.path, []).append(track)
+
+    for n, (path, path_tracks) in enumerate(uses.items()):
+        idx = add_input(path)
+        if len(path_tracks) == 1:
+            sources = [f"{idx}:a"]
+        else:
+            sources = [f"sfxsrc{n}_{k}" for k in range(len(path_tracks))]
+            filters.append(f"[{idx}:a]asplit={len(sources)}" + "".join(f"[{src}]" for src in sources))
+        for src, track in zip(sources, path_tracks):
+            label = f"sfxcue{len(labels)}"
+            filters.append(f"[{src}]{_sfx_chain(track)}[{label}]")
+            labels.append(label)
+
+    level = 0
+    while len(labels) > 1:
+        merged = []
+        for g, start in enumerate(range(0, len(labels), group_size)):
+            group = labels[start:start + group_size]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            label = f"sfxbus{level}_{g}"
+            filters.append(
+                "".join(f"[{l}]" for l in group)
+                + f"amix=inputs={len(group)}:duration=longest:normalize=0[{label}]"
+            )
+            merged.append(label)
+        labels = merged
+        level += 1
+
+    return filters, (labels[0] if labels else None)
+
+
+@lru_cache(maxsize=128)
+def _decode_sfx_cached(path: str, mtime_ns: int, size: int, sample_rate: int, channels: int) -> np.ndarray:
+    try:
+        import soundfile as sf
+
+        info = sf.info(path)
+        if info.samplerate == sample_rate:
+            data, _ = sf.read(path, dtype="float32", always_2d=True)
+            if data.shape[1] != channels:
+                mono = data.mean(axis=1, keepdims=True)
+                data = np.repeat(mono, channels, axis=1)
+            data.setflags(write=False)
+            return data
+    except (ImportError, RuntimeError):
+        pass
+
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", path, "-f", "f32le", "-ac", str(channels), "-ar", str(sample_rate), "pipe:1"],
+        capture_output=True,
+        check=True,
+    )
+    data = np.frombuffer(result.stdout, dtype="<f4").reshape(-1, channels)
+    return data
+
+
+def load_sfx_pcm(path: str, sample_rate: int, channels: int) -> np.ndarray:
+    """
+    Decoded SFX as read-only float32 (frames, channels) at sample_rate.
+
+    Cached per (path, mtime, size): a timeline that fires the same whoosh 30
+    times decodes it once, and so does the next render.
+    """
+    st = os.stat(path)
+    return _decode_sfx_cached(path, st.st_mtime_ns, st.st_size, sample_rate, channels)
+
+
+def render_sfx_bus(
+    tracks: list[AudioTrack],
+    out_path: str,
+    sample_rate: int,
+    channels: int,
+    duration_seconds: Optional[float] = None,
+) -> int:
+    """
+    Overlay-add SFX cues into a raw float32 (f32le, interleaved) file.
+
+    The bus is a memory-mapped file, so peak memory is the decoded clips
+    rather than the whole timeline. Cue offsets are sample-accurate.
+
+    Returns:
+        Number of frames written
+    """
+    placed = []
+    for track in tracks:
+        clip = load_sfx_pcm(track.path, sample_rate, channels)
+        placed.append((max(0, int(round(track.start_seconds * sample_rate))), clip, track.volume))
+
+    if duration_seconds:
+        length = int(round(duration_seconds * sample_rate))
+    else:
+        length = max((offset + len(clip) for offset, clip, _ in placed), default=0)
+    length = max(length, 1)
+
+    bus = np.memmap(out_path, dtype="<f4", mode="w+", shape=(length, channels))
+    for offset, clip, volume in placed:
+        n = min(len(clip), length - offset)
+        if n <= 0:
+            continue
+        if volume == 1.0:
+            bus[offset:offset + n] += clip[:n]
+        else:
+            bus[offset:offset + n] += clip[:n] * np.float32(volume)
+    bus.flush()
+    del bus
+    return length
+
+
 async def mix_audio_bus(
     output_path: str,
     voiceover: Optional[AudioTrack] = None,
@@ -84,6 +282,9 @@ async def mix_audio_bus(
     sfx_tracks: Optional[list[AudioTrack]] = None,
     total_duration_seconds: Optional[float] = None,
     config: Optional[AudioBusConfig] = None,
+    narration_cues: Optional[list[NarrationCue]] = None,
+    ducking_policy: Optional[DuckingPolicy] = None,
+    fps: float = 30,
 ) -> AudioBusResult:
     """
     Mix multiple audio tracks into a single audio bus.
@@ -95,6 +296,9 @@ async def mix_audio_bus(
         sfx_tracks: List of SFX tracks
         total_duration_seconds: Target duration (extends/trims)
         config: Audio bus configuration
+        narration_cues: Duck the music under these cues (frames at fps)
+        ducking_policy: Ducking levels/fades (default: DEFAULT_DUCKING)
+        fps: Frame rate the cues are expressed in
         
     Returns:
         AudioBusResult
@@ -104,13 +308,20 @@ async def mix_audio_bus(
     
     # Collect all input files and build filter graph
     inputs = []
+    input_count = 0
     filters = []
     track_labels = []
+    temp_files = []
+
+    def add_input(path: str, *options: str) -> int:
+        nonlocal input_count
+        inputs.extend([*options, "-i", path])
+        input_count += 1
+        return input_count - 1
     
     # Voiceover input
     if voiceover and os.path.exists(voiceover.path):
-        idx = len(inputs)
-        inputs.extend(["-i", voiceover.path])
+        idx = add_input(voiceover.path)
         
         label = f"vo{idx}"
         filter_str = f"[{idx}:a]"
@@ -130,8 +341,7 @@ async def mix_audio_bus(
     
     # Music input
     if music and os.path.exists(music.path):
-        idx = len(inputs) // 2  # Each input is "-i path"
-        inputs.extend(["-i", music.path])
+        idx = add_input(music.path)
         
         label = f"music{idx}"
         filter_str = f"[{idx}:a]"
@@ -152,33 +362,80 @@ async def mix_audio_bus(
             fade_start = total_duration_seconds - music.fade_out_seconds
             filter_str += f"afade=t=out:st={fade_start}:d={music.fade_out_seconds},"
         
-        filter_str = filter_str.rstrip(",") + f"[{label}]"
-        filters.append(filter_str)
+        engine = DuckingEngine(narration_cues, ducking_policy) if narration_cues else None
+        if engine is not None and engine.end_frame > 0:
+            # amultiply stops at its shorter input, so the gain track has to
+            # cover the whole music branch; without a known length, don't duck
+            music_seconds = total_duration_seconds or await probe_audio_duration(music.path)
+            if music_seconds <= 0:
+                logger.warning(f"Unknown duration for {music.path}, mixing music without ducking")
+                engine = None
+        if engine is not None and engine.end_frame > 0:
+            # Sample-accurate ducking: multiply by a precomputed gain track
+            gain_seconds = max(music_seconds, engine.end_frame / fps)
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            gain_path = f"{output_path}.gain.f32"
+            write_gain_track(engine, gain_path, gain_seconds, cfg.sample_rate, fps)
+            temp_files.append(gain_path)
+            gain_idx = add_input(gain_path, "-f", "f32le", "-ar", str(cfg.sample_rate), "-ac", "1")
+
+            layout = _channel_layout(cfg.channels)
+            filter_str += f"aresample={cfg.sample_rate},aformat=sample_fmts=flt:channel_layouts={layout}"
+            filters.append(filter_str + f"[{label}pre]")
+            spread = "|".join(f"c{c}=c0" for c in range(cfg.channels))
+            filters.append(f"[{gain_idx}:a]pan={layout}|{spread},aformat=sample_fmts=flt[{label}gain]")
+            filters.append(f"[{label}pre][{label}gain]amultiply[{label}]")
+        else:
+            filter_str = filter_str.rstrip(",") + f"[{label}]"
+            filters.append(filter_str)
         track_labels.append(label)
     
     # SFX inputs
-    for i, sfx_track in enumerate(sfx):
-        if not os.path.exists(sfx_track.path):
-            continue
-        
-        idx = len(inputs) // 2
-        inputs.extend(["-i", sfx_track.path])
-        
-        label = f"sfx{i}"
-        filter_str = f"[{idx}:a]"
-        
-        # Apply volume
-        if sfx_track.volume != 1.0:
-            filter_str += f"volume={sfx_track.volume},"
-        
-        # Apply delay
-        if sfx_track.start_seconds > 0:
-            delay_ms = int(sfx_track.start_seconds * 1000)
-            filter_str += f"adelay={delay_ms}|{delay_ms},"
-        
-        filter_str = filter_str.rstrip(",") + f"[{label}]"
-        filters.append(filter_str)
-        track_labels.append(label)
+    if cfg.sfx_mix_mode == "per_cue":
+        for i, sfx_track in enumerate(sfx):
+            if not os.path.exists(sfx_track.path):
+                continue
+            
+            idx = add_input(sfx_track.path)
+            
+            label = f"sfx{i}"
+            filter_str = f"[{idx}:a]"
+            
+            # Apply volume
+            if sfx_track.volume != 1.0:
+                filter_str += f"volume={sfx_track.volume},"
+            
+            # Apply delay
+            if sfx_track.start_seconds > 0:
+                delay_ms = int(sfx_track.start_seconds * 1000)
+                filter_str += f"adelay={delay_ms}|{delay_ms},"
+            
+            filter_str = filter_str.rstrip(",") + f"[{label}]"
+            filters.append(filter_str)
+            track_labels.append(label)
+    else:
+        existing_sfx = [t for t in sfx if os.path.exists(t.path)]
+        if existing_sfx and cfg.sfx_mix_mode == "numpy":
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            bus_path = f"{output_path}.sfx.f32"
+            try:
+                await asyncio.to_thread(
+                    render_sfx_bus, existing_sfx, bus_path, cfg.sample_rate, cfg.channels, total_duration_seconds,
+                )
+            except BaseException:
+                for temp_file in temp_files + [bus_path]:
+                    if os.path.exists(temp_file):
+                        os.unlink(temp_file)
+                raise
+            temp_files.append(bus_path)
+            idx = add_input(
+                bus_path, "-f", "f32le", "-ar", str(cfg.sample_rate), "-ac", str(cfg.channels),
+            )
+            track_labels.append(f"{idx}:a")
+        elif existing_sfx:
+            sfx_filters, bus_label = build_grouped_sfx_graph(existing_sfx, add_input, cfg.sfx_group_size)
+            filters.extend(sfx_filters)
+            track_labels.append(bus_label)
     
     if not track_labels:
         # No valid tracks - generate silence
@@ -238,13 +495,18 @@ async def mix_audio_bus(
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     
     # Run FFmpeg
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    _, stderr = await process.communicate()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        
+        _, stderr = await process.communicate()
+    finally:
+        for temp_file in temp_files:
+            if os.path.exists(temp_file):
+                os.unlink(temp_file)
     
     if process.returncode != 0:
         logger.error(f"FFmpeg failed: {stderr.decode()[:500]}")
@@ -329,6 +591,8 @@ async def build_audio_bus_from_pipeline(
     total_duration_seconds: Optional[float] = None,
     fps: int = 30,
     duck_during_voice: bool = True,
+    narration_cues: Optional[list[NarrationCue]] = None,
+    ducking_policy: Optional[DuckingPolicy] = None,
 ) -> str:
     """
     Build audio bus from pipeline outputs.
@@ -343,6 +607,8 @@ async def build_audio_bus_from_pipeline(
         total_duration_seconds: Target duration
         fps: Frames per second
         duck_during_voice: Duck music during voiceover
+        narration_cues: Where the voiceover speaks (frames at fps); needed to duck
+        ducking_policy: Ducking levels/fades
         
     Returns:
         Path to audio_bus.wav
@@ -376,6 +642,9 @@ async def build_audio_bus_from_pipeline(
         music=music_track,
         sfx_tracks=sfx_tracks,
         total_duration_seconds=total_duration_seconds,
+        narration_cues=narration_cues if duck_during_voice else None,
+        ducking_policy=ducking_policy,
+        fps=fps,
     )
     
     logger.info(f"✅ Audio bus built: {result.output_path} ({result.duration_seconds:.1f}s, {result.track_count} tracks)")
@@ -3,9 +3,19 @@ Audio Ducking Policy
 
 Automatically reduces background audio volume during narration
 to ensure voice clarity while maintaining ambient vibe.
+
+DuckingEngine precomputes everything once per cue list: narration cues
+merged into disjoint intervals (O(log n) point queries via bisect) and a
+minimal, strictly increasing keyframe polyline. Gaps between cues too short
+for a full fade-up and fade-down stay ducked instead of producing
+overlapping ramps. The same polyline is sampled per frame (volume_curve)
+or per audio sample (gain_envelope) with NumPy.
 """
 
+import bisect
 from typing import Optional
+
+import numpy as np
 from pydantic import BaseModel, Field
 
 
@@ -36,9 +46,161 @@ class NarrationCue(BaseModel):
 DEFAULT_DUCKING = DuckingPolicy()
 
 
+class DuckingEngine:
+    """
+    Precomputed ducking envelope for one set of narration cues.
+
+    Usage:
+        engine = DuckingEngine(cues, policy)
+        engine.is_in_narration(frame)            # O(log n)
+        engine.keyframes(total_frames)           # for Remotion interpolate()
+        engine.volume_curve(total_frames)        # np.ndarray, one value per frame
+        engine.gain_envelope(0, n, 48000, fps)   # per-sample gain for the mixer
+    """
+
+    def __init__(self, cues: list[NarrationCue], policy: Optional[DuckingPolicy] = None):
+        self.policy = policy or DEFAULT_DUCKING
+        self.intervals = merge_cue_intervals(cues)
+        self._starts = [start for start, _ in self.intervals]
+        self._points = self._envelope_points()
+
+    # ─── Point queries ───────────────────────────────────────────────────────
+
+    def is_in_narration(self, frame: float) -> bool:
+        """True if frame lies inside a narration cue."""
+        i = bisect.bisect_right(self._starts, frame) - 1
+        return i >= 0 and frame < self.intervals[i][1]
+
+    def bg_volume_at_frame(self, frame: float) -> float:
+        """Step volume (no fades), same semantics as bg_volume_at_frame()."""
+        if not self.policy.enabled:
+            return self.policy.bg_base_volume
+        return self.policy.ducked_volume if self.is_in_narration(frame) else self.policy.bg_base_volume
+
+    def volume_at(self, frame: float) -> float:
+        """Faded volume at a (possibly fractional) frame, O(log n)."""
+        points = self._points
+        if not points:
+            return self.policy.bg_base_volume
+        i = bisect.bisect_right(points, (frame, float("inf")))
+        if i == 0:
+            return points[0][1]
+        if i == len(points):
+            return points[-1][1]
+        (f0, v0), (f1, v1) = points[i - 1], points[i]
+        return v0 + (v1 - v0) * (frame - f0) / (f1 - f0)
+
+    # ─── Envelope ────────────────────────────────────────────────────────────
+
+    def _envelope_points(self) -> list[tuple[float, float]]:
+        """Unclipped (frame, volume) polyline with strictly increasing frames."""
+        policy = self.policy
+        if not policy.enabled or not self.intervals:
+            return []
+        base, ducked, fade = policy.bg_base_volume, policy.ducked_volume, policy.fade_frames
+
+        # Bridge gaps the fades cannot fit into
+        bridged = [list(self.intervals[0])]
+        for start, end in self.intervals[1:]:
+            if start - bridged[-1][1] < 2 * fade:
+                bridged[-1][1] = end
+            else:
+                bridged.append([start, end])
+
+        points: list[tuple[float, float]] = []
+        for start, end in bridged:
+            if fade:
+                segment = [(start - fade, base), (start, ducked), (end, ducked), (end + fade, base)]
+            else:
+                # Hard cut: ducked on [start, end), like bg_volume_at_frame
+                segment = [(start - 1, base), (start, ducked), (end - 1, ducked), (end, base)]
+            for point in segment:
+                if points and point[0] <= points[-1][0]:
+                    # Touching ramps (gap == 2 * fade) share their base point
+                    continue
+                points.append(point)
+        return _drop_collinear(points)
+
+    def keyframes(self, total_frames: int) -> list[dict]:
+        """
+        Minimal keyframes on [0, total_frames] with strictly increasing frames.
+
+        Ramps cut by the start or end of the video keep their slope: the
+        boundary keyframe takes the interpolated volume.
+        """
+        inner = [(f, v) for f, v in self._points if 0 < f < total_frames]
+        points = [(0, self.volume_at(0))] + inner
+        if self._points and self._points[-1][0] >= total_frames > 0:
+            # Cut mid-ramp: pin the end value (a flat tail needs no keyframe)
+            end_volume = self.volume_at(total_frames)
+            if abs(end_volume - points[-1][1]) > 1e-9:
+                points.append((total_frames, end_volume))
+        points = _drop_collinear(points)
+        return [{"frame": int(f), "volume": round(v, 6)} for f, v in points]
+
+    def volume_curve(self, total_frames: int) -> np.ndarray:
+        """Faded volume for every frame 0..total_frames-1 (float64)."""
+        return self._sample(np.arange(total_frames, dtype=np.float64))
+
+    def gain_envelope(
+        self,
+        start_sample: int,
+        num_samples: int,
+        sample_rate: int,
+        fps: float,
+    ) -> np.ndarray:
+        """
+        Per-sample gain for samples [start_sample, start_sample + num_samples).
+
+        Sample-accurate: the keyframe polyline is evaluated at each sample's
+        fractional frame position. Generate long envelopes in blocks.
+        """
+        frames = (np.arange(num_samples, dtype=np.float64) + start_sample) * (fps / sample_rate)
+        return self._sample(frames).astype(np.float32)
+
+    def _sample(self, frames: np.ndarray) -> np.ndarray:
+        if not self._points:
+            return np.full(len(frames), self.policy.bg_base_volume, dtype=np.float64)
+        xp = np.fromiter((f for f, _ in self._points), dtype=np.float64, count=len(self._points))
+        fp = np.fromiter((v for _, v in self._points), dtype=np.float64, count=len(self._points))
+        return np.interp(frames, xp, fp)
+
+    @property
+    def end_frame(self) -> float:
+        """Frame after which the envelope is flat at the base volume."""
+        return self._points[-1][0] if self._points else 0
+
+
+def merge_cue_intervals(cues: list[NarrationCue]) -> list[tuple[int, int]]:
+    """Sorted, disjoint [from, end) intervals covering all cues."""
+    merged: list[list[int]] = []
+    for cue in sorted(cues, key=lambda c: c.from_frame):
+        if merged and cue.from_frame <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], cue.end_frame)
+        else:
+            merged.append([cue.from_frame, cue.end_frame])
+    return [(start, end) for start, end in merged]
+
+
+def _drop_collinear(points: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Remove interior points that lie on the line through their neighbours."""
+    if len(points) < 3:
+        return points
+    kept = [points[0]]
+    for i in range(1, len(points) - 1):
+        (f0, v0), (f1, v1), (f2, v2) = kept[-1], points[i], points[i + 1]
+        if abs((v1 - v0) * (f2 - f0) - (v2 - v0) * (f1 - f0)) > 1e-9:
+            kept.append(points[i])
+    kept.append(points[-1])
+    return kept
+
+
 def is_in_narration(frame: int, cues: list[NarrationCue]) -> bool:
     """
     Check if a frame is within any narration cue.
+
+    Linear in the number of cues; for per-frame loops build a DuckingEngine
+    once and use its O(log n) is_in_narration.
     
     Args:
         frame: Current frame
@@ -91,43 +253,12 @@ def generate_volume_keyframes(
         total_frames: Total frames in video
         cues: List of narration cues
         policy: Ducking policy
-        sample_rate: Sample every N frames
+        sample_rate: Unused (keyframes are exact; kept for compatibility)
         
     Returns:
-        List of keyframe dicts with 'frame' and 'volume'
+        List of keyframe dicts with 'frame' and 'volume' (strictly increasing frames)
     """
-    policy = policy or DEFAULT_DUCKING
-    keyframes = []
-    
-    # Always include first frame
-    keyframes.append({
-        "frame": 0,
-        "volume": policy.bg_base_volume,
-    })
-    
-    # Add keyframes at cue boundaries with fade
-    for cue in sorted(cues, key=lambda c: c.from_frame):
-        fade = policy.fade_frames
-        
-        # Duck start (fade down)
-        duck_start = max(0, cue.from_frame - fade)
-        keyframes.append({"frame": duck_start, "volume": policy.bg_base_volume})
-        keyframes.append({"frame": cue.from_frame, "volume": policy.ducked_volume})
-        
-        # Duck end (fade up)
-        duck_end = cue.end_frame
-        keyframes.append({"frame": duck_end, "volume": policy.ducked_volume})
-        keyframes.append({"frame": min(total_frames, duck_end + fade), "volume": policy.bg_base_volume})
-    
-    # Dedupe and sort
-    seen = set()
-    unique = []
-    for kf in sorted(keyframes, key=lambda k: k["frame"]):
-        if kf["frame"] not in seen:
-            seen.add(kf["frame"])
-            unique.append(kf)
-    
-    return unique
+    return DuckingEngine(cues, policy).keyframes(total_frames)
 
 
 def beats_to_narration_cues(
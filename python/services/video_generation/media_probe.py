@@ -6,13 +6,12 @@ Used to get real plate durations for perfect looping/stretching.
 """
 
 import asyncio
-import subprocess
-import json
 from typing import Optional
-from pathlib import Path
 from pydantic import BaseModel, Field
 from loguru import logger
 
+from services.ffprobe_service import ProbeResult, get_probe_service
+
 
 class MediaTiming(BaseModel):
     """Timing information for a media file."""
@@ -49,50 +48,19 @@ async def probe_duration_seconds(file_path: str) -> float:
     Raises:
         RuntimeError: If ffprobe fails
     """
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, stderr = await process.communicate()
-    
-    try:
-        duration = float(stdout.decode().strip())
-        if duration <= 0:
-            raise ValueError(f"Invalid duration: {duration}")
-        return duration
-    except (ValueError, AttributeError) as e:
-        raise RuntimeError(f"ffprobe failed for {file_path}: {stderr.decode()[:200]}") from e
+    return _valid_duration(file_path, await get_probe_service().probe(file_path))
 
 
 def probe_duration_seconds_sync(file_path: str) -> float:
     """Synchronous version of probe_duration_seconds."""
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path,
-    ]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    try:
-        duration = float(result.stdout.strip())
-        if duration <= 0:
-            raise ValueError(f"Invalid duration: {duration}")
-        return duration
-    except (ValueError, AttributeError) as e:
-        raise RuntimeError(f"ffprobe failed for {file_path}: {result.stderr[:200]}") from e
+    return _valid_duration(file_path, get_probe_service().probe_sync(file_path))
+
+
+def _valid_duration(file_path: str, info: ProbeResult) -> float:
+    duration = info.duration
+    if duration is None or duration <= 0:
+        raise RuntimeError(f"ffprobe failed for {file_path}: invalid duration {duration}")
+    return duration
 
 
 async def probe_media_info(file_path: str) -> MediaInfo:
@@ -105,64 +73,14 @@ async def probe_media_info(file_path: str) -> MediaInfo:
     Returns:
         MediaInfo with duration, dimensions, fps, etc.
     """
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration:stream=width,height,r_frame_rate,codec_name,codec_type",
-        "-of", "json",
-        file_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, stderr = await process.communicate()
-    
-    try:
-        data = json.loads(stdout.decode())
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"ffprobe JSON parse failed: {stderr.decode()[:200]}") from e
-    
-    # Extract format info
-    fmt = data.get("format", {})
-    duration = float(fmt.get("duration", 0))
-    
-    # Extract stream info
-    streams = data.get("streams", [])
-    width = None
-    height = None
-    fps = None
-    has_audio = False
-    codec = None
-    
-    for stream in streams:
-        codec_type = stream.get("codec_type")
-        
-        if codec_type == "video" and width is None:
-            width = stream.get("width")
-            height = stream.get("height")
-            codec = stream.get("codec_name")
-            
-            # Parse frame rate (e.g., "30/1" or "30000/1001")
-            r_frame_rate = stream.get("r_frame_rate", "0/1")
-            if "/" in r_frame_rate:
-                num, den = r_frame_rate.split("/")
-                if int(den) > 0:
-                    fps = int(num) / int(den)
-        
-        if codec_type == "audio":
-            has_audio = True
-    
+    info = await get_probe_service().probe(file_path)
     return MediaInfo(
-        duration_seconds=duration,
-        width=width,
-        height=height,
-        fps=fps,
-        has_audio=has_audio,
-        codec=codec,
+        duration_seconds=info.duration or 0.0,
+        width=info.width,
+        height=info.height,
+        fps=info.fps,
+        has_audio=info.has_audio,
+        codec=info.codec,
     )
 
 
@@ -207,28 +125,27 @@ async def attach_timing_to_clips(
     Returns:
         Clips with timing attached
     """
-    result = []
-    
-    for clip in clips:
+    async def attach(clip: dict) -> dict:
         src = clip.get("src")
         
         if not src or src.startswith("mock://"):
-            result.append(clip)
-            continue
+            return clip
         
         try:
             duration = await probe_duration_seconds(src)
             timing = get_media_timing(duration, fps)
             
-            result.append({
+            return {
                 **clip,
                 "timing": timing.model_dump(by_alias=True),
-            })
+            }
         except Exception as e:
             logger.warning(f"Could not probe timing for {src}: {e}")
-            result.append(clip)
+            return clip
     
-    return result
+    # Probes run concurrently (bounded by the probe service); repeated
+    # plates are probed once
+    return list(await asyncio.gather(*(attach(clip) for clip in clips)))
 
 
 def build_plate_frames_map(
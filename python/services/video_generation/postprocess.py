@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Literal
 from loguru import logger
 
+from services.ffprobe_service import ProbeError, get_probe_service
+
 
 async def run_ffmpeg(args: list[str]) -> tuple[int, str, str]:
     """
@@ -247,26 +249,13 @@ async def get_video_duration(input_path: str) -> float:
     Returns:
         Duration in seconds
     """
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        input_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, stderr = await process.communicate()
-    
     try:
-        return float(stdout.decode().strip())
-    except (ValueError, AttributeError):
+        duration = (await get_probe_service().probe(input_path)).duration
+    except ProbeError:
+        duration = None
+    if duration is None:
         raise RuntimeError(f"Could not get duration for {input_path}")
+    return duration
 
 
 async def get_video_info(input_path: str) -> dict:
@@ -279,46 +268,17 @@ async def get_video_info(input_path: str) -> dict:
     Returns:
         Dict with width, height, fps, duration
     """
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height,r_frame_rate",
-        "-show_entries", "format=duration",
-        "-of", "json",
-        input_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, stderr = await process.communicate()
-    
-    import json
     try:
-        data = json.loads(stdout.decode())
-        stream = data.get("streams", [{}])[0]
-        format_info = data.get("format", {})
-        
-        # Parse frame rate (e.g., "30/1")
-        fps_str = stream.get("r_frame_rate", "30/1")
-        if "/" in fps_str:
-            num, den = fps_str.split("/")
-            fps = float(num) / float(den)
-        else:
-            fps = float(fps_str)
-        
-        return {
-            "width": stream.get("width"),
-            "height": stream.get("height"),
-            "fps": fps,
-            "duration": float(format_info.get("duration", 0)),
-        }
-    except Exception as e:
+        info = await get_probe_service().probe(input_path)
+    except ProbeError as e:
         raise RuntimeError(f"Could not parse video info: {e}")
+    
+    return {
+        "width": info.width,
+        "height": info.height,
+        "fps": info.fps or 30.0,
+        "duration": info.duration or 0.0,
+    }
 
 
 async def postprocess_sora_clip(
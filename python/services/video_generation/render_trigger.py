@@ -16,6 +16,8 @@ from pathlib import Path
 from pydantic import BaseModel, Field
 from loguru import logger
 
+from services.ffprobe_service import ProbeError, get_probe_service
+
 
 RenderEngine = Literal["remotion", "motion_canvas", "ffmpeg"]
 
@@ -302,29 +304,13 @@ async def trigger_ffmpeg_render(
 
 
 async def probe_video_duration(file_path: str) -> float:
-    """Get video duration using ffprobe."""
+    """Get video duration using ffprobe (cached by the shared probe service)."""
     if not os.path.exists(file_path):
         return 0
     
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, _ = await process.communicate()
-    
     try:
-        return float(stdout.decode().strip())
-    except (ValueError, AttributeError):
+        return (await get_probe_service().probe(file_path)).duration or 0
+    except ProbeError:
         return 0
 
 
@@ -3,13 +3,26 @@ VO Stitcher
 
 Generates per-beat TTS audio, normalizes, concatenates into single narration track,
 and produces narration cues for ducking and timeline sync.
+
+Beats are synthesized concurrently (bounded by max_concurrency). Silence
+padding, concatenation and duration measurement work on 16-bit PCM in
+process; ffmpeg is only used to decode non-PCM provider output and for
+loudness normalization / MP3 encoding. Raw TTS clips are shared through the
+content-addressed TTS clip cache, so re-rendering a script only
+re-synthesizes the beats whose text changed.
 """
 
 import asyncio
 import subprocess
 import os
+import wave
 from typing import Optional, Protocol
 from pathlib import Path
+
+import numpy as np
+
+from services.ffprobe_service import ProbeError, get_probe_service
+from services.audio.tts_clip_cache import TTSClipCache, get_tts_clip_cache
 from pydantic import BaseModel, Field
 from loguru import logger
 
@@ -76,54 +89,83 @@ class DummyTTSProvider:
 
 
 async def probe_audio_duration(file_path: str) -> float:
-    """Get audio duration using ffprobe."""
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        file_path,
-    ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    
-    stdout, stderr = await process.communicate()
-    
+    """Get audio duration using ffprobe (cached by the shared probe service)."""
     try:
-        return float(stdout.decode().strip())
-    except (ValueError, AttributeError):
-        raise RuntimeError(f"ffprobe failed: {stderr.decode()[:200]}")
+        duration = (await get_probe_service().probe(file_path)).duration
+    except ProbeError as e:
+        raise RuntimeError(str(e)) from e
+    if duration is None:
+        raise RuntimeError(f"ffprobe failed: no duration for {file_path}")
+    return duration
 
 
-async def generate_silence_wav(out_path: str, ms: int, sample_rate: int = 48000) -> None:
-    """Generate silence WAV file."""
-    seconds = max(0.01, ms / 1000)
+# ─── PCM helpers ──────────────────────────────────────────────────────────────
+
+DEFAULT_SAMPLE_RATE = 48000
+
+
+def silence_samples(ms: int, sample_rate: int = DEFAULT_SAMPLE_RATE) -> int:
+    """Number of samples in ms of silence."""
+    return int(round(ms * sample_rate / 1000))
+
+
+def write_pcm_wav(out_path: str, samples: np.ndarray, sample_rate: int = DEFAULT_SAMPLE_RATE) -> None:
+    """Write mono int16 samples as a PCM WAV."""
+    with wave.open(out_path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.ascontiguousarray(samples, dtype="<i2").tobytes())
+
+
+def load_pcm(file_path: str, sample_rate: int = DEFAULT_SAMPLE_RATE) -> np.ndarray:
+    """
+    Load audio as mono int16 samples at sample_rate.
+    
+    16-bit PCM WAVs at the target rate are read in process; anything else
+    (MP3/FLAC from TTS APIs, other rates) takes one ffmpeg decode.
+    """
+    try:
+        with wave.open(file_path, "rb") as wav:
+            if wav.getsampwidth() == 2 and wav.getframerate() == sample_rate:
+                channels = wav.getnchannels()
+                data = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+                if channels > 1:
+                    data = data.reshape(-1, channels).mean(axis=1).round().astype(np.int16)
+                return data
+    except (wave.Error, EOFError):
+        pass
+    
     cmd = [
-        "ffmpeg", "-y",
-        "-f", "lavfi",
-        "-i", f"anullsrc=r={sample_rate}:cl=mono",
-        "-t", str(seconds),
-        out_path,
+        "ffmpeg", "-v", "error",
+        "-i", file_path,
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "pipe:1",
     ]
-    
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    await process.communicate()
+    result = subprocess.run(cmd, capture_output=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"Audio decode failed for {file_path}: {result.stderr.decode()[:200]}")
+    return np.frombuffer(result.stdout, dtype="<i2")
 
 
-async def normalize_loudness_wav(in_path: str, out_path: str) -> None:
-    """Normalize audio loudness."""
+async def generate_silence_wav(out_path: str, ms: int, sample_rate: int = DEFAULT_SAMPLE_RATE) -> None:
+    """Generate silence WAV file."""
+    n = max(silence_samples(ms, sample_rate), silence_samples(10, sample_rate))
+    write_pcm_wav(out_path, np.zeros(n, dtype=np.int16), sample_rate)
+
+
+async def normalize_loudness_wav(in_path: str, out_path: str, sample_rate: int = DEFAULT_SAMPLE_RATE) -> bool:
+    """Normalize audio loudness. Returns False if ffmpeg failed."""
     cmd = [
         "ffmpeg", "-y",
         "-i", in_path,
         "-af", "loudnorm=I=-16:TP=-1.5:LRA=11",
+        # loudnorm resamples to 192 kHz internally; keep the track's rate
+        "-ar", str(sample_rate),
+        "-c:a", "pcm_s16le",
         out_path,
     ]
     
@@ -132,7 +174,11 @@ async def normalize_loudness_wav(in_path: str, out_path: str) -> None:
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
     )
-    await process.communicate()
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.warning(f"Loudness normalization failed: {stderr.decode()[:200]}")
+        return False
+    return True
 
 
 async def concat_wavs(input_paths: list[str], out_path: str) -> None:
@@ -209,72 +255,154 @@ async def synthesize_beat_narrations(
     beats: list[BeatNarrationInput],
     out_dir: str,
     voice_id: Optional[str] = None,
-    normalize: bool = True,
+    normalize: bool = False,
+    max_concurrency: int = 4,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    cache: Optional[TTSClipCache] = None,
+    use_cache: bool = True,
 ) -> list[NarrationAsset]:
     """
     Synthesize narration for each beat.
     
+    Up to max_concurrency beats are synthesized at once; padding and
+    duration measurement happen in process on the decoded PCM.
+    
     Args:
         provider: TTS provider
         beats: Beat narration inputs
         out_dir: Output directory
         voice_id: Optional voice ID
-        normalize: Whether to normalize loudness
+        normalize: Also normalize loudness per beat (off by default:
+                   stitch_narration normalizes the stitched track once)
+        max_concurrency: Beats synthesized in parallel (1 = one at a time)
+        sample_rate: Sample rate of the padded beat WAVs
+        cache: TTS clip cache (default: the shared cache)
+        use_cache: Reuse/store raw clips in the TTS clip cache
         
     Returns:
-        List of NarrationAsset
+        List of NarrationAsset, in beat order
     """
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     
-    assets = []
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    if use_cache and cache is None:
+        cache = get_tts_clip_cache()
     
-    for beat in beats:
-        if not beat.text.strip():
-            continue
-        
-        raw_path = os.path.join(out_dir, f"vo_{beat.beat_id}_raw.wav")
-        norm_path = os.path.join(out_dir, f"vo_{beat.beat_id}.wav")
-        
-        # Synthesize
+    async def run(beat: BeatNarrationInput) -> NarrationAsset:
+        async with semaphore:
+            return await _synthesize_beat(
+                provider, beat, out_dir, voice_id, normalize, sample_rate,
+                cache if use_cache else None,
+            )
+    
+    tasks = [asyncio.ensure_future(run(beat)) for beat in beats if beat.text.strip()]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def _synthesize_beat(
+    provider: TTSProvider,
+    beat: BeatNarrationInput,
+    out_dir: str,
+    voice_id: Optional[str],
+    normalize: bool,
+    sample_rate: int,
+    cache: Optional[TTSClipCache],
+) -> NarrationAsset:
+    raw_path = os.path.join(out_dir, f"vo_{beat.beat_id}_raw.wav")
+    norm_path = os.path.join(out_dir, f"vo_{beat.beat_id}.wav")
+    
+    # Synthesize (or reuse an identical clip)
+    if cache is not None:
+        key = cache.make_key(beat.text, voice=voice_id, model=_provider_model(provider), fmt="wav")
+        await cache.get_or_synthesize(
+            key, raw_path,
+            lambda: provider.synthesize(beat.text, raw_path, voice_id),
+            meta={"text": beat.text[:100], "provider": provider.name},
+        )
+    else:
         await provider.synthesize(beat.text, raw_path, voice_id)
-        
-        # Normalize
-        if normalize:
-            await normalize_loudness_wav(raw_path, norm_path)
-        else:
-            norm_path = raw_path
-        
-        # Add silence padding
-        parts = []
-        
-        if beat.pre_silence_ms > 0:
-            pre_path = os.path.join(out_dir, f"sil_pre_{beat.beat_id}.wav")
-            await generate_silence_wav(pre_path, beat.pre_silence_ms)
-            parts.append(pre_path)
-        
-        parts.append(norm_path)
-        
-        if beat.post_silence_ms > 0:
-            post_path = os.path.join(out_dir, f"sil_post_{beat.beat_id}.wav")
-            await generate_silence_wav(post_path, beat.post_silence_ms)
-            parts.append(post_path)
-        
-        # Concatenate if needed
+    
+    # Normalize
+    source = raw_path
+    if normalize and await normalize_loudness_wav(raw_path, norm_path, sample_rate):
+        source = norm_path
+    
+    # Decode once, pad with silence in process
+    speech = await asyncio.to_thread(load_pcm, source, sample_rate)
+    pre = silence_samples(beat.pre_silence_ms, sample_rate)
+    post = silence_samples(beat.post_silence_ms, sample_rate)
+    
+    if pre or post:
+        final_path = os.path.join(out_dir, f"vo_{beat.beat_id}_padded.wav")
+        samples = np.concatenate([
+            np.zeros(pre, dtype=np.int16), speech, np.zeros(post, dtype=np.int16),
+        ])
+        await asyncio.to_thread(write_pcm_wav, final_path, samples, sample_rate)
+    else:
         final_path = norm_path
-        if len(parts) > 1:
-            final_path = os.path.join(out_dir, f"vo_{beat.beat_id}_padded.wav")
-            await concat_wavs(parts, final_path)
-        
-        # Get duration
-        duration = await probe_audio_duration(final_path)
-        
-        assets.append(NarrationAsset(
-            beat_id=beat.beat_id,
-            wav_path=final_path,
-            duration_seconds=duration,
-        ))
+        samples = speech
+        if source != norm_path:
+            await asyncio.to_thread(write_pcm_wav, final_path, samples, sample_rate)
+    
+    return NarrationAsset(
+        beat_id=beat.beat_id,
+        wav_path=final_path,
+        duration_seconds=len(samples) / sample_rate,
+    )
+
+
+def _provider_model(provider: TTSProvider) -> str:
+    """Cache identity of a provider: name plus model id when it has one."""
+    config = getattr(provider, "config", None)
+    model_id = getattr(provider, "model_id", None) or getattr(config, "model_id", None)
+    return f"{provider.name}:{model_id}" if model_id else provider.name
+
+
+async def synthesize_and_stitch_narration(
+    provider: TTSProvider,
+    beats: list[BeatNarrationInput],
+    out_dir: str,
+    fps: int,
+    voice_id: Optional[str] = None,
+    normalize: bool = True,
+    also_mp3: bool = False,
+    max_concurrency: int = 4,
+    cache: Optional[TTSClipCache] = None,
+    use_cache: bool = True,
+) -> StitchedNarration:
+    """
+    Synthesize every beat concurrently and stitch the narration track,
+    normalizing loudness once on the stitched track instead of per beat.
     
-    return assets
+    Args:
+        provider: TTS provider
+        beats: Beat narration inputs
+        out_dir: Output directory
+        fps: Frames per second
+        voice_id: Optional voice ID
+        normalize: Loudness-normalize the stitched track
+        also_mp3: Also create MP3 version
+        max_concurrency: Beats synthesized in parallel
+        cache: TTS clip cache (default: the shared cache)
+        use_cache: Reuse/store raw clips in the TTS clip cache
+        
+    Returns:
+        StitchedNarration
+    """
+    assets = await synthesize_beat_narrations(
+        provider, beats, out_dir,
+        voice_id=voice_id,
+        normalize=False,
+        max_concurrency=max_concurrency,
+        cache=cache,
+        use_cache=use_cache,
+    )
+    return await stitch_narration(assets, out_dir, fps, also_mp3=also_mp3, normalize=normalize)
 
 
 def seconds_to_frames(seconds: float, fps: int) -> int:
@@ -282,11 +410,29 @@ def seconds_to_frames(seconds: float, fps: int) -> int:
     return max(1, round(seconds * fps))
 
 
+def _write_stitched_wav(assets: list[NarrationAsset], out_path: str, sample_rate: int) -> None:
+    """Concatenate asset PCM into one WAV, streaming asset by asset."""
+    with wave.open(out_path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for asset in assets:
+            if os.path.exists(asset.wav_path):
+                samples = load_pcm(asset.wav_path, sample_rate)
+            else:
+                # Keep the track aligned with the cues
+                logger.warning(f"Narration asset missing, using silence: {asset.wav_path}")
+                samples = np.zeros(int(round(asset.duration_seconds * sample_rate)), dtype=np.int16)
+            wav.writeframes(np.ascontiguousarray(samples, dtype="<i2").tobytes())
+
+
 async def stitch_narration(
     assets: list[NarrationAsset],
     out_dir: str,
     fps: int,
     also_mp3: bool = False,
+    normalize: bool = True,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
 ) -> StitchedNarration:
     """
     Stitch narration assets into single track with cues.
@@ -296,6 +442,8 @@ async def stitch_narration(
         out_dir: Output directory
         fps: Frames per second
         also_mp3: Also create MP3 version
+        normalize: Loudness-normalize the stitched track (one ffmpeg pass)
+        sample_rate: Sample rate of the stitched track
         
     Returns:
         StitchedNarration
@@ -305,7 +453,15 @@ async def stitch_narration(
     stitched_wav_path = os.path.join(out_dir, "narration_stitched.wav")
     
     # Concatenate all assets
-    await concat_wavs([a.wav_path for a in assets], stitched_wav_path)
+    if normalize:
+        raw_path = os.path.join(out_dir, "narration_stitched_raw.wav")
+        await asyncio.to_thread(_write_stitched_wav, assets, raw_path, sample_rate)
+        if await normalize_loudness_wav(raw_path, stitched_wav_path, sample_rate):
+            os.remove(raw_path)
+        else:
+            os.replace(raw_path, stitched_wav_path)
+    else:
+        await asyncio.to_thread(_write_stitched_wav, assets, stitched_wav_path, sample_rate)
     
     # Build cues
     cues = {}
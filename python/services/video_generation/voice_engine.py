@@ -343,18 +343,52 @@ async def generate_tts_audio(
     text: str,
     config: NarratorConfig,
     output_path: str,
+    use_cache: bool = True,
 ) -> str:
     """
     Generate TTS audio using configured provider.
     
+    Identical requests (text, voice, model, speed, format) are served from
+    the shared TTS clip cache.
+    
     Args:
         text: Text to speak
         config: Narrator configuration
         output_path: Path to save audio file
+        use_cache: Reuse/store the clip in the TTS clip cache
         
     Returns:
         Path to generated audio file
     """
+    if not use_cache:
+        return await _synthesize_tts_audio(text, config, output_path)
+    
+    from services.audio.tts_clip_cache import get_tts_clip_cache
+    
+    cache = get_tts_clip_cache()
+    key = cache.make_key(
+        text,
+        voice=config.voice,
+        model=f"{config.provider}:{config.model_id}",
+        params={"speed": config.speed},
+        fmt=os.path.splitext(output_path)[1] or "mp3",
+    )
+    cached = await cache.get_or_synthesize(
+        key, output_path,
+        lambda: _synthesize_tts_audio(text, config, output_path),
+        meta={"text": text[:100], "provider": config.provider},
+    )
+    if cached:
+        logger.info(f"Reused cached TTS audio: {output_path}")
+    return output_path
+
+
+async def _synthesize_tts_audio(
+    text: str,
+    config: NarratorConfig,
+    output_path: str,
+) -> str:
+    """Call the configured TTS provider."""
     import openai
     
     if config.provider == "openai":
@@ -6,20 +6,31 @@ Background worker for running video generation jobs.
 Features:
 - Async clip plan execution
 - Concurrent clip generation (configurable)
+- Per-provider request-rate and concurrency limits
 - Automatic assessment and retry
-- Progress tracking and events
+- Progress tracking and events (in completion order)
+- Fail-fast cancellation once a plan can no longer pass
+- Priority/aging job queue with per-project fairness (OrchestrationQueue)
 
 Usage:
     worker = OrchestrationWorker()
     await worker.run_clip_plan(plan_id)
+
+    queue = OrchestrationQueue(worker, max_workers=4)
+    await queue.start()
+    await queue.enqueue(plan, scenes, clips, priority=5)
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from .models import (
@@ -36,6 +47,7 @@ from .models import (
 )
 from .scene_crafter import SceneCrafterService
 from .assessor import AssessorService, AssessmentInput, RepairExecutor
+from .rate_limits import ProviderGovernor, ProviderRateLimit, provider_key
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +61,7 @@ class WorkerEvent(str, Enum):
     CLIP_COMPLETED = "clip_completed"
     CLIP_FAILED = "clip_failed"
     CLIP_RETRYING = "clip_retrying"
+    CLIP_CANCELED = "clip_canceled"
     PROGRESS_UPDATE = "progress_update"
 
 
@@ -60,6 +73,7 @@ class WorkerProgress:
     total_clips: int
     completed_clips: int = 0
     failed_clips: int = 0
+    canceled_clips: int = 0
     current_clip_id: Optional[str] = None
     current_clip_status: Optional[str] = None
     started_at: Optional[datetime] = None
@@ -72,7 +86,10 @@ class WorkerProgress:
             "total_clips": self.total_clips,
             "completed_clips": self.completed_clips,
             "failed_clips": self.failed_clips,
-            "pending_clips": self.total_clips - self.completed_clips - self.failed_clips,
+            "canceled_clips": self.canceled_clips,
+            "pending_clips": (
+                self.total_clips - self.completed_clips - self.failed_clips - self.canceled_clips
+            ),
             "current_clip_id": self.current_clip_id,
             "current_clip_status": self.current_clip_status,
             "started_at": self.started_at.isoformat() if self.started_at else None,
@@ -89,6 +106,9 @@ class WorkerConfig:
     generation_timeout_seconds: int = 300
     assessment_enabled: bool = True
     auto_retry_enabled: bool = True
+    fail_fast: bool = True
+    provider_limits: Dict[str, ProviderRateLimit] = field(default_factory=dict)
+    default_provider_limit: Optional[ProviderRateLimit] = None
 
 
 EventCallback = Callable[[WorkerEvent, Dict[str, Any]], None]
@@ -104,31 +124,67 @@ class OrchestrationWorker:
     3. Assessing each clip
     4. Retrying failures based on repair instructions
     5. Tracking progress and emitting events
+    
+    Each clip goes to its provider_override or the worker's provider.
+    Generation requests are governed per provider by config.provider_limits
+    (requests/min and concurrent generations), shared across all plans the
+    worker runs.
     """
     
     def __init__(
         self,
         config: Optional[WorkerConfig] = None,
-        provider_name: ProviderName = ProviderName.MOCK
+        provider_name: ProviderName = ProviderName.MOCK,
+        providers: Optional[Dict[ProviderName, Any]] = None
     ):
+        """
+        Args:
+            config: Worker configuration
+            provider_name: Default provider for clips without an override
+            providers: Pre-built provider adapters by name (default: created
+                on demand via get_video_provider)
+        """
         self.config = config or WorkerConfig()
         self.provider_name = provider_name
         
         self._scene_crafter = SceneCrafterService()
         self._assessor = AssessorService()
         self._repair_executor = RepairExecutor(self._scene_crafter)
+        self._governor = ProviderGovernor(
+            self.config.provider_limits,
+            default=self.config.default_provider_limit
+        )
         
-        self._provider = None
+        self._providers: Dict[str, Any] = {
+            provider_key(name): adapter for name, adapter in (providers or {}).items()
+        }
+        self._provider = self._providers.get(provider_key(provider_name))
         self._event_callbacks: List[EventCallback] = []
         self._running_plans: Set[str] = set()
+        self._plan_tasks: Dict[str, Set[asyncio.Task]] = {}
         self._progress: Dict[str, WorkerProgress] = {}
     
-    def _get_provider(self):
+    def _get_provider(self, provider_name: Optional[ProviderName] = None):
         """Get video provider instance."""
-        if self._provider is None:
+        if provider_name is None or provider_key(provider_name) == provider_key(self.provider_name):
+            if self._provider is None:
+                from services.video_providers import get_video_provider
+                self._provider = get_video_provider(self.provider_name)
+            return self._provider
+        
+        key = provider_key(provider_name)
+        if key not in self._providers:
             from services.video_providers import get_video_provider
-            self._provider = get_video_provider(self.provider_name)
-        return self._provider
+            self._providers[key] = get_video_provider(provider_name)
+        return self._providers[key]
+    
+    def _clip_provider_name(self, clip: ClipPlanClip) -> ProviderName:
+        """Provider a clip is generated with."""
+        return clip.provider_override or self.provider_name
+    
+    def get_provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider request, concurrency and throttling stats."""
+        return self._governor.get_stats()
     
     def on_event(self, callback: EventCallback):
         """Register event callback."""
@@ -185,6 +241,7 @@ class OrchestrationWorker:
         logger.info(f"Starting plan execution: {plan_id} with {len(clips)} clips")
         self._emit_event(WorkerEvent.PLAN_STARTED, {"plan_id": plan_id, "total_clips": len(clips)})
         
+        tasks: Dict[asyncio.Task, ClipPlanClip] = {}
         try:
             # Sort clips by order
             sorted_clips = sorted(clips, key=lambda c: (c.scene_id, c.clip_order))
@@ -193,37 +250,50 @@ class OrchestrationWorker:
             semaphore = asyncio.Semaphore(self.config.max_concurrent_clips)
             
             # Run clips with concurrency limit
-            tasks = []
             for clip in sorted_clips:
                 task = asyncio.create_task(
                     self._run_clip_with_semaphore(
                         semaphore, clip, plan_id, bibles
                     )
                 )
-                tasks.append((clip, task))
+                tasks[task] = clip
+            self._plan_tasks[plan_id] = set(tasks)
             
-            # Wait for all clips
-            results = []
-            for clip, task in tasks:
-                try:
-                    success = await task
-                    results.append((clip, success))
+            # Handle clips as they finish
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    clip = tasks[task]
                     
-                    # Update progress
-                    if success:
+                    if task.cancelled():
+                        clip.state = ClipState.SKIPPED
+                        progress.canceled_clips += 1
+                        self._emit_event(WorkerEvent.CLIP_CANCELED, {
+                            "plan_id": plan_id,
+                            "clip_id": str(clip.id)
+                        })
+                    elif task.exception() is not None:
+                        logger.error(f"Clip task failed: {task.exception()}")
+                        progress.failed_clips += 1
+                    elif task.result():
                         progress.completed_clips += 1
                     else:
                         progress.failed_clips += 1
                     
                     self._emit_event(WorkerEvent.PROGRESS_UPDATE, progress.to_dict())
-                    
-                except Exception as e:
-                    logger.error(f"Clip task failed: {e}")
-                    progress.failed_clips += 1
-                    results.append((clip, False))
+                
+                # Every clip must pass, so one failure decides the plan
+                if pending and progress.failed_clips and self.config.fail_fast:
+                    logger.info(
+                        f"Plan {plan_id} can no longer pass; canceling {len(pending)} remaining clips"
+                    )
+                    for task in pending:
+                        task.cancel()
             
             # Determine final status
-            all_passed = all(success for _, success in results)
+            all_passed = progress.completed_clips == len(clips)
             
             if all_passed:
                 progress.status = "completed"
@@ -233,18 +303,30 @@ class OrchestrationWorker:
                     "clips_passed": progress.completed_clips
                 })
             else:
-                progress.status = "failed"
+                if progress.status != "canceled":
+                    progress.status = "failed"
                 plan.status = PlanStatus.FAILED
                 self._emit_event(WorkerEvent.PLAN_FAILED, {
                     "plan_id": plan_id,
                     "clips_passed": progress.completed_clips,
-                    "clips_failed": progress.failed_clips
+                    "clips_failed": progress.failed_clips,
+                    "clips_canceled": progress.canceled_clips
                 })
             
             logger.info(f"Plan {plan_id} completed: {progress.completed_clips}/{len(clips)} passed")
             return all_passed
             
+        except asyncio.CancelledError:
+            # Plan task itself was canceled: stop its clips too
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            progress.status = "canceled"
+            plan.status = PlanStatus.FAILED
+            raise
+            
         finally:
+            self._plan_tasks.pop(plan_id, None)
             self._running_plans.discard(plan_id)
     
     async def _run_clip_with_semaphore(
@@ -290,7 +372,8 @@ class OrchestrationWorker:
         })
         
         clip.state = ClipState.GENERATING
-        provider = self._get_provider()
+        provider_name = self._clip_provider_name(clip)
+        provider = self._get_provider(provider_name)
         
         while attempt < max_attempts:
             attempt += 1
@@ -307,24 +390,25 @@ class OrchestrationWorker:
                 # Create clip run record
                 clip_run = ClipRun(
                     clip_plan_clip_id=clip.id,
-                    provider=self.provider_name,
+                    provider=provider_name,
                     provider_generation_id="",
                     attempt=attempt,
                     status=ClipRunStatus.QUEUED,
                     request_payload=payload.to_dict()
                 )
                 
-                # Generate
-                generation = await provider.create_clip(payload)
-                clip_run.provider_generation_id = generation.provider_generation_id
-                clip_run.status = ClipRunStatus.RUNNING
-                
-                # Poll for completion
-                completed = await provider.wait_for_completion(
-                    generation.provider_generation_id,
-                    poll_interval=self.config.poll_interval_seconds,
-                    timeout=self.config.generation_timeout_seconds
-                )
+                # Generate within the provider's rate and concurrency limits
+                async with self._governor.generation_slot(provider_name):
+                    generation = await provider.create_clip(payload)
+                    clip_run.provider_generation_id = generation.provider_generation_id
+                    clip_run.status = ClipRunStatus.RUNNING
+                    
+                    # Poll for completion
+                    completed = await provider.wait_for_completion(
+                        generation.provider_generation_id,
+                        poll_interval=self.config.poll_interval_seconds,
+                        timeout=self.config.generation_timeout_seconds
+                    )
                 
                 # Update run record
                 clip_run.status = ClipRunStatus.SUCCEEDED if completed.is_success else ClipRunStatus.FAILED
@@ -425,14 +509,16 @@ class OrchestrationWorker:
         return False
     
     async def cancel_plan(self, plan_id: str):
-        """Cancel a running plan."""
+        """Cancel a running plan (its unfinished clips are canceled)."""
         if plan_id in self._running_plans:
-            # Mark for cancellation (tasks check this)
             self._running_plans.discard(plan_id)
             
             if plan_id in self._progress:
                 self._progress[plan_id].status = "canceled"
             
+            for task in self._plan_tasks.get(plan_id, ()):
+                task.cancel()
+            
             logger.info(f"Plan {plan_id} canceled")
     
     def is_running(self, plan_id: str) -> bool:
@@ -440,45 +526,140 @@ class OrchestrationWorker:
         return plan_id in self._running_plans
 
 
+@dataclass
+class QueuedJob:
+    """
+    A clip plan waiting for (or holding) an OrchestrationQueue slot.
+    
+    Once the job finishes, plan/scenes/clips/bibles are dropped and only
+    the status record is kept.
+    """
+    job_id: str
+    project_id: str
+    plan: Optional[ClipPlan]
+    scenes: Optional[List[Scene]]
+    clips: Optional[List[ClipPlanClip]]
+    bibles: Optional[Dict[str, Any]]
+    priority: int
+    enqueued_at: float
+    total_clips: int = 0
+    seq: int = 0
+    status: str = "queued"
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    
+    def release_payload(self):
+        """Drop the plan payload of a finished job."""
+        self.plan = None
+        self.scenes = None
+        self.clips = None
+        self.bibles = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "project_id": self.project_id,
+            "priority": self.priority,
+            "status": self.status,
+            "total_clips": self.total_clips,
+            "wait_seconds": (
+                round(self.started_at - self.enqueued_at, 3)
+                if self.started_at is not None else None
+            ),
+        }
+
+
 class OrchestrationQueue:
     """
     Queue for managing multiple orchestration jobs.
     
     Features:
-    - Job queuing
-    - Priority handling
-    - Worker pool management
+    - Priority + aging scheduling: a job's effective priority grows by
+      aging_rate per second waited, so low-priority jobs cannot starve
+    - Per-project fairness: each job a project already has running counts
+      as fairness_weight priority points against its next job
+    - Event-driven dispatch: slots are handed out on enqueue and released by
+      job completion callbacks (no polling)
+    - Cancellation and re-prioritization of queued jobs
+    - Queue-wait and slot-utilization metrics
+    
+    Because every queued job ages at the same rate, "priority + aging_rate *
+    waited" orders jobs exactly like the time-invariant key
+    "aging_rate * enqueued_at - priority", which lets each project keep a
+    plain heap. Cancelled/re-prioritized entries are skipped lazily.
+    
+    Finished jobs keep only a status record (no plan payload), and only the
+    FINISHED_HISTORY most recent ones are kept for get_job/get_job_result.
     """
     
+    WAIT_SAMPLE_SIZE = 1000
+    FINISHED_HISTORY = 1000
+    
     def __init__(
         self,
         worker: Optional[OrchestrationWorker] = None,
-        max_workers: int = 2
+        max_workers: int = 2,
+        aging_rate: float = 1 / 60,
+        fairness_weight: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
     ):
+        """
+        Args:
+            worker: Worker that executes plans
+            max_workers: Max plans running at once
+            aging_rate: Priority points gained per second of queue wait
+            fairness_weight: Priority points charged per running job of the
+                same project
+            clock: Monotonic time source (seconds)
+        """
         self.worker = worker or OrchestrationWorker()
         self.max_workers = max_workers
+        self.aging_rate = aging_rate
+        self.fairness_weight = fairness_weight
+        self._clock = clock
         
-        self._queue: asyncio.Queue = asyncio.Queue()
+        self._jobs: Dict[str, QueuedJob] = {}
+        # Queued jobs in enqueue order (stale entries skipped lazily), so the
+        # oldest queued job is found without scanning every job
+        self._fifo: Deque[QueuedJob] = deque()
+        self._finished: Deque[str] = deque()
+        self._project_heaps: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._queued_count = 0
+        self._seq = itertools.count()
         self._active_jobs: Dict[str, asyncio.Task] = {}
+        self._active_by_project: Dict[str, int] = defaultdict(int)
         self._job_results: Dict[str, bool] = {}
+        self._completed = 0
+        self._canceled = 0
         self._running = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        
+        # Metrics
+        self._wait_samples: Deque[float] = deque(maxlen=self.WAIT_SAMPLE_SIZE)
+        self._started_at: Optional[float] = None
+        self._busy_slot_seconds = 0.0
+        self._last_slot_change: Optional[float] = None
     
     async def start(self):
-        """Start the queue processor."""
+        """Start dispatching queued jobs."""
         if self._running:
             return
         
         self._running = True
+        now = self._clock()
+        self._started_at = now
+        self._last_slot_change = now
         logger.info("Orchestration queue started")
         
-        asyncio.create_task(self._process_queue())
+        self._dispatch()
     
     async def stop(self):
-        """Stop the queue processor."""
+        """Stop dispatching and cancel active jobs (queued jobs are kept)."""
         self._running = False
         
         # Cancel active jobs
-        for job_id, task in self._active_jobs.items():
+        for job_id, task in list(self._active_jobs.items()):
             task.cancel()
         
         logger.info("Orchestration queue stopped")
@@ -506,56 +687,202 @@ class OrchestrationQueue:
         """
         job_id = str(plan.id)
         
-        await self._queue.put({
-            "job_id": job_id,
-            "plan": plan,
-            "scenes": scenes,
-            "clips": clips,
-            "bibles": bibles,
-            "priority": priority
-        })
+        existing = self._jobs.get(job_id)
+        if existing and existing.status in ("queued", "running"):
+            logger.warning(f"Job {job_id} is already {existing.status}")
+            return job_id
         
-        logger.info(f"Job {job_id} enqueued")
+        job = QueuedJob(
+            job_id=job_id,
+            project_id=str(plan.project_id),
+            plan=plan,
+            scenes=scenes,
+            clips=clips,
+            bibles=bibles,
+            priority=priority,
+            enqueued_at=self._clock(),
+            total_clips=len(clips)
+        )
+        self._jobs[job_id] = job
+        self._job_results.pop(job_id, None)
+        self._fifo.append(job)
+        self._push(job)
+        self._queued_count += 1
+        self._idle.clear()
+        
+        logger.info(f"Job {job_id} enqueued (priority {priority})")
+        self._dispatch()
         return job_id
     
-    async def _process_queue(self):
-        """Process jobs from the queue."""
-        while self._running:
-            try:
-                # Wait for a job
-                job = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                
-                # Check if we can start a new job
-                while len(self._active_jobs) >= self.max_workers:
-                    await asyncio.sleep(0.5)
-                    
-                    # Clean up completed jobs
-                    completed = [
-                        jid for jid, task in self._active_jobs.items()
-                        if task.done()
-                    ]
-                    for jid in completed:
-                        del self._active_jobs[jid]
-                
-                # Start the job
-                task = asyncio.create_task(self._run_job(job))
-                self._active_jobs[job["job_id"]] = task
-                
-            except asyncio.TimeoutError:
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+        
+        Returns:
+            True if the job was queued or running
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        
+        if job.status == "queued":
+            # Heap entry is skipped lazily
+            job.status = "canceled"
+            self._queued_count -= 1
+            self._canceled += 1
+            self._retire(job)
+            self._check_idle()
+            logger.info(f"Job {job_id} canceled while queued")
+            return True
+        
+        if job.status == "running":
+            # The completion callback releases the slot
+            job.status = "canceled"
+            self._active_jobs[job_id].cancel()
+            logger.info(f"Job {job_id} canceled while running")
+            return True
+        
+        return False
+    
+    def reprioritize(self, job_id: str, priority: int) -> bool:
+        """
+        Change the priority of a queued job (time already waited still counts).
+        
+        Returns:
+            True if the job was queued
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status != "queued":
+            return False
+        
+        job.priority = priority
+        self._push(job)
+        self._dispatch()
+        return True
+    
+    def _push(self, job: QueuedJob):
+        """Push a heap entry for job; earlier entries become stale."""
+        job.seq = next(self._seq)
+        key = self.aging_rate * job.enqueued_at - job.priority
+        heapq.heappush(
+            self._project_heaps.setdefault(job.project_id, []),
+            (key, job.seq, job.job_id)
+        )
+    
+    def _peek(self, project_id: str) -> Optional[Tuple[float, int, str]]:
+        """Head entry of a project heap, dropping stale entries."""
+        heap = self._project_heaps[project_id]
+        while heap:
+            key, seq, job_id = heap[0]
+            job = self._jobs.get(job_id)
+            if job is not None and job.status == "queued" and job.seq == seq:
+                return heap[0]
+            heapq.heappop(heap)
+        del self._project_heaps[project_id]
+        return None
+    
+    def _next_job(self) -> Optional[QueuedJob]:
+        """Pop the best job across projects (priority + aging + fairness)."""
+        best = None
+        for project_id in list(self._project_heaps):
+            head = self._peek(project_id)
+            if head is None:
                 continue
-            except Exception as e:
-                logger.error(f"Queue processing error: {e}")
+            key, seq, _ = head
+            score = (key + self.fairness_weight * self._active_by_project[project_id], seq)
+            if best is None or score < best[0]:
+                best = (score, project_id)
+        
+        if best is None:
+            return None
+        
+        _, _, job_id = heapq.heappop(self._project_heaps[best[1]])
+        return self._jobs[job_id]
+    
+    def _dispatch(self):
+        """Fill free slots from the queue."""
+        while self._running and len(self._active_jobs) < self.max_workers:
+            job = self._next_job()
+            if job is None:
+                return
+            
+            self._queued_count -= 1
+            self._account_slots()
+            job.status = "running"
+            job.started_at = self._clock()
+            self._wait_samples.append(job.started_at - job.enqueued_at)
+            self._active_by_project[job.project_id] += 1
+            
+            task = asyncio.create_task(self._run_job(job))
+            self._active_jobs[job.job_id] = task
+            task.add_done_callback(lambda _, job=job: self._on_job_done(job))
     
-    async def _run_job(self, job: Dict[str, Any]):
+    def _on_job_done(self, job: QueuedJob):
+        """Release the job's slot and start the next one."""
+        self._account_slots()
+        self._active_jobs.pop(job.job_id, None)
+        self._active_by_project[job.project_id] -= 1
+        if not self._active_by_project[job.project_id]:
+            del self._active_by_project[job.project_id]
+        
+        job.finished_at = self._clock()
+        if job.status == "canceled" or job.job_id not in self._job_results:
+            job.status = "canceled"
+            self._canceled += 1
+        else:
+            job.status = "completed" if self._job_results[job.job_id] else "failed"
+            self._completed += 1
+        self._retire(job)
+        
+        self._dispatch()
+        self._check_idle()
+    
+    def _retire(self, job: QueuedJob):
+        """Drop a finished job's payload and forget the oldest finished jobs."""
+        job.release_payload()
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.FINISHED_HISTORY:
+            old_id = self._finished.popleft()
+            old = self._jobs.get(old_id)
+            # The id may have been re-enqueued since it finished
+            if old is not None and old.status not in ("queued", "running"):
+                del self._jobs[old_id]
+                self._job_results.pop(old_id, None)
+    
+    def _oldest_queued(self) -> Optional[QueuedJob]:
+        """Longest-waiting queued job (front of the FIFO after stale entries)."""
+        while self._fifo:
+            job = self._fifo[0]
+            if job.status == "queued" and self._jobs.get(job.job_id) is job:
+                return job
+            self._fifo.popleft()
+        return None
+    
+    def _check_idle(self):
+        if not self._queued_count and not self._active_jobs:
+            self._idle.set()
+    
+    async def join(self):
+        """Wait until no jobs are queued or running."""
+        await self._idle.wait()
+    
+    def _account_slots(self):
+        """Accumulate busy slot-seconds up to now."""
+        now = self._clock()
+        if self._last_slot_change is not None:
+            self._busy_slot_seconds += len(self._active_jobs) * (now - self._last_slot_change)
+        self._last_slot_change = now
+    
+    async def _run_job(self, job: QueuedJob):
         """Run a single job."""
-        job_id = job["job_id"]
+        job_id = job.job_id
         
         try:
             success = await self.worker.run_clip_plan(
-                job["plan"],
-                job["scenes"],
-                job["clips"],
-                job["bibles"]
+                job.plan,
+                job.scenes,
+                job.clips,
+                job.bibles
             )
             self._job_results[job_id] = success
             
@@ -567,11 +894,35 @@ class OrchestrationQueue:
         """Get result for a completed job."""
         return self._job_results.get(job_id)
     
+    def get_job(self, job_id: str) -> Optional[QueuedJob]:
+        """Get a queued, running or finished job."""
+        return self._jobs.get(job_id)
+    
     def get_queue_status(self) -> Dict[str, Any]:
-        """Get queue status."""
+        """Get queue status, queue-wait and slot-utilization metrics."""
+        self._account_slots()
+        now = self._clock()
+        
+        waits = sorted(self._wait_samples)
+        oldest = self._oldest_queued()
+        elapsed = now - self._started_at if self._started_at is not None else 0.0
+        capacity = self.max_workers * elapsed
+        
         return {
             "running": self._running,
-            "queued": self._queue.qsize(),
+            "queued": self._queued_count,
             "active": len(self._active_jobs),
-            "completed": len(self._job_results)
+            "completed": self._completed,
+            "canceled": self._canceled,
+            "max_workers": self.max_workers,
+            "active_by_project": dict(self._active_by_project),
+            "queue_wait_seconds": {
+                "samples": len(waits),
+                "avg": sum(waits) / len(waits) if waits else 0.0,
+                "p50": waits[len(waits) // 2] if waits else 0.0,
+                "p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                "max": waits[-1] if waits else 0.0,
+                "oldest_queued": now - oldest.enqueued_at if oldest is not None else 0.0,
+            },
+            "slot_utilization": self._busy_slot_seconds / capacity if capacity > 0 else 0.0,
         }
@@ -0,0 +1,190 @@
+"""
+Provider Rate Limits
+====================
+Per-provider request-rate and concurrency governance for clip generation.
+
+Each provider gets:
+- A token bucket limiting generation requests per minute
+- A cap on concurrent in-flight generations (create → completion)
+
+Usage:
+    governor = ProviderGovernor({"sora": ProviderRateLimit(requests_per_minute=20, max_concurrent=2)})
+    async with governor.generation_slot("sora"):
+        generation = await provider.create_clip(payload)
+        completed = await provider.wait_for_completion(generation.provider_generation_id)
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderRateLimit:
+    """Limits for one provider (None = unlimited)."""
+    requests_per_minute: Optional[float] = None
+    max_concurrent: Optional[int] = None
+    burst: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "max_concurrent": self.max_concurrent,
+            "burst": self.burst
+        }
+
+
+def provider_key(provider: Any) -> str:
+    """Normalize ProviderName enums (either package's) and strings."""
+    return getattr(provider, "value", provider)
+
+
+class TokenBucket:
+    """
+    Token bucket with reservations.
+
+    acquire() takes a token immediately and, if the bucket is in debt,
+    sleeps until that token would have been refilled. Waiters are therefore
+    served in call order without a lock, and the bucket is not tied to an
+    event loop.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token; return seconds until it is actually available."""
+        self._refill()
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds waited."""
+        delay = self.reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # Give the unused reservation back
+                self._tokens += 1
+                raise
+        return delay
+
+
+class _ProviderState:
+    def __init__(self, limit: ProviderRateLimit, clock: Callable[[], float]):
+        self.limit = limit
+        self.bucket = (
+            TokenBucket(limit.requests_per_minute, limit.burst, clock)
+            if limit.requests_per_minute else None
+        )
+        self.semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.throttled_seconds = 0.0
+        self.slot_wait_seconds = 0.0
+
+    def semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.limit.max_concurrent:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self.semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self.semaphores[loop] = asyncio.Semaphore(self.limit.max_concurrent)
+        return semaphore
+
+
+class ProviderGovernor:
+    """
+    Applies ProviderRateLimit per provider.
+
+    Args:
+        limits: Limits by provider name
+        default: Limits for providers not in `limits` (default: unlimited)
+        clock: Monotonic time source for the token buckets
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[Any, ProviderRateLimit]] = None,
+        default: Optional[ProviderRateLimit] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.limits = {provider_key(k): v for k, v in (limits or {}).items()}
+        self.default = default or ProviderRateLimit()
+        self._clock = clock
+        self._states: Dict[str, _ProviderState] = {}
+
+    def _state(self, provider: Any) -> _ProviderState:
+        key = provider_key(provider)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _ProviderState(self.limits.get(key, self.default), self._clock)
+        return state
+
+    @asynccontextmanager
+    async def generation_slot(self, provider: Any) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot and one request token for a generation.
+
+        The slot is taken first so waiting for it does not burn tokens.
+        """
+        state = self._state(provider)
+        semaphore = state.semaphore()
+
+        if semaphore is not None:
+            started = self._clock()
+            await semaphore.acquire()
+            state.slot_wait_seconds += self._clock() - started
+        try:
+            if state.bucket is not None:
+                waited = await state.bucket.acquire()
+                if waited:
+                    state.throttled_seconds += waited
+                    logger.debug(f"Provider {provider_key(provider)} throttled {waited:.2f}s")
+
+            state.requests += 1
+            state.in_flight += 1
+            state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+            try:
+                yield
+            finally:
+                state.in_flight -= 1
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider request counts, in-flight generations and wait times."""
+        return {
+            key: {
+                "limits": state.limit.to_dict(),
+                "requests": state.requests,
+                "in_flight": state.in_flight,
+                "peak_in_flight": state.peak_in_flight,
+                "throttled_seconds": round(state.throttled_seconds, 3),
+                "slot_wait_seconds": round(state.slot_wait_seconds, 3),
+            }
+            for key, state in self._states.items()
+        }
@@ -704,13 +704,8 @@ Format as JSON with ALL fields populated:
     async def _get_video_duration(self, video_path: str) -> float:
         """Get video duration in seconds"""
         try:
-            import subprocess
-            result = subprocess.run(
-                ["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
-                 "-of", "default=noprint_wrappers=1:nokey=1", video_path],
-                capture_output=True, text=True
-            )
-            return float(result.stdout.strip())
+            from services.ffprobe_service import get_probe_service
+            return (await get_probe_service().probe(video_path)).duration or 0.0
         except Exception:
             return 0.0
     
@@ -7,6 +7,8 @@ Supports multiple sources:
 - Meme templates (multiple adapters)
 - B-roll (multiple adapters)
 - UGC content (UGC b-roll, UGC videos, etc.)
+
+Local libraries share one probe-once media index (VisualsCatalog).
 """
 
 from .worker import VisualsWorker
@@ -15,6 +17,7 @@ from .adapters.base import VisualsAdapter
 from .adapters.meme import MemeAdapter
 from .adapters.broll import BrollAdapter
 from .adapters.ugc import UGCAdapter
+from .catalog import VisualsCatalog, get_visuals_catalog
 
 __all__ = [
     "VisualsWorker",
@@ -25,5 +28,7 @@ __all__ = [
     "MemeAdapter",
     "BrollAdapter",
     "UGCAdapter",
+    "VisualsCatalog",
+    "get_visuals_catalog",
 ]
 
@@ -2,6 +2,9 @@
 B-roll Adapter
 ==============
 Adapter for B-roll footage from various sources.
+
+Local footage is served from the shared visuals catalog, which probes each
+file once in the background.
 """
 
 import logging
@@ -11,6 +14,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from .base import VisualsAdapter
+from services.visuals.catalog import VIDEO_EXTENSIONS, VisualsCatalog, get_visuals_catalog
 from services.visuals.models import VisualsSearchCriteria, VisualsResponse, VisualsType
 
 logger = logging.getLogger(__name__)
@@ -29,7 +33,8 @@ class BrollAdapter(VisualsAdapter):
     def __init__(
         self,
         broll_dir: Optional[str] = None,
-        rapidapi_key: Optional[str] = None
+        rapidapi_key: Optional[str] = None,
+        catalog: Optional[VisualsCatalog] = None
     ):
         """
         Initialize B-roll adapter.
@@ -37,6 +42,7 @@ class BrollAdapter(VisualsAdapter):
         Args:
             broll_dir: Directory containing B-roll footage (default: data/broll)
             rapidapi_key: RapidAPI key for social platform B-roll
+            catalog: Media index (default: shared visuals catalog)
         """
         if broll_dir is None:
             broll_dir = "data/broll"
@@ -44,6 +50,7 @@ class BrollAdapter(VisualsAdapter):
         self.broll_dir.mkdir(parents=True, exist_ok=True)
         
         self.rapidapi_key = rapidapi_key or os.getenv("RAPIDAPI_KEY")
+        self.catalog = catalog or get_visuals_catalog()
     
     def get_source_name(self) -> str:
         return "broll"
@@ -64,27 +71,30 @@ class BrollAdapter(VisualsAdapter):
         """
         results = []
         
-        # Search local B-roll library
+        # Search local B-roll library (indexed)
         if self.broll_dir.exists():
-            video_extensions = [".mp4", ".mov", ".avi", ".mkv", ".webm"]
-            for ext in video_extensions:
-                for file_path in self.broll_dir.rglob(f"*{ext}"):
-                    # Check if matches criteria
-                    if self._matches_criteria(file_path, criteria):
-                        # Get duration (simplified - would use video library in production)
-                        duration = self._get_video_duration(file_path)
-                        
-                        results.append({
-                            "asset_id": str(file_path.relative_to(self.broll_dir)),
-                            "title": file_path.stem,
-                            "path": str(file_path),
-                            "duration": duration,
-                            "source": "local",
-                            "type": "broll"
-                        })
-                        
-                        if len(results) >= limit:
-                            break
+            await self.catalog.ensure_scanned(self.broll_dir, VIDEO_EXTENSIONS)
+            for asset in self.catalog.search(
+                self.broll_dir,
+                keywords=criteria.keywords,
+                aspect_ratio=criteria.aspect_ratio,
+                duration_min=criteria.duration_min,
+                duration_max=criteria.duration_max,
+                limit=limit
+            ):
+                results.append({
+                    "asset_id": asset["key"],
+                    "title": asset["title"],
+                    "path": asset["path"],
+                    "duration": asset["duration"] or 0.0,
+                    "width": asset["width"],
+                    "height": asset["height"],
+                    "aspect_ratio": asset["aspect_ratio"],
+                    "fps": asset["fps"],
+                    "codec": asset["codec"],
+                    "source": "local",
+                    "type": "broll"
+                })
         
         # If not enough results and RapidAPI available, search social platforms
         if len(results) < limit and self.rapidapi_key and criteria.trending:
@@ -117,14 +127,15 @@ class BrollAdapter(VisualsAdapter):
             else:
                 visuals_path = str(source_path)
             
-            duration = self._get_video_duration(source_path)
+            info = await self.catalog.get_info(self.broll_dir, Path(asset_id).as_posix())
             
             return VisualsResponse(
                 job_id=asset_id,
                 success=True,
                 visuals_path=visuals_path,
                 visuals_type="broll",
-                duration_seconds=duration,
+                duration_seconds=(info or {}).get("duration") or 0.0,
+                metadata=info,
                 source="local"
             )
         else:
@@ -303,41 +314,3 @@ class BrollAdapter(VisualsAdapter):
                 success=False,
                 error=str(e)
             )
-    
-    def _matches_criteria(self, file_path: Path, criteria: VisualsSearchCriteria) -> bool:
-        """Check if B-roll file matches criteria."""
-        filename = file_path.stem.lower()
-        
-        # Check keywords
-        if criteria.keywords:
-            if not any(keyword.lower() in filename for keyword in criteria.keywords):
-                return False
-        
-        # Check aspect ratio in filename or metadata
-        if criteria.aspect_ratio:
-            # Would check video metadata in production
-            pass
-        
-        return True
-    
-    def _get_video_duration(self, file_path: Path) -> float:
-        """Get video duration (simplified - would use ffprobe in production)."""
-        try:
-            import subprocess
-            result = subprocess.run(
-                [
-                    "ffprobe", "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    str(file_path)
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-        except Exception:
-            pass
-        return 0.0
-
@@ -2,6 +2,8 @@
 Meme Adapter
 ============
 Adapter for meme templates from various sources.
+
+Local templates are served from the shared visuals catalog.
 """
 
 import logging
@@ -11,6 +13,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from .base import VisualsAdapter
+from services.visuals.catalog import IMAGE_EXTENSIONS, VisualsCatalog, get_visuals_catalog
 from services.visuals.models import VisualsSearchCriteria, VisualsResponse, VisualsType
 
 logger = logging.getLogger(__name__)
@@ -25,13 +28,19 @@ class MemeAdapter(VisualsAdapter):
         - RapidAPI for trending memes from social platforms
     """
     
-    def __init__(self, meme_dir: Optional[str] = None, rapidapi_key: Optional[str] = None):
+    def __init__(
+        self,
+        meme_dir: Optional[str] = None,
+        rapidapi_key: Optional[str] = None,
+        catalog: Optional[VisualsCatalog] = None
+    ):
         """
         Initialize meme adapter.
         
         Args:
             meme_dir: Directory containing meme templates (default: data/memes)
             rapidapi_key: RapidAPI key for social platform memes
+            catalog: Media index (default: shared visuals catalog)
         """
         if meme_dir is None:
             meme_dir = "data/memes"
@@ -39,6 +48,7 @@ class MemeAdapter(VisualsAdapter):
         self.meme_dir.mkdir(parents=True, exist_ok=True)
         
         self.rapidapi_key = rapidapi_key or os.getenv("RAPIDAPI_KEY")
+        self.catalog = catalog or get_visuals_catalog()
     
     def get_source_name(self) -> str:
         return "meme"
@@ -59,23 +69,26 @@ class MemeAdapter(VisualsAdapter):
         """
         results = []
         
-        # Search local meme library
+        # Search local meme library (indexed; mood/style must appear in the name)
         if self.meme_dir.exists():
-            image_extensions = [".png", ".jpg", ".jpeg", ".gif", ".webp"]
-            for ext in image_extensions:
-                for file_path in self.meme_dir.rglob(f"*{ext}"):
-                    # Check if matches criteria
-                    if self._matches_criteria(file_path, criteria):
-                        results.append({
-                            "asset_id": str(file_path.relative_to(self.meme_dir)),
-                            "title": file_path.stem,
-                            "path": str(file_path),
-                            "source": "local",
-                            "type": "meme"
-                        })
-                        
-                        if len(results) >= limit:
-                            break
+            await self.catalog.ensure_scanned(self.meme_dir, IMAGE_EXTENSIONS)
+            for asset in self.catalog.search(
+                self.meme_dir,
+                keywords=criteria.keywords,
+                required_terms=[criteria.mood, criteria.style],
+                aspect_ratio=criteria.aspect_ratio,
+                limit=limit
+            ):
+                results.append({
+                    "asset_id": asset["key"],
+                    "title": asset["title"],
+                    "path": asset["path"],
+                    "width": asset["width"],
+                    "height": asset["height"],
+                    "aspect_ratio": asset["aspect_ratio"],
+                    "source": "local",
+                    "type": "meme"
+                })
         
         # If not enough results and RapidAPI available, search social platforms
         if len(results) < limit and self.rapidapi_key and criteria.trending:
@@ -236,21 +249,3 @@ class MemeAdapter(VisualsAdapter):
                 success=False,
                 error=str(e)
             )
-    
-    def _matches_criteria(self, file_path: Path, criteria: VisualsSearchCriteria) -> bool:
-        """Check if meme file matches criteria."""
-        filename = file_path.stem.lower()
-        
-        # Check keywords
-        if criteria.keywords:
-            if not any(keyword.lower() in filename for keyword in criteria.keywords):
-                return False
-        
-        # Check mood/style in filename
-        if criteria.mood and criteria.mood.lower() not in filename:
-            return False
-        if criteria.style and criteria.style.lower() not in filename:
-            return False
-        
-        return True
-
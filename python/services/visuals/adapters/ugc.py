@@ -2,6 +2,9 @@
 UGC Adapter
 ===========
 Adapter for User-Generated Content (UGC) from various sources.
+
+Local content is served from the shared visuals catalog, which probes each
+file once in the background.
 """
 
 import logging
@@ -11,6 +14,7 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from .base import VisualsAdapter
+from services.visuals.catalog import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, VisualsCatalog, get_visuals_catalog
 from services.visuals.models import VisualsSearchCriteria, VisualsResponse, VisualsType
 
 logger = logging.getLogger(__name__)
@@ -29,7 +33,8 @@ class UGCAdapter(VisualsAdapter):
     def __init__(
         self,
         ugc_dir: Optional[str] = None,
-        rapidapi_key: Optional[str] = None
+        rapidapi_key: Optional[str] = None,
+        catalog: Optional[VisualsCatalog] = None
     ):
         """
         Initialize UGC adapter.
@@ -37,6 +42,7 @@ class UGCAdapter(VisualsAdapter):
         Args:
             ugc_dir: Directory containing UGC content (default: data/ugc)
             rapidapi_key: RapidAPI key for social platform UGC
+            catalog: Media index (default: shared visuals catalog)
         """
         if ugc_dir is None:
             ugc_dir = "data/ugc"
@@ -44,6 +50,7 @@ class UGCAdapter(VisualsAdapter):
         self.ugc_dir.mkdir(parents=True, exist_ok=True)
         
         self.rapidapi_key = rapidapi_key or os.getenv("RAPIDAPI_KEY")
+        self.catalog = catalog or get_visuals_catalog()
     
     def get_source_name(self) -> str:
         return "ugc"
@@ -64,35 +71,29 @@ class UGCAdapter(VisualsAdapter):
         """
         results = []
         
-        # Search local UGC library
+        # Search local UGC library (indexed videos and images)
         if self.ugc_dir.exists():
-            # Video files
-            video_extensions = [".mp4", ".mov", ".avi", ".mkv", ".webm"]
-            # Image files
-            image_extensions = [".png", ".jpg", ".jpeg", ".gif", ".webp"]
-            
-            all_extensions = video_extensions + image_extensions
-            
-            for ext in all_extensions:
-                for file_path in self.ugc_dir.rglob(f"*{ext}"):
-                    # Check if matches criteria
-                    if self._matches_criteria(file_path, criteria):
-                        is_video = ext in video_extensions
-                        duration = None
-                        if is_video:
-                            duration = self._get_video_duration(file_path)
-                        
-                        results.append({
-                            "asset_id": str(file_path.relative_to(self.ugc_dir)),
-                            "title": file_path.stem,
-                            "path": str(file_path),
-                            "duration": duration,
-                            "type": "video" if is_video else "image",
-                            "source": "local_ugc"
-                        })
-                        
-                        if len(results) >= limit:
-                            break
+            await self.catalog.ensure_scanned(self.ugc_dir, VIDEO_EXTENSIONS + IMAGE_EXTENSIONS)
+            for asset in self.catalog.search(
+                self.ugc_dir,
+                keywords=criteria.keywords,
+                aspect_ratio=criteria.aspect_ratio,
+                duration_min=criteria.duration_min,
+                duration_max=criteria.duration_max,
+                limit=limit
+            ):
+                is_video = asset["media_type"] == "video"
+                results.append({
+                    "asset_id": asset["key"],
+                    "title": asset["title"],
+                    "path": asset["path"],
+                    "duration": (asset["duration"] or 0.0) if is_video else None,
+                    "width": asset["width"],
+                    "height": asset["height"],
+                    "aspect_ratio": asset["aspect_ratio"],
+                    "type": asset["media_type"],
+                    "source": "local_ugc"
+                })
         
         # TODO: Search MediaPoster media library
         # This would query the database for UGC content
@@ -129,10 +130,11 @@ class UGCAdapter(VisualsAdapter):
                 visuals_path = str(source_path)
             
             # Determine type
-            is_video = source_path.suffix.lower() in [".mp4", ".mov", ".avi", ".mkv", ".webm"]
+            is_video = source_path.suffix.lower() in VIDEO_EXTENSIONS
+            info = await self.catalog.get_info(self.ugc_dir, Path(asset_id).as_posix())
             duration = None
             if is_video:
-                duration = self._get_video_duration(source_path)
+                duration = (info or {}).get("duration") or 0.0
             
             return VisualsResponse(
                 job_id=asset_id,
@@ -140,6 +142,7 @@ class UGCAdapter(VisualsAdapter):
                 visuals_path=visuals_path,
                 visuals_type="video" if is_video else "image",
                 duration_seconds=duration,
+                metadata=info,
                 source="local_ugc"
             )
         else:
@@ -347,36 +350,3 @@ class UGCAdapter(VisualsAdapter):
                 job_id=asset_id, success=False,
                 error=str(e)
             )
-    
-    def _matches_criteria(self, file_path: Path, criteria: VisualsSearchCriteria) -> bool:
-        """Check if UGC file matches criteria."""
-        filename = file_path.stem.lower()
-        
-        # Check keywords
-        if criteria.keywords:
-            if not any(keyword.lower() in filename for keyword in criteria.keywords):
-                return False
-        
-        return True
-    
-    def _get_video_duration(self, file_path: Path) -> float:
-        """Get video duration (simplified - would use ffprobe in production)."""
-        try:
-            import subprocess
-            result = subprocess.run(
-                [
-                    "ffprobe", "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    str(file_path)
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                return float(result.stdout.strip())
-        except Exception:
-            pass
-        return 0.0
-
@@ -0,0 +1,505 @@
+"""
+Visuals Catalog
+===============
+Shared, probe-once media index for the local B-roll, UGC and meme libraries.
+
+Each library directory is walked by a background scanner. New or changed
+files (by mtime + size) are indexed right away by name, then probed once
+with a single ffprobe call for duration, resolution, aspect, fps and codec.
+Probes run off the request path with bounded concurrency. Searches read
+only the SQLite index:
+
+    - keywords / mood / style: case-insensitive filename substring match
+      (FTS5 trigram index; LIKE for terms shorter than three characters)
+    - aspect_ratio: "9:16", "16:9", "1:1", ... within ASPECT_TOLERANCE
+    - duration_min / duration_max: video duration (images always pass)
+
+Files that have not been probed yet only show up in searches without an
+aspect or duration filter.
+
+Usage:
+    catalog = get_visuals_catalog()
+    await catalog.ensure_scanned("data/broll", VIDEO_EXTENSIONS)
+    rows = catalog.search("data/broll", keywords=["city"], aspect_ratio="9:16")
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+from math import gcd
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from services.ffprobe_service import get_probe_service
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+# Relative tolerance when matching aspect ratios (1080x1920 vs 720x1280 etc.)
+ASPECT_TOLERANCE = 0.02
+
+DEFAULT_SCAN_INTERVAL_SECONDS = 30.0
+DEFAULT_PROBE_CONCURRENCY = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS visuals (
+    id INTEGER PRIMARY KEY,
+    library TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    title TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    probed INTEGER NOT NULL DEFAULT 0,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    aspect REAL,
+    fps REAL,
+    codec TEXT,
+    UNIQUE (library, key)
+);
+CREATE INDEX IF NOT EXISTS idx_visuals_aspect ON visuals (library, aspect);
+CREATE INDEX IF NOT EXISTS idx_visuals_duration ON visuals (library, duration);
+CREATE INDEX IF NOT EXISTS idx_visuals_probed ON visuals (library, probed);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS visuals_fts USING fts5(
+    title, content='visuals', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS visuals_ai AFTER INSERT ON visuals BEGIN
+    INSERT INTO visuals_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS visuals_ad AFTER DELETE ON visuals BEGIN
+    INSERT INTO visuals_fts (visuals_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS visuals_au AFTER UPDATE OF title ON visuals BEGIN
+    INSERT INTO visuals_fts (visuals_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO visuals_fts (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+_COLUMNS = (
+    "key", "path", "title", "media_type", "probed",
+    "duration", "width", "height", "aspect", "fps", "codec",
+)
+
+ProbeFn = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+class VisualsCatalog:
+    """SQLite index of local visual assets, filled by a background scanner."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = ":memory:",
+        probe: Optional[ProbeFn] = None,
+        probe_concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+        scan_interval: float = DEFAULT_SCAN_INTERVAL_SECONDS
+    ):
+        """
+        Args:
+            db_path: Catalog file (":memory:" for a throwaway index)
+            probe: async path -> {duration, width, height, fps, codec}
+                (default: one ffprobe call)
+            probe_concurrency: Max probes running at once
+            scan_interval: Seconds between background re-scans of a library
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.probe = probe or probe_visual_file
+        self.probe_concurrency = probe_concurrency
+        self.scan_interval = scan_interval
+
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite < 3.34 has no trigram tokenizer; keyword queries use LIKE
+            logger.warning(f"Visuals catalog without FTS index: {e}")
+            self._fts = False
+
+        self._scanners: Dict[str, asyncio.Task] = {}
+        self.stats = {"scans": 0, "probes": 0, "probe_failures": 0}
+
+    @staticmethod
+    def library_name(root: Union[str, Path]) -> str:
+        return str(Path(root).resolve())
+
+    # ─── Scanning ────────────────────────────────────────────────────────────
+
+    async def ensure_scanned(self, root: Union[str, Path], extensions: Iterable[str]) -> None:
+        """
+        Make sure a background scanner is running for root.
+
+        The first call for a library that has never been indexed waits for
+        the directory walk (not the probes) so names are searchable at once.
+        """
+        library = self.library_name(root)
+        task = self._scanners.get(library)
+        loop = asyncio.get_running_loop()
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+
+        extensions = tuple(ext.lower() for ext in extensions)
+        if not self.count(library):
+            await self._index_files(Path(library), extensions)
+        self._scanners[library] = loop.create_task(self._scan_forever(Path(library), extensions))
+
+    async def scan(self, root: Union[str, Path], extensions: Iterable[str]) -> Dict[str, int]:
+        """
+        One full pass: index new/changed files, drop vanished ones, then
+        probe everything not yet probed.
+
+        Returns:
+            Counts of added/updated/removed/unchanged/probed files
+        """
+        root = Path(self.library_name(root))
+        extensions = tuple(ext.lower() for ext in extensions)
+        counts = await self._index_files(root, extensions)
+        counts["probed"] = await self.probe_pending(root)
+        self.stats["scans"] += 1
+        return counts
+
+    async def stop(self) -> None:
+        """Cancel background scanners."""
+        tasks = [t for t in self._scanners.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._scanners.clear()
+
+    async def _scan_forever(self, root: Path, extensions: Tuple[str, ...]) -> None:
+        while True:
+            try:
+                await self.scan(root, extensions)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Visuals catalog scan of {root} failed: {e}")
+            await asyncio.sleep(self.scan_interval)
+
+    async def _index_files(self, root: Path, extensions: Tuple[str, ...]) -> Dict[str, int]:
+        library = str(root)
+        files = await asyncio.to_thread(_walk_files, root, extensions)
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with self._lock:
+            known = {
+                key: (mtime_ns, size)
+                for key, mtime_ns, size in self._db.execute(
+                    "SELECT key, mtime_ns, size FROM visuals WHERE library = ?", (library,)
+                )
+            }
+
+            upserts = []
+            for key, path, mtime_ns, size in files:
+                previous = known.pop(key, None)
+                if previous == (mtime_ns, size):
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated" if previous else "added"] += 1
+                stem, ext = os.path.splitext(os.path.basename(key))
+                media_type = "image" if ext.lower() in IMAGE_EXTENSIONS else "video"
+                upserts.append((library, key, path, stem, media_type, mtime_ns, size))
+            counts["removed"] = len(known)
+
+            if upserts or known:
+                with self._db:
+                    # A changed file loses its probe results until re-probed
+                    self._db.executemany(
+                        """
+                        INSERT INTO visuals (library, key, path, title, media_type, mtime_ns, size)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (library, key) DO UPDATE SET
+                            path = excluded.path, title = excluded.title,
+                            media_type = excluded.media_type, mtime_ns = excluded.mtime_ns,
+                            size = excluded.size, probed = 0, duration = NULL, width = NULL,
+                            height = NULL, aspect = NULL, fps = NULL, codec = NULL
+                        """,
+                        upserts,
+                    )
+                    self._db.executemany(
+                        "DELETE FROM visuals WHERE library = ? AND key = ?",
+                        [(library, key) for key in known],
+                    )
+
+        if upserts or known:
+            logger.info(
+                f"Visuals catalog {root}: +{counts['added']} ~{counts['updated']} -{counts['removed']} "
+                f"({counts['unchanged']} unchanged)"
+            )
+        return counts
+
+    # ─── Probing ─────────────────────────────────────────────────────────────
+
+    async def probe_pending(self, root: Union[str, Path]) -> int:
+        """Probe every indexed file of a library that has not been probed."""
+        library = self.library_name(root)
+        with self._lock:
+            pending = self._db.execute(
+                "SELECT key, path, media_type, mtime_ns, size FROM visuals WHERE library = ? AND probed = 0",
+                (library,),
+            ).fetchall()
+        if not pending:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.probe_concurrency)
+
+        async def probe_one(row):
+            async with semaphore:
+                await self._probe_and_store(library, *row)
+
+        await asyncio.gather(*(probe_one(row) for row in pending))
+        return len(pending)
+
+    async def get_info(self, root: Union[str, Path], key: str) -> Optional[Dict[str, Any]]:
+        """
+        Indexed info for one file, probing it now if it is new, changed or
+        not probed yet. None if the file does not exist.
+        """
+        library = self.library_name(root)
+        path = Path(library) / key
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+
+        row = self._get(library, key)
+        if row is not None and row["probed"] and row["_stamp"] == (st.st_mtime_ns, st.st_size):
+            return _public(row)
+
+        media_type = "image" if path.suffix.lower() in IMAGE_EXTENSIONS else "video"
+        with self._lock, self._db:
+            self._db.execute(
+                """
+                INSERT INTO visuals (library, key, path, title, media_type, mtime_ns, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (library, key) DO UPDATE SET
+                    path = excluded.path, mtime_ns = excluded.mtime_ns, size = excluded.size, probed = 0
+                """,
+                (library, key, str(path), path.stem, media_type, st.st_mtime_ns, st.st_size),
+            )
+        await self._probe_and_store(library, key, str(path), media_type, st.st_mtime_ns, st.st_size)
+        row = self._get(library, key)
+        return _public(row) if row else None
+
+    async def _probe_and_store(
+        self, library: str, key: str, path: str, media_type: str, mtime_ns: int, size: int
+    ) -> None:
+        self.stats["probes"] += 1
+        try:
+            info = await self.probe(path)
+        except Exception as e:
+            self.stats["probe_failures"] += 1
+            logger.debug(f"Probe failed for {path}: {e}")
+            info = {}
+
+        width, height = info.get("width"), info.get("height")
+        aspect = width / height if width and height else None
+        duration = info.get("duration") if media_type == "video" else None
+        with self._lock, self._db:
+            # Skip the write if the file changed while it was being probed
+            self._db.execute(
+                """
+                UPDATE visuals SET probed = 1, duration = ?, width = ?, height = ?,
+                    aspect = ?, fps = ?, codec = ?
+                WHERE library = ? AND key = ? AND mtime_ns = ? AND size = ?
+                """,
+                (duration, width, height, aspect, info.get("fps"), info.get("codec"),
+                 library, key, mtime_ns, size),
+            )
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
+
+    def search(
+        self,
+        root: Union[str, Path],
+        keywords: Optional[List[str]] = None,
+        required_terms: Optional[List[str]] = None,
+        media_type: Optional[str] = None,
+        aspect_ratio: Optional[str] = None,
+        duration_min: Optional[float] = None,
+        duration_max: Optional[float] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Indexed search of one library.
+
+        Args:
+            root: Library directory
+            keywords: Filename must contain any of these (case-insensitive)
+            required_terms: Filename must contain all of these (e.g. mood, style)
+            media_type: "video" or "image"
+            aspect_ratio: "W:H" (e.g. "9:16"); needs probed dimensions.
+                Unparseable values are logged and not filtered on
+            duration_min: Minimum video duration in seconds
+            duration_max: Maximum video duration in seconds
+            limit: Maximum number of results
+
+        Returns:
+            Asset dicts (key, path, title, media_type, probed, duration,
+            width, height, aspect, aspect_ratio, fps, codec) ordered by key
+        """
+        clauses = ["library = ?"]
+        params: List[Any] = [self.library_name(root)]
+
+        if keywords:
+            terms = [self._term_clause(k) for k in keywords if k]
+            if terms:
+                clauses.append("(" + " OR ".join(c for c, _ in terms) + ")")
+                params.extend(p for _, p in terms)
+        for term in required_terms or []:
+            if term:
+                clause, param = self._term_clause(term)
+                clauses.append(clause)
+                params.append(param)
+        if media_type:
+            clauses.append("media_type = ?")
+            params.append(media_type)
+        if aspect_ratio:
+            target = parse_aspect_ratio(aspect_ratio)
+            if target is None:
+                logger.warning(f"Ignoring unparseable aspect ratio {aspect_ratio!r} in visuals search")
+            else:
+                clauses.append("aspect BETWEEN ? AND ?")
+                params += [target * (1 - ASPECT_TOLERANCE), target * (1 + ASPECT_TOLERANCE)]
+        if duration_min is not None:
+            clauses.append("(media_type = 'image' OR duration >= ?)")
+            params.append(duration_min)
+        if duration_max is not None:
+            clauses.append("(media_type = 'image' OR duration <= ?)")
+            params.append(duration_max)
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM visuals WHERE {' AND '.join(clauses)} ORDER BY key LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, (*params, limit)).fetchall()
+        return [_public(dict(zip(_COLUMNS, row))) for row in rows]
+
+    def _term_clause(self, term: str) -> Tuple[str, str]:
+        """Substring match on the title: trigram FTS when possible, else LIKE."""
+        if self._fts and len(term) >= 3:
+            return (
+                "id IN (SELECT rowid FROM visuals_fts WHERE visuals_fts MATCH ?)",
+                '"' + term.replace('"', '""') + '"',
+            )
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return "title LIKE ? ESCAPE '\\'", f"%{escaped}%"
+
+    def count(self, root: Union[str, Path], probed: Optional[bool] = None) -> int:
+        sql = "SELECT COUNT(*) FROM visuals WHERE library = ?"
+        params: List[Any] = [self.library_name(root)]
+        if probed is not None:
+            sql += " AND probed = ?"
+            params.append(int(probed))
+        with self._lock:
+            return self._db.execute(sql, params).fetchone()[0]
+
+    def _get(self, library: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(_COLUMNS)}, mtime_ns, size FROM visuals WHERE library = ? AND key = ?",
+                (library, key),
+            ).fetchone()
+        if row is None:
+            return None
+        data = dict(zip(_COLUMNS, row))
+        data["_stamp"] = (row[-2], row[-1])
+        return data
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ─── Helpers ─────────────────────────────────────────────────────────────────
+
+def parse_aspect_ratio(value: str) -> Optional[float]:
+    """ "9:16" -> 0.5625 (width / height); also accepts "0.5625"."""
+    try:
+        if ":" in value:
+            w, h = value.split(":", 1)
+            return float(w) / float(h)
+        return float(value)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _public(row: Dict[str, Any]) -> Dict[str, Any]:
+    data = {k: v for k, v in row.items() if not k.startswith("_")}
+    data["probed"] = bool(data["probed"])
+    width, height = data.get("width"), data.get("height")
+    data["aspect_ratio"] = _format_aspect(width, height)
+    return data
+
+
+def _format_aspect(width: Optional[int], height: Optional[int]) -> Optional[str]:
+    if not width or not height:
+        return None
+    divisor = gcd(width, height)
+    return f"{width // divisor}:{height // divisor}"
+
+
+def _walk_files(root: Path, extensions: Tuple[str, ...]) -> List[Tuple[str, str, int, int]]:
+    """(key, path, mtime_ns, size) for files under root with a matching extension."""
+    files = []
+    stack = [("", str(root))]
+    while stack:
+        prefix, directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((prefix + entry.name + "/", entry.path))
+                elif os.path.splitext(entry.name)[1].lower() in extensions:
+                    st = entry.stat()
+                    files.append((prefix + entry.name, entry.path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+    return files
+
+
+async def probe_visual_file(path: str) -> Dict[str, Any]:
+    """
+    Duration, resolution, fps and codec from the shared ffprobe service.
+
+    Raises:
+        RuntimeError: If ffprobe fails
+    """
+    info = await get_probe_service().probe(path)
+    return {
+        "duration": info.duration,
+        "width": info.width,
+        "height": info.height,
+        "fps": info.fps,
+        "codec": info.codec,
+    }
+
+
+# ─── Singleton ───────────────────────────────────────────────────────────────
+
+_catalog: Optional[VisualsCatalog] = None
+
+
+def get_visuals_catalog() -> VisualsCatalog:
+    """Shared catalog for all visuals adapters ($VISUALS_CATALOG_PATH)."""
+    global _catalog
+    if _catalog is None:
+        _catalog = VisualsCatalog(os.getenv("VISUALS_CATALOG_PATH", "data/visuals_catalog.db"))
+    return _catalog
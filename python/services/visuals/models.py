@@ -83,6 +83,7 @@ class VisualsResponse:
     visuals_type: Optional[str] = None
     duration_seconds: Optional[float] = None  # For video
     metadata: Optional[Dict[str, Any]] = None
+    source: Optional[str] = None  # "local", "rapidapi_pexels", ...
     error: Optional[str] = None
     correlation_id: Optional[str] = None
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
@@ -8,6 +8,7 @@ Features:
 - Dialogue turn management
 - Voice consistency across scenes
 - Parallel voice generation
+- Cached lines reused via one batch cache lookup per script
 
 Usage:
     from services.voice.multi_voice_content_service import MultiVoiceContentService
@@ -90,16 +91,19 @@ class MultiVoiceContentService:
     Orchestrates voice generation for scripts with multiple speakers.
     """
 
-    def __init__(self, voice_service=None):
+    def __init__(self, voice_service=None, voice_cache=None):
         """
         Initialize multi-voice content service.
 
         Args:
             voice_service: Voice cloning service instance
+            voice_cache: VoiceCacheService (default: shared instance)
         """
         from services.voice.modal_voice_service import get_modal_voice_service
+        from services.voice.voice_cache_service import get_voice_cache_service
 
         self.voice_service = voice_service or get_modal_voice_service()
+        self.voice_cache = voice_cache or get_voice_cache_service()
 
     async def generate_multi_voice_content(
         self,
@@ -151,57 +155,74 @@ class MultiVoiceContentService:
                 errors=[error_msg]
             )
 
-        # Generate all dialogue lines
-        dialogue_lines = []
-        current_time = 0.0
+        # Look every line up in the cache at once (one round trip on Redis)
+        requests = [
+            (line_data["text"], voice_mapping[line_data["speaker"]], None)
+            for line_data in script
+        ]
+        results: List[Any] = await self.voice_cache.get_cached_voices(requests)
+        pending = [i for i, cached in enumerate(results) if cached is None]
+        if len(pending) < len(script):
+            logger.info(f"Reusing {len(script) - len(pending)}/{len(script)} cached dialogue lines")
 
-        # Process in batches for efficiency
-        for i in range(0, len(script), max_concurrent):
-            batch = script[i:i + max_concurrent]
+        # Generate the misses in batches for efficiency
+        generated = []
+        for start in range(0, len(pending), max_concurrent):
+            batch = pending[start:start + max_concurrent]
 
             # Create generation tasks
             tasks = []
-            for line_data in batch:
+            for index in batch:
+                line_data = script[index]
                 speaker = line_data["speaker"]
-                text = line_data["text"]
-                voice_ref = voice_mapping[speaker]
 
                 tasks.append(
                     self._generate_line(
                         speaker=speaker,
-                        text=text,
-                        voice_reference_url=voice_ref
+                        text=line_data["text"],
+                        voice_reference_url=voice_mapping[speaker]
                     )
                 )
 
             # Execute batch
             batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+            for index, result in zip(batch, batch_results):
+                results[index] = result
+                if not isinstance(result, Exception):
+                    text, voice_ref, options = requests[index]
+                    generated.append((text, voice_ref, result, options))
 
-            # Process results
-            for line_data, result in zip(batch, batch_results):
-                if isinstance(result, Exception):
-                    error_msg = f"Failed to generate line for {line_data['speaker']}: {result}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    continue
-
-                # Create dialogue line with timing
-                duration = result.get("duration_seconds", 2.0)
-                end_time = current_time + duration
-
-                dialogue_line = DialogueLine(
-                    speaker=line_data["speaker"],
-                    text=line_data["text"],
-                    start_time=current_time,
-                    end_time=end_time,
-                    audio_url=result.get("audio_url"),
-                    duration_seconds=duration
-                )
+        if generated:
+            await self.voice_cache.cache_voices(generated)
+
+        # Lay out the dialogue in script order
+        dialogue_lines = []
+        current_time = 0.0
+
+        for line_data, result in zip(script, results):
+            if isinstance(result, Exception):
+                error_msg = f"Failed to generate line for {line_data['speaker']}: {result}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                continue
+
+            # Create dialogue line with timing
+            duration = result.get("duration_seconds", 2.0)
+            end_time = current_time + duration
+
+            dialogue_line = DialogueLine(
+                speaker=line_data["speaker"],
+                text=line_data["text"],
+                start_time=current_time,
+                end_time=end_time,
+                audio_url=result.get("audio_url"),
+                duration_seconds=duration
+            )
 
-                dialogue_lines.append(dialogue_line)
+            dialogue_lines.append(dialogue_line)
 
-                # Advance timeline with gap
-                current_time = end_time + gap_seconds
+            # Advance timeline with gap
+            current_time = end_time + gap_seconds
 
         # Calculate total metrics
         total_duration = current_time - gap_seconds if dialogue_lines else 0.0
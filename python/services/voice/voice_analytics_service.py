@@ -6,13 +6,22 @@ Track voice clone usage, costs, and metrics.
 Features:
 - Usage tracking (requests, duration, cache hits)
 - Cost estimation based on API pricing
-- Performance metrics (latency, error rate)
+- Performance metrics (latency, error rate, latency percentiles)
 - Per-voice statistics
+- Optional append-only SQLite persistence (stats survive restarts)
+
+Events are not kept in a list. Each one is folded into two ring buffers of
+pre-aggregated buckets (per-minute for the last day, per-day for the
+retention period), each holding per-voice rollups: counts, durations, cost,
+cache hits and a latency histogram. Tracking is O(1); stats queries are
+O(buckets × voices) no matter how many events were tracked. The day ring
+makes get_stats(days=N) day-aligned: it covers the UTC day containing
+now - N days through today.
 
 Usage:
     from services.voice.voice_analytics_service import VoiceAnalyticsService
 
-    analytics = VoiceAnalyticsService()
+    analytics = VoiceAnalyticsService(db_path="data/voice_analytics.db")
 
     # Track a voice generation
     await analytics.track_generation(
@@ -25,16 +34,38 @@ Usage:
 
     # Get analytics
     stats = await analytics.get_stats(days=30)
+    recent = await analytics.get_recent_stats(minutes=60)
 """
 
 import asyncio
+import atexit
+import bisect
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from typing import Optional, Dict, Any, List, Iterable
+from dataclasses import dataclass
 from loguru import logger
 
 
+# Upper edges (ms) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Per-minute ring covers the last 24 hours
+MINUTE_BUCKETS = 24 * 60
+
+# Failed events kept for get_recent_errors
+MAX_RECENT_ERRORS = 1000
+
+# Buffered rows are written to SQLite once this many are pending...
+PERSIST_BATCH_SIZE = 100
+# ...or this many seconds after the last write
+PERSIST_INTERVAL_SECONDS = 5.0
+
+
 @dataclass
 class VoiceGenerationEvent:
     """Single voice generation event for analytics"""
@@ -49,27 +80,124 @@ class VoiceGenerationEvent:
     cost_estimate_usd: float = 0.0
 
 
+class _Rollup:
+    """Aggregates for one voice within one bucket."""
+
+    __slots__ = (
+        "requests", "successful", "cache_hits", "audio_duration",
+        "success_audio_duration", "cost", "success_processing_ms", "latency_histogram",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.successful = 0
+        self.cache_hits = 0
+        self.audio_duration = 0.0
+        self.success_audio_duration = 0.0
+        self.cost = 0.0
+        self.success_processing_ms = 0
+        self.latency_histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, event: VoiceGenerationEvent) -> None:
+        self.requests += 1
+        self.cache_hits += event.cache_hit
+        self.audio_duration += event.audio_duration_seconds
+        self.cost += event.cost_estimate_usd
+        if event.success:
+            self.successful += 1
+            self.success_audio_duration += event.audio_duration_seconds
+            self.success_processing_ms += event.processing_time_ms
+            self.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, event.processing_time_ms)] += 1
+
+    def merge(self, other: "_Rollup") -> None:
+        self.requests += other.requests
+        self.successful += other.successful
+        self.cache_hits += other.cache_hits
+        self.audio_duration += other.audio_duration
+        self.success_audio_duration += other.success_audio_duration
+        self.cost += other.cost
+        self.success_processing_ms += other.success_processing_ms
+        for i, count in enumerate(other.latency_histogram):
+            self.latency_histogram[i] += count
+
+
+class _BucketRing:
+    """
+    Fixed number of time buckets indexed by epoch // width.
+
+    A slot is reused (and reset) when a newer epoch maps onto it, so expired
+    buckets disappear without any cleanup pass.
+    """
+
+    def __init__(self, size: int, width_seconds: int):
+        self.size = size
+        self.width = width_seconds
+        self._epochs: List[int] = [-1] * size
+        self._voices: List[Optional[Dict[str, _Rollup]]] = [None] * size
+
+    def epoch_of(self, ts: float) -> int:
+        return int(ts // self.width)
+
+    def add(self, event: VoiceGenerationEvent) -> bool:
+        epoch = self.epoch_of(event.timestamp.timestamp())
+        slot = epoch % self.size
+        current = self._epochs[slot]
+        if epoch < current:
+            # Older than what this slot now holds: outside the ring
+            return False
+        if epoch != current:
+            self._epochs[slot] = epoch
+            self._voices[slot] = {}
+        rollup = self._voices[slot].get(event.voice_id)
+        if rollup is None:
+            rollup = self._voices[slot][event.voice_id] = _Rollup()
+        rollup.add(event)
+        return True
+
+    def buckets(self, first_epoch: int, last_epoch: int):
+        """(epoch, {voice_id: rollup}) for live buckets in [first_epoch, last_epoch]."""
+        first_epoch = max(first_epoch, last_epoch - self.size + 1)
+        for epoch in range(first_epoch, last_epoch + 1):
+            slot = epoch % self.size
+            if self._epochs[slot] == epoch and self._voices[slot]:
+                yield epoch, self._voices[slot]
+
+
 class VoiceAnalyticsService:
     """
     Track and analyze voice cloning usage and performance.
 
-    Stores events in memory with configurable retention.
-    For production, integrate with database or time-series DB.
+    Keeps pre-aggregated per-minute and per-day buckets in memory; with
+    db_path set, raw events are also appended to a SQLite file and replayed
+    into the buckets on startup.
     """
 
     # Pricing estimate (example: $0.10 per minute of audio)
     COST_PER_MINUTE_USD = 0.10
 
-    def __init__(self, retention_days: int = 90):
+    def __init__(self, retention_days: int = 90, db_path: Optional[str] = None):
         """
         Initialize analytics service.
 
         Args:
-            retention_days: How long to keep events in memory
+            retention_days: How many days of buckets to keep
+            db_path: Optional SQLite file for append-only event persistence
         """
         self.retention_days = retention_days
-        self.events: List[VoiceGenerationEvent] = []
-        self._lock = asyncio.Lock()
+        self._minutes = _BucketRing(MINUTE_BUCKETS, 60)
+        self._days = _BucketRing(retention_days + 1, 86400)
+        self._recent_errors: deque = deque(maxlen=MAX_RECENT_ERRORS)
+        self._lock = threading.Lock()
+
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._last_flush = time.monotonic()
+        if db_path:
+            self._open_db(db_path)
+
+    # ─── Tracking ────────────────────────────────────────────────────────────
 
     async def track_generation(
         self,
@@ -79,7 +207,8 @@ class VoiceAnalyticsService:
         processing_time_ms: int,
         cache_hit: bool = False,
         success: bool = True,
-        error: Optional[str] = None
+        error: Optional[str] = None,
+        timestamp: Optional[datetime] = None
     ) -> None:
         """
         Track a voice generation event.
@@ -92,6 +221,7 @@ class VoiceAnalyticsService:
             cache_hit: Whether result came from cache
             success: Whether generation succeeded
             error: Error message if failed
+            timestamp: When it happened (default: now, UTC)
         """
         # Calculate cost estimate
         cost = 0.0
@@ -99,7 +229,7 @@ class VoiceAnalyticsService:
             cost = (duration_seconds / 60.0) * self.COST_PER_MINUTE_USD
 
         event = VoiceGenerationEvent(
-            timestamp=datetime.now(timezone.utc),
+            timestamp=timestamp or datetime.now(timezone.utc),
             voice_id=voice_id,
             text_length=text_length,
             audio_duration_seconds=duration_seconds,
@@ -110,14 +240,89 @@ class VoiceAnalyticsService:
             cost_estimate_usd=cost
         )
 
-        async with self._lock:
-            self.events.append(event)
-            await self._cleanup_old_events()
+        self._record(event)
+        if self._db is not None and self._flush_due():
+            await asyncio.to_thread(self.flush)
+
+    def _record(self, event: VoiceGenerationEvent, persist: bool = True) -> None:
+        with self._lock:
+            self._minutes.add(event)
+            self._days.add(event)
+            if not event.success:
+                self._recent_errors.append(event)
+            if persist and self._db is not None:
+                self._pending.append(_event_row(event))
+
+    # ─── Persistence ─────────────────────────────────────────────────────────
+
+    def _open_db(self, db_path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS voice_events (
+                ts REAL NOT NULL,
+                voice_id TEXT NOT NULL,
+                text_length INTEGER NOT NULL,
+                audio_duration_seconds REAL NOT NULL,
+                processing_time_ms INTEGER NOT NULL,
+                cache_hit INTEGER NOT NULL,
+                success INTEGER NOT NULL,
+                error TEXT,
+                cost_estimate_usd REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_voice_events_ts ON voice_events (ts)")
+        # Rows still buffered at interpreter exit are written out, not dropped
+        atexit.register(self.close)
+
+        # Drop rows past retention, then rebuild the buckets from the rest
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).timestamp()
+        with self._db:
+            self._db.execute("DELETE FROM voice_events WHERE ts < ?", (cutoff,))
+        rows = self._db.execute("SELECT * FROM voice_events ORDER BY ts")
+        restored = 0
+        for row in rows:
+            self._record(_row_event(row), persist=False)
+            restored += 1
+        if restored:
+            logger.info(f"Voice analytics restored {restored} events from {db_path}")
+
+    def _flush_due(self) -> bool:
+        return (
+            len(self._pending) >= PERSIST_BATCH_SIZE
+            or time.monotonic() - self._last_flush >= PERSIST_INTERVAL_SECONDS
+        )
 
-    async def _cleanup_old_events(self):
-        """Remove events older than retention period."""
-        cutoff = datetime.now(timezone.utc) - timedelta(days=self.retention_days)
-        self.events = [e for e in self.events if e.timestamp > cutoff]
+    def flush(self) -> int:
+        """Append buffered events to SQLite. Returns the number written."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not rows or self._db is None:
+            return 0
+        try:
+            with self._db_lock, self._db:
+                self._db.executemany(
+                    "INSERT INTO voice_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Voice analytics persist failed ({len(rows)} events kept in memory only): {e}")
+            return 0
+        return len(rows)
+
+    def close(self) -> None:
+        """Flush pending events and close the SQLite file (also runs at exit)."""
+        if self._db is not None:
+            self.flush()
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+            atexit.unregister(self.close)
+
+    # ─── Queries ─────────────────────────────────────────────────────────────
 
     async def get_stats(
         self,
@@ -128,59 +333,83 @@ class VoiceAnalyticsService:
         Get voice analytics statistics.
 
         Args:
-            days: Number of days to analyze
+            days: Number of days to analyze (day-aligned, UTC)
             voice_id: Optional filter by voice ID
 
         Returns:
             Dict with comprehensive stats
         """
-        async with self._lock:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-            events = [e for e in self.events if e.timestamp > cutoff]
-
-            if voice_id:
-                events = [e for e in events if e.voice_id == voice_id]
-
-            if not events:
+        now = datetime.now(timezone.utc).timestamp()
+        ring = self._days
+        with self._lock:
+            buckets = list(ring.buckets(ring.epoch_of(now - days * 86400), ring.epoch_of(now)))
+            stats = self._summarize(buckets, voice_id)
+            if stats is None:
                 return self._empty_stats()
+            stats["daily_breakdown"] = self._get_daily_breakdown(buckets, voice_id)
+        return {"period_days": days, **stats}
 
-            # Calculate metrics
-            total_requests = len(events)
-            successful = [e for e in events if e.success]
-            failed = [e for e in events if not e.success]
-            cache_hits = [e for e in events if e.cache_hit]
-
-            total_audio_duration = sum(e.audio_duration_seconds for e in successful)
-            total_cost = sum(e.cost_estimate_usd for e in events)
-            avg_processing_time = sum(e.processing_time_ms for e in successful) / len(successful) if successful else 0
-
-            # Per-voice breakdown
-            voice_stats = defaultdict(lambda: {
-                "requests": 0,
-                "audio_duration": 0.0,
-                "cost": 0.0
-            })
+    async def get_recent_stats(
+        self,
+        minutes: int = 60,
+        voice_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Stats for the last `minutes` (at most 24 hours) at minute resolution.
 
-            for event in events:
-                voice_stats[event.voice_id]["requests"] += 1
-                voice_stats[event.voice_id]["audio_duration"] += event.audio_duration_seconds
-                voice_stats[event.voice_id]["cost"] += event.cost_estimate_usd
-
-            return {
-                "period_days": days,
-                "total_requests": total_requests,
-                "successful_requests": len(successful),
-                "failed_requests": len(failed),
-                "success_rate_percent": round(len(successful) / total_requests * 100, 2),
-                "cache_hits": len(cache_hits),
-                "cache_hit_rate_percent": round(len(cache_hits) / total_requests * 100, 2),
-                "total_audio_duration_seconds": round(total_audio_duration, 2),
-                "total_audio_duration_hours": round(total_audio_duration / 3600, 2),
-                "estimated_cost_usd": round(total_cost, 2),
-                "avg_processing_time_ms": round(avg_processing_time, 2),
-                "top_voices": self._get_top_voices(voice_stats, limit=10),
-                "daily_breakdown": self._get_daily_breakdown(events)
-            }
+        Args:
+            minutes: Window length in minutes
+            voice_id: Optional filter by voice ID
+        """
+        now = datetime.now(timezone.utc).timestamp()
+        ring = self._minutes
+        with self._lock:
+            buckets = list(ring.buckets(ring.epoch_of(now) - minutes + 1, ring.epoch_of(now)))
+            stats = self._summarize(buckets, voice_id)
+        if stats is None:
+            return self._empty_stats()
+        return {"period_minutes": min(minutes, MINUTE_BUCKETS), **stats}
+
+    def _summarize(
+        self,
+        buckets: List[tuple],
+        voice_id: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Merge bucket rollups into the stats dict (None when there are no events)."""
+        totals = _Rollup()
+        voice_stats: Dict[str, _Rollup] = {}
+        for _, voices in buckets:
+            for vid, rollup in _select(voices, voice_id):
+                totals.merge(rollup)
+                voice_total = voice_stats.get(vid)
+                if voice_total is None:
+                    voice_total = voice_stats[vid] = _Rollup()
+                voice_total.merge(rollup)
+
+        total_requests = totals.requests
+        if not total_requests:
+            return None
+        failed = total_requests - totals.successful
+        avg_processing_time = (
+            totals.success_processing_ms / totals.successful if totals.successful else 0
+        )
+
+        return {
+            "total_requests": total_requests,
+            "successful_requests": totals.successful,
+            "failed_requests": failed,
+            "success_rate_percent": round(totals.successful / total_requests * 100, 2),
+            "cache_hits": totals.cache_hits,
+            "cache_hit_rate_percent": round(totals.cache_hits / total_requests * 100, 2),
+            "total_audio_duration_seconds": round(totals.success_audio_duration, 2),
+            "total_audio_duration_hours": round(totals.success_audio_duration / 3600, 2),
+            "estimated_cost_usd": round(totals.cost, 2),
+            "avg_processing_time_ms": round(avg_processing_time, 2),
+            "p50_processing_time_ms": _histogram_percentile(totals.latency_histogram, 50),
+            "p95_processing_time_ms": _histogram_percentile(totals.latency_histogram, 95),
+            "latency_histogram": _histogram_dict(totals.latency_histogram),
+            "top_voices": self._get_top_voices(voice_stats, limit=10),
+        }
 
     def _empty_stats(self) -> Dict[str, Any]:
         """Return empty stats structure."""
@@ -195,55 +424,55 @@ class VoiceAnalyticsService:
             "total_audio_duration_hours": 0.0,
             "estimated_cost_usd": 0.0,
             "avg_processing_time_ms": 0.0,
+            "p50_processing_time_ms": None,
+            "p95_processing_time_ms": None,
+            "latency_histogram": _histogram_dict([0] * (len(LATENCY_BUCKETS_MS) + 1)),
             "top_voices": [],
             "daily_breakdown": []
         }
 
     def _get_top_voices(
         self,
-        voice_stats: Dict[str, Dict],
+        voice_stats: Dict[str, _Rollup],
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Get top voices by usage."""
         sorted_voices = sorted(
             voice_stats.items(),
-            key=lambda x: x[1]["requests"],
+            key=lambda x: x[1].requests,
             reverse=True
         )[:limit]
 
         return [
             {
                 "voice_id": voice_id,
-                "requests": stats["requests"],
-                "audio_duration_seconds": round(stats["audio_duration"], 2),
-                "cost_usd": round(stats["cost"], 2)
+                "requests": stats.requests,
+                "audio_duration_seconds": round(stats.audio_duration, 2),
+                "cost_usd": round(stats.cost, 2)
             }
             for voice_id, stats in sorted_voices
         ]
 
-    def _get_daily_breakdown(self, events: List[VoiceGenerationEvent]) -> List[Dict[str, Any]]:
-        """Get daily usage breakdown."""
-        daily_stats = defaultdict(lambda: {
-            "requests": 0,
-            "duration": 0.0,
-            "cost": 0.0
-        })
-
-        for event in events:
-            day_key = event.timestamp.date().isoformat()
-            daily_stats[day_key]["requests"] += 1
-            daily_stats[day_key]["duration"] += event.audio_duration_seconds
-            daily_stats[day_key]["cost"] += event.cost_estimate_usd
-
-        return [
-            {
-                "date": date,
-                "requests": stats["requests"],
-                "audio_duration_seconds": round(stats["duration"], 2),
-                "cost_usd": round(stats["cost"], 2)
-            }
-            for date, stats in sorted(daily_stats.items())
-        ]
+    def _get_daily_breakdown(
+        self,
+        buckets: List[tuple],
+        voice_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get daily usage breakdown from day buckets (already in date order)."""
+        breakdown = []
+        for epoch, voices in buckets:
+            day = _Rollup()
+            for _, rollup in _select(voices, voice_id):
+                day.merge(rollup)
+            if not day.requests:
+                continue
+            breakdown.append({
+                "date": datetime.fromtimestamp(epoch * 86400, tz=timezone.utc).date().isoformat(),
+                "requests": day.requests,
+                "audio_duration_seconds": round(day.audio_duration, 2),
+                "cost_usd": round(day.cost, 2)
+            })
+        return breakdown
 
     async def get_voice_stats(self, voice_id: str, days: int = 30) -> Dict[str, Any]:
         """
@@ -263,28 +492,82 @@ class VoiceAnalyticsService:
         Get recent generation errors.
 
         Args:
-            limit: Max errors to return
+            limit: Max errors to return (up to MAX_RECENT_ERRORS are kept)
 
         Returns:
             List of error events
         """
-        async with self._lock:
-            failed_events = [e for e in self.events if not e.success]
+        with self._lock:
             recent_errors = sorted(
-                failed_events,
+                self._recent_errors,
                 key=lambda e: e.timestamp,
                 reverse=True
             )[:limit]
 
-            return [
-                {
-                    "timestamp": e.timestamp.isoformat(),
-                    "voice_id": e.voice_id,
-                    "error": e.error,
-                    "text_length": e.text_length
-                }
-                for e in recent_errors
-            ]
+        return [
+            {
+                "timestamp": e.timestamp.isoformat(),
+                "voice_id": e.voice_id,
+                "error": e.error,
+                "text_length": e.text_length
+            }
+            for e in recent_errors
+        ]
+
+
+def _select(voices: Dict[str, _Rollup], voice_id: Optional[str]) -> Iterable[tuple]:
+    if voice_id is None:
+        return voices.items()
+    rollup = voices.get(voice_id)
+    return [(voice_id, rollup)] if rollup is not None else []
+
+
+def _histogram_dict(counts: List[int]) -> Dict[str, int]:
+    labels = [f"<={edge}" for edge in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+    return dict(zip(labels, counts))
+
+
+def _histogram_percentile(counts: List[int], pct: float) -> Optional[int]:
+    """Upper bucket edge containing the pct-th percentile (None if empty)."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = total * pct / 100
+    seen = 0
+    for i, count in enumerate(counts):
+        seen += count
+        if seen >= rank:
+            return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+    return None
+
+
+def _event_row(event: VoiceGenerationEvent) -> tuple:
+    return (
+        event.timestamp.timestamp(),
+        event.voice_id,
+        event.text_length,
+        event.audio_duration_seconds,
+        event.processing_time_ms,
+        int(event.cache_hit),
+        int(event.success),
+        event.error,
+        event.cost_estimate_usd,
+    )
+
+
+def _row_event(row: tuple) -> VoiceGenerationEvent:
+    ts, voice_id, text_length, duration, processing_ms, cache_hit, success, error, cost = row
+    return VoiceGenerationEvent(
+        timestamp=datetime.fromtimestamp(ts, tz=timezone.utc),
+        voice_id=voice_id,
+        text_length=text_length,
+        audio_duration_seconds=duration,
+        processing_time_ms=processing_ms,
+        cache_hit=bool(cache_hit),
+        success=bool(success),
+        error=error,
+        cost_estimate_usd=cost,
+    )
 
 
 # Singleton instance
@@ -292,8 +575,8 @@ _voice_analytics_service: Optional[VoiceAnalyticsService] = None
 
 
 def get_voice_analytics_service() -> VoiceAnalyticsService:
-    """Get or create voice analytics service singleton."""
+    """Get or create voice analytics service singleton ($VOICE_ANALYTICS_DB enables persistence)."""
     global _voice_analytics_service
     if _voice_analytics_service is None:
-        _voice_analytics_service = VoiceAnalyticsService()
+        _voice_analytics_service = VoiceAnalyticsService(db_path=os.environ.get("VOICE_ANALYTICS_DB"))
     return _voice_analytics_service
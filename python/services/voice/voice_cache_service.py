@@ -8,6 +8,10 @@ Features:
 - TTL-based expiration (default: 7 days)
 - Cache hit/miss metrics
 - Memory-efficient storage
+- Batch lookups (pipelined MGET on Redis) for multi-line dialogue
+
+Without Redis, results live in MemoryCacheBackend: a sharded, size-bounded
+LRU with per-entry TTL (expired lazily on read and by a periodic sweep).
 
 Usage:
     from services.voice.voice_cache_service import VoiceCacheService
@@ -31,13 +35,205 @@ Usage:
 """
 
 import hashlib
+import itertools
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from loguru import logger
 
 
+# Keys per Redis MGET inside one pipeline round trip
+MGET_CHUNK_SIZE = 100
+
+# (text, voice_reference_url, options)
+VoiceRequest = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class _Shard:
+    """One LRU segment: OrderedDict in recency order + its own lock."""
+
+    __slots__ = ("lock", "entries", "bytes", "evictions", "expirations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> (value, size_bytes, expires_at, last_use_stamp)
+        self.entries: "OrderedDict[str, Tuple[Any, int, float, int]]" = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU cache with per-entry TTL and entry/byte limits.
+
+    Keys are spread over independently locked shards so concurrent callers
+    (coroutines on worker threads, thread pools) rarely contend. Each shard
+    is an OrderedDict kept in recency order, so get/set are O(1). Shards only
+    split the locking: max_entries and max_bytes bound the whole cache, and
+    a write that goes over them evicts the globally least recently used
+    entry (the oldest of the shard heads).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        shards: int = 16,
+        sweep_interval_seconds: float = 60.0,
+    ):
+        """
+        Args:
+            max_entries: Maximum cached entries
+            max_bytes: Maximum total size (JSON-encoded bytes) of cached values
+            shards: Number of independently locked LRU segments
+            sweep_interval_seconds: How often writes also purge expired entries
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        # Global totals; always taken after (never while waiting on) a shard lock
+        self._totals_lock = threading.Lock()
+        self._entry_count = 0
+        self._byte_count = 0
+        self._stamps = itertools.count()
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._last_sweep = time.monotonic()
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _account(self, entries: int, size: int) -> None:
+        with self._totals_lock:
+            self._entry_count += entries
+            self._byte_count += size
+
+    def _over_budget(self) -> bool:
+        with self._totals_lock:
+            return self._entry_count > self.max_entries or self._byte_count > self.max_bytes
+
+    def _evict_over_budget(self) -> None:
+        """Evict least recently used entries across shards until within limits."""
+        while self._over_budget():
+            victim = None
+            for shard in self._shards:
+                with shard.lock:
+                    if shard.entries:
+                        key, entry = next(iter(shard.entries.items()))
+                        if victim is None or entry[3] < victim[2]:
+                            victim = (shard, key, entry[3])
+            if victim is None:
+                return
+            shard, key, stamp = victim
+            with shard.lock:
+                entry = shard.entries.get(key)
+                if entry is None or entry[3] != stamp:
+                    continue  # touched or removed since the scan; look again
+                del shard.entries[key]
+                shard.bytes -= entry[1]
+                shard.evictions += 1
+                self._account(-1, -entry[1])
+
+    def get(self, key: str) -> Optional[Any]:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return None
+            value, size, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                del shard.entries[key]
+                shard.bytes -= size
+                shard.expirations += 1
+                self._account(-1, -size)
+                return None
+            shard.entries.move_to_end(key)
+            shard.entries[key] = (value, size, expires_at, next(self._stamps))
+            return value
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: Any, ttl_seconds: float, size: Optional[int] = None) -> bool:
+        """
+        Store value for ttl_seconds. Returns False if it is larger than the
+        whole byte budget.
+        """
+        if size is None:
+            size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return False
+
+        shard = self._shard(key)
+        with shard.lock:
+            old = shard.entries.pop(key, None)
+            old_size = old[1] if old is not None else 0
+            shard.entries[key] = (value, size, time.monotonic() + ttl_seconds, next(self._stamps))
+            shard.bytes += size - old_size
+            self._account(0 if old is not None else 1, size - old_size)
+
+        self._evict_over_budget()
+        if time.monotonic() - self._last_sweep >= self.sweep_interval_seconds:
+            self.purge_expired()
+        return True
+
+    def delete(self, key: str) -> bool:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.pop(key, None)
+            if entry is None:
+                return False
+            shard.bytes -= entry[1]
+            self._account(-1, -entry[1])
+            return True
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry (the periodic half of TTL enforcement)."""
+        self._last_sweep = now = time.monotonic()
+        purged = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [k for k, entry in shard.entries.items() if entry[2] <= now]
+                freed = sum(shard.entries.pop(key)[1] for key in expired)
+                shard.bytes -= freed
+                shard.expirations += len(expired)
+                self._account(-len(expired), -freed)
+                purged += len(expired)
+        return purged
+
+    def clear(self) -> int:
+        count = 0
+        for shard in self._shards:
+            with shard.lock:
+                count += len(shard.entries)
+                self._account(-len(shard.entries), -shard.bytes)
+                shard.entries.clear()
+                shard.bytes = 0
+        return count
+
+    @property
+    def total_bytes(self) -> int:
+        return self._byte_count
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    @property
+    def expirations(self) -> int:
+        return sum(shard.expirations for shard in self._shards)
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
 class VoiceCacheService:
     """
     Cache layer for voice cloning results.
@@ -49,7 +245,11 @@ class VoiceCacheService:
         self,
         redis_client=None,
         default_ttl_days: int = 7,
-        use_redis: bool = True
+        use_redis: bool = True,
+        max_memory_entries: int = 1000,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        memory_shards: int = 16,
+        sweep_interval_seconds: float = 60.0
     ):
         """
         Initialize voice cache service.
@@ -58,13 +258,22 @@ class VoiceCacheService:
             redis_client: Redis client instance (optional)
             default_ttl_days: Default cache TTL in days
             use_redis: Whether to use Redis (falls back to in-memory)
+            max_memory_entries: In-memory fallback entry limit
+            max_memory_bytes: In-memory fallback size limit (JSON bytes)
+            memory_shards: Lock shards for the in-memory fallback
+            sweep_interval_seconds: Periodic expiry interval for the in-memory fallback
         """
         self.redis_client = redis_client
         self.default_ttl = timedelta(days=default_ttl_days)
         self.use_redis = use_redis and redis_client is not None
 
         # In-memory fallback
-        self._memory_cache: Dict[str, Any] = {}
+        self._memory_cache = MemoryCacheBackend(
+            max_entries=max_memory_entries,
+            max_bytes=max_memory_bytes,
+            shards=memory_shards,
+            sweep_interval_seconds=sweep_interval_seconds,
+        )
 
         # Metrics
         self.hits = 0
@@ -137,10 +346,11 @@ class VoiceCacheService:
                     return json.loads(cached_data)
             else:
                 # Try in-memory cache
-                if cache_key in self._memory_cache:
+                cached = self._memory_cache.get(cache_key)
+                if cached is not None:
                     self.hits += 1
                     logger.debug(f"Voice cache HIT (memory): {cache_key[:16]}...")
-                    return self._memory_cache[cache_key]
+                    return cached
 
         except Exception as e:
             logger.error(f"Cache read error: {e}")
@@ -193,23 +403,98 @@ class VoiceCacheService:
                 )
                 logger.debug(f"Cached voice in Redis: {cache_key[:16]}... (TTL: {ttl})")
             else:
-                # Store in memory (no TTL enforcement)
-                self._memory_cache[cache_key] = cached_data
+                # Store in memory (LRU, bounded, TTL enforced)
+                if not self._memory_cache.set(cache_key, cached_data, ttl.total_seconds()):
+                    logger.debug(f"Voice result too large for memory cache: {cache_key[:16]}...")
+                    return False
                 logger.debug(f"Cached voice in memory: {cache_key[:16]}...")
 
-                # Limit memory cache size (keep last 1000 entries)
-                if len(self._memory_cache) > 1000:
-                    # Remove oldest entries
-                    keys_to_remove = list(self._memory_cache.keys())[:-1000]
-                    for key in keys_to_remove:
-                        del self._memory_cache[key]
-
             return True
 
         except Exception as e:
             logger.error(f"Cache write error: {e}")
             return False
 
+    async def get_cached_voices(
+        self,
+        requests: List[VoiceRequest]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Batch lookup for many lines (e.g. a dialogue script).
+
+        On Redis the keys are fetched with MGETs in a single pipelined round
+        trip instead of one GET per line.
+
+        Args:
+            requests: (text, voice_reference_url, options) per line
+
+        Returns:
+            Cached result or None per request, in order
+        """
+        keys = [self._generate_cache_key(text, voice, options) for text, voice, options in requests]
+        if not keys:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        try:
+            if self.use_redis:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for i in range(0, len(keys), MGET_CHUNK_SIZE):
+                    pipe.mget(keys[i:i + MGET_CHUNK_SIZE])
+                raw = [value for chunk in await pipe.execute() for value in chunk]
+                results = [json.loads(value) if value else None for value in raw]
+            else:
+                results = self._memory_cache.get_many(keys)
+        except Exception as e:
+            logger.error(f"Cache batch read error: {e}")
+
+        found = sum(1 for r in results if r is not None)
+        self.hits += found
+        self.misses += len(keys) - found
+        logger.debug(f"Voice cache batch: {found}/{len(keys)} hits")
+        return results
+
+    async def cache_voices(
+        self,
+        entries: List[Tuple[str, str, Dict[str, Any], Optional[Dict[str, Any]]]],
+        ttl: Optional[timedelta] = None
+    ) -> int:
+        """
+        Batch store (text, voice_reference_url, result, options) entries;
+        one pipelined round trip on Redis.
+
+        Returns:
+            Number of entries cached
+        """
+        if not self.use_redis:
+            stored = 0
+            for text, voice, result, options in entries:
+                stored += await self.cache_voice(text, voice, result, options, ttl)
+            return stored
+
+        ttl = ttl or self.default_ttl
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for text, voice, result, options in entries:
+                cached_data = {
+                    **result,
+                    "cache_metadata": {
+                        "cached_at": str(timedelta(seconds=0)),  # Placeholder
+                        "text": text[:100],
+                        "voice_ref": voice
+                    }
+                }
+                pipe.setex(
+                    self._generate_cache_key(text, voice, options),
+                    int(ttl.total_seconds()),
+                    json.dumps(cached_data)
+                )
+            await pipe.execute()
+            return len(entries)
+        except Exception as e:
+            logger.error(f"Cache batch write error: {e}")
+            return 0
+
     async def clear_cache(self, pattern: str = "voice_cache:*") -> int:
         """
         Clear cached voices matching pattern.
@@ -231,8 +516,7 @@ class VoiceCacheService:
                 logger.error(f"Cache clear error: {e}")
         else:
             # Clear in-memory cache
-            count = len(self._memory_cache)
-            self._memory_cache.clear()
+            count = self._memory_cache.clear()
             logger.info(f"Cleared {count} in-memory voice cache entries")
             return count
 
@@ -243,10 +527,12 @@ class VoiceCacheService:
         Get cache performance metrics.
 
         Returns:
-            Dict with hits, misses, hit_rate
+            Dict with hits, misses, hit_rate and, for the in-memory
+            backend, entry/byte usage, evictions and expirations
         """
         total = self.hits + self.misses
         hit_rate = (self.hits / total * 100) if total > 0 else 0.0
+        memory = self._memory_cache
 
         return {
             "hits": self.hits,
@@ -254,7 +540,12 @@ class VoiceCacheService:
             "total_requests": total,
             "hit_rate_percent": round(hit_rate, 2),
             "cache_type": "redis" if self.use_redis else "memory",
-            "memory_entries": len(self._memory_cache) if not self.use_redis else None
+            "memory_entries": len(memory) if not self.use_redis else None,
+            "memory_bytes": memory.total_bytes if not self.use_redis else None,
+            "memory_max_entries": memory.max_entries if not self.use_redis else None,
+            "memory_max_bytes": memory.max_bytes if not self.use_redis else None,
+            "evictions": memory.evictions if not self.use_redis else None,
+            "expirations": memory.expirations if not self.use_redis else None
         }
 
 
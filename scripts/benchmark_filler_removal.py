@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark EditPlanCompiler filler-word removal on a synthetic long transcript.
+
+Times the original per-word _is_filler scan (which re-finds every word in
+its window), the indexed per-window pass, and the vectorized batch sweep,
+and verifies that all three keep exactly the same words.
+
+Usage:
+    python scripts/benchmark_filler_removal.py
+    python scripts/benchmark_filler_removal.py --hours 3 --window-sec 45
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+from services.longform.edit_plan_compiler import EditPlanCompiler  # noqa: E402
+from services.longform.types import TimelineWindow, TranscriptWord  # noqa: E402
+
+
+VOCAB = (
+    ["the", "pipeline", "really", "works", "because", "we", "ship", "it", "looks", "is"] * 3
+    + ["so", "So,", "like", "right", "right?", "um", "uh,", "oh"]
+)
+
+
+def synth_windows(hours: float, window_sec: float, seed: int = 7):
+    rng = random.Random(seed)
+    duration = hours * 3600
+    windows = []
+    words = []
+    window_start = 0.0
+    t = 0.0
+    while t < duration:
+        length = rng.uniform(0.15, 0.6)
+        words.append(TranscriptWord(word=rng.choice(VOCAB), start=round(t, 3), end=round(t + length, 3)))
+        t += length + rng.choice([0.05, 0.1, 0.2, 0.4, 0.8])
+        if t - window_start >= window_sec:
+            windows.append(TimelineWindow(
+                window_id=f"w_{len(windows) + 1:04d}",
+                start=words[0].start,
+                end=words[-1].end,
+                transcript_text=" ".join(w.word for w in words),
+                speaker="speaker_0",
+                words=words,
+            ))
+            words = []
+            window_start = t
+    return windows
+
+
+def legacy_filter(windows):
+    """Original filter_filler_words: _is_filler + linear _find_word_index per word."""
+
+    def find_word_index(word, context):
+        for i, w in enumerate(context):
+            if w.word == word.word and abs(w.start - word.start) < 0.01:
+                return i
+        return -1
+
+    def is_filler(word, context):
+        clean = word.word.lower().strip(".,!?;:'\"")
+        if clean in {"um", "uh", "umm", "uhh", "erm", "hmm", "hm", "ah", "oh"}:
+            return True
+        idx = find_word_index(word, context)
+        if clean == "like":
+            if idx > 0 and idx < len(context) - 1:
+                prev = context[idx - 1].word.lower().strip(".,!?")
+                if prev not in {"looks", "sounds", "feels", "seems", "acts", "is", "was"}:
+                    return True
+        if clean == "right":
+            if idx > 0 and idx < len(context) - 1:
+                gap_before = word.start - context[idx - 1].end
+                gap_after = context[idx + 1].start - word.end
+                if gap_before > 0.15 and gap_after > 0.15:
+                    return True
+        if clean == "so":
+            if idx == 0:
+                return True
+            if idx > 0:
+                gap_before = word.start - context[idx - 1].end
+                if gap_before > 0.3:
+                    return True
+        return False
+
+    for window in windows:
+        window.words = [w for w in window.words if not is_filler(w, window.words)]
+        if window.words:
+            window.transcript_text = " ".join(w.word for w in window.words)
+            window.start = window.words[0].start
+            window.end = window.words[-1].end
+    return [w for w in windows if w.words]
+
+
+def kept(windows):
+    return [(w.window_id, [(x.word, x.start) for x in w.words]) for w in windows]
+
+
+def timed(label, fn, windows, baseline=None):
+    data = copy.deepcopy(windows)
+    start = time.perf_counter()
+    result = fn(data)
+    elapsed = time.perf_counter() - start
+    line = f"  {label:<22} {elapsed * 1000:10.1f} ms"
+    if baseline is not None:
+        line += f"  ({baseline[0] / elapsed:.1f}x vs legacy, identical={kept(result) == baseline[1]})"
+    print(line)
+    return elapsed, kept(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filler-word removal")
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--window-sec", type=float, default=45.0)
+    args = parser.parse_args()
+
+    windows = synth_windows(args.hours, args.window_sec)
+    total_words = sum(len(w.words) for w in windows)
+    print(f"Synthetic transcript: {args.hours}h, {total_words} words, {len(windows)} windows")
+
+    # Silence the per-call summary log
+    from loguru import logger
+    logger.remove()
+
+    compiler = EditPlanCompiler()
+    baseline = timed("legacy _is_filler", legacy_filter, windows)
+    timed("indexed per-window", compiler.filter_filler_words, windows, baseline)
+    timed("vectorized batch", compiler.filter_filler_words_batch, windows, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark LipSyncEngine frame generation and Remotion export size.
+
+Times the original per-frame word scan (every frame checks every word and
+re-normalizes the word) against the sweep generator on a synthetic avatar
+track, verifies both give identical frames, and compares the JSON size of
+the legacy per-frame props with the run-length encoded span layout.
+
+Usage:
+    python scripts/benchmark_lip_sync.py
+    python scripts/benchmark_lip_sync.py --minutes 10 --fps 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+from services.ai_video_pipeline.lip_sync import (  # noqa: E402
+    WORD_TO_VISEME_HINTS,
+    LipSyncEngine,
+    Viseme,
+    VisemeFrame,
+    WordTimestamp,
+    word_viseme_sequence,
+)
+
+VOCAB = (
+    "the quick brown fox jumps over a lazy dog hello world thank you please "
+    "sorry we ship video content every single day with avatars that talk"
+).split()
+
+
+def synth_words(minutes: float, seed: int = 11):
+    rng = random.Random(seed)
+    words, t = [], 0.0
+    while t < minutes * 60:
+        length = rng.uniform(0.12, 0.6)
+        words.append({"word": rng.choice(VOCAB), "start": round(t, 3), "end": round(t + length, 3)})
+        t += length + rng.choice([0.02, 0.05, 0.1, 0.3, 0.8])
+    return words
+
+
+def legacy_generate_frames(engine, words, fps, total_frames):
+    """Original _generate_frames: scan all words for every frame."""
+    frames = []
+    frame_duration = 1.0 / fps
+    for frame_num in range(total_frames):
+        frame_time = frame_num * frame_duration
+        current_word = None
+        for word in words:
+            if word.start <= frame_time <= word.end:
+                current_word = word
+                break
+        if current_word:
+            word_duration = current_word.end - current_word.start
+            word_progress = (frame_time - current_word.start) / word_duration if word_duration > 0 else 0.0
+            word_lower = current_word.word.lower().strip(".,!?;:")
+            if word_lower in WORD_TO_VISEME_HINTS:
+                hints = WORD_TO_VISEME_HINTS[word_lower]
+                viseme = hints[min(int(word_progress * len(hints)), len(hints) - 1)]
+            else:
+                viseme = engine._analyze_word_visemes(word_lower, word_progress)
+            intensity = 1.0
+        else:
+            viseme = Viseme.REST
+            intensity = 0.0
+        frames.append(VisemeFrame(
+            frame_number=frame_num,
+            time=frame_time,
+            viseme=viseme,
+            intensity=intensity,
+            word=current_word.word if current_word else None
+        ))
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lip-sync frame generation")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--skip-legacy", action="store_true", help="Skip the slow original scan")
+    args = parser.parse_args()
+
+    raw = synth_words(args.minutes)
+    engine = LipSyncEngine()
+    print(f"Synthetic track: {args.minutes} min, {len(raw)} words, {args.fps} fps")
+
+    word_viseme_sequence.cache_clear()
+    start = time.perf_counter()
+    animation = asyncio.run(engine.generate_lip_sync(raw, fps=args.fps))
+    sweep = time.perf_counter() - start
+    print(f"  {'sweep generator':<22} {sweep * 1000:10.1f} ms  ({animation.total_frames} frames)")
+
+    if not args.skip_legacy:
+        words = [WordTimestamp(w["word"], w["start"], w["end"]) for w in raw]
+        start = time.perf_counter()
+        legacy = legacy_generate_frames(engine, words, args.fps, animation.total_frames)
+        elapsed = time.perf_counter() - start
+        identical = [
+            (f.frame_number, f.viseme, f.intensity, f.word) for f in legacy
+        ] == [
+            (f.frame_number, f.viseme, f.intensity, f.word) for f in animation.frames
+        ]
+        print(f"  {'legacy per-frame scan':<22} {elapsed * 1000:10.1f} ms  "
+              f"({elapsed / sweep:.0f}x slower, identical={identical})")
+
+    spans = json.dumps(engine.export_for_remotion(animation))
+    frames = json.dumps(engine.export_for_remotion(animation, layout="frames"))
+    print(f"  Remotion props: frames {len(frames) / 1024:.0f} KiB, spans {len(spans) / 1024:.0f} KiB "
+          f"({len(frames) / len(spans):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark the music catalog index against the legacy linear scans.
+
+Builds a synthetic Suno-style library (audio stubs + sidecar JSON) and a
+MusicSelector index of the same size, then reports:
+
+    index     first full index, and a no-op incremental refresh
+    search    legacy rglob + per-file metadata parse vs indexed SQL/FTS query
+    ranking   legacy per-track compatibility loop vs vectorized rank_compatible
+
+Usage:
+    python scripts/benchmark_music_catalog.py
+    python scripts/benchmark_music_catalog.py --tracks 50000 --queries 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+GENRES = ["lofi", "pop", "electronic", "hiphop", "ambient", "general", "corporate", "cinematic"]
+MOODS = ["happy", "calm", "energetic", "neutral", "peaceful", "relaxed", "confident", "sad", "upbeat"]
+TAGS = ["study", "retro", "synthwave", "acoustic", "guitar", "piano", "vlog", "gaming", "summer", "dark"]
+EXTENSIONS = [".mp3", ".wav", ".m4a", ".flac"]
+
+
+def build_library(root, n, seed=0):
+    rng = random.Random(seed)
+    tracks = []
+    for i in range(n):
+        sub = root / f"batch_{i // 500:03d}"
+        sub.mkdir(exist_ok=True)
+        path = sub / f"track_{i:06d}{rng.choice(EXTENSIONS)}"
+        path.write_bytes(b"\0" * 16)
+        metadata = {
+            "title": f"Track {i}",
+            "genre": rng.choice(GENRES),
+            "mood": rng.choice(MOODS),
+            "bpm": rng.randrange(60, 170),
+            "duration": rng.choice([30, 60, 120, 180, 240]),
+            "tags": rng.sample(TAGS, 2),
+        }
+        path.with_suffix(".json").write_text(json.dumps(metadata))
+        tracks.append({
+            "id": f"t{i}",
+            "file_path": str(path),
+            "genre": metadata["genre"],
+            "mood": metadata["mood"],
+            "moods": rng.sample(MOODS, rng.randrange(0, 3)),
+            "energy_level": round(rng.random(), 2),
+            "tempo": metadata["bpm"],
+            "duration": metadata["duration"],
+        })
+    return tracks
+
+
+def extract_metadata(file_path):
+    """SunoAdapter._extract_metadata"""
+    metadata = {}
+    metadata_file = file_path.with_suffix(".json")
+    if metadata_file.exists():
+        with open(metadata_file, "r") as f:
+            metadata = json.load(f)
+    filename = file_path.stem.lower()
+    if "hip" in filename or "hop" in filename:
+        metadata.setdefault("genre", "hip-hop")
+    if "electronic" in filename or "edm" in filename:
+        metadata.setdefault("genre", "electronic")
+    if "calm" in filename or "chill" in filename:
+        metadata.setdefault("mood", "calm")
+    if "energetic" in filename or "upbeat" in filename:
+        metadata.setdefault("mood", "energetic")
+    return metadata
+
+
+def legacy_search(root, criteria, limit):
+    """Original SunoAdapter.search_music: walk and parse every file per query."""
+    results = []
+    for ext in EXTENSIONS:
+        for file_path in root.rglob(f"*{ext}"):
+            metadata = extract_metadata(file_path)
+            if criteria.get("genre") and metadata.get("genre") != criteria["genre"]:
+                continue
+            if criteria.get("mood") and metadata.get("mood") != criteria["mood"]:
+                continue
+            if criteria.get("bpm_min") and metadata.get("bpm", 0) < criteria["bpm_min"]:
+                continue
+            if criteria.get("bpm_max") and metadata.get("bpm", 999) > criteria["bpm_max"]:
+                continue
+            results.append(file_path.relative_to(root).as_posix())
+    return sorted(results)[:limit]
+
+
+def legacy_rank(selector, analysis, top_n):
+    """Original MusicSelector.select_music_for_clip scoring loop."""
+    matches = []
+    for track in selector.load_music_library():
+        score, _ = selector._calculate_compatibility(analysis, track)
+        if score > 0.3:
+            matches.append((track.id, score))
+    matches.sort(key=lambda m: m[1], reverse=True)
+    return matches[:top_n]
+
+
+def timed(fn, repeat=1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, samples
+
+
+def fmt(samples):
+    return f"median {statistics.median(samples) * 1000:8.3f} ms  p95 {sorted(samples)[int(len(samples) * 0.95)] * 1000:8.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the music catalog index")
+    parser.add_argument("--tracks", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--legacy-queries", type=int, default=3, help="Legacy directory scans to time")
+    args = parser.parse_args()
+
+    from loguru import logger
+    from services.audio.music_catalog import MusicCatalog
+    from services.audio.music_selector import ClipAnalysis, MusicSelector
+
+    logger.remove()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        root = Path(workdir) / "suno"
+        root.mkdir()
+        print(f"Building {args.tracks} tracks...")
+        tracks = build_library(root, args.tracks)
+
+        catalog = MusicCatalog(Path(workdir) / "catalog.db")
+        counts, (first,) = timed(lambda: catalog.refresh_directory(root, extract_metadata, force=True))
+        _, (noop,) = timed(lambda: catalog.refresh_directory(root, extract_metadata, force=True))
+        print(f"index     first {first * 1000:9.0f} ms ({counts['added']} tracks)   "
+              f"no-op refresh {noop * 1000:7.0f} ms")
+
+        source = catalog.dir_source(root)
+        queries = [
+            {
+                "genre": rng.choice(GENRES + [None]),
+                "mood": rng.choice(MOODS + [None]),
+                "bpm_min": rng.choice([None, 80, 100]),
+                "bpm_max": rng.choice([None, 120, 140]),
+            }
+            for _ in range(args.queries)
+        ]
+        identical = True
+        search_samples = []
+        for i, query in enumerate(queries):
+            rows, samples = timed(lambda: catalog.search(source=source, limit=10, **query))
+            search_samples += samples
+            if i < args.legacy_queries:
+                legacy, _ = timed(lambda: legacy_search(root, query, 10))
+                identical &= [r["key"] for r in rows] == legacy
+        _, legacy_samples = timed(lambda: legacy_search(root, queries[0], 10), repeat=args.legacy_queries)
+        _, fts_samples = timed(lambda: catalog.search(source=source, text=rng.sample(TAGS, 2), limit=10), repeat=args.queries)
+        print(f"search    legacy scan {fmt(legacy_samples)}")
+        print(f"          indexed     {fmt(search_samples)}")
+        print(f"          FTS tags    {fmt(fts_samples)}")
+
+        selector = MusicSelector(catalog=MusicCatalog())
+        selector.load_music_library({"tracks": tracks})
+        _, (imported,) = timed(selector._get_catalog)
+        analyses = [
+            ClipAnalysis(
+                clip_id=str(i),
+                duration=rng.choice([15, 60, 200]),
+                mood=rng.choice(MOODS),
+                energy_level=rng.random(),
+                content_type=rng.choice(list(MusicSelector.GENRE_MAP)),
+            )
+            for i in range(args.queries)
+        ]
+        rank_samples, legacy_rank_samples = [], []
+        library = selector.load_music_library()
+        catalog_ = selector._get_catalog()
+        for analysis in analyses:
+            ranked, samples = timed(lambda: catalog_.rank_compatible(
+                selector._catalog_source,
+                mood=analysis.mood,
+                compatible_moods=selector._compatible_moods(analysis.mood),
+                energy=analysis.energy_level,
+                preferred_genres=MusicSelector.GENRE_MAP.get(analysis.content_type, ["general"]),
+                duration=analysis.duration,
+                top_n=3,
+            ))
+            rank_samples += samples
+            legacy, samples = timed(lambda: legacy_rank(selector, analysis, 3))
+            legacy_rank_samples += samples
+            identical &= [(library[int(r["key"])].id, s) for r, s in ranked] == legacy
+
+        _, select_samples = timed(lambda: asyncio.run(selector.select_music_for_clip(duration=30, top_n=3)), repeat=20)
+        print(f"ranking   import {imported * 1000:.0f} ms (once per index change)")
+        print(f"          legacy loop {fmt(legacy_rank_samples)}")
+        print(f"          vectorized  {fmt(rank_samples)}")
+        print(f"          select_music_for_clip {fmt(select_samples)}")
+        print(f"identical={identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark longform scene detection: legacy two-pass vs single-pass decode.
+
+Reports wall time per mode and how well each mode's safe cut points agree
+with the two-pass reference output.
+
+Usage:
+    python scripts/benchmark_scene_detection.py --video path/to/podcast.mp4
+    python scripts/benchmark_scene_detection.py --video video.mp4 --downscale 4 --frame-skip 1
+    python scripts/benchmark_scene_detection.py --video video.mp4 --tolerance 0.1 --json results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+from services.longform.scene_detector import SceneDetector  # noqa: E402
+
+
+def boundary_agreement(reference: List[float], candidate: List[float], tolerance: float) -> Dict:
+    """Precision/recall of candidate cut points against reference within ±tolerance seconds."""
+
+    def matched(points: List[float], against: List[float]) -> int:
+        hits = 0
+        for p in points:
+            i = bisect_left(against, p)
+            neighbours = against[max(0, i - 1):i + 1]
+            if any(abs(p - n) <= tolerance for n in neighbours):
+                hits += 1
+        return hits
+
+    recall = matched(reference, candidate) / len(reference) if reference else 1.0
+    precision = matched(candidate, reference) / len(candidate) if candidate else 1.0
+    return {
+        "reference_cuts": len(reference),
+        "candidate_cuts": len(candidate),
+        "exact_match": reference == candidate,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+    }
+
+
+def run_mode(video: str, label: str, **kwargs) -> Dict:
+    detector = SceneDetector(**kwargs)
+    start = time.perf_counter()
+    result = detector.detect_scenes(video)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s  {len(result.scenes):5d} scenes  "
+          f"{len(result.safe_cut_points):5d} cuts")
+    return {"label": label, "seconds": elapsed, "result": result}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark longform scene detection")
+    parser.add_argument("--video", required=True, help="Source video to analyse")
+    parser.add_argument("--downscale", type=int, default=None,
+                        help="Extra downscaled single-pass run with this factor")
+    parser.add_argument("--frame-skip", type=int, default=0,
+                        help="Extra frame-skip single-pass run with this skip")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="Boundary match tolerance in seconds (default: 0.05)")
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"Benchmarking scene detection on {args.video}")
+    runs = [
+        run_mode(args.video, "two-pass (reference)", single_pass=False),
+        run_mode(args.video, "single-pass", single_pass=True),
+    ]
+    if args.downscale or args.frame_skip:
+        runs.append(run_mode(
+            args.video,
+            f"single-pass ds={args.downscale} skip={args.frame_skip}",
+            single_pass=True,
+            downscale=args.downscale,
+            frame_skip=args.frame_skip,
+        ))
+
+    reference = runs[0]
+    report = []
+    print(f"\nAgreement vs two-pass (tolerance ±{args.tolerance}s):")
+    for run in runs:
+        agreement = boundary_agreement(
+            reference["result"].safe_cut_points,
+            run["result"].safe_cut_points,
+            args.tolerance,
+        )
+        speedup = reference["seconds"] / run["seconds"] if run["seconds"] else 0.0
+        print(f"  {run['label']:<28} speedup {speedup:5.2f}x  "
+              f"precision {agreement['precision']:.3f}  recall {agreement['recall']:.3f}  "
+              f"exact={agreement['exact_match']}")
+        report.append({
+            "label": run["label"],
+            "seconds": round(run["seconds"], 3),
+            "speedup": round(speedup, 3),
+            "agreement": agreement,
+        })
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"video": args.video, "runs": report}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
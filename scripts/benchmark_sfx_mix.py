@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark audio bus SFX mixing modes on a 100-cue timeline.
+
+Builds a synthetic timeline (a few distinct SFX files fired many times,
+plus a voiceover and looping music bed), then renders the audio bus with
+each sfx_mix_mode in a fresh child process and reports wall time and peak
+memory (the larger of the Python process and its ffmpeg child).
+
+    per_cue   one -i input + adelay branch per cue into one giant amix
+    grouped   de-duplicated inputs fanned out with asplit, bounded sub-bus amix
+    numpy     SFX bus rendered in process from cached PCM, one ffmpeg input
+
+Requires ffmpeg/ffprobe on PATH.
+
+Usage:
+    python scripts/benchmark_sfx_mix.py
+    python scripts/benchmark_sfx_mix.py --cues 100 --distinct 12 --seconds 180
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+MODES = ("per_cue", "grouped", "numpy")
+SR = 48000
+
+
+def write_wav(path, samples, channels=2):
+    data = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(SR)
+        wav.writeframes(data.tobytes())
+
+
+def build_fixture(workdir, distinct, seconds, seed=5):
+    rng = np.random.default_rng(seed)
+    sfx_paths = []
+    for i in range(distinct):
+        length = rng.uniform(0.2, 1.5)
+        t = np.arange(int(length * SR)) / SR
+        tone = np.sin(2 * np.pi * rng.uniform(200, 2000) * t) * np.exp(-t * rng.uniform(2, 8))
+        path = os.path.join(workdir, f"sfx_{i:02d}.wav")
+        write_wav(path, np.repeat(0.5 * tone[:, None], 2, axis=1))
+        sfx_paths.append(path)
+
+    t = np.arange(int(seconds * SR)) / SR
+    write_wav(os.path.join(workdir, "voiceover.wav"), 0.3 * np.sin(2 * np.pi * 180 * t)[:, None], channels=1)
+    t = np.arange(int(30 * SR)) / SR
+    write_wav(os.path.join(workdir, "music.wav"), np.repeat(0.2 * np.sin(2 * np.pi * 110 * t)[:, None], 2, axis=1))
+    return sfx_paths
+
+
+def run_mode(mode, workdir, cues, seconds):
+    from loguru import logger
+    from services.video_generation.audio_bus_mixer import AudioBusConfig, AudioTrack, mix_audio_bus
+
+    logger.remove()
+    sfx_paths = sorted(p for p in (os.path.join(workdir, f) for f in os.listdir(workdir)) if "sfx_" in p)
+    rng = random.Random(9)
+    tracks = [
+        AudioTrack(path=rng.choice(sfx_paths), start_seconds=rng.uniform(0, seconds - 2), volume=rng.choice([0.6, 0.8, 1.0]))
+        for _ in range(cues)
+    ]
+
+    start = time.perf_counter()
+    asyncio.run(mix_audio_bus(
+        os.path.join(workdir, f"bus_{mode}.wav"),
+        voiceover=AudioTrack(path=os.path.join(workdir, "voiceover.wav")),
+        music=AudioTrack(path=os.path.join(workdir, "music.wav"), volume=0.25, loop=True),
+        sfx_tracks=tracks,
+        total_duration_seconds=seconds,
+        config=AudioBusConfig(sfx_mix_mode=mode, normalize=False),
+    ))
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({"mode": mode, "seconds": elapsed, "python_mib": own / 1024, "ffmpeg_mib": child / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SFX mixing modes")
+    parser.add_argument("--cues", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=12, help="Distinct SFX files")
+    parser.add_argument("--seconds", type=float, default=180.0, help="Timeline length")
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.run_mode, args.workdir, args.cues, args.seconds)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        build_fixture(workdir, args.distinct, args.seconds)
+        print(f"Timeline: {args.cues} SFX cues over {args.distinct} files, {args.seconds:.0f}s, VO + looping music")
+        results = {}
+        for mode in MODES:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--run-mode", mode, "--workdir", workdir,
+                 "--cues", str(args.cues), "--seconds", str(args.seconds)],
+                capture_output=True, text=True,
+            )
+            if proc.returncode != 0:
+                print(f"  {mode:<9} failed: {proc.stderr.strip()[-300:]}")
+                continue
+            results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        for mode, r in results.items():
+            speedup = ""
+            if "per_cue" in results and mode != "per_cue":
+                speedup = f"  ({results['per_cue']['seconds'] / r['seconds']:.1f}x vs per_cue)"
+            print(f"  {mode:<9} {r['seconds'] * 1000:9.0f} ms   peak RSS python {r['python_mib']:6.0f} MiB, "
+                  f"ffmpeg {r['ffmpeg_mib']:6.0f} MiB{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for LongformTranscriber.assign_speakers on synthetic transcripts.
+
+Compares the legacy per-word scan over every diarization turn against the
+sweep-based assignment, checks that the midpoint results are identical, and
+times the overlap-maximizing strategy.
+
+Usage:
+    python scripts/benchmark_speaker_assignment.py
+    python scripts/benchmark_speaker_assignment.py --hours 3 --speakers 4 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+from services.longform.transcriber import LongformTranscriber  # noqa: E402
+
+
+def synth_transcript(hours: float, speakers: int, seed: int = 7):
+    """~150 wpm words plus 2–20s diarization turns with occasional crosstalk."""
+    rng = random.Random(seed)
+    duration = hours * 3600
+    words = []
+    t = 0.0
+    while t < duration:
+        length = rng.uniform(0.15, 0.6)
+        words.append({"word": "word", "start": round(t, 3), "end": round(t + length, 3)})
+        t += length + rng.uniform(0.02, 0.25)
+
+    turns = []
+    t = 0.0
+    while t < duration:
+        length = rng.uniform(2.0, 20.0)
+        speaker = f"SPEAKER_{rng.randrange(speakers):02d}"
+        turns.append((t, t + length, speaker))
+        if rng.random() < 0.1:  # crosstalk
+            turns.append((t + length * 0.8, t + length * 1.1, f"SPEAKER_{rng.randrange(speakers):02d}"))
+        t += length + rng.uniform(0.0, 0.8)
+    turns.sort(key=lambda turn: turn[0])
+    return words, turns
+
+
+def legacy_assign(words, diarization):
+    """Original O(words × turns) midpoint assignment."""
+    result = []
+    for w in words:
+        word_mid = (w.get("start", 0) + w.get("end", 0)) / 2
+        speaker = "speaker_0"
+        for seg_start, seg_end, seg_speaker in diarization:
+            if seg_start <= word_mid <= seg_end:
+                speaker = seg_speaker
+                break
+        result.append(speaker)
+    return result
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speaker assignment")
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--speakers", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy", action="store_true", help="Skip the slow legacy scan")
+    args = parser.parse_args()
+
+    words, turns = synth_transcript(args.hours, args.speakers)
+    print(f"Synthetic transcript: {args.hours}h, {len(words)} words, {len(turns)} turns")
+
+    sweep_t, sweep = best_of(
+        lambda: LongformTranscriber.assign_speakers(words, turns, strategy="midpoint"), args.repeat
+    )
+    overlap_t, overlap = best_of(
+        lambda: LongformTranscriber.assign_speakers(words, turns, strategy="overlap"), args.repeat
+    )
+    print(f"  sweep (midpoint)   {sweep_t * 1000:10.1f} ms")
+    print(f"  sweep (overlap)    {overlap_t * 1000:10.1f} ms")
+
+    if not args.skip_legacy:
+        legacy_t, legacy = best_of(lambda: legacy_assign(words, turns), 1)
+        identical = legacy == [w.speaker_id for w in sweep]
+        print(f"  legacy scan        {legacy_t * 1000:10.1f} ms  "
+              f"({legacy_t / sweep_t:.0f}x slower, identical={identical})")
+        changed = sum(a != b.speaker_id for a, b in zip(legacy, overlap))
+        print(f"  overlap strategy relabels {changed} words ({changed / len(words):.2%})")
+
+
+if __name__ == "__main__":
+    main()
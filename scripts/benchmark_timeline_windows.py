@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark TimelinePlanner.create_windows on a synthetic long transcript.
+
+Times the array/bisect window builder against the original per-word scan
+and verifies that both produce identical TimelineWindow lists.
+
+Usage:
+    python scripts/benchmark_timeline_windows.py
+    python scripts/benchmark_timeline_windows.py --hours 3 --cuts-per-minute 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "python"))
+
+from services.longform.timeline_planner import TimelinePlanner  # noqa: E402
+from services.longform.types import (  # noqa: E402
+    SceneDetectionResult,
+    TimelineWindow,
+    TranscriptSegment,
+    TranscriptWord,
+    TranscriptionResult,
+)
+
+
+def synth_transcript(hours: float, cuts_per_minute: float, seed: int = 11):
+    rng = random.Random(seed)
+    duration = hours * 3600
+    words = []
+    t = 0.0
+    while t < duration:
+        length = rng.uniform(0.15, 0.6)
+        text = rng.choice(["so", "the", "pipeline", "really", "works", "because", "we", "ship"])
+        text += rng.choice(["", "", "", "", ",", ".", "?", "!"])
+        words.append(TranscriptWord(
+            word=text, start=round(t, 3), end=round(t + length, 3),
+            speaker_id=f"speaker_{rng.randrange(2)}",
+        ))
+        t += length + rng.choice([0.05, 0.1, 0.2, 0.4, 0.8])
+
+    transcript = TranscriptionResult(
+        segments=[TranscriptSegment(speaker="speaker_0", start=0.0, end=t, text="", words=words)],
+        speakers=["speaker_0", "speaker_1"],
+        language="en",
+        confidence=1.0,
+        duration_seconds=t,
+    )
+    cuts = sorted(round(rng.uniform(0, duration), 3) for _ in range(int(hours * 60 * cuts_per_minute)))
+    return transcript, SceneDetectionResult(scenes=[], safe_cut_points=cuts)
+
+
+def legacy_create_windows(planner, transcript, scene_boundaries):
+    """Original create_windows: per-word scoring with a full scan over safe cuts."""
+
+    def score_cut_point(words, idx, safe_cuts):
+        word = words[idx]
+        text = word.word.strip()
+        score = 0.0
+        if text.endswith((".", "?", "!")):
+            score += 10.0
+        elif text.endswith((",", ";", ":", "—", "-")):
+            score += 5.0
+        if idx + 1 < len(words):
+            gap = words[idx + 1].start - word.end
+            if gap > 0.3:
+                score += 7.0
+            elif gap > 0.15:
+                score += 3.0
+        for cut in safe_cuts:
+            if abs(cut - word.end) < 0.5:
+                score += 4.0
+                break
+        return score
+
+    words = transcript.all_words
+    safe_cuts = set(scene_boundaries.safe_cut_points) if scene_boundaries else set()
+    windows = []
+    window_start_idx = 0
+    counter = 0
+    while window_start_idx < len(words):
+        window_start_time = words[window_start_idx].start
+        target_end_time = window_start_time + planner.max_window_sec
+        min_end_time = window_start_time + planner.min_window_sec
+        best_cut_idx = None
+        best_cut_score = -1
+        for i in range(window_start_idx + 1, len(words)):
+            word_end = words[i].end
+            if word_end > target_end_time:
+                break
+            if word_end < min_end_time:
+                continue
+            score = score_cut_point(words, i, safe_cuts)
+            if score > best_cut_score:
+                best_cut_score = score
+                best_cut_idx = i
+        if best_cut_idx is None:
+            best_cut_idx = min(
+                window_start_idx + planner._words_for_duration(words, window_start_idx, planner.max_window_sec),
+                len(words) - 1,
+            )
+        window_words = words[window_start_idx:best_cut_idx + 1]
+        counter += 1
+        speaker_counts = {}
+        for w in window_words:
+            speaker_counts[w.speaker_id] = speaker_counts.get(w.speaker_id, 0) + 1
+        nearest_cut = 0.0
+        if safe_cuts:
+            nearest_cut = min(safe_cuts, key=lambda c: abs(c - window_words[0].start))
+        windows.append(TimelineWindow(
+            window_id=f"w_{counter:04d}",
+            start=window_words[0].start,
+            end=window_words[-1].end,
+            transcript_text=" ".join(w.word for w in window_words),
+            speaker=max(speaker_counts, key=speaker_counts.get),
+            words=window_words,
+            nearest_safe_cut=nearest_cut,
+        ))
+        window_start_idx = best_cut_idx + 1
+    return windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark timeline window creation")
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--cuts-per-minute", type=float, default=3.0)
+    parser.add_argument("--skip-legacy", action="store_true", help="Skip the slow legacy builder")
+    args = parser.parse_args()
+
+    transcript, scenes = synth_transcript(args.hours, args.cuts_per_minute)
+    planner = TimelinePlanner(provider="none")
+    print(f"Synthetic transcript: {args.hours}h, {len(transcript.all_words)} words, "
+          f"{len(scenes.safe_cut_points)} safe cuts")
+
+    start = time.perf_counter()
+    windows = planner.create_windows(transcript, scenes)
+    fast = time.perf_counter() - start
+    print(f"  array/bisect builder {fast * 1000:10.1f} ms  ({len(windows)} windows)")
+
+    if not args.skip_legacy:
+        start = time.perf_counter()
+        legacy = legacy_create_windows(planner, transcript, scenes)
+        slow = time.perf_counter() - start
+        identical = [w.to_dict() for w in windows] == [w.to_dict() for w in legacy]
+        print(f"  legacy builder       {slow * 1000:10.1f} ms  "
+              f"({slow / fast:.0f}x slower, identical={identical})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Lip-Sync Engine — sweep-based viseme frames and compact Remotion export
+
+Tests that:
+1. The sweep generator gives exactly the frames of the per-frame word scan
+   (gaps, overlaps, zero-length and out-of-order words, exact frame boundaries)
+2. Word viseme sequences are memoized and match the per-progress lookups
+3. The span layout run-length encodes the frames and decodes back to them
+4. The "frames" export layout is unchanged and still the default
+5. LipSyncAnimation still accepts the original frames= constructor argument
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.ai_video_pipeline import lip_sync  # noqa: E402
+from services.ai_video_pipeline.lip_sync import LipSyncEngine, Viseme, WordTimestamp  # noqa: E402
+
+
+def reference_frames(engine, words, fps, total_frames):
+    """Original O(frames × words) scan."""
+    frames = []
+    frame_duration = 1.0 / fps
+    for frame_num in range(total_frames):
+        frame_time = frame_num * frame_duration
+        current = next((w for w in words if w.start <= frame_time <= w.end), None)
+        if current:
+            duration = current.end - current.start
+            progress = (frame_time - current.start) / duration if duration > 0 else 0.0
+            frames.append((frame_num, engine._get_viseme_for_word(current.word, progress), 1.0, current.word))
+        else:
+            frames.append((frame_num, Viseme.REST, 0.0, None))
+    return frames
+
+
+def as_tuples(frames):
+    return [(f.frame_number, f.viseme, f.intensity, f.word) for f in frames]
+
+
+def random_words(n, seed=0):
+    rng = random.Random(seed)
+    vocab = ["Hello", "world,", "thank", "you", "please!", "strength", "hmm", "a", "rhythm", "ok"]
+    words, t = [], 0.0
+    for _ in range(n):
+        length = rng.choice([0.0, 0.1, 0.25, 1 / 3, 0.5])
+        words.append({"word": rng.choice(vocab), "start": round(t, 3), "end": round(t + length, 3)})
+        t += length + rng.choice([-0.1, 0.0, 0.05, 0.4])
+    return words
+
+
+def generate(words, fps):
+    return asyncio.run(LipSyncEngine().generate_lip_sync(words, fps=fps, character_id="c1"))
+
+
+class TestSweep:
+    @pytest.mark.parametrize("fps", [24, 30, 60])
+    def test_matches_per_frame_scan(self, fps):
+        raw = random_words(400, seed=fps)
+        raw.append({"word": "late", "start": 2.0, "end": 2.5})  # out of order, overlaps
+        engine = LipSyncEngine()
+        words = [WordTimestamp(w["word"], w["start"], w["end"]) for w in raw]
+        animation = generate(raw, fps)
+
+        assert as_tuples(animation.frames) == reference_frames(engine, words, fps, animation.total_frames)
+
+    def test_frame_boundaries_are_inclusive(self):
+        # 0.1 and 0.2 are exact-ish frame times at 30 fps; both ends belong to the word
+        raw = [{"word": "no", "start": 0.1, "end": 0.2}]
+        frames = generate(raw, 30).frames
+        speaking = [f.frame_number for f in frames if f.word]
+        engine = LipSyncEngine()
+        ref = reference_frames(engine, [WordTimestamp("no", 0.1, 0.2)], 30, len(frames))
+        assert speaking == [f[0] for f in ref if f[3]]
+
+    def test_sequences_are_memoized(self):
+        lip_sync.word_viseme_sequence.cache_clear()
+        lip_sync._word_codes.cache_clear()
+        generate([{"word": "Hello", "start": i, "end": i + 0.5} for i in range(50)], 30)
+        info = lip_sync.word_viseme_sequence.cache_info()
+        assert info.misses == 1
+        assert lip_sync.word_viseme_sequence("Hello!") == (Viseme.E, Viseme.L, Viseme.O)
+        assert lip_sync.word_viseme_sequence("hmm") == (Viseme.M, Viseme.M)
+
+    def test_empty_input(self):
+        animation = generate([], 30)
+        assert animation.frames == []
+        assert LipSyncEngine().export_for_remotion(animation, layout="spans")["spans"]["startFrame"] == []
+
+
+class TestRemotionExport:
+    def test_spans_decode_to_frames(self):
+        animation = generate(random_words(300, seed=5), 60)
+        props = LipSyncEngine().export_for_remotion(animation, layout="spans")
+        spans = props["spans"]
+        table = props["visemeTable"]
+
+        decoded = []
+        starts = spans["startFrame"] + [props["durationInFrames"]]
+        for i, start in enumerate(spans["startFrame"]):
+            for frame in range(start, starts[i + 1]):
+                decoded.append((frame, table[spans["viseme"][i]], float(spans["intensity"][i])))
+
+        expected = [(f.frame_number, f.viseme.value, f.intensity) for f in animation.frames]
+        assert decoded == expected
+        assert len(spans["startFrame"]) < len(expected) / 2
+
+        legacy = LipSyncEngine().export_for_remotion(animation)
+        assert len(json.dumps(props)) * 5 < len(json.dumps(legacy))
+
+    def test_frames_layout_unchanged(self):
+        animation = generate([{"word": "yes", "start": 0.0, "end": 0.1}], 30)
+        props = LipSyncEngine().export_for_remotion(animation, layout="frames")
+        assert props["frames"] == [
+            {"frame": 0, "viseme": "e", "intensity": 1.0},
+            {"frame": 1, "viseme": "e", "intensity": 1.0},
+            {"frame": 2, "viseme": "s", "intensity": 1.0},
+            {"frame": 3, "viseme": "s", "intensity": 1.0},
+        ]
+        assert props["durationInFrames"] == 4
+        assert LipSyncEngine().export_for_remotion(animation) == props
+        assert animation.to_dict()["frames"][0]["word"] == "yes"
+
+
+class TestLegacyConstructor:
+    def test_frames_argument(self):
+        frames = [
+            lip_sync.VisemeFrame(0, 0.0, Viseme.REST, 0.0),
+            lip_sync.VisemeFrame(1, 1 / 30, Viseme.A, 0.5, "ah"),
+            lip_sync.VisemeFrame(2, 2 / 30, Viseme.A, 0.5, "ah"),
+            lip_sync.VisemeFrame(3, 3 / 30, Viseme.M, 1.0, "mm"),
+        ]
+        animation = lip_sync.LipSyncAnimation(frames=frames, duration=0.1, fps=30, total_frames=4)
+        assert as_tuples(animation.frames) == as_tuples(frames)
+        assert lip_sync.LipSyncAnimation(frames, 0.1, 30, 4) == animation
+
+        spans = LipSyncEngine().export_for_remotion(animation, layout="spans")["spans"]
+        assert spans["startFrame"] == [0, 1, 3]
+        assert spans["intensity"] == [0, 0.5, 1]
+
+        with pytest.raises(TypeError):
+            lip_sync.LipSyncAnimation(duration=0.1, fps=30, total_frames=4)
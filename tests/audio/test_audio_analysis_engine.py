@@ -0,0 +1,130 @@
+"""
+Audio Analysis Engine — streamed, off-event-loop librosa analysis
+
+Tests that:
+1. Block-streamed features match a whole-signal librosa analysis
+2. Results don't depend on the block size
+3. Feature extraction runs in a worker pool without blocking the event loop
+4. analyze_batch analyzes several files concurrently and keeps input order
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip("numpy")
+librosa = pytest.importorskip("librosa")
+sf = pytest.importorskip("soundfile")
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.audio.audio_analysis_engine import AudioAnalysisEngine, compute_audio_features
+from services.audio.audio_analyzer import AudioAnalyzer
+
+SR = 22050
+
+
+def synth_music(seconds, seed=0):
+    """Tone + noise with a click every half second (≈120 BPM)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(SR * seconds)) / SR
+    y = 0.2 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(len(t))
+    y[np.floor(t * 2) != np.floor((t - 1 / SR) * 2)] += 0.9
+    y = np.convolve(y, np.exp(-np.arange(200) / 30.0), mode="same") * 0.3
+    return y.astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def wav_path(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("audio") / "music.wav")
+    sf.write(path, synth_music(40), SR, subtype="FLOAT")
+    return path
+
+
+class TestStreamedFeatures:
+    def test_matches_whole_signal_analysis(self, wav_path):
+        y, _ = librosa.load(wav_path, sr=SR, mono=True)
+        rms = librosa.feature.rms(y=y)[0]
+        bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=SR)[0]
+        centroid = librosa.feature.spectral_centroid(y=y, sr=SR)[0]
+        tempo, beats = librosa.beat.beat_track(y=y, sr=SR)
+        y_harmonic, _ = librosa.effects.hpss(y)
+        harmonic_ratio = np.sum(np.abs(y_harmonic)) / (np.sum(np.abs(y)) + 1e-10)
+
+        features = compute_audio_features(wav_path, sample_rate=SR, block_seconds=7.0)
+
+        assert features["duration"] == pytest.approx(len(y) / SR)
+        assert features["mean_rms"] == pytest.approx(float(np.mean(rms)), rel=1e-5)
+        assert features["max_rms"] == pytest.approx(float(np.max(rms)), rel=1e-5)
+        assert features["min_rms"] == pytest.approx(float(np.min(rms)), rel=1e-5)
+        assert features["mean_bandwidth"] == pytest.approx(float(np.mean(bandwidth)), rel=1e-5)
+        assert features["mean_centroid"] == pytest.approx(float(np.mean(centroid)), rel=1e-5)
+        assert features["harmonic_ratio"] == pytest.approx(float(harmonic_ratio), rel=1e-4)
+        assert features["tempo"] == pytest.approx(float(np.atleast_1d(tempo)[0]))
+        assert features["beat_count"] == len(beats)
+
+    def test_block_size_independent(self, wav_path):
+        small = compute_audio_features(wav_path, sample_rate=SR, block_seconds=3.0)
+        large = compute_audio_features(wav_path, sample_rate=SR, block_seconds=120.0)
+        for key in ("mean_rms", "mean_zcr", "mean_bandwidth", "harmonic_ratio", "tempo"):
+            assert small[key] == pytest.approx(large[key], rel=1e-5)
+        assert small["beat_count"] == large["beat_count"]
+
+
+class TestAnalyzerOffLoop:
+    def test_event_loop_stays_responsive(self, wav_path):
+        analyzer = AudioAnalyzer(engine=AudioAnalysisEngine(executor=ThreadPoolExecutor(max_workers=1)))
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await analyzer._analyze_with_librosa(wav_path)
+            task.cancel()
+            return result, ticks
+
+        result, ticks = asyncio.run(scenario())
+        assert result.error is None
+        assert result.has_music
+        assert result.duration_sec == pytest.approx(40.0, abs=0.01)
+        assert ticks > 5
+
+    def test_analyze_batch_keeps_order(self, wav_path, tmp_path, monkeypatch):
+        quiet = str(tmp_path / "quiet.wav")
+        sf.write(quiet, np.zeros(SR * 3, dtype=np.float32), SR)
+        sources = {"a.mp4": wav_path, "b.mp4": quiet, "missing.mp4": None}
+        for name in sources:
+            if sources[name]:
+                (tmp_path / name).write_bytes(b"\0")
+
+        async def fake_extract(video_path):
+            # Stand-in for ffmpeg: hand back a copy of the prepared WAV
+            src = sources[os.path.basename(video_path)]
+            copy = str(tmp_path / f"extracted_{os.path.basename(video_path)}.wav")
+            shutil.copy(src, copy)
+            return copy
+
+        analyzer = AudioAnalyzer(engine=AudioAnalysisEngine(executor=ThreadPoolExecutor(max_workers=2)))
+        monkeypatch.setattr(analyzer, "_extract_audio", fake_extract)
+
+        paths = [str(tmp_path / n) for n in ("a.mp4", "b.mp4", "missing.mp4")]
+        start = time.perf_counter()
+        results = asyncio.run(analyzer.analyze_batch(paths, max_concurrency=2))
+        assert time.perf_counter() - start < 60
+
+        assert [r.duration_sec for r in results[:2]] == pytest.approx([40.0, 3.0], abs=0.01)
+        assert results[0].has_music
+        assert not results[1].has_music
+        assert results[2].error.startswith("File not found")
@@ -0,0 +1,268 @@
+"""
+Music Catalog — indexed music metadata with incremental refresh
+
+Tests that:
+1. A directory refresh extracts each file once and afterwards only re-reads
+   new/changed files (audio or sidecar), dropping vanished ones
+2. The index persists on disk across catalog instances
+3. Indexed search gives the same results as the legacy per-file criteria check,
+   plus FTS tag and duration filters
+4. Vectorized compatibility ranking matches MusicSelector's linear scoring loop
+   (scores, order and ties)
+5. SunoAdapter serves search_music/get_music from the catalog
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.audio.music_catalog import MusicCatalog
+from services.audio.music_selector import ClipAnalysis, MusicSelector, MusicTrack
+
+GENRES = ["lofi", "pop", "electronic", "hiphop", "ambient", "general", "corporate", "cinematic"]
+MOODS = ["happy", "calm", "energetic", "neutral", "peaceful", "relaxed", "confident", "sad"]
+
+
+def write_track(root, name, metadata=None):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"ID3" + name.encode())
+    if metadata is not None:
+        path.with_suffix(".json").write_text(json.dumps(metadata))
+    return path
+
+
+def read_sidecar(path):
+    sidecar = path.with_suffix(".json")
+    return json.loads(sidecar.read_text()) if sidecar.exists() else {}
+
+
+def random_library(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"t{i}",
+            "file_path": f"/music/t{i}.mp3",
+            "genre": rng.choice(GENRES),
+            "mood": rng.choice(MOODS),
+            "moods": rng.sample(MOODS, rng.randrange(0, 3)),
+            "energy_level": rng.choice([0.2, 0.3, 0.5, 0.7, 0.85, 0.9]),
+            "tempo": rng.randrange(70, 150),
+            "duration": rng.choice([30, 60, 120, 240]),
+        }
+        for i in range(n)
+    ]
+
+
+class TestRefresh:
+    def test_only_changed_files_are_extracted(self, tmp_path):
+        lib = tmp_path / "lib"
+        a = write_track(lib, "a.mp3", {"genre": "lofi", "bpm": 80})
+        write_track(lib, "sub/b.wav", {"genre": "pop"})
+        c = write_track(lib, "c.flac")
+        (lib / "notes.txt").write_text("not audio")
+
+        calls = []
+
+        def extract(path):
+            calls.append(path.name)
+            return read_sidecar(path)
+
+        catalog = MusicCatalog(tmp_path / "catalog.db")
+        counts = catalog.refresh_directory(lib, extract)
+        assert counts == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+        assert sorted(calls) == ["a.mp3", "b.wav", "c.flac"]
+
+        calls.clear()
+        assert catalog.refresh_directory(lib, extract, force=True)["unchanged"] == 3
+        assert calls == []
+
+        # Sidecar edit, audio rewrite, removal and a new file
+        a.with_suffix(".json").write_text(json.dumps({"genre": "ambient", "bpm": 70}))
+        os.utime(a.with_suffix(".json"), ns=(1, 10**18))
+        c.write_bytes(b"longer payload")
+        (lib / "sub" / "b.wav").unlink()
+        write_track(lib, "d.mp3", {"genre": "pop"})
+
+        counts = catalog.refresh_directory(lib, extract, force=True)
+        assert counts == {"added": 1, "updated": 2, "removed": 1, "unchanged": 0}
+        assert sorted(calls) == ["a.mp3", "c.flac", "d.mp3"]
+        source = catalog.dir_source(lib)
+        assert catalog.get(source, "a.mp3")["genre"] == "ambient"
+        assert catalog.get(source, "sub/b.wav") is None
+        assert catalog.count(source) == 3
+
+    def test_refresh_is_throttled_and_persistent(self, tmp_path):
+        lib = tmp_path / "lib"
+        write_track(lib, "a.mp3", {"genre": "lofi"})
+        db = tmp_path / "catalog.db"
+
+        catalog = MusicCatalog(db, min_refresh_interval=60)
+        catalog.refresh_directory(lib, read_sidecar)
+        write_track(lib, "b.mp3")
+        assert catalog.refresh_directory(lib, read_sidecar)["added"] == 0
+        catalog.close()
+
+        reopened = MusicCatalog(db)
+        assert reopened.count(reopened.dir_source(lib)) == 1
+        counts = reopened.refresh_directory(lib, read_sidecar)
+        assert counts["added"] == 1 and counts["unchanged"] == 1
+
+
+class TestSearch:
+    @staticmethod
+    def legacy_matches(metadata, genre=None, mood=None, bpm_min=None, bpm_max=None):
+        if genre and metadata.get("genre") != genre:
+            return False
+        if mood and metadata.get("mood") != mood:
+            return False
+        if bpm_min and metadata.get("bpm", 0) < bpm_min:
+            return False
+        if bpm_max and metadata.get("bpm", 999) > bpm_max:
+            return False
+        return True
+
+    def test_filters_match_legacy_semantics(self, tmp_path):
+        rng = random.Random(3)
+        lib = tmp_path / "lib"
+        sidecars = {}
+        for i in range(200):
+            metadata = {"genre": rng.choice(GENRES), "mood": rng.choice(MOODS)}
+            if rng.random() < 0.8:
+                metadata["bpm"] = rng.randrange(60, 160)
+            sidecars[f"track_{i:03d}.mp3"] = metadata
+            write_track(lib, f"track_{i:03d}.mp3", metadata)
+
+        catalog = MusicCatalog()
+        catalog.refresh_directory(lib, read_sidecar)
+        source = catalog.dir_source(lib)
+
+        for criteria in [
+            {},
+            {"genre": "lofi"},
+            {"mood": "calm", "bpm_max": 100},
+            {"bpm_min": 90, "bpm_max": 120},
+            {"genre": "pop", "bpm_min": 100},
+        ]:
+            rows = catalog.search(source=source, limit=1000, **criteria)
+            expected = sorted(k for k, m in sidecars.items() if self.legacy_matches(m, **criteria))
+            assert [r["key"] for r in rows] == expected
+
+        assert len(catalog.search(source=source, limit=5)) == 5
+
+    def test_tags_and_duration(self, tmp_path):
+        lib = tmp_path / "lib"
+        write_track(lib, "a.mp3", {"title": "Night Drive", "tags": ["synthwave", "retro"], "duration": 90})
+        write_track(lib, "b.mp3", {"title": "Morning Coffee", "tags": ["acoustic"], "duration": 200})
+        write_track(lib, "c.mp3", {"title": "Unknown length", "tags": ["retro"]})
+
+        catalog = MusicCatalog()
+        catalog.refresh_directory(lib, read_sidecar)
+        source = catalog.dir_source(lib)
+
+        def keys(**kwargs):
+            return [r["key"] for r in catalog.search(source=source, **kwargs)]
+
+        assert keys(text=["retro"]) == ["a.mp3", "c.mp3"]
+        assert keys(text=["acoustic", "synthwave"]) == ["a.mp3", "b.mp3"]
+        assert keys(text="night drive") == ["a.mp3"]
+        assert keys(text=['odd "quote']) == []
+        # Tracks without a known duration are kept
+        assert keys(duration_min=120) == ["b.mp3", "c.mp3"]
+        assert keys(duration_max=120, text=["retro"]) == ["a.mp3", "c.mp3"]
+
+
+class TestCompatibilityRanking:
+    @staticmethod
+    def legacy_select(selector, analysis, top_n):
+        matches = []
+        for track in selector.load_music_library():
+            score, _ = selector._calculate_compatibility(analysis, track)
+            if score > 0.3:
+                matches.append((track.id, score))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches[:top_n]
+
+    def test_matches_linear_scoring(self):
+        selector = MusicSelector(catalog=MusicCatalog())
+        selector.load_music_library({"tracks": random_library(2000)})
+
+        rng = random.Random(1)
+        for _ in range(40):
+            analysis = ClipAnalysis(
+                clip_id="c",
+                duration=rng.choice([20, 60, 180]),
+                mood=rng.choice(MOODS + ["upbeat"]),
+                energy_level=rng.choice([0.1, 0.5, 0.7, 0.9]),
+                content_type=rng.choice(list(MusicSelector.GENRE_MAP) + ["unknown"]),
+            )
+            top_n = rng.choice([1, 3, 25])
+            cols = selector._get_catalog().rank_compatible(
+                selector._catalog_source,
+                mood=analysis.mood,
+                compatible_moods=selector._compatible_moods(analysis.mood),
+                energy=analysis.energy_level,
+                preferred_genres=MusicSelector.GENRE_MAP.get(analysis.content_type, ["general"]),
+                duration=analysis.duration,
+                top_n=top_n,
+            )
+            library = selector.load_music_library()
+            ranked = [(library[int(row["key"])].id, score) for row, score in cols]
+            assert ranked == self.legacy_select(selector, analysis, top_n)
+
+    def test_select_music_for_clip(self):
+        selector = MusicSelector(catalog=MusicCatalog())
+        kwargs = dict(duration=30, transcript="so calm and peaceful, relaxing", topics=["tutorial"])
+        matches = asyncio.run(selector.select_music_for_clip(top_n=2, **kwargs))
+        analysis = asyncio.run(selector.analyze_clip(**kwargs))
+
+        assert [(m.track.id, m.compatibility_score) for m in matches] == self.legacy_select(selector, analysis, 2)
+        assert isinstance(matches[0].track, MusicTrack)
+        assert matches[0].reasoning == selector._calculate_compatibility(analysis, matches[0].track)[1]
+
+    def test_library_is_imported_once(self):
+        catalog = MusicCatalog()
+        selector = MusicSelector(catalog=catalog)
+        selector._get_catalog()
+        cols = catalog._source_columns(selector._catalog_source)
+        selector._get_catalog()
+        assert catalog._source_columns(selector._catalog_source) is cols
+
+
+class TestSunoAdapter:
+    @pytest.fixture
+    def suno(self, tmp_path):
+        module = pytest.importorskip("services.music.adapters.suno")
+        from services.music.models import MusicSearchCriteria
+
+        write_track(tmp_path, "chill_beats.mp3", {"bpm": 80, "tags": ["study"]})
+        write_track(tmp_path, "drops/edm_energetic.wav", {"bpm": 128})
+        write_track(tmp_path, "hiphop_loop.mp3")
+        return module.SunoAdapter(str(tmp_path)), MusicSearchCriteria
+
+    def test_search_uses_catalog(self, suno):
+        adapter, Criteria = suno
+        results = asyncio.run(adapter.search_music(Criteria(mood="calm")))
+        assert [r["track_id"] for r in results] == ["chill_beats.mp3"]
+        assert results[0]["bpm"] == 80 and results[0]["source"] == "suno"
+
+        results = asyncio.run(adapter.search_music(Criteria(genre="electronic", bpm_min=100)))
+        assert [r["track_id"] for r in results] == ["drops/edm_energetic.wav"]
+        assert asyncio.run(adapter.search_music(Criteria(tags=["study"])))[0]["title"] == "chill_beats"
+        assert (adapter.suno_dir / adapter.CATALOG_FILENAME).exists()
+
+    def test_get_music_reads_index(self, suno):
+        adapter, Criteria = suno
+        asyncio.run(adapter.search_music(Criteria()))
+        adapter._extract_metadata = lambda path: pytest.fail("metadata should come from the index")
+        response = asyncio.run(adapter.get_music("hiphop_loop.mp3"))
+        assert response.success and response.genre == "hip-hop"
@@ -0,0 +1,155 @@
+"""
+TTS Clip Cache — disk-backed, content-addressed speech clip cache
+
+Tests that:
+1. Keys depend on normalized text, voice, model, params and format (not whitespace)
+2. Hits materialize an identical copy and are counted in the metrics
+3. The cache evicts least recently used clips once it grows past max_bytes
+4. Concurrent get_or_synthesize calls for one key synthesize once, and the
+   per-key lock is released after success or failure
+5. Writes are atomic: no temp files are left behind and partial clips are never visible
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.audio.tts_clip_cache import TTSClipCache, normalize_tts_text
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TTSClipCache(root_dir=str(tmp_path / "cache"), max_bytes=10_000)
+
+
+def clip(tmp_path, name, size, fill=b"a"):
+    path = tmp_path / name
+    path.write_bytes(fill * size)
+    return path
+
+
+class TestKeys:
+    def test_whitespace_is_normalized_but_case_is_not(self):
+        assert normalize_tts_text("  Hello \n  world ") == "Hello world"
+        base = TTSClipCache.make_key("Hello world", voice="alloy", model="openai:tts-1")
+        assert TTSClipCache.make_key(" Hello   world\n", voice="alloy", model="openai:tts-1") == base
+        assert TTSClipCache.make_key("hello world", voice="alloy", model="openai:tts-1") != base
+
+    @pytest.mark.parametrize("change", [
+        {"voice": "nova"},
+        {"model": "openai:tts-1-hd"},
+        {"params": {"speed": 1.1}},
+        {"params": {"emotion": {"happy": 0.8}}},
+        {"fmt": "wav"},
+    ])
+    def test_every_input_changes_the_key(self, change):
+        args = {"voice": "alloy", "model": "openai:tts-1", "params": {"speed": 1.0}, "fmt": "mp3"}
+        assert TTSClipCache.make_key("Hi", **args) != TTSClipCache.make_key("Hi", **{**args, **change})
+
+    def test_param_order_does_not_matter(self):
+        assert TTSClipCache.make_key("Hi", params={"a": 1, "b": 2}) == TTSClipCache.make_key("Hi", params={"b": 2, "a": 1})
+
+
+class TestStoreAndMaterialize:
+    def test_round_trip_and_metrics(self, cache, tmp_path):
+        key = cache.make_key("Hi", voice="v", fmt="wav")
+        assert not cache.materialize(key, str(tmp_path / "out" / "miss.wav"))
+
+        src = clip(tmp_path, "src.wav", 1000, b"x")
+        cache.store(key, str(src), meta={"duration_seconds": 1.5})
+        out = tmp_path / "out" / "hit.wav"
+        assert cache.materialize(key, str(out))
+        assert out.read_bytes() == src.read_bytes()
+        assert cache.get_meta(key)["duration_seconds"] == 1.5
+
+        metrics = cache.get_metrics()
+        assert (metrics["hits"], metrics["misses"], metrics["writes"]) == (1, 1, 1)
+        assert metrics["bytes_cached"] == 1000
+        assert metrics["bytes_served"] == 1000
+        assert metrics["hit_rate_percent"] == 50.0
+
+    def test_no_temp_files_left(self, cache, tmp_path):
+        key = cache.make_key("Hi")
+        cache.store(key, str(clip(tmp_path, "src.wav", 100)), meta={})
+        cache.materialize(key, str(tmp_path / "out.wav"))
+        leftovers = [p for p in (tmp_path).rglob("*") if p.name.endswith(".tmp")]
+        assert leftovers == []
+
+    def test_size_survives_restart(self, cache, tmp_path):
+        cache.store(cache.make_key("Hi"), str(clip(tmp_path, "src.wav", 1234)))
+        reopened = TTSClipCache(root_dir=str(cache.root_dir), max_bytes=10_000)
+        assert reopened.get_metrics()["bytes_cached"] == 1234
+
+
+class TestEviction:
+    def test_least_recently_used_evicted(self, cache, tmp_path):
+        keys = [cache.make_key(f"line {i}") for i in range(4)]
+        for i, key in enumerate(keys[:3]):
+            cache.store(key, str(clip(tmp_path, f"{i}.wav", 3000)))
+            # Distinct mtimes even on coarse filesystems
+            past = time.time() - 100 + i
+            os.utime(cache.lookup(key), (past, past))
+
+        # Touch the oldest so the second one becomes least recently used
+        assert cache.lookup(keys[0]) is not None
+        cache.store(keys[3], str(clip(tmp_path, "3.wav", 3000)))
+
+        assert cache.lookup(keys[1]) is None
+        assert all(cache.lookup(k) is not None for k in (keys[0], keys[2], keys[3]))
+        assert cache.get_metrics()["evictions"] == 1
+        assert cache.get_metrics()["bytes_cached"] <= 9000
+
+
+class TestSingleFlight:
+    def test_concurrent_requests_synthesize_once(self, cache, tmp_path):
+        calls = []
+
+        async def main():
+            key = cache.make_key("Shared line")
+
+            async def request(i):
+                out = tmp_path / f"out_{i}.wav"
+
+                async def synthesize():
+                    calls.append(i)
+                    await asyncio.sleep(0.05)
+                    out.write_bytes(b"audio")
+
+                return await cache.get_or_synthesize(key, str(out), synthesize)
+
+            return await asyncio.gather(*(request(i) for i in range(5)))
+
+        served = asyncio.run(main())
+        assert len(calls) == 1
+        assert sorted(served) == [False, True, True, True, True]
+        assert all((tmp_path / f"out_{i}.wav").read_bytes() == b"audio" for i in range(5))
+
+    def test_key_lock_released_after_failure(self, cache, tmp_path):
+        key = cache.make_key("Flaky line")
+        out = tmp_path / "out.wav"
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("TTS provider error")
+
+        async def succeed():
+            out.write_bytes(b"audio")
+
+        async def main():
+            results = await asyncio.gather(
+                *(cache.get_or_synthesize(key, str(out), fail) for _ in range(3)),
+                return_exceptions=True,
+            )
+            assert all(isinstance(r, RuntimeError) for r in results)
+            assert cache._key_locks[asyncio.get_running_loop()] == {}
+            return await cache.get_or_synthesize(key, str(out), succeed)
+
+        assert asyncio.run(main()) is False
+        # Each asyncio.run gets its own loop and locks
+        assert asyncio.run(cache.get_or_synthesize(key, str(tmp_path / "again.wav"), succeed)) is True
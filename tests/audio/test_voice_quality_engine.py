@@ -0,0 +1,143 @@
+"""
+Voice Quality Engine — one-decode NumPy voice cloning assessment
+
+Tests that:
+1. Block-wise per-frame RMS/peak levels match a direct per-packet (astats-style) computation
+2. Silence spans follow silencedetect rules (-40 dB, >= 0.5 s, trailing silence reported)
+3. Clipping, voice-band energy and F0 are detected on synthetic speech-like signals
+4. The memory-mapped decode gives exactly the same results as the in-memory decode
+5. assess_audio_quality fills VoiceQualityMetrics without spawning ffmpeg
+6. assess_directory scores a folder of clips and ranks the clean one first
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+sf = pytest.importorskip("soundfile")
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.audio import voice_quality_engine as engine
+from services.audio.voice_cloning_quality_assessor import VoiceCloningQualityAssessor
+
+SR = 16000
+
+
+def voice(seconds, f0=150.0, amplitude=0.3, seed=0):
+    """Harmonic 'voice' with a slow syllable envelope."""
+    t = np.arange(int(SR * seconds)) / SR
+    y = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 3 * t) ** 2
+    rng = np.random.default_rng(seed)
+    return (amplitude * y / 2.3 * envelope + 0.001 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(SR * seconds), dtype=np.float32)
+
+
+@pytest.fixture
+def speech_wav(tmp_path):
+    y = np.concatenate([voice(2.0), silence(1.0), voice(1.5), silence(0.3), voice(1.0), silence(0.75)])
+    path = tmp_path / "speech.wav"
+    sf.write(str(path), y, SR, subtype="PCM_16")
+    return path
+
+
+class TestAnalyzeBuffer:
+    def test_frame_levels_match_per_packet_stats(self, speech_wav):
+        y, _ = sf.read(str(speech_wav), dtype="float32", always_2d=True)
+        raw = engine.analyze_buffer(y, SR)
+
+        expected_rms, expected_peak = [], []
+        for start in range(0, len(y), engine.FRAME_SAMPLES):
+            frame = y[start:start + engine.FRAME_SAMPLES].astype(np.float64)
+            expected_rms.append(max(10 * np.log10(np.mean(frame ** 2) or 1e-30), engine.DB_FLOOR))
+            expected_peak.append(max(20 * np.log10(np.max(np.abs(frame)) or 1e-30), engine.DB_FLOOR))
+
+        np.testing.assert_allclose(raw["rms_db"], expected_rms, atol=1e-4)
+        np.testing.assert_allclose(raw["peak_db"], expected_peak, atol=1e-4)
+        assert raw["mean_square"] == pytest.approx(float(np.mean(y.astype(np.float64) ** 2)))
+
+    def test_silence_spans(self, speech_wav):
+        y, _ = sf.read(str(speech_wav), dtype="float32", always_2d=True)
+        raw = engine.analyze_buffer(y, SR)
+        spans = raw["silences"]
+        # 1.0 s gap and the 0.75 s tail; the 0.3 s gap is too short
+        assert len(spans) == 2
+        assert spans[0][1] - spans[0][0] == pytest.approx(1.0, abs=0.02)
+        assert spans[1][1] == pytest.approx(len(y) / SR)
+        assert spans[1][1] - spans[1][0] == pytest.approx(0.75, abs=0.02)
+
+    def test_silence_run_spanning_blocks(self):
+        block_seconds = engine.BLOCK_FRAMES * engine.FRAME_SAMPLES / SR
+        y = np.concatenate([voice(block_seconds - 0.2), silence(0.6), voice(1.0)])[:, None]
+        spans = engine.analyze_buffer(y, SR)["silences"]
+        assert len(spans) == 1
+        assert spans[0][1] - spans[0][0] == pytest.approx(0.6, abs=0.02)
+
+    def test_clipping_voice_band_and_f0(self):
+        clean = engine.summarize(engine.analyze_buffer(voice(3.0)[:, None], SR), {})
+        assert not clean["distortion"]["has_clipping"]
+        assert clean["frequency"]["voice_range_covered"]
+        assert clean["frequency"]["fundamental_freq_hz"] == pytest.approx(150.0, rel=0.03)
+
+        clipped = np.clip(voice(3.0, amplitude=2.0), -1.0, 1.0)[:, None]
+        distortion = engine.summarize(engine.analyze_buffer(clipped, SR), {})["distortion"]
+        assert distortion["has_clipping"]
+        assert distortion["score"] == 0.3
+        assert distortion["clipped_samples"] > 0
+
+        hiss = (0.05 * np.random.default_rng(1).standard_normal(SR * 3)).astype(np.float32)
+        hiss_freq = engine.summarize(engine.analyze_buffer(hiss[:, None], SR), {})["frequency"]
+        assert hiss_freq["mean_voice_energy_db"] < clean["frequency"]["mean_voice_energy_db"] - 10
+
+
+class TestDecode:
+    def test_memory_mapped_decode_matches_in_memory(self, speech_wav):
+        in_memory = engine.analyze_voice_quality(speech_wav, mmap_threshold_seconds=3600)
+        mapped = engine.analyze_voice_quality(speech_wav, mmap_threshold_seconds=0)
+        assert mapped == in_memory
+        assert in_memory["metadata"]["format"] == "pcm_s16le"
+        assert in_memory["metadata"]["sample_rate"] == SR
+
+
+class TestAssessor:
+    def test_assess_without_ffmpeg(self, speech_wav, monkeypatch):
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("ffmpeg should not be spawned")
+
+        monkeypatch.setattr(subprocess, "run", no_subprocess)
+        metrics = VoiceCloningQualityAssessor().assess_audio_quality(
+            speech_wav, transcript="hello there this is a short reference clip",
+        )
+
+        assert not any(issue.startswith("Assessment error") for issue in metrics.issues)
+        assert metrics.duration_seconds == pytest.approx(6.55, abs=0.01)
+        assert metrics.sample_rate_hz == SR
+        assert metrics.channels == 1
+        assert metrics.pause_count == 2
+        assert metrics.snr_db is not None and metrics.mean_volume_db is not None
+        assert metrics.fundamental_frequency_hz == pytest.approx(150.0, rel=0.03)
+        assert metrics.transcript_length_words == 8
+        assert 0.0 < metrics.overall_score <= 1.0
+
+    def test_assess_directory_ranks_clips(self, tmp_path):
+        rng = np.random.default_rng(3)
+        clean = voice(4.0)
+        noisy = np.clip(voice(4.0, amplitude=1.5) + 0.2 * rng.standard_normal(SR * 4), -1, 1)
+        sf.write(str(tmp_path / "a_noisy.wav"), noisy.astype(np.float32), SR)
+        sf.write(str(tmp_path / "b_clean.wav"), clean, SR)
+        (tmp_path / "b_clean.txt").write_text("a transcript for the clean clip")
+        (tmp_path / "notes.md").write_text("not a clip")
+
+        ranked = VoiceCloningQualityAssessor().assess_directory(tmp_path, max_workers=1)
+
+        assert [p.name for p, _ in ranked] == ["b_clean.wav", "a_noisy.wav"]
+        assert ranked[0][1].transcript_length_words == 6
+        assert ranked[1][1].has_clipping
@@ -0,0 +1,58 @@
+"""
+Audio Enhancer — single-pass ffmpeg graph
+
+Tests that:
+1. The source is decoded once (single -i) and split into two outputs
+2. The enhanced video copies the video stream instead of re-encoding it
+3. The Whisper branch matches LongformTranscriber.extract_audio (16 kHz mono MP3, unfiltered)
+"""
+
+import os
+import sys
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform.audio_enhancer import AudioEnhancer, VOICE_FILTER_CHAIN
+
+
+OUTPUTS = ["enhanced.mp4", "asr.mp3"]
+
+
+def _output_args(cmd, output):
+    """Options that apply to one output (everything after the previous output)."""
+    end = cmd.index(output)
+    previous = [cmd.index(o) for o in OUTPUTS if cmd.index(o) < end]
+    start = max(previous) + 1 if previous else cmd.index("-filter_complex") + 2
+    return cmd[start:end]
+
+
+class TestSinglePassCommand:
+    def setup_method(self):
+        self.cmd = AudioEnhancer.build_single_pass_command(
+            "source.mp4", *OUTPUTS,
+        )
+
+    def test_single_decode(self):
+        assert self.cmd.count("-i") == 1
+        assert self.cmd[0] == "ffmpeg"
+        assert self.cmd.count("-filter_complex") == 1
+
+    def test_video_stream_copied(self):
+        args = _output_args(self.cmd, "enhanced.mp4")
+        assert args[args.index("-c:v") + 1] == "copy"
+        assert "[enh_mux]" in args
+
+    def test_voice_chain_feeds_only_the_video(self):
+        graph = self.cmd[self.cmd.index("-filter_complex") + 1]
+        assert f"[voice]{VOICE_FILTER_CHAIN}[enh_mux]" in graph
+        assert self.cmd.count("-map") == 3  # video stream, enhanced audio, Whisper audio
+
+    def test_whisper_branch_is_unfiltered_16k_mono(self):
+        args = _output_args(self.cmd, "asr.mp3")
+        assert args[args.index("-ar") + 1] == "16000"
+        assert args[args.index("-ac") + 1] == "1"
+        assert args[args.index("-c:a") + 1] == "libmp3lame"
+        graph = self.cmd[self.cmd.index("-filter_complex") + 1]
+        assert "[0:a:0]asplit=2[voice][asr]" in graph
+        assert "[asr]aresample=16000" in graph
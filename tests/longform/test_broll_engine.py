@@ -0,0 +1,219 @@
+"""
+B-Roll Sourcing Engine tests against a local fake Pexels/OpenAI server
+
+Tests that:
+1. Identical queries across windows hit Pexels once
+2. All Pass A embeddings go out in batched requests
+3. The on-disk query cache serves repeat runs and expires after its TTL
+4. Each window gets a downloaded, Pass A-ranked clip
+5. Embeddings persist across runs keyed by text hash
+6. The in-process embedding cache is a bounded LRU backed by the .npy files
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform.broll_engine import BrollSourcingEngine, QueryCache
+from services.longform.broll_sourcer import BrollSourcer, EmbeddingCache
+from services.longform.types import BrollSearchIntent, TimelineWindow
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """Serves /videos/search, /v1/embeddings and /files/<id>.mp4."""
+
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        FakeApiHandler.requests.append(("GET", url.path, parse_qs(url.query)))
+        if url.path == "/videos/search":
+            query = parse_qs(url.query)["query"][0]
+            base = abs(hash(query)) % 10_000 * 10
+            host = f"http://{self.headers['Host']}"
+            self._json({"videos": [
+                {
+                    "id": base + i,
+                    "duration": 10,
+                    "video_pictures": [{"picture": ""}],
+                    "video_files": [{
+                        "width": 1920, "height": 1080, "fps": 30, "file_type": "video/mp4",
+                        "link": f"{host}/files/{base + i}.mp4",
+                    }],
+                }
+                for i in range(3)
+            ]})
+        elif url.path.startswith("/files/"):
+            body = b"\x00" * 1024
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        FakeApiHandler.requests.append(("POST", self.path, payload))
+        if self.path == "/v1/embeddings":
+            data = []
+            for idx, text in enumerate(payload["input"]):
+                # Deterministic 8-dim vectors: intents and candidates share letters
+                vec = [float(text.count(ch)) + 0.01 for ch in "aeiourst"]
+                data.append({"index": idx, "embedding": vec})
+            self._json({"data": data})
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def fake_api():
+    FakeApiHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def make_windows(count, shared_intent=True):
+    windows = []
+    for i in range(count):
+        suffix = "" if shared_intent else f" {i}"
+        windows.append(TimelineWindow(
+            window_id=f"w_{i:04d}",
+            start=i * 5.0,
+            end=i * 5.0 + 5.0,
+            transcript_text="pipelines decay without follow up",
+            speaker="speaker_0",
+            broll_needed=True,
+            broll_search_intent=BrollSearchIntent(
+                literal=f"sales pipeline{suffix}",
+                metaphor="leaky bucket",
+                contextual=f"crm dashboard{suffix}",
+            ),
+        ))
+    return windows
+
+
+def make_engine(fake_api, tmp_path, **kwargs):
+    sourcer = BrollSourcer(
+        pexels_api_key="test-pexels",
+        openai_api_key="test-openai",
+        anthropic_api_key="",
+        download_dir=str(tmp_path / "broll"),
+        embedding_cache_dir=str(tmp_path / "embeddings"),
+        pexels_base_url=fake_api,
+        openai_base_url=f"{fake_api}/v1",
+    )
+    sourcer.pexels._min_interval = 0.0
+    return BrollSourcingEngine(
+        sourcer,
+        cache_dir=str(tmp_path / "cache"),
+        multimodal=False,
+        **kwargs,
+    )
+
+
+def count(method, path):
+    return sum(1 for m, p, _ in FakeApiHandler.requests if m == method and p == path)
+
+
+class TestBrollSourcingEngine:
+
+    def test_identical_queries_are_fetched_once(self, fake_api, tmp_path):
+        engine = make_engine(fake_api, tmp_path)
+        selected = asyncio.run(engine.source_windows(make_windows(20)))
+
+        assert len(selected) == 20
+        assert count("GET", "/videos/search") == 3
+        assert engine.stats["search_deduped"] == 57
+
+    def test_embeddings_are_batched_across_windows(self, fake_api, tmp_path):
+        engine = make_engine(fake_api, tmp_path, embedding_batch_size=16)
+        asyncio.run(engine.source_windows(make_windows(10, shared_intent=False)))
+
+        embed_calls = [p for m, path, p in FakeApiHandler.requests if path == "/v1/embeddings"]
+        texts = [t for payload in embed_calls for t in payload["input"]]
+        assert len(texts) == len(set(texts))
+        assert len(embed_calls) == -(-len(texts) // 16)
+        assert len(embed_calls) < 10
+
+    def test_query_cache_serves_repeat_runs(self, fake_api, tmp_path):
+        windows = make_windows(4, shared_intent=False)
+        asyncio.run(make_engine(fake_api, tmp_path).source_windows(windows))
+        first = count("GET", "/videos/search")
+
+        engine = make_engine(fake_api, tmp_path)
+        asyncio.run(engine.source_windows(make_windows(4, shared_intent=False)))
+        assert count("GET", "/videos/search") == first
+        assert engine.stats["search_cache_hits"] == first
+
+    def test_query_cache_expires(self, tmp_path):
+        cache = QueryCache(str(tmp_path), ttl_seconds=0.0)
+        key = QueryCache.make_key("q")
+        cache.set(key, [1, 2])
+        assert cache.get(key) is None
+        assert QueryCache(str(tmp_path), ttl_seconds=60).get(key) == [1, 2]
+
+    def test_selected_clips_are_downloaded_and_ranked(self, fake_api, tmp_path):
+        engine = make_engine(fake_api, tmp_path)
+        selected = asyncio.run(engine.source_windows(make_windows(3, shared_intent=False)))
+
+        for candidate in selected.values():
+            assert candidate.selected
+            assert os.path.getsize(candidate.local_path) == 1024
+            assert candidate.overall_score == candidate.embedding_similarity
+        assert engine.stats["downloads"] == len({c.candidate_id for c in selected.values()})
+
+    def test_embeddings_are_cached_across_runs(self, fake_api, tmp_path):
+        asyncio.run(make_engine(fake_api, tmp_path).source_windows(make_windows(5, shared_intent=False)))
+        first = count("POST", "/v1/embeddings")
+        assert first > 0
+
+        engine = make_engine(fake_api, tmp_path)
+        selected = asyncio.run(engine.source_windows(make_windows(5, shared_intent=False)))
+        assert count("POST", "/v1/embeddings") == first
+        assert engine.sourcer.embedding_cache.misses == 0
+        assert all(c.embedding_similarity > 0 for c in selected.values())
+
+
+class TestEmbeddingCache:
+    def test_memory_is_bounded_lru_over_disk(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), max_memory_entries=2)
+        for i, text in enumerate("abc"):
+            cache.set(text, [float(i)])
+        assert len(cache._memory) == 2
+
+        # "a" was evicted from memory but is reloaded from its .npy file
+        assert cache.get("a").tolist() == [0.0]
+        assert len(cache._memory) == 2 and cache.misses == 0
+
+        memory_only = EmbeddingCache(max_memory_entries=2)
+        for i, text in enumerate("abc"):
+            memory_only.set(text, [float(i)])
+        assert memory_only.get("b") is not None  # b becomes most recent
+        memory_only.set("d", [3.0])
+        assert memory_only.get("c") is None
+        assert memory_only.get("b").tolist() == [1.0]
@@ -0,0 +1,166 @@
+"""
+Edit Plan Compiler — filler-word removal regression tests
+
+Tests that:
+1. The indexed per-window pass matches the original _is_filler/_find_word_index output
+2. The vectorized batch API matches it too, across many windows at once
+3. Near-duplicate words and out-of-order windows resolve exactly as before
+4. Context rules ("looks like", pauses around "right"/"so") behave as documented
+"""
+
+import copy
+import os
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform.edit_plan_compiler import EditPlanCompiler
+from services.longform.types import TimelineWindow, TranscriptWord
+
+
+# ─── Original implementation (reference) ─────────────────────────────────────
+
+def legacy_find_word_index(word, context):
+    for i, w in enumerate(context):
+        if w.word == word.word and abs(w.start - word.start) < 0.01:
+            return i
+    return -1
+
+
+def legacy_is_filler(word, context):
+    clean = word.word.lower().strip(".,!?;:'\"")
+    if clean in {"um", "uh", "umm", "uhh", "erm", "hmm", "hm", "ah", "oh"}:
+        return True
+    idx = legacy_find_word_index(word, context)
+    if clean == "like":
+        if idx > 0 and idx < len(context) - 1:
+            prev = context[idx - 1].word.lower().strip(".,!?")
+            if prev not in {"looks", "sounds", "feels", "seems", "acts", "is", "was"}:
+                return True
+    if clean == "right":
+        if idx > 0 and idx < len(context) - 1:
+            gap_before = word.start - context[idx - 1].end
+            gap_after = context[idx + 1].start - word.end
+            if gap_before > 0.15 and gap_after > 0.15:
+                return True
+    if clean == "so":
+        if idx == 0:
+            return True
+        if idx > 0:
+            gap_before = word.start - context[idx - 1].end
+            if gap_before > 0.3:
+                return True
+    return False
+
+
+def legacy_filter(windows):
+    for window in windows:
+        window.words = [w for w in window.words if not legacy_is_filler(w, window.words)]
+        if window.words:
+            window.transcript_text = " ".join(w.word for w in window.words)
+            window.start = window.words[0].start
+            window.end = window.words[-1].end
+    return [w for w in windows if w.words]
+
+
+# ─── Fixtures ────────────────────────────────────────────────────────────────
+
+VOCAB = [
+    "so", "So,", "like", "Like", "right", "right?", "um", "Uh,", "oh", "ah.",
+    "looks", "is", "was", "the", "pipeline", "works", "really", "'so'", "hmm...",
+]
+
+
+def synth_windows(n_windows, seed, shuffle_some=False, duplicates=False):
+    rng = random.Random(seed)
+    windows = []
+    t = 0.0
+    for w_idx in range(n_windows):
+        words = []
+        for _ in range(rng.randint(0, 25)):
+            length = rng.uniform(0.1, 0.5)
+            words.append(TranscriptWord(word=rng.choice(VOCAB), start=round(t, 3), end=round(t + length, 3)))
+            if duplicates and rng.random() < 0.15:
+                # Near-duplicate emitted by the ASR (same text within 10ms)
+                words.append(TranscriptWord(
+                    word=words[-1].word, start=round(t + rng.choice([0.0, 0.004, 0.009]), 3),
+                    end=round(t + length, 3),
+                ))
+            t += length + rng.choice([0.0, 0.1, 0.16, 0.2, 0.31, 0.5])
+        if shuffle_some and rng.random() < 0.3:
+            rng.shuffle(words)
+        windows.append(TimelineWindow(
+            window_id=f"w{w_idx}",
+            start=words[0].start if words else t,
+            end=words[-1].end if words else t,
+            transcript_text=" ".join(w.word for w in words),
+            speaker="speaker_0",
+            words=words,
+        ))
+    return windows
+
+
+def as_tuples(windows):
+    return [
+        (w.window_id, w.start, w.end, w.transcript_text, [(x.word, x.start, x.end) for x in w.words])
+        for w in windows
+    ]
+
+
+# ─── Tests ───────────────────────────────────────────────────────────────────
+
+class TestFillerRegression:
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("variant", ["plain", "duplicates", "unordered"])
+    def test_matches_original(self, seed, variant):
+        windows = synth_windows(
+            40, seed,
+            shuffle_some=variant == "unordered",
+            duplicates=variant == "duplicates",
+        )
+        expected = as_tuples(legacy_filter(copy.deepcopy(windows)))
+        compiler = EditPlanCompiler()
+
+        indexed = compiler.filter_filler_words(copy.deepcopy(windows))
+        batch = compiler.filter_filler_words_batch(copy.deepcopy(windows))
+
+        assert as_tuples(indexed) == expected
+        assert as_tuples(batch) == expected
+
+    def test_masks_align_with_windows(self):
+        windows = synth_windows(10, seed=3)
+        masks = EditPlanCompiler.filler_masks(windows)
+        assert [len(m) for m in masks] == [len(w.words) for w in windows]
+
+    def test_disabled_is_passthrough(self):
+        windows = synth_windows(5, seed=1)
+        compiler = EditPlanCompiler(remove_fillers=False)
+        assert compiler.filter_filler_words_batch(windows) is windows
+
+
+class TestFillerRules:
+    @staticmethod
+    def words(*spec):
+        return [TranscriptWord(word=w, start=s, end=e) for w, s, e in spec]
+
+    def test_comparison_like_is_kept(self):
+        words = self.words(("looks", 0.0, 0.3), ("like", 0.35, 0.5), ("rain", 0.55, 0.8))
+        assert EditPlanCompiler._filler_flags(words) == [False, False, False]
+
+    def test_filler_like_is_removed(self):
+        words = self.words(("it's", 0.0, 0.3), ("like", 0.35, 0.5), ("huge", 0.55, 0.8))
+        assert EditPlanCompiler._filler_flags(words) == [False, True, False]
+
+    def test_right_between_pauses(self):
+        words = self.words(("ok", 0.0, 0.3), ("right", 0.5, 0.7), ("next", 0.9, 1.2))
+        assert EditPlanCompiler._filler_flags(words) == [False, True, False]
+
+    def test_leading_so(self):
+        words = self.words(("So,", 0.0, 0.2), ("today", 0.25, 0.5), ("so", 0.55, 0.7))
+        assert EditPlanCompiler._filler_flags(words) == [True, False, False]
@@ -0,0 +1,54 @@
+"""
+Scene Detector — single-pass decode vs legacy two-pass
+
+Tests that:
+1. Single-pass detection finds the same scenes and safe cut points as the
+   two-pass SceneManager runs on a generated clip
+2. The same holds with AdaptiveDetector disabled
+"""
+
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("scenedetect")
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform.scene_detector import SceneDetector
+
+FPS = 24
+# (frames, BGR colour) per shot: hard cuts at frames 36, 84 and 108
+SHOTS = [(36, (20, 40, 200)), (48, (200, 180, 30)), (24, (10, 10, 10)), (40, (240, 240, 240))]
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("scenes") / "shots.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (160, 90))
+    if not writer.isOpened():
+        pytest.skip("OpenCV cannot write MJPG video here")
+    rng = np.random.default_rng(0)
+    for frames, colour in SHOTS:
+        for _ in range(frames):
+            frame = np.empty((90, 160, 3), dtype=np.uint8)
+            frame[:] = colour
+            # A little texture so every frame is not identical
+            frame[rng.integers(0, 90, 40), rng.integers(0, 160, 40)] = 0
+            writer.write(frame)
+    writer.release()
+    return path
+
+
+@pytest.mark.parametrize("use_adaptive", [True, False])
+def test_single_pass_matches_two_pass(clip, use_adaptive):
+    kwargs = dict(min_scene_len_sec=0.5, use_adaptive=use_adaptive, downscale=1)
+    single = SceneDetector(single_pass=True, **kwargs).detect_scenes(clip)
+    two_pass = SceneDetector(single_pass=False, **kwargs).detect_scenes(clip)
+
+    assert single.to_dict() == two_pass.to_dict()
+    assert [s.start_time for s in single.scenes] == [0.0, 1.5, 3.5, 4.5]
@@ -0,0 +1,125 @@
+"""
+Speaker Segmenter — streaming/chunked inference tests (CPU only)
+
+Tests that:
+1. FrameStreamer yields bounded chunks that share one seam frame
+2. The chunked path writes exactly one full-resolution mask frame per source frame
+3. Reduced-resolution inference masks are upscaled back to source size
+4. Chunk staging never holds more than one chunk of frames on disk
+"""
+
+import os
+import sys
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform.speaker_segmenter import (
+    FrameStreamer,
+    MockMaskPredictor,
+    SpeakerSegmenter,
+)
+
+FPS = 10
+WIDTH, HEIGHT = 160, 96
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = str(tmp_path / "source.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (WIDTH, HEIGHT))
+    for i in range(45):
+        frame = np.full((HEIGHT, WIDTH, 3), (i * 5) % 255, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def read_frames(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+class CountingPredictor(MockMaskPredictor):
+    """MockMaskPredictor that records staged chunk sizes and prompt types."""
+
+    def __init__(self):
+        self.staged = []
+        self.prompts = []
+
+    def init_state(self, video_path):
+        self.staged.append(len(os.listdir(video_path)))
+        return super().init_state(video_path)
+
+    def add_new_points_or_box(self, inference_state, frame_idx, obj_id, box=None, **kwargs):
+        self.prompts.append("box")
+        return super().add_new_points_or_box(inference_state, frame_idx, obj_id, box=box)
+
+    def add_new_mask(self, inference_state, frame_idx, obj_id, mask):
+        self.prompts.append("mask")
+        return super().add_new_mask(inference_state, frame_idx, obj_id, mask)
+
+
+class TestFrameStreamer:
+
+    def test_chunks_are_bounded_and_share_seam_frames(self, video_path):
+        streamer = FrameStreamer(video_path, chunk_seconds=1.0)
+        chunks = list(streamer.chunks())
+
+        assert all(len(c) <= FPS for c in chunks)
+        # 45 frames, 10 per chunk, 1 shared frame per seam
+        assert sum(len(c) for c in chunks) - (len(chunks) - 1) == 45
+
+    def test_downscaled_frames(self, video_path):
+        streamer = FrameStreamer(video_path, chunk_seconds=1.0, scale=0.5)
+        first = next(streamer.chunks())[0]
+        assert first.shape[:2] == (HEIGHT // 2, WIDTH // 2)
+
+
+class TestStreamingSegmentation:
+
+    @pytest.mark.parametrize("scale", [1.0, 0.5])
+    def test_mask_covers_every_frame_at_full_resolution(self, tmp_path, video_path, scale):
+        segmenter = SpeakerSegmenter(
+            output_dir=str(tmp_path / "masks"),
+            device="cpu",
+            chunk_seconds=1.0,
+            inference_scale=scale,
+        )
+        predictor = CountingPredictor()
+        mask_path = segmenter._segment_streaming(predictor, video_path, (40, 10, 80, 80), label="mock")
+
+        masks = read_frames(mask_path)
+        assert len(masks) == 45
+        assert masks[0].shape[:2] == (HEIGHT, WIDTH)
+        # Ellipse centre is foreground, corner is background
+        assert masks[20][int(HEIGHT * 0.4), WIDTH // 2].max() > 200
+        assert masks[20][0, 0].max() < 50
+
+        assert max(predictor.staged) <= FPS
+        assert predictor.prompts[0] == "box"
+        assert set(predictor.prompts[1:]) == {"mask"}
+        assert not [d for d in os.listdir(tmp_path / "masks") if d.startswith("sam_chunk_")]
+
+    def test_streaming_mock_backend_without_sam(self, tmp_path, video_path):
+        segmenter = SpeakerSegmenter(
+            output_dir=str(tmp_path / "masks"),
+            device="cpu",
+            chunk_seconds=2.0,
+            mock_backend="streaming",
+        )
+        segmenter._sam2_available = False
+        mask_path = segmenter.segment_with_sam(video_path, (40, 10, 80, 80), 1.0, 3.0)
+        assert len(read_frames(mask_path)) == 21  # frames 10..30 inclusive
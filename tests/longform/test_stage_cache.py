@@ -0,0 +1,162 @@
+"""
+Longform Stage Cache — content-addressed reuse of stage outputs
+
+Tests that:
+1. A stage runs once per (source hash, config, upstream keys) and is served from disk after
+2. Changing a stage's config invalidates only that stage
+3. Busting a stage also busts everything downstream of it
+4. Cached payloads round-trip through the types' from_dict constructors
+5. Stage outputs backed by a missing artifact file are recomputed
+6. A failed B-roll sourcing run falls back to no B-roll without being cached
+"""
+
+import os
+import sys
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform import pipeline as pipeline_module
+from services.longform.pipeline import LongformPipeline, PipelineConfig
+from services.longform.stage_cache import StageCache, file_fingerprint
+from services.longform.types import TimelinePlan, TranscriptionResult, TranscriptSegment, TranscriptWord
+
+
+class FakeTranscriber:
+    calls = 0
+
+    def __init__(self, diarization_enabled=True, **kwargs):
+        self.diarization_enabled = diarization_enabled
+
+    def transcribe_video(self, video_path, audio_path=None):
+        FakeTranscriber.calls += 1
+        word = TranscriptWord(word="hello", start=0.0, end=0.5, confidence=0.9)
+        segment = TranscriptSegment(speaker="speaker_0", start=0.0, end=0.5, text="hello", words=[word])
+        return TranscriptionResult(
+            segments=[segment], speakers=["speaker_0"], language="en",
+            confidence=0.9, duration_seconds=0.5,
+        )
+
+
+class FlakyBrollEngine:
+    """Fails the first sourcing run, returns nothing after that."""
+    calls = 0
+    multimodal = False
+    top_n_pass_a = 8
+
+    def __init__(self, sourcer, **kwargs):
+        pass
+
+    async def source_windows(self, windows):
+        FlakyBrollEngine.calls += 1
+        if FlakyBrollEngine.calls == 1:
+            raise RuntimeError("stock API down")
+        return {}
+
+
+@pytest.fixture
+def source_video(tmp_path):
+    path = tmp_path / "source.mp4"
+    path.write_bytes(b"not really a video" * 100)
+    return str(path)
+
+
+@pytest.fixture
+def make_pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_module, "LongformTranscriber", FakeTranscriber)
+    FakeTranscriber.calls = 0
+
+    def factory(**overrides):
+        config = PipelineConfig(output_dir=str(tmp_path / "out"), **overrides)
+        return LongformPipeline(config=config)
+
+    return factory
+
+
+class TestStageCache:
+    def test_second_run_is_served_from_cache(self, make_pipeline, source_video):
+        first = make_pipeline()
+        first._prepare_stage_cache(source_video)
+        result = first.step_transcribe(source_video)
+
+        second = make_pipeline()
+        second._prepare_stage_cache(source_video)
+        cached = second.step_transcribe(source_video)
+
+        assert FakeTranscriber.calls == 1
+        assert cached.to_dict() == result.to_dict()
+        assert isinstance(cached.segments[0].words[0], TranscriptWord)
+        assert second._stage_keys["transcribe"] == first._stage_keys["transcribe"]
+
+    def test_config_change_invalidates_stage(self, make_pipeline, source_video):
+        pipeline = make_pipeline()
+        pipeline._prepare_stage_cache(source_video)
+        pipeline.step_transcribe(source_video)
+
+        other = make_pipeline(diarization_enabled=False)
+        other._prepare_stage_cache(source_video)
+        other.step_transcribe(source_video)
+
+        assert FakeTranscriber.calls == 2
+
+    def test_disabled_cache_always_recomputes(self, make_pipeline, source_video):
+        for _ in range(2):
+            pipeline = make_pipeline(use_stage_cache=False)
+            pipeline._prepare_stage_cache(source_video)
+            pipeline.step_transcribe(source_video)
+        assert FakeTranscriber.calls == 2
+
+    def test_force_stage_busts_downstream(self, make_pipeline, source_video):
+        pipeline = make_pipeline()
+        pipeline._prepare_stage_cache(source_video)
+        pipeline.step_transcribe(source_video)
+        cache = pipeline.stage_cache
+        cache.put("plan_timeline", "k" * 32, {"windows": []})
+        cache.put("detect_scenes", "s" * 32, {"scenes": []})
+
+        forced = make_pipeline(force_stages=["transcribe"])
+        forced._prepare_stage_cache(source_video)
+
+        summary = cache.inspect()
+        assert summary["transcribe"] == []
+        assert summary["plan_timeline"] == []
+        assert summary["source_broll"] == []
+        assert len(summary["detect_scenes"]) == 1
+
+    def test_missing_artifact_is_a_miss(self, tmp_path):
+        cache = StageCache(str(tmp_path / "stages"))
+        artifact = tmp_path / "enhanced.wav"
+        artifact.write_bytes(b"\0" * 64)
+        cache.put("enhance_audio", "a" * 32, {"enhanced_path": str(artifact)}, artifacts=[str(artifact)])
+        assert cache.get("enhance_audio", "a" * 32) == {"enhanced_path": str(artifact)}
+
+        artifact.unlink()
+        assert cache.get("enhance_audio", "a" * 32) is None
+
+    def test_fingerprint_is_memoized_by_stat(self, tmp_path, source_video):
+        index = str(tmp_path / "hashes.json")
+        digest = file_fingerprint(source_video, index_path=index)
+        assert os.path.exists(index)
+        assert file_fingerprint(source_video, index_path=index) == digest
+
+        with open(source_video, "ab") as f:
+            f.write(b"more")
+        assert file_fingerprint(source_video, index_path=index) != digest
+
+    def test_failed_broll_sourcing_is_not_cached(self, make_pipeline, source_video, monkeypatch):
+        monkeypatch.setattr(pipeline_module, "BrollSourcer", lambda **kwargs: None)
+        monkeypatch.setattr(pipeline_module, "BrollSourcingEngine", FlakyBrollEngine)
+        FlakyBrollEngine.calls = 0
+        plan = TimelinePlan(windows=[], total_duration=0.0)
+
+        for _ in range(2):
+            pipeline = make_pipeline()
+            pipeline._prepare_stage_cache(source_video)
+            pipeline._stage_keys["plan_timeline"] = "p" * 32
+            assert pipeline.step_source_broll(plan) == {}
+
+        # The failure fell back to {} but was not stored, so the second run recomputed
+        assert FlakyBrollEngine.calls == 2
+        assert len(pipeline.stage_cache.inspect()["source_broll"]) == 1
@@ -0,0 +1,199 @@
+"""
+Longform Stage Graph — dependency-driven stage execution
+
+Tests that:
+1. Independent stages overlap; a stage starts only after all of its inputs finish
+2. Inputs are passed positionally after the stage's own args
+3. The critical-path report names the chain and stage that gated total latency
+4. run_async overlaps audio enhancement with transcription by default and
+   feeds the enhanced video only to compile
+5. In (opt-in) single-pass audio mode transcription waits for and reuses the
+   enhancement graph's Whisper audio
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform import pipeline as pipeline_module
+from services.longform.pipeline import LongformPipeline, PipelineConfig
+from services.longform.stage_graph import StageGraph
+from services.longform.types import TranscriptionResult
+
+
+def sleeper(seconds, value):
+    def fn(*inputs):
+        time.sleep(seconds)
+        return (value, inputs)
+    return fn
+
+
+class TestStageGraph:
+    def test_independent_stages_overlap(self):
+        graph = StageGraph()
+        graph.add("slow", sleeper(0.3, "slow"))
+        graph.add("fast_a", sleeper(0.1, "a"))
+        graph.add("fast_b", sleeper(0.1, "b"), inputs=["fast_a"])
+        graph.add("join", sleeper(0.0, "join"), inputs=["slow", "fast_b"])
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = asyncio.run(graph.run(executor))
+
+        t = graph.timings
+        assert t["slow"].start < t["fast_a"].end
+        assert t["fast_b"].start >= t["fast_a"].end
+        assert t["join"].start >= max(t["slow"].end, t["fast_b"].end)
+        assert results["join"][1] == (results["slow"], results["fast_b"])
+        assert graph._total < 0.55
+
+    def test_args_precede_inputs(self):
+        graph = StageGraph()
+        graph.add("x", lambda: 2)
+        graph.add("y", lambda base, x: base ** x, 10, inputs=["x"])
+        results = asyncio.run(graph.run())
+        assert results["y"] == 100
+
+    def test_unknown_dependency_rejected(self):
+        graph = StageGraph()
+        with pytest.raises(ValueError):
+            graph.add("plan", lambda t: t, inputs=["transcribe"])
+
+    def test_critical_path_report(self):
+        graph = StageGraph()
+        graph.add("enhance", sleeper(0.05, "e"))
+        graph.add("transcribe", sleeper(0.3, "t"))
+        graph.add("plan", sleeper(0.05, "p"), inputs=["transcribe"])
+        graph.add("compile", sleeper(0.0, "c"), inputs=["plan", "enhance"])
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            asyncio.run(graph.run(executor))
+
+        report = graph.critical_path()
+        assert report.critical_path == ["transcribe", "plan", "compile"]
+        assert report.gating_stage == "transcribe"
+        by_name = {s.name: s for s in report.stages}
+        assert not by_name["enhance"].critical
+        assert by_name["enhance"].slack > 0.2
+        assert by_name["transcribe"].slack < 0.05
+        assert "gated by transcribe" in report.summary()
+
+    def test_failure_propagates(self):
+        def boom():
+            raise RuntimeError("stage failed")
+
+        graph = StageGraph()
+        graph.add("bad", boom)
+        graph.add("after", lambda bad: bad, inputs=["bad"])
+        with pytest.raises(RuntimeError):
+            asyncio.run(graph.run())
+        assert "after" not in graph.timings
+
+
+class TestRunAsyncGraph:
+    def test_enhance_overlaps_transcription(self, tmp_path, monkeypatch):
+        video = tmp_path / "source.mp4"
+        video.write_bytes(b"\0" * 128)
+        pipeline = LongformPipeline(PipelineConfig(output_dir=str(tmp_path / "out"), use_stage_cache=False))
+
+        transcribe_started = threading.Event()
+        seen = {}
+
+        class FakeTranscript:
+            def to_dict(self):
+                return {}
+
+        class FakePlan:
+            def save(self, path):
+                seen["saved"] = path
+
+        def enhance(video_path):
+            # Would deadlock if transcription waited for enhancement
+            assert transcribe_started.wait(timeout=2.0)
+            pipeline.config.music_config = {"track_url": "music.mp3"}
+            return "enhanced.mp4"
+
+        def transcribe(video_path):
+            transcribe_started.set()
+            seen["transcribe_input"] = video_path
+            return FakeTranscript()
+
+        def compile_(plan, broll, masks, transcript, source_video):
+            seen["compile_source"] = source_video
+            seen["music"] = pipeline.config.music_config
+            plan = FakePlan()
+            plan.edl = []
+            return plan
+
+        monkeypatch.setattr(pipeline, "step_enhance_audio", enhance)
+        monkeypatch.setattr(pipeline, "step_transcribe", transcribe)
+        monkeypatch.setattr(pipeline, "step_detect_scenes", lambda v: None)
+        monkeypatch.setattr(pipeline, "step_plan_timeline", lambda t, s: "plan")
+        monkeypatch.setattr(pipeline, "step_source_broll", lambda p: {})
+        monkeypatch.setattr(pipeline, "step_segment_speaker", lambda v, t: [])
+        monkeypatch.setattr(pipeline, "step_compile", compile_)
+
+        asyncio.run(pipeline.run_async(str(video)))
+
+        assert seen["transcribe_input"] == str(video)
+        assert seen["compile_source"] == "enhanced.mp4"
+        assert seen["music"] == {"track_url": "music.mp3"}
+        report_path = tmp_path / "out" / f"{pipeline.video_id}_stage_report.json"
+        assert report_path.exists()
+
+    def test_single_pass_transcription_uses_extracted_audio(self, tmp_path, monkeypatch):
+        video = tmp_path / "source.mp4"
+        video.write_bytes(b"\0" * 128)
+        pipeline = LongformPipeline(PipelineConfig(
+            output_dir=str(tmp_path / "out"), use_stage_cache=False, single_pass_audio=True,
+        ))
+        seen = {}
+
+        class FakeEnhancer:
+            def __init__(self, output_dir=None):
+                pass
+
+            def enhance_single_pass(self, video_path):
+                return {"video": "enhanced.mp4", "transcription_audio": "asr.mp3"}
+
+            def source_background_music(self, **kwargs):
+                return "music.mp3"
+
+        class FakeTranscriber:
+            def __init__(self, **kwargs):
+                pass
+
+            def transcribe_video(self, video_path, audio_path=None):
+                seen["audio_path"] = audio_path
+                return TranscriptionResult(
+                    segments=[], speakers=[], language="en", confidence=1.0, duration_seconds=0.0,
+                )
+
+        class FakePlan:
+            edl = []
+
+            def save(self, path):
+                pass
+
+        def compile_(plan, broll, masks, transcript, source_video):
+            seen["compile_source"] = source_video
+            return FakePlan()
+
+        monkeypatch.setattr(pipeline_module, "AudioEnhancer", FakeEnhancer)
+        monkeypatch.setattr(pipeline_module, "LongformTranscriber", FakeTranscriber)
+        monkeypatch.setattr(pipeline, "step_detect_scenes", lambda v: None)
+        monkeypatch.setattr(pipeline, "step_plan_timeline", lambda t, s: "plan")
+        monkeypatch.setattr(pipeline, "step_source_broll", lambda p: {})
+        monkeypatch.setattr(pipeline, "step_segment_speaker", lambda v, t: [])
+        monkeypatch.setattr(pipeline, "step_compile", compile_)
+
+        asyncio.run(pipeline.run_async(str(video)))
+
+        assert seen["audio_path"] == "asr.mp3"
+        assert seen["compile_source"] == "enhanced.mp4"
@@ -0,0 +1,207 @@
+"""
+Longform Transcriber — chunked transcription tests
+
+Tests that:
+1. plan_chunks() covers the whole duration with the requested overlap
+2. Concurrent chunk transcription + stitching reproduces every word exactly once
+3. Transient chunk failures are retried
+4. Seams without a reliable textual match (none, or a single repeated
+   stop-word) fall back to the overlap midpoint
+5. Segments and text are cut at the same word as the word splice
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.longform.transcriber import LongformTranscriber
+
+
+def make_script(duration: float, word_len: float = 0.4, gap: float = 0.1):
+    """Synthetic source transcript: numbered words spread over `duration` seconds."""
+    words = []
+    t = 0.0
+    idx = 0
+    while t + word_len <= duration:
+        words.append({"word": f"w{idx}", "start": round(t, 3), "end": round(t + word_len, 3)})
+        t += word_len + gap
+        idx += 1
+    return words
+
+
+class FakeTranscriptions:
+    """Stands in for client.audio.transcriptions; chunk files hold 'start,end'."""
+
+    def __init__(self, script, fail_first: int = 0):
+        self.script = script
+        self.fail_first = fail_first
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, file, response_format, timestamp_granularities):
+        with self._lock:
+            self.calls += 1
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise RuntimeError("simulated 503")
+
+        start, end = (float(x) for x in file.read().decode().split(","))
+        words = []
+        for w in self.script:
+            if w["end"] <= start or w["start"] >= end:
+                continue
+            clipped = w["start"] < start or w["end"] > end
+            words.append({
+                # A word cut by the chunk edge is misheard as a fragment
+                "word": w["word"] + "~" if clipped else w["word"],
+                "start": max(w["start"], start) - start,
+                "end": min(w["end"], end) - start,
+            })
+        return {
+            "text": " ".join(w["word"] for w in words),
+            "words": words,
+            "segments": [{"start": 0.0, "end": end - start, "text": " ".join(w["word"] for w in words)}],
+            "language": "en",
+        }
+
+
+class FakeClient:
+    def __init__(self, transcriptions):
+        self.audio = type("Audio", (), {"transcriptions": transcriptions})()
+
+
+def write_chunks(tmp_path, spans):
+    chunks = []
+    for idx, (start, end) in enumerate(spans):
+        path = tmp_path / f"chunk_{idx}.mp3"
+        path.write_text(f"{start},{end}")
+        chunks.append((str(path), start, end))
+    return chunks
+
+
+class TestPlanChunks:
+
+    def test_chunks_cover_duration_with_overlap(self):
+        spans = LongformTranscriber.plan_chunks(1250.0, 600.0, 3.0)
+        assert spans[0][0] == 0.0
+        assert spans[-1][1] == 1250.0
+        for (a_start, a_end), (b_start, b_end) in zip(spans, spans[1:]):
+            assert a_end - b_start == pytest.approx(3.0)
+
+    def test_short_audio_is_single_chunk(self):
+        assert LongformTranscriber.plan_chunks(42.0, 600.0, 3.0) == [(0.0, 42.0)]
+
+
+class TestChunkedTranscription:
+
+    def _transcriber(self, fake, **kwargs):
+        return LongformTranscriber(
+            client=FakeClient(fake),
+            diarization_enabled=False,
+            retry_backoff_sec=0.0,
+            **kwargs,
+        )
+
+    @pytest.mark.parametrize("overlap", [2.0, 3.0, 5.0])
+    def test_stitch_keeps_every_word_once(self, tmp_path, overlap):
+        script = make_script(300.0)
+        fake = FakeTranscriptions(script)
+        transcriber = self._transcriber(fake, max_workers=4)
+
+        spans = LongformTranscriber.plan_chunks(300.0, 37.0, overlap)
+        results = transcriber._transcribe_chunks(write_chunks(tmp_path, spans))
+        merged = LongformTranscriber.stitch_chunks(results)
+
+        expected = [w["word"] for w in script]
+        assert [w["word"] for w in merged["words"]] == expected
+        for got, want in zip(merged["words"], script):
+            assert got["start"] == pytest.approx(want["start"])
+            assert got["end"] == pytest.approx(want["end"])
+        assert merged["text"].split() == expected
+        assert " ".join(seg["text"] for seg in merged["segments"]).split() == expected
+        assert fake.calls == len(spans)
+
+    def test_transient_failures_are_retried(self, tmp_path):
+        script = make_script(60.0)
+        fake = FakeTranscriptions(script, fail_first=2)
+        transcriber = self._transcriber(fake, max_workers=2, max_retries=3)
+
+        spans = LongformTranscriber.plan_chunks(60.0, 20.0, 3.0)
+        results = transcriber._transcribe_chunks(write_chunks(tmp_path, spans))
+        merged = LongformTranscriber.stitch_chunks(results)
+
+        assert [w["word"] for w in merged["words"]] == [w["word"] for w in script]
+        assert fake.calls == len(spans) + 2
+
+    def test_exhausted_retries_raise(self, tmp_path):
+        fake = FakeTranscriptions(make_script(10.0), fail_first=10)
+        transcriber = self._transcriber(fake, max_workers=1, max_retries=2)
+
+        with pytest.raises(RuntimeError, match="simulated 503"):
+            transcriber._transcribe_chunks(write_chunks(tmp_path, [(0.0, 10.0)]))
+
+    def test_seam_without_text_match_uses_midpoint(self):
+        first = {
+            "chunk_start": 0.0, "chunk_end": 10.0, "language": "en",
+            "words": [{"word": "a", "start": 8.0, "end": 8.5}, {"word": "b", "start": 9.6, "end": 9.9}],
+            "segments": [],
+        }
+        second = {
+            "chunk_start": 8.0, "chunk_end": 20.0, "language": "en",
+            "words": [{"word": "x", "start": 8.1, "end": 8.4}, {"word": "y", "start": 9.7, "end": 10.2}],
+            "segments": [],
+        }
+        merged = LongformTranscriber.stitch_chunks([first, second])
+        assert [w["word"] for w in merged["words"]] == ["a", "y"]
+
+    def test_repeated_stop_word_does_not_splice(self):
+        def word(text, start):
+            return {"word": text, "start": start, "end": start + 0.3}
+
+        # "the" occurs in both overlaps, but as different instances
+        first = {
+            "chunk_start": 0.0, "chunk_end": 10.0, "language": "en",
+            "words": [word("we", 7.0), word("the", 8.2), word("dog", 8.6), word("ran", 9.1), word("to", 9.6)],
+            "segments": [],
+        }
+        second = {
+            "chunk_start": 8.0, "chunk_end": 20.0, "language": "en",
+            "words": [word("dug", 8.6), word("rant", 9.1), word("two", 9.6), word("the", 9.9), word("park", 10.5)],
+            "segments": [],
+        }
+        merged = LongformTranscriber.stitch_chunks([first, second])
+        assert [w["word"] for w in merged["words"]] == ["we", "the", "dog", "rant", "two", "the", "park"]
+
+    def test_seam_splits_segments_at_word_splice(self):
+        def word(text, start):
+            return {"word": text, "start": start, "end": start + 0.5}
+
+        first = {
+            "chunk_start": 0.0, "chunk_end": 32.0, "language": "en",
+            "words": [word("one", 1.0), word("two", 2.0), word("alpha", 20.0), word("beta", 22.0),
+                      word("gamma", 24.0), word("delta", 26.0), word("eps", 29.0), word("zeta", 30.5)],
+            "segments": [
+                {"start": 0.0, "end": 10.0, "text": "One, two."},
+                {"start": 19.5, "end": 32.0, "text": "alpha beta gamma delta eps zeta"},
+            ],
+        }
+        second = {
+            "chunk_start": 28.0, "chunk_end": 60.0, "language": "en",
+            "words": [word("eps", 29.0), word("zeta", 30.5), word("eta", 33.0)],
+            "segments": [{"start": 28.5, "end": 34.0, "text": "eps zeta eta"}],
+        }
+        merged = LongformTranscriber.stitch_chunks([first, second])
+
+        expected = ["one", "two", "alpha", "beta", "gamma", "delta", "eps", "zeta", "eta"]
+        assert [w["word"] for w in merged["words"]] == expected
+        assert merged["text"] == " ".join(expected)
+        assert merged["segments"] == [
+            {"start": 0.0, "end": 10.0, "text": "One, two."},
+            {"start": 19.5, "end": 29.5, "text": "alpha beta gamma delta eps"},
+            {"start": 30.5, "end": 34.0, "text": "zeta eta"},
+        ]
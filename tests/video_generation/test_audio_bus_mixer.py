@@ -0,0 +1,177 @@
+"""
+Audio Bus Mixer — bounded fan-in SFX mixing
+
+Tests that:
+1. The grouped graph decodes each distinct SFX file once (asplit fan-out)
+2. Sub-bus amix groups never exceed sfx_group_size and reduce to one SFX bus
+3. Every filtergraph label is produced once and consumed once
+4. The NumPy SFX bus overlay-adds cached PCM sample-accurately into a raw f32 file
+5. mix_audio_bus feeds ffmpeg a single SFX input in "numpy" mode and keeps
+   the original per-cue graph by default ("grouped" is opt-in)
+"""
+
+import asyncio
+import os
+import re
+import sys
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("aiohttp")  # services.video_generation imports it
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.video_generation import audio_bus_mixer
+from services.video_generation.audio_bus_mixer import (
+    AudioBusConfig,
+    AudioTrack,
+    build_grouped_sfx_graph,
+    load_sfx_pcm,
+    mix_audio_bus,
+    render_sfx_bus,
+)
+
+SR = 8000
+
+
+def write_wav(path, samples, channels=1, sample_rate=SR):
+    data = (np.asarray(samples) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(data.tobytes())
+
+
+@pytest.fixture
+def sfx_files(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"sfx_{i}.wav"
+        write_wav(path, np.full(400 + 100 * i, 0.1 * (i + 1)))
+        paths.append(str(path))
+    return paths
+
+
+def timeline(paths, cues=100):
+    return [
+        AudioTrack(path=paths[i % len(paths)], start_seconds=i * 0.25, volume=0.5 + (i % 3) * 0.25)
+        for i in range(cues)
+    ]
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Capture the ffmpeg command (and the SFX bus file it would read)."""
+    captured = {}
+
+    class FakeProcess:
+        returncode = 0
+
+        async def communicate(self):
+            return b"", b""
+
+    async def fake_exec(*cmd, **kwargs):
+        if cmd[0] == "ffmpeg":
+            captured["cmd"] = cmd
+            captured["filter_complex"] = cmd[cmd.index("-filter_complex") + 1]
+            if "f32le" in cmd:
+                captured["bus"] = np.fromfile(cmd[cmd.index("f32le") + 6], dtype="<f4")
+        return FakeProcess()
+
+    async def fake_probe(path):
+        return 25.0
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(audio_bus_mixer, "probe_audio_duration", fake_probe)
+    return captured
+
+
+class TestGroupedGraph:
+    def test_dedupes_inputs_and_bounds_fan_in(self, sfx_files):
+        inputs = []
+
+        def add_input(path):
+            inputs.append(path)
+            return len(inputs) - 1
+
+        filters, bus = build_grouped_sfx_graph(timeline(sfx_files), add_input, group_size=8)
+
+        assert inputs == sfx_files
+        assert sum(f.count("asplit=20") for f in filters) == 5
+        amix_sizes = [int(m) for f in filters for m in re.findall(r"amix=inputs=(\d+)", f)]
+        assert max(amix_sizes) <= 8
+        assert all("normalize=0" in f for f in filters if "amix" in f)
+
+        produced, consumed = [], []
+        for f in filters:
+            labels = re.findall(r"\[([^\]]+)\]", f)
+            head = re.match(r"((?:\[[^\]]+\])+)", f).group(1)
+            n_in = head.count("[")
+            consumed += labels[:n_in]
+            produced += labels[n_in:]
+        assert sorted(produced) == sorted(set(produced))
+        assert sorted(consumed) == sorted(set(consumed))
+        # Everything produced is consumed except the bus itself
+        assert set(produced) - set(consumed) == {bus}
+        assert {c for c in consumed if c.endswith(":a")} == {f"{i}:a" for i in range(5)}
+
+    def test_single_cue(self, sfx_files):
+        filters, bus = build_grouped_sfx_graph([AudioTrack(path=sfx_files[0])], lambda p: 3)
+        assert filters == ["[3:a]anull[sfxcue0]"]
+        assert bus == "sfxcue0"
+
+
+class TestNumpyBus:
+    def test_overlay_add_is_sample_accurate(self, tmp_path, sfx_files):
+        tracks = timeline(sfx_files, cues=40)
+        out = tmp_path / "bus.f32"
+        frames = render_sfx_bus(tracks, str(out), SR, 2, duration_seconds=None)
+
+        bus = np.fromfile(out, dtype="<f4").reshape(-1, 2)
+        expected = np.zeros((frames, 2), dtype=np.float32)
+        for track in tracks:
+            clip = load_sfx_pcm(track.path, SR, 2)
+            offset = int(round(track.start_seconds * SR))
+            expected[offset:offset + len(clip)] += clip * np.float32(track.volume)
+
+        assert frames == int(round(tracks[-1].start_seconds * SR)) + 800
+        np.testing.assert_allclose(bus, expected, atol=1e-6)
+        assert np.all(bus[:, 0] == bus[:, 1])
+
+    def test_duration_trims_and_cache_reuses_decodes(self, tmp_path, sfx_files):
+        audio_bus_mixer._decode_sfx_cached.cache_clear()
+        frames = render_sfx_bus(timeline(sfx_files), str(tmp_path / "bus.f32"), SR, 1, duration_seconds=2.0)
+        assert frames == 2 * SR
+        assert os.path.getsize(tmp_path / "bus.f32") == 2 * SR * 4
+        info = audio_bus_mixer._decode_sfx_cached.cache_info()
+        assert info.misses == 5 and info.hits == 95
+
+
+class TestMixModes:
+    def test_numpy_mode_uses_one_sfx_input(self, tmp_path, sfx_files, fake_ffmpeg):
+        out = tmp_path / "audio_bus.wav"
+        asyncio.run(mix_audio_bus(
+            str(out),
+            sfx_tracks=timeline(sfx_files),
+            config=AudioBusConfig(sample_rate=SR, normalize=False, sfx_mix_mode="numpy"),
+        ))
+        cmd = fake_ffmpeg["cmd"]
+        assert cmd.count("-i") == 1
+        assert fake_ffmpeg["filter_complex"] == "[0:a]amix=inputs=1:duration=longest[mixed]"
+        assert fake_ffmpeg["bus"].size > 0
+        assert not os.path.exists(f"{out}.sfx.f32")
+
+    def test_per_cue_is_default_and_grouped_is_opt_in(self, tmp_path, sfx_files, fake_ffmpeg):
+        tracks = timeline(sfx_files, cues=30)
+        asyncio.run(mix_audio_bus(str(tmp_path / "a.wav"), sfx_tracks=tracks))
+        assert fake_ffmpeg["cmd"].count("-i") == 30
+        assert "amix=inputs=30:duration=longest[mixed]" in fake_ffmpeg["filter_complex"]
+
+        asyncio.run(mix_audio_bus(
+            str(tmp_path / "b.wav"), sfx_tracks=tracks, config=AudioBusConfig(sfx_mix_mode="grouped"),
+        ))
+        assert fake_ffmpeg["cmd"].count("-i") == 5
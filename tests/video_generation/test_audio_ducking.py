@@ -0,0 +1,210 @@
+"""
+Audio Ducking — merged cues, minimal keyframes and sample-accurate music ducking
+
+Tests that:
+1. Cues are merged into disjoint intervals and point queries agree with the linear scan
+2. Keyframes are strictly increasing, minimal, and bridge gaps too short for both fades
+3. Ramps cut by the start/end of the video keep their slope
+4. volume_curve / gain_envelope sample the same polyline as volume_at
+5. mix_audio_bus multiplies the music by a per-sample gain track (amultiply) when cues are given;
+   the track is 1.0 outside ducks, spans the whole music, and is skipped when the length is unknown
+"""
+
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("aiohttp")  # services.video_generation imports it
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.video_generation import audio_bus_mixer
+from services.video_generation.audio_bus_mixer import AudioBusConfig, AudioTrack, mix_audio_bus
+from services.video_generation.audio_ducking import (
+    DuckingEngine,
+    DuckingPolicy,
+    NarrationCue,
+    bg_volume_at_frame,
+    generate_volume_keyframes,
+    is_in_narration,
+)
+
+POLICY = DuckingPolicy(bg_base_volume=0.9, ducked_volume=0.2, fade_frames=6)
+
+
+def cue(start, length):
+    return NarrationCue(from_frame=start, duration_in_frames=length)
+
+
+def random_cues(n, seed=0):
+    rng = random.Random(seed)
+    return [cue(rng.randrange(0, 3000), rng.randrange(1, 120)) for _ in range(n)]
+
+
+class TestDuckingEngine:
+    def test_point_queries_match_linear_scan(self):
+        cues = random_cues(80)
+        engine = DuckingEngine(cues, POLICY)
+
+        for (s0, e0), (s1, _) in zip(engine.intervals, engine.intervals[1:]):
+            assert s0 < e0 < s1
+        for frame in range(0, 3200):
+            assert engine.is_in_narration(frame) == is_in_narration(frame, cues)
+            assert engine.bg_volume_at_frame(frame) == bg_volume_at_frame(frame, cues, POLICY)
+
+    def test_keyframes_are_monotonic_and_bridge_short_gaps(self):
+        # Gap of 8 frames < 2 * fade: stays ducked; gap of 40 gets full ramps
+        cues = [cue(20, 30), cue(58, 20), cue(118, 30)]
+        keyframes = generate_volume_keyframes(300, cues, POLICY)
+
+        assert keyframes == [
+            {"frame": 0, "volume": 0.9},
+            {"frame": 14, "volume": 0.9},
+            {"frame": 20, "volume": 0.2},
+            {"frame": 78, "volume": 0.2},
+            {"frame": 84, "volume": 0.9},
+            {"frame": 112, "volume": 0.9},
+            {"frame": 118, "volume": 0.2},
+            {"frame": 148, "volume": 0.2},
+            {"frame": 154, "volume": 0.9},
+        ]
+
+    def test_random_cues_never_overlap_ramps(self):
+        for seed in range(5):
+            keyframes = DuckingEngine(random_cues(60, seed), POLICY).keyframes(3200)
+            frames = [k["frame"] for k in keyframes]
+            assert frames == sorted(set(frames))
+            # Every narrated frame is fully ducked
+            curve = DuckingEngine(random_cues(60, seed), POLICY).volume_curve(3200)
+            narrated = [f for f in range(3200) if is_in_narration(f, random_cues(60, seed))]
+            assert np.allclose(curve[narrated], 0.2)
+
+    def test_clipped_ramps_keep_slope(self):
+        engine = DuckingEngine([cue(3, 10), cue(95, 20)], POLICY)
+        keyframes = engine.keyframes(100)
+        # Fade-down from frame -3 is cut at 0; fade-up after 113 never starts
+        assert keyframes[0] == {"frame": 0, "volume": round(0.9 - 0.7 * 3 / 6, 6)}
+        assert keyframes[-1] == {"frame": 95, "volume": 0.2}
+        assert generate_volume_keyframes(100, [cue(0, 10)], POLICY)[0] == {"frame": 0, "volume": 0.2}
+
+    def test_hard_cut_without_fades(self):
+        policy = DuckingPolicy(fade_frames=0)
+        engine = DuckingEngine([cue(10, 5)], policy)
+        curve = engine.volume_curve(20)
+        assert list(curve[10:15]) == [policy.ducked_volume] * 5
+        assert curve[9] == curve[15] == policy.bg_base_volume
+
+    def test_curve_and_envelope_sample_the_polyline(self):
+        engine = DuckingEngine(random_cues(30, seed=3), POLICY)
+        curve = engine.volume_curve(3200)
+        assert np.allclose(curve, [engine.volume_at(f) for f in range(3200)])
+
+        fps, sr = 30, 48000
+        gain = engine.gain_envelope(sr * 2, sr, sr, fps)
+        frames = (np.arange(sr) + sr * 2) * fps / sr
+        assert gain.dtype == np.float32
+        assert np.allclose(gain[::97], [engine.volume_at(f) for f in frames[::97]], atol=1e-6)
+
+    def test_disabled_policy_is_flat(self):
+        engine = DuckingEngine([cue(10, 50)], DuckingPolicy(enabled=False))
+        assert engine.keyframes(100) == [{"frame": 0, "volume": 0.9}]
+        assert np.all(engine.volume_curve(100) == 0.9)
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Capture the ffmpeg command (and the gain track it would read)."""
+    captured = {}
+
+    class FakeProcess:
+        returncode = 0
+
+        async def communicate(self):
+            return b"", b""
+
+    async def fake_exec(*cmd, **kwargs):
+        if cmd[0] == "ffmpeg":
+            captured["cmd"] = cmd
+            captured["filter_complex"] = cmd[cmd.index("-filter_complex") + 1]
+            if "f32le" in cmd:
+                captured["gain"] = np.fromfile(cmd[cmd.index("f32le") + 6], dtype="<f4")
+        return FakeProcess()
+
+    async def fake_probe(path):
+        return 10.0
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_exec)
+    monkeypatch.setattr(audio_bus_mixer, "probe_audio_duration", fake_probe)
+    return captured
+
+
+class TestMixerDucking:
+    def test_music_is_multiplied_by_gain_track(self, tmp_path, fake_ffmpeg):
+        music = tmp_path / "music.wav"
+        music.write_bytes(b"RIFF")
+        out = tmp_path / "bus" / "audio_bus.wav"
+
+        asyncio.run(mix_audio_bus(
+            str(out),
+            music=AudioTrack(path=str(music), volume=0.5),
+            total_duration_seconds=4.0,
+            config=AudioBusConfig(sample_rate=8000, normalize=False),
+            narration_cues=[cue(30, 60)],
+            ducking_policy=POLICY,
+            fps=30,
+        ))
+
+        assert "amultiply" in fake_ffmpeg["filter_complex"]
+        assert "pan=stereo|c0=c0|c1=c0" in fake_ffmpeg["filter_complex"]
+        gain = fake_ffmpeg["gain"]
+        assert len(gain) == 4 * 8000
+        # Sample-accurate: fully ducked from exactly frame 30 (1.0 s) to frame 90 (3.0 s).
+        # Levels are relative to bg_base_volume, so the bed is untouched outside ducks
+        assert np.allclose(gain[8000:24000], 0.2 / 0.9)
+        assert gain[int(0.5 * 8000)] == pytest.approx(1.0)
+        assert gain[-1] == pytest.approx(1.0)
+        assert gain[7999] > 0.2 / 0.9 and gain[24001] > 0.2 / 0.9
+        assert not os.path.exists(f"{out}.gain.f32")
+
+    def test_gain_track_covers_probed_music_length(self, tmp_path, fake_ffmpeg):
+        music = tmp_path / "music.wav"
+        music.write_bytes(b"RIFF")
+
+        asyncio.run(mix_audio_bus(
+            str(tmp_path / "out.wav"),
+            music=AudioTrack(path=str(music)),
+            config=AudioBusConfig(sample_rate=8000, normalize=False),
+            narration_cues=[cue(30, 60)],
+            ducking_policy=POLICY,
+        ))
+        # 10 s of music (fake probe), not just up to the last cue at 3 s
+        assert len(fake_ffmpeg["gain"]) == 10 * 8000
+
+    def test_unknown_music_length_falls_back_to_static_graph(self, tmp_path, fake_ffmpeg, monkeypatch):
+        async def no_duration(path):
+            return 0
+
+        monkeypatch.setattr(audio_bus_mixer, "probe_audio_duration", no_duration)
+        music = tmp_path / "music.wav"
+        music.write_bytes(b"RIFF")
+
+        asyncio.run(mix_audio_bus(
+            str(tmp_path / "out.wav"),
+            music=AudioTrack(path=str(music), volume=0.5),
+            narration_cues=[cue(30, 60)],
+        ))
+        assert fake_ffmpeg["filter_complex"].startswith("[0:a]volume=0.5[music0]")
+        assert "amultiply" not in fake_ffmpeg["filter_complex"]
+
+    def test_no_cues_keeps_static_graph(self, tmp_path, fake_ffmpeg):
+        music = tmp_path / "music.wav"
+        music.write_bytes(b"RIFF")
+
+        asyncio.run(mix_audio_bus(str(tmp_path / "out.wav"), music=AudioTrack(path=str(music), volume=0.5)))
+        assert fake_ffmpeg["filter_complex"].startswith("[0:a]volume=0.5[music0]")
+        assert "amultiply" not in fake_ffmpeg["filter_complex"]
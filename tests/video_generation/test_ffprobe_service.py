@@ -0,0 +1,257 @@
+"""
+FFprobe Service — shared, cached, single-flight media probing
+
+Tests that:
+1. One ffprobe call yields duration, resolution, fps, codec and audio presence
+2. Results are cached by (path, size, mtime) and re-probed after the file changes
+3. Concurrent requests for the same file share one in-flight probe
+4. No more than max_concurrency ffprobe processes run at once
+5. probe_sync shares the cache and coalesces concurrent threads
+6. Failures raise ProbeError and are not cached
+7. media_probe / postprocess / audio_bus_mixer / vo_stitcher helpers delegate
+   to the service and keep their error semantics
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services import ffprobe_service
+from services.ffprobe_service import FFprobeService, ProbeError
+
+# Stand-in ffprobe: the "media" files hold the JSON ffprobe would print.
+# Each call is logged (start/end timestamps) so tests can count processes.
+FAKE_FFPROBE = """#!{python}
+import json, os, sys, time
+path = sys.argv[-1]
+log = os.environ["FAKE_FFPROBE_LOG"]
+with open(log, "a") as f:
+    f.write(json.dumps(["start", path, time.time()]) + "\\n")
+time.sleep(float(os.environ.get("FAKE_FFPROBE_DELAY", "0")))
+try:
+    data = json.load(open(path))
+except Exception:
+    sys.stderr.write("Invalid data found when processing input")
+    sys.exit(1)
+with open(log, "a") as f:
+    f.write(json.dumps(["end", path, time.time()]) + "\\n")
+print(json.dumps(data))
+"""
+
+VIDEO = {
+    "format": {"duration": "12.500000", "size": "1000"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 1080, "height": 1920, "r_frame_rate": "30000/1001"},
+        {"codec_type": "audio", "codec_name": "aac"},
+    ],
+}
+AUDIO = {"format": {"duration": "3.25"}, "streams": [{"codec_type": "audio", "codec_name": "pcm_s16le"}]}
+
+
+@pytest.fixture
+def fake_ffprobe(tmp_path, monkeypatch):
+    script = tmp_path / "ffprobe"
+    script.write_text(FAKE_FFPROBE.format(python=sys.executable))
+    script.chmod(0o755)
+    log = tmp_path / "calls.log"
+    log.touch()
+    monkeypatch.setenv("FAKE_FFPROBE_LOG", str(log))
+
+    def calls():
+        return [json.loads(line) for line in log.read_text().splitlines()]
+
+    return str(script), calls
+
+
+def write_media(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def starts(calls):
+    return [c for c in calls() if c[0] == "start"]
+
+
+class TestProbe:
+    def test_one_call_for_all_fields(self, tmp_path, fake_ffprobe):
+        binary, calls = fake_ffprobe
+        clip = write_media(tmp_path / "clip.mp4", VIDEO)
+        service = FFprobeService(ffprobe_bin=binary)
+
+        info = asyncio.run(service.probe(clip))
+        assert info.duration == 12.5
+        assert (info.width, info.height) == (1080, 1920)
+        assert info.fps == pytest.approx(29.97, abs=0.01)
+        assert info.codec == "h264" and info.audio_codec == "aac"
+        assert info.has_video and info.has_audio
+        assert info.raw == VIDEO
+        assert len(starts(calls)) == 1
+
+    def test_cache_and_invalidation_on_change(self, tmp_path, fake_ffprobe):
+        binary, calls = fake_ffprobe
+        clip = tmp_path / "clip.mp4"
+        write_media(clip, AUDIO)
+        service = FFprobeService(ffprobe_bin=binary)
+
+        async def run():
+            for _ in range(5):
+                assert (await service.probe(str(clip))).duration == 3.25
+            write_media(clip, VIDEO)
+            os.utime(clip, ns=(1, 10**18))
+            return await service.probe(str(clip))
+
+        assert asyncio.run(run()).duration == 12.5
+        assert service.probe_sync(str(clip)).width == 1080
+        assert len(starts(calls)) == 2
+        stats = service.get_stats()
+        assert stats["probes"] == 2 and stats["cache_hits"] == 5
+        assert stats["probes_avoided"] == 5
+
+        service.invalidate(str(clip))
+        service.probe_sync(str(clip))
+        assert len(starts(calls)) == 3
+
+    def test_concurrent_same_file_single_flight(self, tmp_path, fake_ffprobe, monkeypatch):
+        binary, calls = fake_ffprobe
+        monkeypatch.setenv("FAKE_FFPROBE_DELAY", "0.2")
+        clip = write_media(tmp_path / "clip.mp4", VIDEO)
+        service = FFprobeService(ffprobe_bin=binary)
+
+        async def run():
+            return await asyncio.gather(*(service.probe(clip) for _ in range(10)))
+
+        results = asyncio.run(run())
+        assert all(r is results[0] for r in results)
+        assert len(starts(calls)) == 1
+        assert service.get_stats()["coalesced"] == 9
+
+    def test_cancelled_caller_does_not_abort_shared_probe(self, tmp_path, fake_ffprobe, monkeypatch):
+        binary, calls = fake_ffprobe
+        monkeypatch.setenv("FAKE_FFPROBE_DELAY", "0.2")
+        clip = write_media(tmp_path / "clip.mp4", VIDEO)
+        service = FFprobeService(ffprobe_bin=binary)
+
+        async def run():
+            first = asyncio.create_task(service.probe(clip))
+            second = asyncio.create_task(service.probe(clip))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()).duration == 12.5
+        assert len(starts(calls)) == 1
+
+    def test_concurrency_is_bounded(self, tmp_path, fake_ffprobe, monkeypatch):
+        binary, calls = fake_ffprobe
+        monkeypatch.setenv("FAKE_FFPROBE_DELAY", "0.15")
+        paths = [write_media(tmp_path / f"clip{i}.mp4", VIDEO) for i in range(6)]
+        service = FFprobeService(max_concurrency=2, ffprobe_bin=binary)
+
+        results = asyncio.run(service.probe_many(paths))
+        assert all(r.duration == 12.5 for r in results)
+
+        events = sorted(calls(), key=lambda c: c[2])
+        running = peak = 0
+        for kind, _, _ in events:
+            running += 1 if kind == "start" else -1
+            peak = max(peak, running)
+        assert peak <= 2
+        assert len(starts(calls)) == 6
+
+    def test_sync_threads_coalesce(self, tmp_path, fake_ffprobe, monkeypatch):
+        binary, calls = fake_ffprobe
+        monkeypatch.setenv("FAKE_FFPROBE_DELAY", "0.2")
+        clip = write_media(tmp_path / "clip.mp4", AUDIO)
+        service = FFprobeService(ffprobe_bin=binary)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.probe_sync(clip))) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(results) == 6 and all(r is results[0] for r in results)
+        assert len(starts(calls)) == 1
+        assert service.get_stats()["probes_avoided"] == 5
+
+    def test_failures_raise_and_are_not_cached(self, tmp_path, fake_ffprobe):
+        binary, calls = fake_ffprobe
+        bad = tmp_path / "bad.mp4"
+        bad.write_text("not media")
+        service = FFprobeService(ffprobe_bin=binary)
+
+        with pytest.raises(ProbeError, match="Invalid data"):
+            asyncio.run(service.probe(str(bad)))
+        with pytest.raises(ProbeError):
+            service.probe_sync(str(bad))
+        with pytest.raises(ProbeError):
+            service.probe_sync(str(tmp_path / "missing.mp4"))
+        assert len(starts(calls)) == 2
+
+        missing_binary = FFprobeService(ffprobe_bin=str(tmp_path / "no-ffprobe"))
+        with pytest.raises(ProbeError, match="unavailable"):
+            asyncio.run(missing_binary.probe(str(bad)))
+
+    def test_probe_many_returns_none_for_failures(self, tmp_path, fake_ffprobe):
+        binary, _ = fake_ffprobe
+        good = write_media(tmp_path / "a.wav", AUDIO)
+        service = FFprobeService(ffprobe_bin=binary)
+        results = asyncio.run(service.probe_many([good, str(tmp_path / "missing.wav"), good]))
+        assert results[0].duration == 3.25 and results[1] is None and results[2] is results[0]
+
+
+class TestHelpersDelegate:
+    @pytest.fixture
+    def service(self, fake_ffprobe, monkeypatch):
+        pytest.importorskip("aiohttp")  # services.video_generation imports it
+        binary, calls = fake_ffprobe
+        service = FFprobeService(ffprobe_bin=binary)
+        monkeypatch.setattr(ffprobe_service, "_service", service)
+        return service, calls
+
+    def test_video_generation_helpers(self, tmp_path, service):
+        from services.video_generation import audio_bus_mixer, media_probe, postprocess, render_trigger, vo_stitcher
+
+        svc, calls = service
+        clip = write_media(tmp_path / "clip.mp4", VIDEO)
+        missing = str(tmp_path / "missing.mp4")
+
+        async def run():
+            info = await media_probe.probe_media_info(clip)
+            assert (info.width, info.height, info.has_audio, info.codec) == (1080, 1920, True, "h264")
+            assert await media_probe.probe_duration_seconds(clip) == 12.5
+            assert media_probe.probe_duration_seconds_sync(clip) == 12.5
+            assert await postprocess.get_video_duration(clip) == 12.5
+            video_info = await postprocess.get_video_info(clip)
+            assert video_info["width"] == 1080 and video_info["duration"] == 12.5
+            assert await audio_bus_mixer.probe_audio_duration(clip) == 12.5
+            assert await vo_stitcher.probe_audio_duration(clip) == 12.5
+            assert await render_trigger.probe_video_duration(clip) == 12.5
+
+            # Failure semantics are unchanged
+            assert await audio_bus_mixer.probe_audio_duration(missing) == 0
+            assert await render_trigger.probe_video_duration(missing) == 0
+            for helper in (media_probe.probe_duration_seconds, postprocess.get_video_duration, vo_stitcher.probe_audio_duration):
+                with pytest.raises(RuntimeError):
+                    await helper(missing)
+
+        asyncio.run(run())
+        assert len(starts(calls)) == 1
+        assert svc.get_stats()["probes_avoided"] == 7
+
+    def test_attach_timing_probes_each_plate_once(self, tmp_path, service):
+        from services.video_generation.media_probe import attach_timing_to_clips
+
+        _, calls = service
+        plate = write_media(tmp_path / "plate.mp4", VIDEO)
+        clips = [{"src": plate, "id": i} for i in range(4)] + [{"src": "mock://x"}]
+        result = asyncio.run(attach_timing_to_clips(clips, fps=30))
+        assert [c.get("timing", {}).get("durationFrames") for c in result] == [375] * 4 + [None]
+        assert len(starts(calls)) == 1
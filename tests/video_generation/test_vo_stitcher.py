@@ -0,0 +1,206 @@
+"""
+VO Stitcher — concurrent per-beat synthesis with in-process PCM stitching
+
+Tests that:
+1. Beats are synthesized concurrently, bounded by max_concurrency, and come back in beat order
+2. Silence padding and durations are computed in process (no ffmpeg/ffprobe per beat)
+3. A 40-beat short synthesizes and stitches in well under a second with DummyTTSProvider
+4. Loudness normalization runs once, on the stitched track, by default
+5. Cues line up with the stitched WAV sample for sample
+6. Re-rendering with one edited beat re-synthesizes only that beat (TTS clip cache)
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import time
+import wave
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("aiohttp")  # services.video_generation imports it
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+from services.audio.tts_clip_cache import TTSClipCache
+from services.video_generation import vo_stitcher
+from services.video_generation.vo_stitcher import (
+    BeatNarrationInput,
+    DummyTTSProvider,
+    stitch_narration,
+    synthesize_and_stitch_narration,
+    synthesize_beat_narrations,
+)
+
+SR = vo_stitcher.DEFAULT_SAMPLE_RATE
+
+
+class SlowDummyProvider(DummyTTSProvider):
+    """DummyTTSProvider with network-like latency and a concurrency gauge."""
+
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+
+    async def synthesize(self, text, out_path, voice_id=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.latency)
+        await super().synthesize(text, out_path, voice_id)
+        self.active -= 1
+
+
+def beats(n):
+    return [
+        BeatNarrationInput(beat_id=f"b{i:02d}", text="word " * (1 + i % 5), pre_silence_ms=100, post_silence_ms=140)
+        for i in range(n)
+    ]
+
+
+def wav_frames(path):
+    with wave.open(path, "rb") as wav:
+        assert wav.getframerate() == SR
+        return wav.getnframes()
+
+
+@pytest.fixture(autouse=True)
+def clip_cache(tmp_path, monkeypatch):
+    """Keep the shared TTS clip cache out of the real temp dir."""
+    cache = TTSClipCache(root_dir=str(tmp_path / "tts_cache"))
+    monkeypatch.setattr(vo_stitcher, "get_tts_clip_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def no_subprocess(monkeypatch):
+    calls = []
+
+    async def fake_exec(*cmd, **kwargs):
+        calls.append(cmd)
+        raise AssertionError(f"unexpected subprocess: {cmd[0]}")
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_exec)
+    return calls
+
+
+class TestSynthesizeBeats:
+    def test_concurrent_and_ordered(self, tmp_path, no_subprocess):
+        provider = SlowDummyProvider()
+        inputs = beats(12)
+        assets = asyncio.run(synthesize_beat_narrations(
+            provider, inputs, str(tmp_path), normalize=False, max_concurrency=4,
+        ))
+
+        assert [a.beat_id for a in assets] == [b.beat_id for b in inputs]
+        assert provider.peak == 4
+        for beat, asset in zip(inputs, assets):
+            expected = (len(beat.text) * 50 + beat.pre_silence_ms + beat.post_silence_ms) / 1000
+            assert asset.duration_seconds == pytest.approx(expected, abs=1 / SR)
+            assert asset.wav_path.endswith(f"vo_{beat.beat_id}_padded.wav")
+            assert wav_frames(asset.wav_path) == round(asset.duration_seconds * SR)
+
+    def test_empty_beats_skipped_and_unpadded_path(self, tmp_path, no_subprocess):
+        inputs = [
+            BeatNarrationInput(beat_id="a", text="   "),
+            BeatNarrationInput(beat_id="b", text="hi", pre_silence_ms=0, post_silence_ms=0),
+        ]
+        assets = asyncio.run(synthesize_beat_narrations(DummyTTSProvider(), inputs, str(tmp_path), normalize=False))
+        assert [a.beat_id for a in assets] == ["b"]
+        assert assets[0].wav_path.endswith("vo_b.wav")
+        assert assets[0].duration_seconds == pytest.approx(0.1)
+
+
+class TestStitch:
+    def test_forty_beat_short(self, tmp_path, monkeypatch):
+        normalized = []
+
+        async def fake_normalize(in_path, out_path, sample_rate=SR):
+            normalized.append(in_path)
+            shutil.copyfile(in_path, out_path)
+            return True
+
+        monkeypatch.setattr(vo_stitcher, "normalize_loudness_wav", fake_normalize)
+        provider = SlowDummyProvider(latency=0.05)
+        inputs = beats(40)
+
+        start = time.perf_counter()
+        narration = asyncio.run(synthesize_and_stitch_narration(
+            provider, inputs, str(tmp_path), fps=30, max_concurrency=8,
+        ))
+        elapsed = time.perf_counter() - start
+
+        # Serially the provider latency alone would be 2s
+        assert elapsed < 1.0
+        assert normalized == [str(tmp_path / "narration_stitched_raw.wav")]
+        assert len(narration.cues) == 40
+        assert wav_frames(narration.stitched_wav_path) == round(narration.total_seconds * SR)
+
+        cursor = 0.0
+        for beat in inputs:
+            cue = narration.cues[beat.beat_id]
+            assert cue.start_seconds == pytest.approx(cursor)
+            assert cue.from_frame == round(cursor * 30)
+            cursor += cue.duration_seconds
+
+    def test_missing_asset_becomes_silence(self, tmp_path, no_subprocess):
+        assets = asyncio.run(synthesize_beat_narrations(
+            DummyTTSProvider(), beats(2), str(tmp_path), normalize=False,
+        ))
+        assets.append(vo_stitcher.NarrationAsset(beat_id="ghost", wav_path=str(tmp_path / "nope.wav"), duration_seconds=0.5))
+
+        narration = asyncio.run(stitch_narration(assets, str(tmp_path / "out"), fps=30, normalize=False))
+        assert wav_frames(narration.stitched_wav_path) == round(narration.total_seconds * SR)
+        assert narration.cues["ghost"].duration_in_frames == 15
+
+    def test_defaults_normalize_once_per_stitch(self, tmp_path, no_subprocess, monkeypatch):
+        # Per-beat synthesis runs no ffmpeg (no_subprocess), the stitch normalizes once
+        assets = asyncio.run(synthesize_beat_narrations(DummyTTSProvider(), beats(3), str(tmp_path)))
+        assert no_subprocess == []
+
+        normalized = []
+
+        async def fake_normalize(in_path, out_path, sample_rate=SR):
+            normalized.append(in_path)
+            shutil.copyfile(in_path, out_path)
+            return True
+
+        monkeypatch.setattr(vo_stitcher, "normalize_loudness_wav", fake_normalize)
+        narration = asyncio.run(stitch_narration(assets, str(tmp_path / "out"), fps=30))
+        assert normalized == [str(tmp_path / "out" / "narration_stitched_raw.wav")]
+        assert wav_frames(narration.stitched_wav_path) == round(narration.total_seconds * SR)
+
+
+class TestClipCache:
+    def test_edited_beat_is_the_only_one_resynthesized(self, tmp_path, clip_cache, no_subprocess):
+        class CountingProvider(DummyTTSProvider):
+            def __init__(self):
+                self.texts = []
+
+            async def synthesize(self, text, out_path, voice_id=None):
+                self.texts.append(text)
+                await super().synthesize(text, out_path, voice_id)
+
+        inputs = [BeatNarrationInput(beat_id=f"b{i}", text=f"line number {i}") for i in range(6)]
+        first = CountingProvider()
+        asyncio.run(synthesize_beat_narrations(first, inputs, str(tmp_path / "r1"), normalize=False))
+        assert len(first.texts) == 6
+
+        edited = [b.model_copy() for b in inputs]
+        edited[3] = edited[3].model_copy(update={"text": "a freshly edited line"})
+        second = CountingProvider()
+        assets = asyncio.run(synthesize_beat_narrations(second, edited, str(tmp_path / "r2"), normalize=False))
+
+        assert second.texts == ["a freshly edited line"]
+        assert len(assets) == 6
+        assert clip_cache.get_metrics()["hits"] == 5
+
+    def test_voice_is_part_of_the_key(self, tmp_path, no_subprocess):
+        provider = SlowDummyProvider(latency=0)
+        asyncio.run(synthesize_beat_narrations(provider, beats(2), str(tmp_path / "a"), voice_id="v1", normalize=False))
+        provider.peak = 0
+        asyncio.run(synthesize_beat_narrations(provider, beats(2), str(tmp_path / "b"), voice_id="v2", normalize=False))
+        assert provider.peak > 0
@@ -0,0 +1,273 @@
+"""
+Orchestration Queue — priority/aging scheduling with per-project fairness
+
+Tests that:
+1. Queued jobs start in priority order (ties in FIFO order)
+2. Aging lets a long-waiting low-priority job overtake newer urgent work
+3. A project flooding the queue cannot starve another project
+4. Queued jobs can be canceled and re-prioritized; canceling a running job
+   frees its slot for the next one
+5. Slots are released by completion callbacks (no polling gaps) and
+   get_queue_status reports queue-wait and slot-utilization metrics
+6. Hundreds of plans run through the real worker with the mock provider
+   without exceeding max_workers
+7. Finished jobs drop their plan payload and only the most recent
+   FINISHED_HISTORY records are kept
+"""
+
+import asyncio
+import os
+import sys
+import time
+from uuid import uuid4
+
+import pytest
+
+# Ensure python/ and the mock provider are on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'video_providers'))
+
+from services.video_orchestrator.models import ClipPlan, ClipPlanClip, Scene
+from services.video_orchestrator.orchestration_worker import (
+    OrchestrationQueue,
+    OrchestrationWorker,
+    WorkerConfig,
+    WorkerEvent,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingWorker:
+    """Stands in for OrchestrationWorker; records start order."""
+
+    def __init__(self, duration=0.0, block=False):
+        self.duration = duration
+        self.started = []
+        self.gate = asyncio.Event() if block else None
+
+    async def run_clip_plan(self, plan, scenes, clips, bibles=None):
+        self.started.append(plan.plan_json["name"])
+        if self.gate is not None:
+            await self.gate.wait()
+        await asyncio.sleep(self.duration)
+        return True
+
+    async def cancel_plan(self, plan_id):
+        pass
+
+
+def make_plan(name, project_id=None, clips=1):
+    plan = ClipPlan(project_id=project_id or uuid4(), plan_json={"name": name})
+    scene = Scene(clip_plan_id=plan.id)
+    return plan, [scene], [ClipPlanClip(scene_id=scene.id, clip_order=i) for i in range(clips)]
+
+
+class TestScheduling:
+    def test_priority_order(self):
+        async def run():
+            worker = RecordingWorker()
+            queue = OrchestrationQueue(worker, max_workers=1)
+            project = uuid4()
+            for name, priority in [("low", 0), ("urgent", 9), ("mid", 5), ("mid2", 5), ("low2", 0)]:
+                await queue.enqueue(*make_plan(name, project), priority=priority)
+            await queue.start()
+            await queue.join()
+            return worker.started
+
+        assert asyncio.run(run()) == ["urgent", "mid", "mid2", "low", "low2"]
+
+    @pytest.mark.parametrize("aging_rate,expected", [(1 / 60, ["old", "new"]), (0.0, ["new", "old"])])
+    def test_aging(self, aging_rate, expected):
+        async def run():
+            clock = FakeClock()
+            worker = RecordingWorker()
+            queue = OrchestrationQueue(worker, max_workers=1, aging_rate=aging_rate, clock=clock)
+            project = uuid4()
+            await queue.enqueue(*make_plan("old", project), priority=0)
+            clock.now = 600.0  # +10 priority points at 1/60 per second
+            await queue.enqueue(*make_plan("new", project), priority=5)
+            await queue.start()
+            await queue.join()
+            return worker.started
+
+        assert asyncio.run(run()) == expected
+
+    def test_project_fairness(self):
+        async def run():
+            worker = RecordingWorker(duration=0.01)
+            queue = OrchestrationQueue(worker, max_workers=2)
+            a, b = uuid4(), uuid4()
+            for i in range(10):
+                await queue.enqueue(*make_plan(f"a{i}", a))
+            for i in range(2):
+                await queue.enqueue(*make_plan(f"b{i}", b))
+            await queue.start()
+            await queue.join()
+            return worker.started
+
+        started = asyncio.run(run())
+        assert started[:4] == ["a0", "b0", "a1", "b1"]
+        assert len(started) == 12
+
+
+class TestCancelAndReprioritize:
+    def test_queued_jobs(self):
+        async def run():
+            worker = RecordingWorker()
+            queue = OrchestrationQueue(worker, max_workers=1)
+            project = uuid4()
+            ids = [await queue.enqueue(*make_plan(f"j{i}", project)) for i in range(4)]
+
+            assert queue.cancel(ids[1])
+            assert not queue.cancel("unknown")
+            assert queue.reprioritize(ids[3], 10)
+            assert queue.get_queue_status()["queued"] == 3
+
+            await queue.start()
+            await queue.join()
+            assert not queue.reprioritize(ids[3], 0)  # already finished
+            return worker.started, queue.get_queue_status(), queue.get_job(ids[1]).status
+
+        started, status, canceled_status = asyncio.run(run())
+        assert started == ["j3", "j0", "j2"]
+        assert status["canceled"] == 1 and status["completed"] == 3 and status["queued"] == 0
+        assert canceled_status == "canceled"
+
+    def test_cancel_running_frees_slot(self):
+        async def run():
+            worker = RecordingWorker(block=True)
+            queue = OrchestrationQueue(worker, max_workers=1)
+            first = await queue.enqueue(*make_plan("first"))
+            await queue.enqueue(*make_plan("second"))
+            await queue.start()
+            await asyncio.sleep(0)
+            assert worker.started == ["first"]
+
+            assert queue.cancel(first)
+            await asyncio.sleep(0.01)
+            assert worker.started == ["first", "second"]
+            worker.gate.set()
+            await queue.join()
+            return queue, first
+
+        queue, first = asyncio.run(run())
+        assert queue.get_job(first).status == "canceled"
+        assert queue.get_job_result(first) is None
+        assert queue.get_queue_status()["canceled"] == 1
+
+
+class TestMetrics:
+    def test_completion_releases_slots_immediately(self):
+        async def run():
+            worker = RecordingWorker(duration=0.05)
+            queue = OrchestrationQueue(worker, max_workers=2)
+            for i in range(10):
+                await queue.enqueue(*make_plan(f"j{i}"))
+            start = time.perf_counter()
+            await queue.start()
+            await queue.join()
+            return time.perf_counter() - start, queue.get_queue_status()
+
+        elapsed, status = asyncio.run(run())
+        # 5 waves of 50 ms; the old 0.5 s poll loop needed several seconds
+        assert elapsed < 0.5
+        assert status["completed"] == 10 and status["active"] == 0
+        waits = status["queue_wait_seconds"]
+        assert waits["samples"] == 10
+        assert 0.15 < waits["max"] < 0.4
+        assert waits["p50"] <= waits["p95"] <= waits["max"]
+        assert 0.5 < status["slot_utilization"] <= 1.0
+
+    def test_oldest_queued_wait(self):
+        async def run():
+            clock = FakeClock()
+            queue = OrchestrationQueue(RecordingWorker(), clock=clock)
+            await queue.enqueue(*make_plan("a"))
+            clock.now = 7.5
+            await queue.enqueue(*make_plan("b"))
+            clock.now = 10.0
+            return queue.get_queue_status()
+
+        status = asyncio.run(run())
+        assert status["queued"] == 2 and not status["running"]
+        assert status["queue_wait_seconds"]["oldest_queued"] == 10.0
+        assert status["slot_utilization"] == 0.0
+
+
+class TestLoad:
+    def test_hundreds_of_plans_with_mock_provider(self):
+        mock_provider = pytest.importorskip("mock_provider")
+
+        async def run():
+            worker = OrchestrationWorker(WorkerConfig(poll_interval_seconds=0.001))
+            worker._provider = mock_provider.MockVideoProvider(simulate_delay=0.001, processing_steps=1)
+
+            running = peak = 0
+
+            def track(event, data):
+                nonlocal running, peak
+                if event == WorkerEvent.PLAN_STARTED:
+                    running += 1
+                    peak = max(peak, running)
+                elif event in (WorkerEvent.PLAN_COMPLETED, WorkerEvent.PLAN_FAILED):
+                    running -= 1
+
+            worker.on_event(track)
+            queue = OrchestrationQueue(worker, max_workers=16)
+            await queue.start()
+
+            projects = [uuid4() for _ in range(12)]
+            ids = []
+            for i in range(300):
+                plan = make_plan(f"p{i}", projects[i % len(projects)], clips=1 + i % 3)
+                ids.append(await queue.enqueue(*plan, priority=i % 4))
+            await queue.join()
+            return queue, ids, peak
+
+        queue, ids, peak = asyncio.run(run())
+        status = queue.get_queue_status()
+        assert all(queue.get_job_result(job_id) is True for job_id in ids)
+        assert status["completed"] == 300 and status["queued"] == 0 and status["active"] == 0
+        assert status["queue_wait_seconds"]["samples"] == 300
+        assert 0 < status["slot_utilization"] <= 1.0
+        assert peak <= 16
+
+
+class TestRetention:
+    def test_finished_jobs_are_small_and_bounded(self, monkeypatch):
+        monkeypatch.setattr(OrchestrationQueue, "FINISHED_HISTORY", 5)
+
+        async def run():
+            clock = FakeClock()
+            queue = OrchestrationQueue(RecordingWorker(), max_workers=1, clock=clock)
+            ids = [await queue.enqueue(*make_plan(f"j{i}", clips=2)) for i in range(8)]
+            assert queue.cancel(ids[0])
+            await queue.start()
+            await queue.join()
+
+            # A newer job still queued behind finished ones sets oldest_queued
+            await queue.stop()
+            clock.now = 4.0
+            late = await queue.enqueue(*make_plan("late"))
+            clock.now = 6.0
+            return queue, ids, late
+
+        queue, ids, late = asyncio.run(run())
+        assert len(queue._jobs) == 6  # 5 finished records + the queued one
+        assert queue.get_job(ids[0]) is None and queue.get_job_result(ids[1]) is None
+        last = queue.get_job(ids[-1])
+        assert last.status == "completed" and last.plan is None and last.clips is None
+        assert last.to_dict()["total_clips"] == 2
+        assert queue.get_job_result(ids[-1]) is True
+
+        status = queue.get_queue_status()
+        assert status["completed"] == 7 and status["canceled"] == 1
+        assert status["queue_wait_seconds"]["oldest_queued"] == 2.0
+        assert queue.get_job(late).plan is not None
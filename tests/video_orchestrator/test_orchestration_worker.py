@@ -0,0 +1,179 @@
+"""
+Orchestration Worker — completion-order handling and provider rate governance
+
+Tests that:
+1. Progress is reported as clips finish, not in submission order
+2. Clips go to their provider_override and each provider's concurrent
+   generations stay within its limit
+3. The token bucket spaces generation requests to requests_per_minute
+4. A failed clip cancels the rest of the plan (fail_fast), and all clips
+   still run with fail_fast disabled
+5. cancel_plan cancels a running plan's clips
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Ensure python/ and the mock provider are on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'video_providers'))
+
+from services.video_orchestrator.models import ClipPlan, ClipPlanClip, ClipState, ProviderName, Scene
+from services.video_orchestrator.orchestration_worker import (
+    OrchestrationWorker,
+    WorkerConfig,
+    WorkerEvent,
+)
+from services.video_orchestrator.rate_limits import ProviderGovernor, ProviderRateLimit, TokenBucket
+
+mock_provider = pytest.importorskip("mock_provider")
+MockVideoProvider = mock_provider.MockVideoProvider
+
+
+def make_plan(n, overrides=None):
+    plan = ClipPlan()
+    scene = Scene(clip_plan_id=plan.id)
+    overrides = overrides or {}
+    clips = [
+        ClipPlanClip(scene_id=scene.id, clip_order=i, provider_override=overrides.get(i))
+        for i in range(n)
+    ]
+    return plan, [scene], clips
+
+
+def make_worker(providers, **config):
+    config.setdefault("poll_interval_seconds", 0.001)
+    worker = OrchestrationWorker(WorkerConfig(**config), providers=providers)
+    events = []
+    worker.on_event(lambda event, data: events.append((event, data)))
+    return worker, events
+
+
+class TestCompletionOrder:
+    def test_progress_does_not_wait_for_slow_first_clip(self):
+        slow = MockVideoProvider(simulate_delay=0.1)
+        fast = MockVideoProvider(simulate_delay=0.001, processing_steps=1)
+        worker, events = make_worker({ProviderName.MOCK: fast, ProviderName.RUNWAY: slow}, max_concurrent_clips=4)
+        plan, scenes, clips = make_plan(4, {0: ProviderName.RUNWAY})
+
+        assert asyncio.run(worker.run_clip_plan(plan, scenes, clips))
+
+        slow_done = next(
+            i for i, (e, d) in enumerate(events)
+            if e == WorkerEvent.CLIP_COMPLETED and d["clip_id"] == str(clips[0].id)
+        )
+        updates = [i for i, (e, _) in enumerate(events) if e == WorkerEvent.PROGRESS_UPDATE]
+        assert len(updates) == 4
+        assert sum(i < slow_done for i in updates) == 3
+        assert [events[i][1]["completed_clips"] for i in updates] == [1, 2, 3, 4]
+
+
+class TestProviderLimits:
+    def test_per_provider_concurrency(self):
+        sora = MockVideoProvider(simulate_delay=0.01)
+        runway = MockVideoProvider(simulate_delay=0.01)
+        worker, _ = make_worker(
+            {ProviderName.MOCK: sora, ProviderName.RUNWAY: runway},
+            max_concurrent_clips=12,
+            provider_limits={ProviderName.MOCK: ProviderRateLimit(max_concurrent=2)},
+        )
+        plan, scenes, clips = make_plan(12, {i: ProviderName.RUNWAY for i in range(6)})
+
+        assert asyncio.run(worker.run_clip_plan(plan, scenes, clips))
+
+        stats = worker.get_provider_stats()
+        assert stats["mock"]["requests"] == 6 and stats["mock"]["peak_in_flight"] == 2
+        assert stats["mock"]["slot_wait_seconds"] > 0
+        assert stats["runway"]["requests"] == 6 and stats["runway"]["peak_in_flight"] == 6
+        assert len(sora.get_all_generations()) == 6 and len(runway.get_all_generations()) == 6
+
+    def test_requests_per_minute(self):
+        provider = MockVideoProvider(simulate_delay=0.001, processing_steps=1)
+        worker, _ = make_worker(
+            {ProviderName.MOCK: provider},
+            max_concurrent_clips=5,
+            provider_limits={"mock": ProviderRateLimit(requests_per_minute=600)},
+        )
+        plan, scenes, clips = make_plan(5)
+
+        start = time.perf_counter()
+        assert asyncio.run(worker.run_clip_plan(plan, scenes, clips))
+        # 10 requests/s, burst 1: four of the five wait 0.1 s more than the last
+        assert time.perf_counter() - start >= 0.38
+        stats = worker.get_provider_stats()["mock"]
+        assert stats["requests"] == 5 and stats["throttled_seconds"] >= 0.9
+
+    def test_token_bucket_reservations(self):
+        now = [0.0]
+        bucket = TokenBucket(requests_per_minute=60, burst=2, clock=lambda: now[0])
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+        now[0] = 10.0
+        assert bucket.reserve() == 0.0  # refilled, capped at burst
+
+    def test_cancelled_waiter_returns_its_token(self):
+        async def run():
+            governor = ProviderGovernor({"sora": ProviderRateLimit(requests_per_minute=60)})
+            async with governor.generation_slot("sora"):
+                pass
+            waiter = asyncio.create_task(governor.generation_slot("sora").__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            return governor._state("sora").bucket.reserve()
+
+        # Only the first request's token is spent; the next is ~1 s away, not ~2 s
+        assert asyncio.run(run()) == pytest.approx(1.0, abs=0.05)
+
+
+class TestFailFast:
+    def run_plan(self, fail_fast):
+        good = MockVideoProvider(simulate_delay=0.02)
+        bad = MockVideoProvider(simulate_delay=0.001, failure_rate=1.0)
+        worker, events = make_worker(
+            {ProviderName.MOCK: good, ProviderName.RUNWAY: bad},
+            max_concurrent_clips=2,
+            max_retries_per_clip=1,
+            fail_fast=fail_fast,
+        )
+        plan, scenes, clips = make_plan(6, {0: ProviderName.RUNWAY})
+        passed = asyncio.run(worker.run_clip_plan(plan, scenes, clips))
+        return passed, worker.get_progress(str(plan.id)), clips, events
+
+    def test_failure_cancels_remaining_clips(self):
+        passed, progress, clips, events = self.run_plan(fail_fast=True)
+        assert not passed and progress.status == "failed"
+        assert progress.failed_clips == 1
+        assert progress.canceled_clips >= 3
+        assert progress.to_dict()["pending_clips"] == 0
+        skipped = [c for c in clips if c.state == ClipState.SKIPPED]
+        assert len(skipped) == progress.canceled_clips
+        assert sum(e == WorkerEvent.CLIP_CANCELED for e, _ in events) == len(skipped)
+        assert events[-1][0] == WorkerEvent.PLAN_FAILED
+        assert events[-1][1]["clips_canceled"] == len(skipped)
+
+    def test_without_fail_fast_all_clips_run(self):
+        passed, progress, clips, _ = self.run_plan(fail_fast=False)
+        assert not passed
+        assert (progress.completed_clips, progress.failed_clips, progress.canceled_clips) == (5, 1, 0)
+
+
+class TestCancelPlan:
+    def test_cancel_plan_cancels_clips(self):
+        async def run():
+            worker, _ = make_worker({ProviderName.MOCK: MockVideoProvider(simulate_delay=0.05)}, max_concurrent_clips=2)
+            plan, scenes, clips = make_plan(6)
+            task = asyncio.create_task(worker.run_clip_plan(plan, scenes, clips))
+            await asyncio.sleep(0.02)
+            await worker.cancel_plan(str(plan.id))
+            passed = await task
+            return passed, worker.get_progress(str(plan.id)), worker.is_running(str(plan.id))
+
+        passed, progress, running = asyncio.run(run())
+        assert not passed and not running
+        assert progress.status == "canceled"
+        assert progress.canceled_clips == 6
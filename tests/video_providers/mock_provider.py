@@ -15,7 +15,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from .base import (
+from services.video_providers.base import (
     VideoProviderAdapter,
     ProviderConfig,
     ProviderName,
@@ -0,0 +1,206 @@
+"""
+Visuals Catalog — probe-once media index for local B-roll/UGC/meme libraries
+
+Tests that:
+1. A scan probes each file once; unchanged files are never re-probed, changed
+   files (mtime/size) are, and vanished files are dropped
+2. Keyword search keeps the filename substring semantics (any keyword,
+   case-insensitive, short and special-character terms included)
+3. aspect_ratio and duration filters use the probed metadata; an unparseable
+   aspect_ratio is logged and skipped rather than failing the search
+4. Probes run with bounded concurrency
+5. The adapters serve search/get from the shared catalog, index names before
+   probing finishes, and never probe on the request path for indexed files
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+catalog_module = pytest.importorskip("services.visuals.catalog")
+from services.visuals.catalog import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, VisualsCatalog  # noqa: E402
+from services.visuals.models import VisualsSearchCriteria, VisualsType  # noqa: E402
+
+ALL_EXTENSIONS = VIDEO_EXTENSIONS + IMAGE_EXTENSIONS
+
+
+class FakeProbe:
+    """Portrait if the name contains "vert", duration from a "_<n>s" suffix."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, path):
+        self.calls.append(os.path.basename(path))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        stem = os.path.splitext(os.path.basename(path))[0]
+        width, height = (1080, 1920) if "vert" in stem.lower() else (1920, 1080)
+        duration = float(stem.rsplit("_", 1)[-1].rstrip("s")) if stem.endswith("s") else 10.0
+        return {"duration": duration, "width": width, "height": height, "fps": 30.0, "codec": "h264"}
+
+
+def touch(root, name, payload=b"x"):
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
+    return path
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestScan:
+    def test_probe_once_and_incremental(self, tmp_path):
+        touch(tmp_path, "city_vert_12s.mp4")
+        touch(tmp_path, "beach_30s.mov")
+        changed = touch(tmp_path, "sub/forest_5s.webm")
+        touch(tmp_path, "notes.txt")
+        probe = FakeProbe()
+        catalog = VisualsCatalog(probe=probe)
+
+        counts = run(catalog.scan(tmp_path, VIDEO_EXTENSIONS))
+        assert counts == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0, "probed": 3}
+        assert sorted(probe.calls) == ["beach_30s.mov", "city_vert_12s.mp4", "forest_5s.webm"]
+
+        probe.calls.clear()
+        counts = run(catalog.scan(tmp_path, VIDEO_EXTENSIONS))
+        assert counts["unchanged"] == 3 and probe.calls == []
+
+        changed.write_bytes(b"bigger file")
+        (tmp_path / "beach_30s.mov").unlink()
+        counts = run(catalog.scan(tmp_path, VIDEO_EXTENSIONS))
+        assert counts == {"added": 0, "updated": 1, "removed": 1, "unchanged": 1, "probed": 1}
+        assert probe.calls == ["forest_5s.webm"]
+        assert [r["key"] for r in catalog.search(tmp_path)] == ["city_vert_12s.mp4", "sub/forest_5s.webm"]
+
+    def test_persists_across_instances(self, tmp_path):
+        lib = tmp_path / "lib"
+        touch(lib, "clip_4s.mp4")
+        db = tmp_path / "catalog.db"
+        run(VisualsCatalog(db, probe=FakeProbe()).scan(lib, VIDEO_EXTENSIONS))
+
+        probe = FakeProbe()
+        reopened = VisualsCatalog(db, probe=probe)
+        assert run(reopened.scan(lib, VIDEO_EXTENSIONS))["unchanged"] == 1
+        assert probe.calls == []
+        assert reopened.search(lib)[0]["duration"] == 4.0
+
+    def test_bounded_probe_concurrency(self, tmp_path):
+        for i in range(20):
+            touch(tmp_path, f"clip_{i}.mp4")
+        probe = FakeProbe(delay=0.01)
+        run(VisualsCatalog(probe=probe, probe_concurrency=3).scan(tmp_path, VIDEO_EXTENSIONS))
+        assert len(probe.calls) == 20
+        assert probe.max_in_flight == 3
+
+
+class TestSearch:
+    NAMES = ["Funny_Cat.png", "cat-jump.mp4", "dog_ok.mp4", "100%_real.jpg", "Sunset_Vert_8s.mp4", "a_b.gif"]
+
+    @pytest.fixture
+    def catalog(self, tmp_path):
+        for name in self.NAMES:
+            touch(tmp_path, name)
+        catalog = VisualsCatalog(probe=FakeProbe())
+        run(catalog.scan(tmp_path, ALL_EXTENSIONS))
+        return catalog
+
+    @pytest.mark.parametrize("keywords", [["cat"], ["CAT", "dog"], ["ok"], ["%"], ["_b"], ["sunset vert"], ["zzz"]])
+    def test_keywords_match_filename_substrings(self, tmp_path, catalog, keywords):
+        expected = sorted(
+            n for n in self.NAMES
+            if any(k.lower() in os.path.splitext(n)[0].lower() for k in keywords)
+        )
+        assert [r["key"] for r in catalog.search(tmp_path, keywords=keywords, limit=50)] == expected
+
+    def test_required_terms_and_media_type(self, tmp_path, catalog):
+        rows = catalog.search(tmp_path, keywords=["cat", "dog"], required_terms=["funny"])
+        assert [r["key"] for r in rows] == ["Funny_Cat.png"]
+        assert {r["media_type"] for r in catalog.search(tmp_path, media_type="image", limit=50)} == {"image"}
+
+    def test_aspect_and_duration_filters(self, tmp_path, catalog):
+        portrait = catalog.search(tmp_path, aspect_ratio="9:16")
+        assert [r["key"] for r in portrait] == ["Sunset_Vert_8s.mp4"]
+        assert portrait[0]["aspect_ratio"] == "9:16" and portrait[0]["fps"] == 30.0
+        assert len(catalog.search(tmp_path, aspect_ratio="16:9", limit=50)) == 5
+
+        # Images always pass duration filters; videos use the probed duration
+        rows = catalog.search(tmp_path, duration_max=9, limit=50)
+        assert [r["key"] for r in rows] == ["100%_real.jpg", "Funny_Cat.png", "Sunset_Vert_8s.mp4", "a_b.gif"]
+
+    def test_unparseable_aspect_ratio_is_ignored(self, tmp_path, catalog, caplog):
+        with caplog.at_level("WARNING"):
+            rows = catalog.search(tmp_path, aspect_ratio="vertical", limit=50)
+        assert rows == catalog.search(tmp_path, limit=50)
+        assert "vertical" in caplog.text
+
+    def test_unprobed_files_need_no_metadata_filters(self, tmp_path):
+        touch(tmp_path, "late.mp4")
+        catalog = VisualsCatalog(probe=FakeProbe())
+        run(catalog._index_files(tmp_path.resolve(), VIDEO_EXTENSIONS))
+        assert [r["key"] for r in catalog.search(tmp_path)] == ["late.mp4"]
+        assert catalog.search(tmp_path, aspect_ratio="16:9") == []
+
+
+class TestAdapters:
+    @pytest.fixture
+    def adapters(self):
+        return pytest.importorskip("services.visuals.adapters.broll"), pytest.importorskip("services.visuals.adapters.meme")
+
+    def test_broll_search_and_get(self, tmp_path, adapters):
+        broll_module, _ = adapters
+        touch(tmp_path, "city_vert_12s.mp4")
+        touch(tmp_path, "city_wide_20s.mp4")
+        probe = FakeProbe(delay=0.01)
+        catalog = VisualsCatalog(probe=probe, scan_interval=3600)
+        adapter = broll_module.BrollAdapter(str(tmp_path), catalog=catalog)
+
+        async def scenario():
+            # Names are searchable before the background probes finish
+            first = await adapter.search_visuals(VisualsType.BROLL, VisualsSearchCriteria(VisualsType.BROLL, keywords=["city"]))
+            assert [r["asset_id"] for r in first] == ["city_vert_12s.mp4", "city_wide_20s.mp4"]
+            while catalog.count(tmp_path, probed=False):
+                await asyncio.sleep(0.01)
+
+            portrait = await adapter.search_visuals(
+                VisualsType.BROLL, VisualsSearchCriteria(VisualsType.BROLL, aspect_ratio="9:16")
+            )
+            response = await adapter.get_visuals("city_wide_20s.mp4")
+            await catalog.stop()
+            return portrait, response
+
+        portrait, response = run(scenario())
+        assert [r["asset_id"] for r in portrait] == ["city_vert_12s.mp4"]
+        assert portrait[0]["duration"] == 12.0 and portrait[0]["width"] == 1080
+        assert response.success and response.duration_seconds == 20.0 and response.source == "local"
+        assert sorted(probe.calls) == ["city_vert_12s.mp4", "city_wide_20s.mp4"]
+
+    def test_meme_mood_and_style(self, tmp_path, adapters):
+        _, meme_module = adapters
+        for name in ["funny_dark_cat.png", "funny_cat.jpg", "sad_dark_dog.webp"]:
+            touch(tmp_path, name)
+        catalog = VisualsCatalog(probe=FakeProbe(), scan_interval=3600)
+        adapter = meme_module.MemeAdapter(str(tmp_path), catalog=catalog)
+
+        async def scenario():
+            results = await adapter.search_visuals(
+                VisualsType.MEME, VisualsSearchCriteria(VisualsType.MEME, keywords=["cat", "dog"], mood="funny", style="dark")
+            )
+            await catalog.stop()
+            return results
+
+        assert [r["asset_id"] for r in run(scenario())] == ["funny_dark_cat.png"]
@@ -0,0 +1,187 @@
+"""
+Voice Analytics Service — time-bucketed rollups
+
+Tests that:
+1. get_stats aggregates counts, durations, cost and cache hits like the event-list version
+2. Per-voice filtering, top voices and the daily breakdown come from day buckets
+3. Buckets older than the retention period fall out of the ring
+4. get_recent_stats uses minute buckets and the latency histogram gives percentiles
+5. Tracking cost does not grow with the number of events already tracked
+6. Events appended to SQLite are replayed into the buckets after a restart,
+   including events still buffered when the process exited without close()
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+# services.voice's package __init__ pulls in the database layer
+voice_analytics_service = pytest.importorskip("services.voice.voice_analytics_service")
+
+VoiceAnalyticsService = voice_analytics_service.VoiceAnalyticsService
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def days_ago(n, hours=0):
+    return datetime.now(timezone.utc) - timedelta(days=n, hours=hours)
+
+
+async def track_sample(analytics):
+    await analytics.track_generation("alice", 100, 60.0, 1200)
+    await analytics.track_generation("alice", 100, 30.0, 400, cache_hit=True)
+    await analytics.track_generation("bob", 50, 12.0, 3000, success=False, error="timeout")
+    await analytics.track_generation("bob", 80, 120.0, 800, timestamp=days_ago(2))
+
+
+class TestStats:
+    def test_totals_match_event_semantics(self):
+        analytics = VoiceAnalyticsService()
+        run(track_sample(analytics))
+        stats = run(analytics.get_stats(days=7))
+
+        assert stats["period_days"] == 7
+        assert stats["total_requests"] == 4
+        assert stats["successful_requests"] == 3
+        assert stats["failed_requests"] == 1
+        assert stats["success_rate_percent"] == 75.0
+        assert stats["cache_hits"] == 1
+        assert stats["cache_hit_rate_percent"] == 25.0
+        # Successful audio only; cost only for uncached successes
+        assert stats["total_audio_duration_seconds"] == 210.0
+        assert stats["estimated_cost_usd"] == round((60 + 120) / 60 * 0.10, 2)
+        assert stats["avg_processing_time_ms"] == round((1200 + 400 + 800) / 3, 2)
+
+    def test_voice_filter_top_voices_and_daily_breakdown(self):
+        analytics = VoiceAnalyticsService()
+        run(track_sample(analytics))
+        stats = run(analytics.get_stats(days=7))
+
+        top = {v["voice_id"]: v for v in stats["top_voices"]}
+        assert set(top) == {"alice", "bob"}
+        bob = top["bob"]
+        assert bob["requests"] == 2
+        assert bob["audio_duration_seconds"] == 132.0  # includes the failed request
+
+        daily = stats["daily_breakdown"]
+        assert [d["date"] for d in daily] == [
+            days_ago(2).date().isoformat(), datetime.now(timezone.utc).date().isoformat(),
+        ]
+        assert [d["requests"] for d in daily] == [1, 3]
+
+        bob_stats = run(analytics.get_voice_stats("bob", days=7))
+        assert bob_stats["total_requests"] == 2
+        assert [d["requests"] for d in bob_stats["daily_breakdown"]] == [1, 1]
+        assert run(analytics.get_voice_stats("nobody"))["total_requests"] == 0
+
+    def test_window_and_retention(self):
+        analytics = VoiceAnalyticsService(retention_days=5)
+        run(analytics.track_generation("v", 10, 1.0, 100, timestamp=days_ago(4)))
+        run(analytics.track_generation("v", 10, 1.0, 100, timestamp=days_ago(20)))
+        run(analytics.track_generation("v", 10, 1.0, 100))
+
+        assert run(analytics.get_stats(days=1))["total_requests"] == 1
+        assert run(analytics.get_stats(days=30))["total_requests"] == 2
+
+    def test_recent_stats_and_latency_percentiles(self):
+        analytics = VoiceAnalyticsService()
+        for ms in [50] * 90 + [4000] * 10:
+            run(analytics.track_generation("v", 10, 1.0, ms))
+        run(analytics.track_generation("v", 10, 1.0, 100, timestamp=days_ago(0, hours=3)))
+
+        recent = run(analytics.get_recent_stats(minutes=60))
+        assert recent["total_requests"] == 100
+        assert recent["latency_histogram"]["<=100"] == 90
+        assert recent["latency_histogram"]["<=5000"] == 10
+        assert recent["p50_processing_time_ms"] == 100
+        assert recent["p95_processing_time_ms"] == 5000
+        assert run(analytics.get_recent_stats(minutes=24 * 60))["total_requests"] == 101
+
+    def test_recent_errors(self):
+        analytics = VoiceAnalyticsService()
+        run(track_sample(analytics))
+        errors = run(analytics.get_recent_errors())
+        assert [(e["voice_id"], e["error"]) for e in errors] == [("bob", "timeout")]
+
+    def test_tracking_is_constant_time(self):
+        analytics = VoiceAnalyticsService()
+
+        async def track(n):
+            start = time.perf_counter()
+            for i in range(n):
+                await analytics.track_generation(f"voice_{i % 50}", 100, 5.0, 500)
+            return time.perf_counter() - start
+
+        first = run(track(2000))
+        run(track(20000))
+        last = run(track(2000))
+        # The list-rebuild version was ~10x slower here; allow generous noise
+        assert last < first * 3
+        stats = run(analytics.get_stats(days=1))
+        assert stats["total_requests"] == 24000
+
+
+class TestPersistence:
+    def test_restart_replays_events(self, tmp_path):
+        db = tmp_path / "analytics.db"
+        analytics = VoiceAnalyticsService(db_path=str(db))
+        run(track_sample(analytics))
+        before = run(analytics.get_stats(days=7))
+        analytics.close()
+
+        restored = VoiceAnalyticsService(db_path=str(db))
+        assert run(restored.get_stats(days=7)) == before
+        assert len(run(restored.get_recent_errors())) == 1
+
+        # Appends continue on the same file
+        run(restored.track_generation("carol", 10, 2.0, 100))
+        restored.close()
+        again = VoiceAnalyticsService(db_path=str(db))
+        assert run(again.get_stats(days=7))["total_requests"] == 5
+        again.close()
+
+    def test_buffered_events_survive_exit_without_close(self, tmp_path):
+        db = tmp_path / "analytics.db"
+        # A separate interpreter tracks two events (below the batch size and
+        # interval, so nothing is flushed yet) and exits without close()
+        script = textwrap.dedent("""
+            import asyncio, importlib.util, sys
+            spec = importlib.util.spec_from_file_location("voice_analytics_service", sys.argv[1])
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            analytics = module.VoiceAnalyticsService(db_path=sys.argv[2])
+            asyncio.run(analytics.track_generation("alice", 100, 60.0, 1200))
+            asyncio.run(analytics.track_generation("bob", 50, 12.0, 3000, success=False, error="timeout"))
+            assert len(analytics._pending) == 2
+        """)
+        subprocess.run(
+            [sys.executable, "-c", script, voice_analytics_service.__file__, str(db)],
+            check=True, timeout=60,
+        )
+
+        reopened = VoiceAnalyticsService(db_path=str(db))
+        stats = run(reopened.get_stats(days=1))
+        assert stats["total_requests"] == 2 and stats["failed_requests"] == 1
+        reopened.close()
+
+    def test_rows_past_retention_are_dropped(self, tmp_path):
+        db = tmp_path / "analytics.db"
+        analytics = VoiceAnalyticsService(retention_days=90, db_path=str(db))
+        run(analytics.track_generation("v", 10, 1.0, 100, timestamp=days_ago(10)))
+        analytics.close()
+
+        short = VoiceAnalyticsService(retention_days=5, db_path=str(db))
+        assert run(short.get_stats(days=30))["total_requests"] == 0
+        assert short._db.execute("SELECT COUNT(*) FROM voice_events").fetchone()[0] == 0
+        short.close()
@@ -0,0 +1,240 @@
+"""
+Voice Cache Service — bounded in-memory backend and batch lookups
+
+Tests that:
+1. The in-memory backend evicts least recently used entries at the entry and byte limits,
+   which bound the whole cache rather than each shard
+2. TTLs are enforced lazily on read and by the periodic sweep
+3. Byte accounting stays exact under concurrent writers across shards
+4. get_metrics exposes evictions, expirations and memory usage
+5. Redis batch lookups use chunked MGETs in one pipelined round trip
+6. MultiVoiceContentService only generates dialogue lines missing from the cache
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Ensure python/ is on the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'python'))
+
+# services.voice's package __init__ pulls in the database layer
+voice_cache_service = pytest.importorskip("services.voice.voice_cache_service")
+from services.voice.multi_voice_content_service import MultiVoiceContentService  # noqa: E402
+
+MemoryCacheBackend = voice_cache_service.MemoryCacheBackend
+VoiceCacheService = voice_cache_service.VoiceCacheService
+
+
+class TestMemoryBackend:
+    def test_lru_eviction_by_entries(self):
+        cache = MemoryCacheBackend(max_entries=3, shards=1)
+        for key in "abc":
+            cache.set(key, {"v": key}, ttl_seconds=60)
+        assert cache.get("a") == {"v": "a"}  # a becomes most recent
+        cache.set("d", {"v": "d"}, ttl_seconds=60)
+
+        assert cache.get("b") is None
+        assert [cache.get(k) is not None for k in "acd"] == [True, True, True]
+        assert cache.evictions == 1
+        assert len(cache) == 3
+
+    def test_eviction_by_bytes(self):
+        cache = MemoryCacheBackend(max_entries=100, max_bytes=100, shards=1)
+        for i in range(5):
+            cache.set(f"k{i}", "x" * 30, ttl_seconds=60)  # 32 JSON bytes each
+        assert cache.total_bytes <= 100
+        assert len(cache) == 3
+        assert cache.get("k0") is None and cache.get("k4") is not None
+        assert not cache.set("huge", "x" * 200, ttl_seconds=60)
+
+    def test_overwrite_keeps_accounting(self):
+        cache = MemoryCacheBackend(shards=1)
+        cache.set("k", "x" * 10, ttl_seconds=60)
+        cache.set("k", "x" * 20, ttl_seconds=60)
+        assert len(cache) == 1
+        assert cache.total_bytes == len(json.dumps("x" * 20))
+
+    def test_ttl_lazy_and_periodic(self):
+        cache = MemoryCacheBackend(shards=4, sweep_interval_seconds=3600)
+        cache.set("short", 1, ttl_seconds=0.05)
+        cache.set("other", 2, ttl_seconds=0.05)
+        cache.set("long", 3, ttl_seconds=60)
+        time.sleep(0.08)
+
+        assert cache.get("short") is None          # lazy
+        assert cache.purge_expired() == 1          # sweep catches "other"
+        assert cache.expirations == 2
+        assert cache.get("long") == 3
+        assert cache.total_bytes == len(json.dumps(3))
+
+    def test_sweep_runs_from_writes(self):
+        cache = MemoryCacheBackend(shards=2, sweep_interval_seconds=0.05)
+        cache.set("old", 1, ttl_seconds=0.01)
+        time.sleep(0.06)
+        cache.set("new", 2, ttl_seconds=60)
+        assert len(cache) == 1
+        assert cache.expirations == 1
+
+    def test_concurrent_writers_keep_exact_accounting(self):
+        cache = MemoryCacheBackend(max_entries=200, max_bytes=10_000, shards=8)
+
+        def writer(seed):
+            for i in range(500):
+                cache.set(f"{seed}-{i % 150}", "v" * (i % 40), ttl_seconds=60)
+                cache.get(f"{(seed + 1) % 4}-{i % 150}")
+
+        threads = [threading.Thread(target=writer, args=(s,)) for s in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        actual = sum(
+            entry[1] for shard in cache._shards for entry in shard.entries.values()
+        )
+        assert cache.total_bytes == actual
+        assert len(cache) == sum(len(shard.entries) for shard in cache._shards)
+        assert len(cache) <= 200
+        assert cache.total_bytes <= 10_000
+
+    def test_limits_are_global_across_shards(self):
+        cache = MemoryCacheBackend(max_entries=10, max_bytes=10_000, shards=16)
+        for i in range(50):
+            cache.set(f"k{i}", i, ttl_seconds=60)
+            assert len(cache) <= 10
+        # Global LRU order, whichever shards the keys hashed to
+        assert [cache.get(f"k{i}") for i in range(40, 50)] == list(range(40, 50))
+        assert cache.get("k39") is None
+        assert cache.evictions == 40
+
+        small = MemoryCacheBackend(max_entries=100, max_bytes=100, shards=16)
+        for i in range(5):
+            small.set(f"b{i}", "x" * 30, ttl_seconds=60)
+        assert small.total_bytes <= 100 and len(small) == 3
+
+
+class TestVoiceCacheService:
+    def test_memory_mode_metrics(self):
+        service = VoiceCacheService(max_memory_entries=2, memory_shards=1)
+
+        async def run():
+            for text in ("one", "two", "three"):
+                await service.cache_voice(text, "ref.mp3", {"audio_url": text})
+            assert await service.get_cached_voice("one", "ref.mp3") is None
+            assert (await service.get_cached_voice("three", "ref.mp3"))["audio_url"] == "three"
+            return await service.get_cached_voices([("two", "ref.mp3", None), ("one", "ref.mp3", None)])
+
+        batch = asyncio.run(run())
+        assert batch[0]["audio_url"] == "two" and batch[1] is None
+
+        metrics = service.get_metrics()
+        assert metrics["cache_type"] == "memory"
+        assert (metrics["hits"], metrics["misses"]) == (2, 2)
+        assert metrics["memory_entries"] == 2
+        assert metrics["evictions"] == 1
+        assert metrics["memory_bytes"] > 0
+
+    def test_ttl_respected_in_memory_mode(self):
+        from datetime import timedelta
+
+        service = VoiceCacheService()
+
+        async def run():
+            await service.cache_voice("hi", "ref", {"audio_url": "x"}, ttl=timedelta(milliseconds=30))
+            await asyncio.sleep(0.05)
+            return await service.get_cached_voice("hi", "ref")
+
+        assert asyncio.run(run()) is None
+        assert service.get_metrics()["expirations"] == 1
+
+
+class FakePipeline:
+    def __init__(self, store, log):
+        self.store = store
+        self.log = log
+        self.ops = []
+
+    def mget(self, keys):
+        self.ops.append(("mget", list(keys)))
+        return self
+
+    def setex(self, key, ttl, value):
+        self.ops.append(("setex", key, value))
+        return self
+
+    async def execute(self):
+        self.log.append([op[0] for op in self.ops])
+        out = []
+        for op in self.ops:
+            if op[0] == "mget":
+                out.append([self.store.get(k) for k in op[1]])
+            else:
+                self.store[op[1]] = op[2]
+                out.append(True)
+        return out
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.round_trips = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.store, self.round_trips)
+
+
+class TestRedisBatch:
+    def test_pipelined_mget(self, monkeypatch):
+        monkeypatch.setattr(voice_cache_service, "MGET_CHUNK_SIZE", 4)
+        redis = FakeRedis()
+        service = VoiceCacheService(redis_client=redis)
+        lines = [(f"line {i}", "ref", None) for i in range(10)]
+
+        async def run():
+            await service.cache_voices([(t, v, {"audio_url": t}, o) for t, v, o in lines[::2]])
+            return await service.get_cached_voices(lines)
+
+        results = asyncio.run(run())
+        assert redis.round_trips == [["setex"] * 5, ["mget"] * 3]
+        assert [r["audio_url"] if r else None for r in results] == [
+            t if i % 2 == 0 else None for i, (t, _, _) in enumerate(lines)
+        ]
+        assert (service.hits, service.misses) == (5, 5)
+
+
+class FakeVoiceService:
+    def __init__(self):
+        self.calls = []
+
+    async def clone_voice(self, text, voice_reference_url):
+        self.calls.append(text)
+        return {"audio_url": f"https://cdn/{len(self.calls)}.mp3", "duration_seconds": 1.0}
+
+
+class TestMultiVoiceCaching:
+    def test_only_uncached_lines_generated(self):
+        voice = FakeVoiceService()
+        service = MultiVoiceContentService(voice_service=voice, voice_cache=VoiceCacheService())
+        script = [
+            {"speaker": "host", "text": "Welcome!"},
+            {"speaker": "guest", "text": "Thanks!"},
+            {"speaker": "host", "text": "Let's start."},
+        ]
+        mapping = {"host": "host.mp3", "guest": "guest.mp3"}
+
+        first = asyncio.run(service.generate_multi_voice_content(script, mapping))
+        assert len(voice.calls) == 3
+
+        script[1] = {"speaker": "guest", "text": "Thanks for having me!"}
+        second = asyncio.run(service.generate_multi_voice_content(script, mapping))
+
+        assert voice.calls[3:] == ["Thanks for having me!"]
+        assert second.success
+        assert [l.audio_url for l in second.dialogue_lines][::2] == [l.audio_url for l in first.dialogue_lines][::2]
+        assert second.dialogue_lines[2].start_time == pytest.approx(3.0)